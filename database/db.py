@@ -6,8 +6,33 @@ database/db.py
 
 import sqlite3
 import os
+from pathlib import Path
 from datetime import datetime
 
+from modules.timetable_model import PERIOD_TIMES
+
+SCHEDULE_COLUMNS = ("class_room", "day_of_week", "period_no", "start_time", "end_time",
+                    "subject_name", "teacher_id", "room_no")
+
+# ครูสอนซ้ำถูกกันต่อรุ่นของตาราง: UNIQUE(version_id, teacher_id, day_of_week, period_no)
+SCHEDULE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        version_id INTEGER NOT NULL DEFAULT 1,
+        class_room TEXT NOT NULL,
+        day_of_week TEXT NOT NULL,
+        period_no INTEGER NOT NULL,
+        start_time TEXT,
+        end_time TEXT,
+        subject_name TEXT NOT NULL,
+        teacher_id TEXT NOT NULL,
+        room_no TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (teacher_id) REFERENCES teachers(teacher_id),
+        UNIQUE(version_id, teacher_id, day_of_week, period_no)
+    )
+"""
+
 
 class Database:
     """คลาสหลักสำหรับจัดการฐานข้อมูล SQLite"""
@@ -35,6 +60,24 @@ class Database:
             print(f"เกิดข้อผิดพลาดในการเชื่อมต่อฐานข้อมูล: {e}")
             return False
 
+    @classmethod
+    def open_readonly(cls, db_path):
+        """
+        เปิดการเชื่อมต่อแบบอ่านอย่างเดียว (ไม่สร้างตาราง)
+        ใช้ใน worker ของงาน Export เพราะ connection ของ sqlite3 ใช้ข้าม thread ไม่ได้
+        Args:
+            db_path: ที่อยู่ไฟล์ฐานข้อมูล
+        Returns:
+            Database ที่เขียนข้อมูลไม่ได้
+        """
+        db = cls.__new__(cls)
+        db.db_path = db_path
+        uri = Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+        db.conn = sqlite3.connect(uri, uri=True)
+        db.conn.row_factory = sqlite3.Row
+        db.cursor = db.conn.cursor()
+        return db
+
     def close(self):
         """ปิดการเชื่อมต่อฐานข้อมูล"""
         if self.conn:
@@ -122,23 +165,46 @@ class Database:
             )
         """)
 
-        # ตารางตารางเรียน
+        # ตารางตารางเรียน (แยกตามรุ่นของตาราง - version_id)
+        self.cursor.execute(SCHEDULE_TABLE_SQL.format(table="schedule"))
+        self._migrate_schedule_versions()
+
+        # รุ่นของตารางเรียนต่อภาคเรียน: live = ตารางที่ใช้อยู่, draft = ฉบับร่างภาคเรียนถัดไป
+        # materialized = 0 -> ยังไม่มีแถวของตัวเอง อ่านจากรุ่น based_on (copy-on-write)
         self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS schedule (
+            CREATE TABLE IF NOT EXISTS timetable_versions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                class_room TEXT NOT NULL,
-                day_of_week TEXT NOT NULL,
-                period_no INTEGER NOT NULL,
-                start_time TEXT,
-                end_time TEXT,
-                subject_name TEXT NOT NULL,
-                teacher_id TEXT NOT NULL,
-                room_no TEXT,
+                term TEXT NOT NULL,
+                name TEXT,
+                status TEXT NOT NULL DEFAULT 'draft',
+                based_on INTEGER,
+                materialized INTEGER NOT NULL DEFAULT 1,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (teacher_id) REFERENCES teachers(teacher_id),
-                UNIQUE(teacher_id, day_of_week, period_no)
+                FOREIGN KEY (based_on) REFERENCES timetable_versions(id)
+            )
+        """)
+        self.cursor.execute("SELECT COUNT(*) FROM timetable_versions")
+        if self.cursor.fetchone()[0] == 0:
+            # แถวเดิมทั้งหมดมี version_id = 1
+            self.cursor.execute("""
+                INSERT INTO timetable_versions (id, term, name, status)
+                VALUES (1, ?, 'ตารางปัจจุบัน', 'live')
+            """, (f"{datetime.now().year + 543}/1",))
+
+        # ตารางเวลาเรียน (คาบ + เวลาเริ่ม/สิ้นสุด)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS bell_schedule (
+                period_no INTEGER PRIMARY KEY,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL
             )
         """)
+        self.cursor.execute("SELECT COUNT(*) FROM bell_schedule")
+        if self.cursor.fetchone()[0] == 0:
+            self.cursor.executemany(
+                "INSERT INTO bell_schedule (period_no, start_time, end_time) VALUES (?, ?, ?)",
+                [(i, start, end) for i, (start, end) in enumerate(PERIOD_TIMES, start=1)]
+            )
 
         # สร้าง index เพื่อเพิ่มประสิทธิภาพการค้นหา
         self.cursor.execute("""
@@ -156,9 +222,15 @@ class Database:
             ON grades(academic_year, semester)
         """)
 
+        # ทุก query ของตารางเรียนระบุรุ่นก่อน -> อ่านเฉพาะแถวของรุ่นนั้น
         self.cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_schedule_class
-            ON schedule(class_room, day_of_week)
+            ON schedule(version_id, class_room, day_of_week)
+        """)
+
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_schedule_room
+            ON schedule(version_id, room_no, day_of_week, period_no)
         """)
 
         # ตารางห้องเรียน
@@ -172,6 +244,21 @@ class Database:
 
         self.conn.commit()
 
+    def _migrate_schedule_versions(self):
+        """ฐานข้อมูลเดิมที่ schedule ยังไม่มี version_id: สร้างตารางใหม่แล้วย้ายแถวเดิมเป็นรุ่น 1"""
+        self.cursor.execute("PRAGMA table_info(schedule)")
+        if any(row['name'] == 'version_id' for row in self.cursor.fetchall()):
+            return
+        columns = ", ".join(("id",) + SCHEDULE_COLUMNS + ("created_at",))
+        # UNIQUE เดิมไม่มี version_id - เปลี่ยนได้ด้วยการสร้างตารางใหม่เท่านั้น
+        self.cursor.execute(SCHEDULE_TABLE_SQL.format(table="schedule_versioned"))
+        self.cursor.execute(f"""
+            INSERT INTO schedule_versioned ({columns}, version_id)
+            SELECT {columns}, 1 FROM schedule
+        """)
+        self.cursor.execute("DROP TABLE schedule")
+        self.cursor.execute("ALTER TABLE schedule_versioned RENAME TO schedule")
+
     # ==================== STUDENTS ====================
 
     def add_student(self, student_data):
@@ -350,6 +437,36 @@ class Database:
         result = self.cursor.fetchone()
         return result[0] if result else 0
 
+    def count_students_per_classroom(self):
+        """
+        นับจำนวนนักเรียนทุกห้องใน query เดียว
+        Returns:
+            dict {ห้อง: จำนวน} (เฉพาะห้องที่มีนักเรียน)
+        """
+        self.cursor.execute("""
+            SELECT class_room, COUNT(*) FROM students
+            WHERE is_active = 1
+            GROUP BY class_room
+        """)
+        return {row[0]: row[1] for row in self.cursor.fetchall()}
+
+    def count_students(self, active_only=True):
+        """นับจำนวนนักเรียนทั้งหมด"""
+        query = "SELECT COUNT(*) FROM students"
+        if active_only:
+            query += " WHERE is_active = 1"
+        self.cursor.execute(query)
+        return self.cursor.fetchone()[0]
+
+    def data_version(self):
+        """
+        ตัวบอกว่าข้อมูลเปลี่ยนหรือไม่ (ใช้ตรวจว่า cache ยังใช้ได้)
+        Returns:
+            tuple ที่เปลี่ยนค่าเมื่อมีการเขียนข้อมูล ทั้งจาก connection นี้และ connection อื่น
+        """
+        self.cursor.execute("PRAGMA data_version")
+        return (self.conn.total_changes, self.cursor.fetchone()[0])
+
     # ==================== CLASSROOMS ====================
 
     def add_classroom(self, name):
@@ -747,6 +864,51 @@ class Database:
         """, (student_id,))
         return [dict(row) for row in self.cursor.fetchall()]
 
+    def get_all_transcripts(self, class_room=None):
+        """
+        ดึง Transcript ของนักเรียนหลายคนในครั้งเดียว (query เดียว แทนการเรียก get_transcript ทีละคน)
+        Args:
+            class_room: กรองตามห้อง (None = ทั้งโรงเรียน)
+        Returns:
+            list of dict {'student': dict, 'grades': list of dict}
+            เรียงตามห้องและรหัสนักเรียน เฉพาะนักเรียนที่มีคะแนน
+        """
+        query = """
+            SELECT g.*, s.title, s.first_name, s.last_name, s.class_room
+            FROM grades g
+            JOIN students s ON s.student_id = g.student_id
+            WHERE s.is_active = 1
+        """
+        params = []
+        if class_room:
+            query += " AND s.class_room = ?"
+            params.append(class_room)
+        query += " ORDER BY s.class_room, g.student_id, g.academic_year, g.semester, g.subject_code"
+
+        self.cursor.execute(query, params)
+
+        transcripts = []
+        current_id = None
+        for row in self.cursor.fetchall():
+            row = dict(row)
+            if row['student_id'] != current_id:
+                current_id = row['student_id']
+                transcripts.append({
+                    'student': {
+                        'student_id': row['student_id'],
+                        'title': row.pop('title'),
+                        'first_name': row.pop('first_name'),
+                        'last_name': row.pop('last_name'),
+                        'class_room': row.pop('class_room'),
+                    },
+                    'grades': [],
+                })
+            else:
+                for key in ('title', 'first_name', 'last_name', 'class_room'):
+                    row.pop(key)
+            transcripts[-1]['grades'].append(row)
+        return transcripts
+
     def calculate_grade(self, score):
         """
         คำนวณเกรดจากคะแนน
@@ -868,6 +1030,14 @@ class Database:
         self.cursor.execute(query)
         return [dict(row) for row in self.cursor.fetchall()]
 
+    def count_teachers(self, active_only=True):
+        """นับจำนวนครูทั้งหมด"""
+        query = "SELECT COUNT(*) FROM teachers"
+        if active_only:
+            query += " WHERE is_active = 1"
+        self.cursor.execute(query)
+        return self.cursor.fetchone()[0]
+
     def get_teacher_by_id(self, teacher_id):
         """
         ดึงข้อมูลครูจากรหัส
@@ -882,34 +1052,247 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
 
+    # ==================== TIMETABLE VERSIONS ====================
+
+    def live_version_id(self):
+        """id ของรุ่นตารางเรียนที่ใช้อยู่ (status = 'live')"""
+        self.cursor.execute("""
+            SELECT id FROM timetable_versions WHERE status = 'live' ORDER BY id DESC LIMIT 1
+        """)
+        row = self.cursor.fetchone()
+        return row[0] if row else 1
+
+    def get_timetable_versions(self):
+        """
+        ดึงรุ่นของตารางเรียนทั้งหมด
+        Returns:
+            list of dict {id, term, name, status, based_on, materialized, created_at}
+        """
+        self.cursor.execute("""
+            SELECT * FROM timetable_versions
+            ORDER BY CASE status WHEN 'live' THEN 0 WHEN 'draft' THEN 1 ELSE 2 END, term DESC, id DESC
+        """)
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def create_timetable_version(self, term, name=None, based_on=None):
+        """
+        สร้างฉบับร่างตารางเรียนของภาคเรียน (ยังไม่คัดลอกแถว - คัดลอกเมื่อแก้ไขครั้งแรก)
+        Args:
+            term: ภาคเรียน เช่น "2569/2"
+            name: ชื่อรุ่น (ไม่บังคับ)
+            based_on: id ของรุ่นต้นแบบ (None = รุ่นที่ใช้อยู่)
+        Returns:
+            id ของรุ่นใหม่ หรือ None
+        """
+        try:
+            self.cursor.execute("""
+                INSERT INTO timetable_versions (term, name, status, based_on, materialized)
+                VALUES (?, ?, 'draft', ?, 0)
+            """, (term, name, based_on or self.live_version_id()))
+            self.conn.commit()
+            return self.cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"เกิดข้อผิดพลาดในการสร้างรุ่นตารางเรียน: {e}")
+            return None
+
+    def publish_timetable_version(self, version_id):
+        """
+        ใช้รุ่นนี้เป็นตารางเรียนปัจจุบัน (รุ่นที่ใช้อยู่เดิมเปลี่ยนเป็น archived)
+        Returns:
+            True/False
+        """
+        try:
+            self.cursor.execute("""
+                UPDATE timetable_versions SET status = 'archived'
+                WHERE status = 'live' AND id != ?
+            """, (version_id,))
+            self.cursor.execute("""
+                UPDATE timetable_versions SET status = 'live' WHERE id = ?
+            """, (version_id,))
+            if self.cursor.rowcount == 0:
+                self.conn.rollback()
+                return False
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"เกิดข้อผิดพลาดในการเปลี่ยนรุ่นตารางเรียน: {e}")
+            return False
+
+    def delete_timetable_version(self, version_id):
+        """
+        ลบรุ่นตารางเรียน (ลบรุ่นที่ใช้อยู่ไม่ได้) - รุ่นที่ยังอ่านจากรุ่นนี้จะถูกคัดลอกแถวไปก่อน
+        Returns:
+            True/False
+        """
+        if version_id == self.live_version_id():
+            return False
+        try:
+            self._materialize_dependents(version_id)
+            self.cursor.execute("DELETE FROM schedule WHERE version_id = ?", (version_id,))
+            self.cursor.execute("DELETE FROM timetable_versions WHERE id = ?", (version_id,))
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"เกิดข้อผิดพลาดในการลบรุ่นตารางเรียน: {e}")
+            return False
+
+    def _version_chain(self, version_id):
+        """
+        รุ่นที่ต้องไล่ตาม based_on จนเจอรุ่นที่มีแถวของตัวเอง
+        Returns:
+            list ของ id (ตัวสุดท้าย = รุ่นที่เก็บแถวจริง)
+        """
+        chain = []
+        current = version_id
+        while current is not None and current not in chain:
+            chain.append(current)
+            self.cursor.execute("""
+                SELECT based_on, materialized FROM timetable_versions WHERE id = ?
+            """, (current,))
+            row = self.cursor.fetchone()
+            if row is None or row['materialized'] or row['based_on'] is None:
+                break
+            current = row['based_on']
+        return chain
+
+    def read_version_id(self, version_id=None):
+        """id ของรุ่นที่เก็บแถวของ version_id (None = รุ่นที่ใช้อยู่)"""
+        return self._version_chain(version_id or self.live_version_id())[-1]
+
+    def _materialize(self, version_id, source_id):
+        """คัดลอกแถวของ source_id มาเป็นของ version_id (ไม่ commit)"""
+        columns = ", ".join(SCHEDULE_COLUMNS)
+        if source_id != version_id:
+            self.cursor.execute(f"""
+                INSERT INTO schedule (version_id, {columns})
+                SELECT ?, {columns} FROM schedule WHERE version_id = ?
+            """, (version_id, source_id))
+        self.cursor.execute("""
+            UPDATE timetable_versions SET materialized = 1 WHERE id = ?
+        """, (version_id,))
+
+    def _materialize_dependents(self, version_id):
+        """รุ่นที่ยังอ่านแถวผ่าน version_id ได้สำเนาของตัวเองก่อนแถวของ version_id จะเปลี่ยน"""
+        self.cursor.execute("""
+            SELECT id FROM timetable_versions WHERE materialized = 0 AND id != ?
+        """, (version_id,))
+        for (other_id,) in self.cursor.fetchall():
+            chain = self._version_chain(other_id)
+            if version_id in chain:
+                self._materialize(other_id, chain[-1])
+
+    def _write_version(self, version_id=None):
+        """
+        เตรียมรุ่นสำหรับเขียน (copy-on-write, ไม่ commit)
+        - รุ่นนี้ยังไม่มีแถวของตัวเอง -> คัดลอกจากรุ่นต้นแบบ
+        - รุ่นอื่นที่ยังอ่านแถวผ่านรุ่นนี้ได้สำเนาไปก่อนแถวจะเปลี่ยน
+        Returns:
+            id ของรุ่นที่จะเขียน
+        """
+        version_id = version_id or self.live_version_id()
+        source_id = self._version_chain(version_id)[-1]
+        if source_id != version_id:
+            self._materialize(version_id, source_id)
+        self._materialize_dependents(version_id)
+        return version_id
+
+    def _own_schedule_id(self, schedule_id, version_id):
+        """id ของคาบเดียวกันในรุ่น version_id (คาบที่เห็นก่อนคัดลอกยังเป็น id ของรุ่นต้นแบบ)"""
+        self.cursor.execute("""
+            SELECT version_id, teacher_id, day_of_week, period_no FROM schedule WHERE id = ?
+        """, (schedule_id,))
+        row = self.cursor.fetchone()
+        if row is None or row['version_id'] == version_id:
+            return schedule_id
+        self.cursor.execute("""
+            SELECT id FROM schedule
+            WHERE version_id = ? AND teacher_id = ? AND day_of_week = ? AND period_no = ?
+        """, (version_id, row['teacher_id'], row['day_of_week'], row['period_no']))
+        own = self.cursor.fetchone()
+        return own[0] if own else None
+
+    # ==================== BELL SCHEDULE ====================
+
+    def get_bell_schedule(self):
+        """
+        ดึงตารางเวลาเรียน
+        Returns:
+            list of dict {period_no, start_time, end_time} เรียงตามคาบ
+        """
+        self.cursor.execute("SELECT * FROM bell_schedule ORDER BY period_no")
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def save_bell_schedule(self, periods):
+        """
+        บันทึกตารางเวลาเรียนใหม่ทั้งชุด
+        Args:
+            periods: list ของ (start_time, end_time) รูปแบบ HH:MM ตามลำดับคาบ 1, 2, ...
+        Returns:
+            True/False หรือ error message
+        """
+        rows = []
+        previous_end = None
+        for period_no, (start, end) in enumerate(periods, start=1):
+            try:
+                start_at = datetime.strptime(start.strip(), "%H:%M")
+                end_at = datetime.strptime(end.strip(), "%H:%M")
+            except (AttributeError, ValueError):
+                return f"คาบที่ {period_no}: กรุณากรอกเวลาในรูปแบบ HH:MM"
+            if end_at <= start_at:
+                return f"คาบที่ {period_no}: เวลาสิ้นสุดต้องหลังเวลาเริ่ม"
+            if previous_end is not None and start_at < previous_end:
+                return f"คาบที่ {period_no}: เวลาเริ่มซ้อนกับคาบก่อนหน้า"
+            previous_end = end_at
+            rows.append((period_no, start_at.strftime("%H:%M"), end_at.strftime("%H:%M")))
+        if not rows:
+            return "ต้องมีอย่างน้อย 1 คาบ"
+
+        try:
+            self.cursor.execute("DELETE FROM bell_schedule")
+            self.cursor.executemany(
+                "INSERT INTO bell_schedule (period_no, start_time, end_time) VALUES (?, ?, ?)", rows)
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"เกิดข้อผิดพลาดในการบันทึกตารางเวลาเรียน: {e}")
+            return False
+
     # ==================== SCHEDULE ====================
+    # ทุกเมธอดรับ version_id (None = รุ่นที่ใช้อยู่) และกรองด้วย version_id ก่อนเสมอ
 
-    def add_schedule(self, schedule_data):
+    def add_schedule(self, schedule_data, version_id=None):
         """
         เพิ่มตารางเรียน
         Args:
             schedule_data: dict ข้อมูลตารางเรียน
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             True/False หรือ error message
         """
+        # ครูสอนซ้ำถูกกันด้วย UNIQUE(version_id, teacher_id, day_of_week, period_no)
+        # - query หาคาบที่ชนเฉพาะเมื่อบันทึกไม่ผ่าน (ไม่ต้องตรวจก่อนทุกครั้ง)
+        # ห้องซ้อนไม่มี constraint - ตรวจก่อนบันทึกด้วย idx_schedule_room
         try:
-            # ตรวจสอบความขัดแย้งของครู
-            conflict = self.check_teacher_conflict(
-                schedule_data.get('teacher_id'),
+            conflict = self.check_room_conflict(
+                schedule_data.get('room_no'),
                 schedule_data.get('day_of_week'),
                 schedule_data.get('period_no'),
-                exclude_id=None
+                version_id=version_id
             )
-
             if conflict:
-                return conflict  # ส่ง error message กลับไป
+                return conflict
 
+            version_id = self._write_version(version_id)
             self.cursor.execute("""
                 INSERT INTO schedule (
-                    class_room, day_of_week, period_no, start_time, end_time,
+                    version_id, class_room, day_of_week, period_no, start_time, end_time,
                     subject_name, teacher_id, room_no
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
+                version_id,
                 schedule_data.get('class_room'),
                 schedule_data.get('day_of_week'),
                 schedule_data.get('period_no'),
@@ -921,31 +1304,38 @@ class Database:
             ))
             self.conn.commit()
             return True
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            return self._schedule_conflict_or_false(schedule_data, None, e, version_id)
         except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"เกิดข้อผิดพลาดในการเพิ่มตารางเรียน: {e}")
             return False
 
-    def update_schedule(self, schedule_id, schedule_data):
+    def update_schedule(self, schedule_id, schedule_data, version_id=None):
         """
         แก้ไขตารางเรียน
         Args:
             schedule_id: id ของตาราง
             schedule_data: dict ข้อมูลที่ต้องการแก้ไข
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             True/False หรือ error message
         """
+        # ครูสอนซ้ำถูกกันด้วย UNIQUE (แถวที่กำลังแก้ไขไม่นับเป็นคาบชนอยู่แล้ว)
         try:
-            # ตรวจสอบความขัดแย้งของครู (ไม่รวมตัวเองที่กำลังแก้ไข)
-            conflict = self.check_teacher_conflict(
-                schedule_data.get('teacher_id'),
+            conflict = self.check_room_conflict(
+                schedule_data.get('room_no'),
                 schedule_data.get('day_of_week'),
                 schedule_data.get('period_no'),
-                exclude_id=schedule_id
+                exclude_id=schedule_id,
+                version_id=version_id
             )
-
             if conflict:
                 return conflict
 
+            version_id = self._write_version(version_id)
+            own_id = self._own_schedule_id(schedule_id, version_id)
             self.cursor.execute("""
                 UPDATE schedule SET
                     class_room = ?,
@@ -956,7 +1346,7 @@ class Database:
                     subject_name = ?,
                     teacher_id = ?,
                     room_no = ?
-                WHERE id = ?
+                WHERE id = ? AND version_id = ?
             """, (
                 schedule_data.get('class_room'),
                 schedule_data.get('day_of_week'),
@@ -966,33 +1356,103 @@ class Database:
                 schedule_data.get('subject_name'),
                 schedule_data.get('teacher_id'),
                 schedule_data.get('room_no'),
-                schedule_id
+                own_id,
+                version_id
             ))
+            if self.cursor.rowcount == 0:
+                # คาบถูกลบไปแล้ว - ทิ้งสำเนา copy-on-write ที่เพิ่งสร้างด้วย
+                self.conn.rollback()
+                return False
             self.conn.commit()
             return True
+        except sqlite3.IntegrityError as e:
+            self.conn.rollback()
+            return self._schedule_conflict_or_false(schedule_data, schedule_id, e, version_id)
         except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"เกิดข้อผิดพลาดในการแก้ไขตารางเรียน: {e}")
             return False
 
-    def delete_schedule(self, schedule_id):
+    def _schedule_conflict_or_false(self, schedule_data, exclude_id, error, version_id=None):
+        """ข้อความครูสอนซ้ำหลังบันทึกไม่ผ่านเพราะ constraint (False ถ้าไม่ใช่กรณีครูซ้ำ)"""
+        conflict = self.check_teacher_conflict(
+            schedule_data.get('teacher_id'),
+            schedule_data.get('day_of_week'),
+            schedule_data.get('period_no'),
+            exclude_id=exclude_id,
+            version_id=version_id
+        )
+        if conflict:
+            return conflict
+        print(f"เกิดข้อผิดพลาดในการบันทึกตารางเรียน: {error}")
+        return False
+
+    def replace_class_schedules(self, class_rooms, schedules, version_id=None):
+        """
+        แทนที่ตารางเรียนของห้องที่ระบุทั้งหมดใน transaction เดียว (ใช้กับตารางที่จัดอัตโนมัติ)
+        Args:
+            class_rooms: list ของห้องเรียนที่จะลบตารางเดิม
+            schedules: list of dict ข้อมูลตารางเรียนใหม่ (รูปแบบเดียวกับ add_schedule)
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
+        Returns:
+            True/False (ไม่สำเร็จ = ตารางเดิมไม่เปลี่ยน)
+        """
+        class_rooms = list(class_rooms)
+        try:
+            version_id = self._write_version(version_id)
+            if class_rooms:
+                placeholders = ", ".join("?" for _ in class_rooms)
+                self.cursor.execute(
+                    f"DELETE FROM schedule WHERE version_id = ? AND class_room IN ({placeholders})",
+                    [version_id] + class_rooms)
+            self.cursor.executemany("""
+                INSERT INTO schedule (
+                    version_id, class_room, day_of_week, period_no, start_time, end_time,
+                    subject_name, teacher_id, room_no
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                version_id,
+                s.get('class_room'),
+                s.get('day_of_week'),
+                s.get('period_no'),
+                s.get('start_time'),
+                s.get('end_time'),
+                s.get('subject_name'),
+                s.get('teacher_id'),
+                s.get('room_no')
+            ) for s in schedules])
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            print(f"เกิดข้อผิดพลาดในการบันทึกตารางเรียน: {e}")
+            return False
+
+    def delete_schedule(self, schedule_id, version_id=None):
         """
         ลบตารางเรียน
         Args:
             schedule_id: id ของตาราง
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             True/False
         """
         try:
+            version_id = self._write_version(version_id)
             self.cursor.execute("""
-                DELETE FROM schedule WHERE id = ?
-            """, (schedule_id,))
+                DELETE FROM schedule WHERE id = ? AND version_id = ?
+            """, (self._own_schedule_id(schedule_id, version_id), version_id))
+            if self.cursor.rowcount == 0:
+                self.conn.rollback()
+                return False
             self.conn.commit()
             return True
         except sqlite3.Error as e:
+            self.conn.rollback()
             print(f"เกิดข้อผิดพลาดในการลบตารางเรียน: {e}")
             return False
 
-    def check_teacher_conflict(self, teacher_id, day_of_week, period_no, exclude_id=None):
+    def check_teacher_conflict(self, teacher_id, day_of_week, period_no, exclude_id=None, version_id=None):
         """
         ตรวจสอบความขัดแย้งของครู
         Args:
@@ -1000,6 +1460,7 @@ class Database:
             day_of_week: วัน
             period_no: คาบที่
             exclude_id: id ที่ไม่ต้องตรวจสอบ (กรณีแก้ไข)
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             error message หรือ None
         """
@@ -1007,9 +1468,9 @@ class Database:
             SELECT s.*, t.title, t.first_name, t.last_name
             FROM schedule s
             JOIN teachers t ON s.teacher_id = t.teacher_id
-            WHERE s.teacher_id = ? AND s.day_of_week = ? AND s.period_no = ?
+            WHERE s.version_id = ? AND s.teacher_id = ? AND s.day_of_week = ? AND s.period_no = ?
         """
-        params = [teacher_id, day_of_week, period_no]
+        params = [self.read_version_id(version_id), teacher_id, day_of_week, period_no]
 
         if exclude_id:
             query += " AND s.id != ?"
@@ -1024,11 +1485,82 @@ class Database:
 
         return None
 
-    def get_schedule_by_class(self, class_room):
+    def check_room_conflict(self, room_no, day_of_week, period_no, exclude_id=None, version_id=None):
         """
-        ดึงตารางเรียนตามห้อง
+        ตรวจสอบห้องถูกใช้ซ้อน (ใช้ idx_schedule_room)
+        Args:
+            room_no: ห้อง (ว่าง = ไม่ตรวจ)
+            day_of_week: วัน
+            period_no: คาบที่
+            exclude_id: id ที่ไม่ต้องตรวจสอบ (กรณีแก้ไข)
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
+        Returns:
+            error message หรือ None
+        """
+        if not room_no:
+            return None
+        query = """
+            SELECT class_room, subject_name FROM schedule
+            WHERE version_id = ? AND room_no = ? AND day_of_week = ? AND period_no = ?
+        """
+        params = [self.read_version_id(version_id), room_no, day_of_week, period_no]
+
+        if exclude_id:
+            query += " AND id != ?"
+            params.append(exclude_id)
+
+        self.cursor.execute(query + " LIMIT 1", params)
+        conflict = self.cursor.fetchone()
+
+        if conflict:
+            return (f"ห้อง {room_no} ถูกใช้อยู่แล้วในวัน {day_of_week} คาบที่ {period_no} "
+                    f"(ห้องเรียน {conflict['class_room']} วิชา {conflict['subject_name']}) "
+                    f"กรุณาเลือกห้องหรือคาบอื่น")
+
+        return None
+
+    def get_room_usage(self, version_id=None):
+        """
+        จำนวนการใช้ห้องต่อ (ห้อง, คาบ) จาก aggregate query เดียว
+        Returns:
+            list of dict {room_no, period_no, days_used, bookings}
+            days_used = จำนวนวันที่ห้องถูกใช้ในคาบนั้น, bookings > days_used = มีการใช้ซ้อน
+        """
+        self.cursor.execute("""
+            SELECT room_no, period_no,
+                   COUNT(DISTINCT day_of_week) AS days_used,
+                   COUNT(*) AS bookings
+            FROM schedule
+            WHERE version_id = ? AND room_no IS NOT NULL AND room_no != ''
+            GROUP BY room_no, period_no
+            ORDER BY room_no, period_no
+        """, (self.read_version_id(version_id),))
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def get_room_conflicts(self, version_id=None):
+        """
+        ช่องที่ห้องถูกใช้ซ้อน (ข้อมูลเดิมก่อนมีการตรวจ หรือแก้ไขจากภายนอก)
+        Returns:
+            list of dict {room_no, day_of_week, period_no, bookings, class_rooms}
+        """
+        self.cursor.execute("""
+            SELECT room_no, day_of_week, period_no,
+                   COUNT(*) AS bookings,
+                   GROUP_CONCAT(class_room, ', ') AS class_rooms
+            FROM schedule
+            WHERE version_id = ? AND room_no IS NOT NULL AND room_no != ''
+            GROUP BY room_no, day_of_week, period_no
+            HAVING COUNT(*) > 1
+            ORDER BY room_no, period_no
+        """, (self.read_version_id(version_id),))
+        return [dict(row) for row in self.cursor.fetchall()]
+
+    def get_schedule_by_class(self, class_room, version_id=None):
+        """
+        ดึงตารางเรียนตามห้อง (ใช้ idx_schedule_class: version_id, class_room, day_of_week)
         Args:
             class_room: ห้องเรียน
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             list of dict
         """
@@ -1036,7 +1568,7 @@ class Database:
             SELECT s.*, t.title, t.first_name, t.last_name
             FROM schedule s
             JOIN teachers t ON s.teacher_id = t.teacher_id
-            WHERE s.class_room = ?
+            WHERE s.version_id = ? AND s.class_room = ?
             ORDER BY
                 CASE s.day_of_week
                     WHEN 'จันทร์' THEN 1
@@ -1046,14 +1578,15 @@ class Database:
                     WHEN 'ศุกร์' THEN 5
                 END,
                 s.period_no
-        """, (class_room,))
+        """, (self.read_version_id(version_id), class_room))
         return [dict(row) for row in self.cursor.fetchall()]
 
-    def get_schedule_by_teacher(self, teacher_id):
+    def get_schedule_by_teacher(self, teacher_id, version_id=None):
         """
         ดึงตารางสอนของครู
         Args:
             teacher_id: รหัสครู
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             list of dict
         """
@@ -1061,7 +1594,7 @@ class Database:
             SELECT s.*, t.title, t.first_name, t.last_name
             FROM schedule s
             JOIN teachers t ON s.teacher_id = t.teacher_id
-            WHERE s.teacher_id = ?
+            WHERE s.version_id = ? AND s.teacher_id = ?
             ORDER BY
                 CASE s.day_of_week
                     WHEN 'จันทร์' THEN 1
@@ -1071,10 +1604,10 @@ class Database:
                     WHEN 'ศุกร์' THEN 5
                 END,
                 s.period_no
-        """, (teacher_id,))
+        """, (self.read_version_id(version_id), teacher_id))
         return [dict(row) for row in self.cursor.fetchall()]
 
-    def get_teacher_workload(self):
+    def get_teacher_workload(self, version_id=None):
         """
         คำนวณภาระงานของครูแต่ละคน
         Returns:
@@ -1086,16 +1619,18 @@ class Database:
                 t.title || t.first_name || ' ' || t.last_name as name,
                 COUNT(s.id) as periods_per_week
             FROM teachers t
-            LEFT JOIN schedule s ON t.teacher_id = s.teacher_id
+            LEFT JOIN schedule s ON t.teacher_id = s.teacher_id AND s.version_id = ?
             WHERE t.is_active = 1
             GROUP BY t.teacher_id
             ORDER BY periods_per_week DESC, name
-        """)
+        """, (self.read_version_id(version_id),))
         return [dict(row) for row in self.cursor.fetchall()]
 
-    def get_all_schedules(self):
+    def get_all_schedules(self, version_id=None):
         """
         ดึงตารางเรียนทั้งหมด
+        Args:
+            version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
         Returns:
             list of dict
         """
@@ -1103,6 +1638,7 @@ class Database:
             SELECT s.*, t.title, t.first_name, t.last_name
             FROM schedule s
             JOIN teachers t ON s.teacher_id = t.teacher_id
+            WHERE s.version_id = ?
             ORDER BY s.class_room,
                 CASE s.day_of_week
                     WHEN 'จันทร์' THEN 1
@@ -1112,5 +1648,5 @@ class Database:
                     WHEN 'ศุกร์' THEN 5
                 END,
                 s.period_no
-        """)
+        """, (self.read_version_id(version_id),))
         return [dict(row) for row in self.cursor.fetchall()]
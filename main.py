@@ -5,9 +5,13 @@ main.py
 Version 3.0 - Design System Refactor (60-30-10 Rule)
 """
 
+# ต้อง import ก่อนทุกอย่าง เพื่อจับเวลา import ของ module อื่น (เปิดด้วย --profile-startup)
+from modules.startup_profiler import STARTUP
+
 import customtkinter as ctk
 from datetime import datetime
 import importlib
+import multiprocessing
 import os
 import sys
 import threading
@@ -33,6 +37,12 @@ from modules.grades import GradesModule
 from modules.schedule import ScheduleModule
 from modules.reports import ReportsModule
 from modules.icons import IconManager
+from modules.ui_fonts import FONTS
+from modules.screen_manager import ScreenManager
+from modules.dashboard_stats import get_dashboard_stats
+from modules.idle_slices import IdleSlices
+
+STARTUP.mark("imports")
 
 
 # ==================== AUTO RELOAD ====================
@@ -73,7 +83,8 @@ class FileWatcher(FileSystemEventHandler):
                 except Exception as e:
                     print(f"Reload {mod_name}: {e}")
             
-            # Refresh current page
+            # Refresh current page (หน้าที่เก็บไว้สร้างจากคลาสเก่า -> ทิ้งทั้งหมด)
+            self.app.screens.clear()
             self.app.current_show_func()
             print(f"[Auto-reload] Refreshed at {datetime.now().strftime('%H:%M:%S')}")
 
@@ -131,13 +142,17 @@ SHADOW_LG = "0 10px 15px rgba(0,0,0,0.1)"
 SIDEBAR_WIDTH = 220
 HEADER_HEIGHT = 60
 CONTENT_PADDING = 24
+MAX_ALIVE_SCREENS = 4  # จำนวนหน้าโมดูลที่เก็บไว้ไม่ต้องสร้างใหม่
+HOME_CARD_COLUMNS = 3
+HOME_CARDS_PER_SLICE = 6  # จำนวน card ห้องเรียนที่สร้างต่อหนึ่ง idle slice
 
 
 class SchoolManagementApp(ctk.CTk):
     """คลาสหลักของแอพพลิเคชัน - Design System v3.0"""
 
     def __init__(self):
-        super().__init__()
+        with STARTUP.phase("CTk root"):
+            super().__init__()
 
         # ตั้งค่าหน้าต่างหลัก
         self.title("โปรแกรมบริหารจัดการโรงเรียน")
@@ -147,11 +162,13 @@ class SchoolManagementApp(ctk.CTk):
         self.minsize(1100, 700)
 
         # ตั้งค่าให้เปิดหน้าต่างตรงกลางจอ
-        self.center_window()
+        with STARTUP.phase("center_window"):
+            self.center_window()
 
         # ตั้งค่า theme (เริ่มต้น light mode)
-        ctk.set_appearance_mode("light")
-        ctk.set_default_color_theme("blue")
+        with STARTUP.phase("theme"):
+            ctk.set_appearance_mode("light")
+            ctk.set_default_color_theme("blue")
 
         # สถานะ theme
         self.is_dark_mode = False
@@ -182,7 +199,11 @@ class SchoolManagementApp(ctk.CTk):
         self.TEXT_CAPTION = TEXT_CAPTION
 
         # เชื่อมต่อฐานข้อมูล
-        self.db = Database("school_data.db")
+        with STARTUP.phase("Database (connect + create_tables)"):
+            self.db = Database("school_data.db")
+        self.dashboard_stats = get_dashboard_stats(self.db)
+        self._home_snapshot = None
+        self.home_cards_task = None
 
         # ข้อมูลปีการศึกษาปัจจุบัน
         current_year = datetime.now().year
@@ -193,10 +214,14 @@ class SchoolManagementApp(ctk.CTk):
         self.selected_classroom = None
 
         # สร้าง UI
-        self.create_layout()
-        self.create_sidebar()
-        self.create_header()
-        self.create_main_content()
+        with STARTUP.phase("create_layout"):
+            self.create_layout()
+        with STARTUP.phase("create_sidebar"):
+            self.create_sidebar()
+        with STARTUP.phase("create_header"):
+            self.create_header()
+        with STARTUP.phase("create_main_content"):
+            self.create_main_content()
 
         # Hot reload: เก็บหน้าปัจจุบันและ module mapping
         self.current_show_func = None
@@ -214,10 +239,19 @@ class SchoolManagementApp(ctk.CTk):
         self.bind("<F5>", self.refresh_current_page)
 
         # แสดงหน้าแรก (จัดการนักเรียน)
-        self.show_home()
+        with STARTUP.phase("show_home"):
+            self.show_home()
+
+        # สร้าง icon ของ sidebar/toolbar ล่วงหน้าตอน idle หลังหน้าต่างแสดงแล้ว
+        IconManager.prewarm(self)
         
         # เริ่ม auto-reload file watcher
-        self._start_file_watcher()
+        with STARTUP.phase("file watcher"):
+            self._start_file_watcher()
+
+        # เขียน timeline เมื่อ frame แรกแสดงผล (เฉพาะเมื่อเปิด profiler)
+        STARTUP.watch_first_frame(
+            self, lambda profiler: profiler.annotate("icon_cache", IconManager.cache_stats()))
     
     def _start_file_watcher(self):
         """เริ่มต้น file watcher สำหรับ auto-reload"""
@@ -267,6 +301,7 @@ class SchoolManagementApp(ctk.CTk):
                                     importlib.reload(mod)
                                 except:
                                     pass
+                            self.screens.clear()
                             self.current_show_func()
                             print(f"[Auto-reload] Refreshed at {datetime.now().strftime('%H:%M:%S')}")
                             break
@@ -332,7 +367,7 @@ class SchoolManagementApp(ctk.CTk):
         logo_icon = ctk.CTkLabel(
             logo_frame,
             text="🎓",
-            font=ctk.CTkFont(size=32)
+            font=FONTS.font(size=32)
         )
         logo_icon.pack()
         
@@ -347,7 +382,7 @@ class SchoolManagementApp(ctk.CTk):
         version_label = ctk.CTkLabel(
             logo_frame,
             text="School Management v4.0",
-            font=ctk.CTkFont(family="Kanit", size=11),
+            font=FONTS.font("Kanit", 11),
             text_color="#64748B"
         )
         version_label.pack(pady=(2, 0))
@@ -406,7 +441,7 @@ class SchoolManagementApp(ctk.CTk):
         self.mode_switch = ctk.CTkSwitch(
             mode_frame,
             text="โหมดมืด",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color="#D1D5DB",
             command=self.toggle_mode,
             onvalue="dark",
@@ -432,7 +467,7 @@ class SchoolManagementApp(ctk.CTk):
             text="⟳",
             width=36, 
             height=36,
-            font=ctk.CTkFont(size=18),
+            font=FONTS.font(size=18),
             fg_color="#F1F5F9",
             hover_color="#E2E8F0",
             text_color="#475569",
@@ -454,7 +489,7 @@ class SchoolManagementApp(ctk.CTk):
         date_label = ctk.CTkLabel(
             right_frame,
             text=f"{thai_day} {thai_date}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_CAPTION
         )
         date_label.pack(side="left", padx=(0, M))
@@ -479,7 +514,7 @@ class SchoolManagementApp(ctk.CTk):
             values=classroom_options,
             width=150,
             height=32,
-            font=ctk.CTkFont(family="TH Sarabun New", size=13),
+            font=FONTS.font("TH Sarabun New", 13),
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY,
             button_color=PRIMARY,
@@ -496,32 +531,41 @@ class SchoolManagementApp(ctk.CTk):
         """สร้างพื้นที่ Main Content
         ใช้ grid layout + sticky="nsew" เพื่อให้ module_frame ขยายเต็มพื้นที่
         แต่ละโมดูลจัดการ scroll เองภายในตัว (CTkScrollableFrame ในส่วนที่เนื้อหาเยอะ)
+        หน้าจอของโมดูลถูกเก็บไว้ใน ScreenManager - เปลี่ยนเมนูแค่ซ่อน/แสดง ไม่สร้างใหม่
         """
 
-        # ลบ widget เดิมทั้งหมด (try-except สำหรับ CTkOptionMenu dropdown cleanup)
-        for widget in self.content_frame.winfo_children():
-            try:
-                widget.destroy()
-            except Exception:
-                pass
-
         # ใช้ grid layout เพื่อให้ module_frame ขยายเต็มพื้นที่ content_frame
         self.content_frame.grid_rowconfigure(0, weight=1)
         self.content_frame.grid_columnconfigure(0, weight=1)
 
-        # พื้นที่สำหรับโมดูล - ใช้ grid + sticky="nsew" เพื่อให้ขยายเต็มพื้นที่
-        self.module_frame = ctk.CTkFrame(
+        self.module_frame = None
+        self.screens = ScreenManager(
+            self._create_module_frame, max_alive=MAX_ALIVE_SCREENS,
+            grid_options={'row': 0, 'column': 0, 'sticky': "nsew",
+                          'padx': CONTENT_PADDING, 'pady': CONTENT_PADDING}
+        )
+
+    def _create_module_frame(self):
+        """พื้นที่สำหรับโมดูลหนึ่งหน้า - ScreenManager เป็นคน grid (sticky="nsew")"""
+        return ctk.CTkFrame(
             self.content_frame,
             fg_color=SURFACE_LIGHT,
             corner_radius=RADIUS_CARD,
             border_width=1,
             border_color=TABLE_BORDER
         )
-        self.module_frame.grid(
-            row=0, column=0,
-            sticky="nsew",
-            padx=CONTENT_PADDING, pady=CONTENT_PADDING
-        )
+
+    def show_screen(self, key, module_class):
+        """
+        แสดงหน้าของโมดูล - สร้างครั้งแรกที่เปิด ครั้งต่อไปใช้หน้าเดิมและโหลดข้อมูลใหม่ (on_show)
+        Args:
+            key: ชื่อหน้าจอ
+            module_class: คลาสโมดูล (parent, db, update_status_callback)
+        """
+        module = self.screens.show(
+            key, lambda frame: module_class(frame, self.db, self.update_status))
+        self.module_frame = self.screens.current_screen.frame
+        return module
 
     def show_toast(self, message, toast_type="success"):
         """
@@ -644,17 +688,18 @@ class SchoolManagementApp(ctk.CTk):
         self.sidebar_hidden = True
         self.header_frame.grid_remove()
         
-        self.create_main_content()
-        
-        # สร้าง UI เลือกห้องเรียน
-        self.create_classroom_selector()
+        # สร้าง UI เลือกห้องเรียนใหม่เฉพาะเมื่อรายชื่อห้อง/จำนวนนักเรียนเปลี่ยน
+        if self.dashboard_stats.snapshot() is not self._home_snapshot:
+            self.screens.discard("home")
+        self.screens.show("home", self.create_classroom_selector, refresh=False)
+        self.module_frame = self.screens.current_screen.frame
 
-    def create_classroom_selector(self):
+    def create_classroom_selector(self, parent):
         """สร้าง UI เลือกห้องเรียนสำหรับหน้าแรก - สมดุลและสวยงาม"""
         
         # ใช้ ScrollableFrame เพื่อให้เลื่อนลงได้
         scroll_frame = ctk.CTkScrollableFrame(
-            self.module_frame,
+            parent,
             fg_color="transparent",
             scrollbar_button_color="#CBD5E1",
             scrollbar_button_hover_color=PRIMARY
@@ -677,13 +722,16 @@ class SchoolManagementApp(ctk.CTk):
         subtitle_label = ctk.CTkLabel(
             main_container,
             text="กรุณาเลือกห้องเรียนเพื่อเริ่มใช้งาน",
-            font=ctk.CTkFont(family="Kanit", size=14),
+            font=FONTS.font("Kanit", 14),
             text_color=TEXT_CAPTION
         )
         subtitle_label.pack(pady=(0, L))
         
-        # ดึงรายชื่อห้องเรียน
-        classrooms = self.db.get_class_rooms()
+        # ดึงรายชื่อห้องเรียน + จำนวนนักเรียนทุกห้อง (cache ระหว่างการเปิดหน้า)
+        snapshot = self.dashboard_stats.snapshot()
+        self._home_snapshot = snapshot
+        classrooms = snapshot['class_rooms']
+        room_counts = snapshot['room_counts']
         
         # ปุ่มสร้างห้องเรียน (อยู่ด้านบน) - สวยขึ้น
         create_btn = ctk.CTkButton(
@@ -721,7 +769,7 @@ class SchoolManagementApp(ctk.CTk):
             ctk.CTkLabel(
                 empty_card,
                 text="กรุณาสร้างห้องเรียนก่อน",
-                font=ctk.CTkFont(family="Kanit", size=14),
+                font=FONTS.font("Kanit", 14),
                 text_color="#B91C1C"  # Red-700
             ).pack(pady=(0, M))
             return
@@ -775,16 +823,12 @@ class SchoolManagementApp(ctk.CTk):
             name_label.pack(pady=(8, 4))
             
             # จำนวนนักเรียน
-            try:
-                count = self.db.count_students_by_classroom(classroom_name)
-                count_label = ctk.CTkLabel(
-                    content, text=f"👥 {count} คน",
-                    font=("Kanit", 13),
-                    text_color=TEXT_CAPTION
-                )
-                count_label.pack()
-            except:
-                pass
+            count_label = ctk.CTkLabel(
+                content, text=f"👥 {room_counts.get(classroom_name, 0)} คน",
+                font=("Kanit", 13),
+                text_color=TEXT_CAPTION
+            )
+            count_label.pack()
             
             # Hover effect
             def on_enter(e):
@@ -806,11 +850,15 @@ class SchoolManagementApp(ctk.CTk):
             
             return card
         
-        # วาง cards เป็น grid 3 คอลัมน์
-        for i, classroom in enumerate(classrooms):
-            row = i // 3
-            col = i % 3
-            create_classroom_card(classroom, row, col)
+        # วาง cards เป็น grid 3 คอลัมน์ - ชุดแรกสร้างทันที ที่เหลือทยอยสร้างตอน idle
+        # หน้าแรกจึงแสดงผลได้ทันทีแม้มีห้องเรียนหลายสิบห้อง
+        if self.home_cards_task is not None:
+            self.home_cards_task.cancel()
+        self.home_cards_task = IdleSlices(
+            cards_container, list(enumerate(classrooms)),
+            lambda item: create_classroom_card(item[1], *divmod(item[0], HOME_CARD_COLUMNS)),
+            batch_size=HOME_CARDS_PER_SLICE, first_batch_now=True
+        )
 
     def confirm_classroom_selection(self):
         """ยืนยันการเลือกห้องเรียน (legacy - ไม่ใช้แล้ว)"""
@@ -931,9 +979,8 @@ class SchoolManagementApp(ctk.CTk):
         # header กลับไปใช้ปกติ
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="จัดการนักเรียน")
-        StudentsModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("students", StudentsModule)
 
     def show_classrooms(self):
         """แสดงโมดูลจัดการห้องเรียน"""
@@ -946,9 +993,8 @@ class SchoolManagementApp(ctk.CTk):
             self.sidebar_hidden = False
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="จัดการห้องเรียน")
-        ClassroomsModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("classrooms", ClassroomsModule)
 
     def show_attendance(self):
         """แสดงโมดูลเช็คชื่อ"""
@@ -961,9 +1007,8 @@ class SchoolManagementApp(ctk.CTk):
             self.sidebar_hidden = False
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="เช็คชื่อ")
-        AttendanceModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("attendance", AttendanceModule)
 
     def show_health(self):
         """แสดงโมดูลสุขภาพ"""
@@ -976,9 +1021,8 @@ class SchoolManagementApp(ctk.CTk):
             self.sidebar_hidden = False
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="สุขภาพ")
-        HealthModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("health", HealthModule)
 
     def show_grades(self):
         """แสดงโมดูลบันทึกเกรด"""
@@ -991,9 +1035,8 @@ class SchoolManagementApp(ctk.CTk):
             self.sidebar_hidden = False
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="บันทึกเกรด")
-        GradesModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("grades", GradesModule)
 
     def show_schedule(self):
         """แสดงโมดูลตารางเรียน"""
@@ -1006,9 +1049,8 @@ class SchoolManagementApp(ctk.CTk):
             self.sidebar_hidden = False
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="ตารางเรียน")
-        ScheduleModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("schedule", ScheduleModule)
 
     def show_reports(self):
         """แสดงโมดูลรายงาน"""
@@ -1021,9 +1063,8 @@ class SchoolManagementApp(ctk.CTk):
             self.sidebar_hidden = False
         self.header_frame.grid(columnspan=2)
         
-        self.create_main_content()
         self.header_title.configure(text="รายงาน")
-        ReportsModule(self.module_frame, self.db, self.update_status)
+        self.show_screen("reports", ReportsModule)
 
     def refresh_current_page(self, event=None):
         """Hot reload - reload module แล้วแสดงหน้าปัจจุบันใหม่ (กด F5 หรือกดปุ่ม ↻)"""
@@ -1045,6 +1086,9 @@ class SchoolManagementApp(ctk.CTk):
             if hasattr(reloaded, 'ScheduleModule'): ScheduleModule = reloaded.ScheduleModule
             if hasattr(reloaded, 'ReportsModule'): ReportsModule = reloaded.ReportsModule
 
+        # สร้างหน้าปัจจุบันใหม่จากคลาสที่ reload แล้ว
+        if self.screens.current:
+            self.screens.discard(self.screens.current)
         self.current_show_func()
         self.show_toast("รีโหลดหน้าเรียบร้อย", "info")
 
@@ -1060,10 +1104,13 @@ class SchoolManagementApp(ctk.CTk):
 
 def main():
     """ฟังก์ชันหลักสำหรับรันโปรแกรม"""
-    app = SchoolManagementApp()
+    with STARTUP.phase("SchoolManagementApp.__init__"):
+        app = SchoolManagementApp()
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
     app.mainloop()
 
 
 if __name__ == "__main__":
+    # จำเป็นสำหรับ ProcessPoolExecutor เมื่อ build เป็น .exe ด้วย PyInstaller
+    multiprocessing.freeze_support()
     main()
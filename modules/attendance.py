@@ -9,17 +9,15 @@ modules/attendance.py
 """
 
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 from modules.icons import IconManager
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from modules.pdf_utils import get_thai_font
+from modules.ui_fonts import FONTS
+from modules.lazy_tabs import LazyTabs
+from modules.widget_pool import WidgetPool
+from modules.attendance_roster import (AttendanceRoster, VirtualLayout,
+                                       ROW_ROOM, ROW_STUDENT, ROW_SUMMARY)
 
 # ==================== Design System v4.0 ====================
 PRIMARY = "#3B82F6"
@@ -67,6 +65,11 @@ STATUSES = [
 STATUS_MAP = {s["value"]: s for s in STATUSES}
 
 
+# ชื่อ tab (ใช้ทั้งตอน add และ tab())
+TAB_DAILY = "📝 เช็คชื่อรายวัน"
+TAB_ABSENT_REPORT = "📊 รายงานขาดเรียน"
+
+
 class AttendanceModule:
     """โมดูลเช็คชื่อ - Teacher-Friendly Edition"""
 
@@ -76,12 +79,16 @@ class AttendanceModule:
         self.update_status = update_status_callback
         self.current_date = datetime.now()
         self.students_data = []
-        self.attendance_buttons = {}
-        self.room_summary_labels = {}
+        self.roster = AttendanceRoster()
         self.global_summary_labels = {}
 
         self.create_ui()
 
+    def on_show(self):
+        """เรียกเมื่อกลับมาที่หน้านี้ (ScreenManager) - โหลดข้อมูลใหม่เฉพาะ tab ที่สร้างแล้ว"""
+        if self.tabs.is_built(TAB_DAILY):
+            self.load_daily_attendance()
+
     def create_ui(self):
         """สร้าง UI หลัก"""
 
@@ -102,22 +109,21 @@ class AttendanceModule:
             segmented_button_selected_hover_color="#2563EB",
             segmented_button_unselected_hover_color="#CBD5E1",
             text_color="#FFFFFF",
-            font=ctk.CTkFont(family="Kanit", size=13, weight="500")
+            font=FONTS.font("Kanit", 13, "500")
         )
         self.tabview.pack(fill="both", expand=True, padx=L, pady=L)
 
-        self.tabview.add("📝 เช็คชื่อรายวัน")
-        self.create_daily_tab()
-
-        self.tabview.add("📊 รายงานขาดเรียน")
-        self.create_absent_report_tab()
+        # สร้างเนื้อหาแต่ละ tab เมื่อถูกเลือกครั้งแรก
+        self.tabs = LazyTabs(self.tabview)
+        self.tabs.add(TAB_DAILY, self.create_daily_tab)
+        self.tabs.add(TAB_ABSENT_REPORT, self.create_absent_report_tab)
 
     # ==================== TAB เช็คชื่อรายวัน ====================
 
     def create_daily_tab(self):
         """Tab เช็คชื่อรายวัน - ตาราง + Quick Actions"""
 
-        tab = self.tabview.tab("เช็คชื่อรายวัน")
+        tab = self.tabview.tab(TAB_DAILY)
 
         # === แถบควบคุมด้านบน ===
         control_card = ctk.CTkFrame(
@@ -133,7 +139,7 @@ class AttendanceModule:
         # วันที่
         ctk.CTkLabel(
             row1, text="📅 วันที่:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -141,7 +147,7 @@ class AttendanceModule:
         date_entry = ctk.CTkEntry(
             row1, textvariable=self.date_var,
             width=150, height=40,
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            font=FONTS.font("TH Sarabun New", 16),
             corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
             placeholder_text="YYYY-MM-DD"
         )
@@ -150,7 +156,7 @@ class AttendanceModule:
         # เลือกห้อง
         ctk.CTkLabel(
             row1, text="🏫 ห้อง:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -163,20 +169,20 @@ class AttendanceModule:
             values=class_options,
             command=lambda x: self.load_daily_attendance(),
             width=160, height=40,
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            font=FONTS.font("TH Sarabun New", 16),
             corner_radius=RADIUS_PILL,
             fg_color=PRIMARY_LIGHT, button_color=PRIMARY_LIGHT,
             button_hover_color="#DBEAFE", text_color="#1E40AF",
             dropdown_fg_color="#F0F4FF", dropdown_hover_color="#DBEAFE",
             dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16)
+            dropdown_font=FONTS.font("TH Sarabun New", 16)
         ).pack(side="left", padx=(0, L))
 
         # ปุ่มโหลดข้อมูล
         ctk.CTkButton(
             row1, text="  โหลดข้อมูล",
             command=self.load_daily_attendance,
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             width=140, height=40,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color=PRIMARY_HOVER,
@@ -187,7 +193,7 @@ class AttendanceModule:
         save_btn = ctk.CTkButton(
             row1, text="  💾 บันทึกทั้งหมด",
             command=self.save_all_attendance,
-            font=ctk.CTkFont(family="TH Sarabun New", size=18, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 18, "bold"),
             width=180, height=44,
             corner_radius=RADIUS_BUTTON,
             fg_color=SUCCESS, hover_color=SUCCESS_HOVER,
@@ -203,14 +209,14 @@ class AttendanceModule:
 
         ctk.CTkLabel(
             summary_inner, text="📊 สรุป:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=15, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 15, "bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, M))
 
         # จำนวนรวม
         self.global_summary_labels["total"] = ctk.CTkLabel(
             summary_inner, text="ทั้งหมด 0 คน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=15, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 15, "bold"),
             text_color=TEXT_H2
         )
         self.global_summary_labels["total"].pack(side="left", padx=(0, L))
@@ -222,7 +228,7 @@ class AttendanceModule:
 
             lbl = ctk.CTkLabel(
                 pill, text=f"  {st['text']}: 0  ",
-                font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+                font=FONTS.style("body_bold"),
                 text_color=st["color"]
             )
             lbl.pack(padx=S, pady=XS)
@@ -233,18 +239,14 @@ class AttendanceModule:
         pill_none.pack(side="left", padx=(0, S))
         self.global_summary_labels["none"] = ctk.CTkLabel(
             pill_none, text="  ยังไม่เลือก: 0  ",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color="#9CA3AF"
         )
         self.global_summary_labels["none"].pack(padx=S, pady=XS)
 
-        # === พื้นที่ตาราง ===
-        self.cards_container = ctk.CTkScrollableFrame(
-            tab, fg_color="#F8FAFC",
-            corner_radius=RADIUS_CARD, border_width=1, border_color=TABLE_BORDER,
-            scrollbar_button_color="#D1D5DB", scrollbar_button_hover_color=PRIMARY
-        )
-        self.cards_container.pack(fill="both", expand=True, padx=M, pady=(0, M))
+        # === พื้นที่ตาราง (virtualized: สร้าง widget เฉพาะแถวที่มองเห็น) ===
+        self.roster_view = VirtualRosterView(tab, self)
+        self.roster_view.frame.pack(fill="both", expand=True, padx=M, pady=(0, M))
 
         self.load_daily_attendance()
 
@@ -253,345 +255,54 @@ class AttendanceModule:
     def load_daily_attendance(self):
         """โหลดข้อมูลเช็คชื่อ - ตารางแยกห้อง พร้อม Quick Actions"""
 
-        for widget in self.cards_container.winfo_children():
-            widget.destroy()
-
-        self.attendance_buttons = {}
-        self.room_summary_labels = {}
-
         date = self.date_var.get()
         class_room = None if self.daily_class_var.get() == "ทั้งหมด" else self.daily_class_var.get()
 
         students = self.db.get_all_students(class_room=class_room)
 
         if not students:
-            self._show_empty_state()
+            self.roster = AttendanceRoster()
+            self.roster_view.show_empty()
             self._update_global_summary()
             return
 
         attendance_records = self.db.get_attendance_by_date(date, class_room)
         attendance_dict = {rec['student_id']: rec['status'] for rec in attendance_records}
 
-        # จัดกลุ่มตามห้อง
-        rooms = {}
-        for student in students:
-            room = student['class_room']
-            if room not in rooms:
-                rooms[room] = []
-            rooms[room].append(student)
-
-        # สร้างตารางแต่ละห้อง
-        for room_idx, room_name in enumerate(sorted(rooms.keys())):
-            room_students = rooms[room_name]
-            self._create_room_section(room_name, room_students, attendance_dict, room_idx)
+        self.roster = AttendanceRoster(students, attendance_dict)
+        self.roster_view.set_roster(self.roster)
 
         # อัปเดตสรุป
         self._update_global_summary()
-        self.update_status(f"โหลดข้อมูล {len(students)} คน ({len(rooms)} ห้อง)", "success")
-
-    def _show_empty_state(self):
-        """แสดง Empty State"""
-        empty_frame = ctk.CTkFrame(self.cards_container, fg_color="transparent")
-        empty_frame.pack(fill="both", expand=True, pady=XXL)
-
-        ctk.CTkLabel(
-            empty_frame, text="📋",
-            font=ctk.CTkFont(size=48)
-        ).pack(pady=(XL, M))
-
-        ctk.CTkLabel(
-            empty_frame,
-            text="ยังไม่มีข้อมูลนักเรียน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=20, weight="bold"),
-            text_color=TEXT_H3
-        ).pack()
-
-        ctk.CTkLabel(
-            empty_frame,
-            text="เลือกห้องเรียนและกด 'โหลดข้อมูล' เพื่อเริ่มเช็คชื่อ",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
-            text_color="#9CA3AF"
-        ).pack(pady=(S, 0))
-
-    # ==================== ส่วนห้อง ====================
-
-    def _create_room_section(self, room_name, students, attendance_dict, room_idx):
-        """สร้างส่วนของแต่ละห้อง: Header + Quick Actions + ตาราง + สรุป"""
-
-        # Container ของห้อง
-        room_container = ctk.CTkFrame(
-            self.cards_container, fg_color="#FFFFFF",
-            corner_radius=RADIUS_CARD, border_width=1, border_color=TABLE_BORDER
-        )
-        room_container.pack(fill="x", padx=S, pady=(M if room_idx == 0 else L, 0))
-
-        # === Header ห้อง + Quick Actions ===
-        header_frame = ctk.CTkFrame(room_container, fg_color=PRIMARY_LIGHT, corner_radius=0)
-        header_frame.pack(fill="x")
-
-        header_inner = ctk.CTkFrame(header_frame, fg_color="transparent")
-        header_inner.pack(fill="x", padx=L, pady=M)
-
-        # ชื่อห้อง
-        ctk.CTkFrame(
-            header_inner, fg_color=PRIMARY, width=5, height=28, corner_radius=2
-        ).pack(side="left", padx=(0, S))
-
-        ctk.CTkLabel(
-            header_inner,
-            text=f"ห้อง {room_name}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=20, weight="bold"),
-            text_color=TEXT_H1
-        ).pack(side="left")
-
-        ctk.CTkLabel(
-            header_inner,
-            text=f"  ({len(students)} คน)",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
-            text_color=TEXT_CAPTION
-        ).pack(side="left")
-
-        # Quick Action Buttons (ขวา)
-        quick_frame = ctk.CTkFrame(header_inner, fg_color="transparent")
-        quick_frame.pack(side="right")
-
-        ctk.CTkButton(
-            quick_frame, text="  ✅ เช็คมาทั้งหมด",
-            command=lambda rn=room_name: self._mark_all_room(rn, "มา"),
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
-            width=150, height=34,
-            corner_radius=RADIUS_PILL,
-            fg_color=SUCCESS, hover_color=SUCCESS_HOVER,
-            text_color="#FFFFFF"
-        ).pack(side="left", padx=(0, S))
-
-        ctk.CTkButton(
-            quick_frame, text="  🔄 ล้างทั้งหมด",
-            command=lambda rn=room_name: self._clear_all_room(rn),
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
-            width=120, height=34,
-            corner_radius=RADIUS_PILL,
-            fg_color="transparent", hover_color="#FEE2E2",
-            text_color=DANGER, border_width=1, border_color=DANGER
-        ).pack(side="left")
-
-        # === ตาราง Header ===
-        table_header = ctk.CTkFrame(room_container, fg_color="#1E3A5F", corner_radius=0, height=44)
-        table_header.pack(fill="x")
-        table_header.pack_propagate(False)
-
-        # ใช้ grid layout ให้คอลัมน์มีสัดส่วนเหมาะสม
-        header_cols = [
-            # (text, col_idx, weight, minsize)
-            ("ลำดับ", 0, 0, 50),
-            ("รหัสนักเรียน", 1, 1, 100),
-            ("ชื่อ-นามสกุล", 2, 3, 180),
-            ("ห้อง", 3, 0, 60),
-            ("มา", 4, 1, 70),
-            ("ขาด", 5, 1, 70),
-            ("ลา", 6, 1, 70),
-            ("สาย", 7, 1, 70),
-        ]
-
-        for text, col, weight, minsize in header_cols:
-            table_header.grid_columnconfigure(col, weight=weight, minsize=minsize)
-            ctk.CTkLabel(
-                table_header, text=text,
-                font=ctk.CTkFont(family="TH Sarabun New", size=15, weight="bold"),
-                text_color="#FFFFFF", anchor="center"
-            ).grid(row=0, column=col, sticky="ew", padx=1, pady=8)
-
-        # === แถวนักเรียน ===
-        for idx, student in enumerate(students):
-            self._create_student_row(room_container, student, attendance_dict, idx, room_name)
-
-        # === สรุปท้ายห้อง ===
-        summary_bar = ctk.CTkFrame(room_container, fg_color="#F0F4FF", corner_radius=0)
-        summary_bar.pack(fill="x")
-
-        summary_inner = ctk.CTkFrame(summary_bar, fg_color="transparent")
-        summary_inner.pack(padx=L, pady=S)
-
-        room_labels = {}
-        ctk.CTkLabel(
-            summary_inner, text=f"สรุปห้อง {room_name}:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
-            text_color=TEXT_H3
-        ).pack(side="left", padx=(0, M))
-
-        for st in STATUSES:
-            pill = ctk.CTkFrame(summary_inner, fg_color=st["light"], corner_radius=RADIUS_PILL)
-            pill.pack(side="left", padx=2)
-            lbl = ctk.CTkLabel(
-                pill, text=f" {st['text']}: 0 ",
-                font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
-                text_color=st["color"]
-            )
-            lbl.pack(padx=XS, pady=2)
-            room_labels[st["value"]] = lbl
-
-        self.room_summary_labels[room_name] = room_labels
-        self._update_room_summary(room_name)
-
-    def _create_student_row(self, parent, student, attendance_dict, idx, room_name):
-        """สร้างแถวนักเรียน 1 คน ในตาราง (grid layout)"""
-
-        bg_color = "#FFFFFF" if idx % 2 == 0 else TABLE_STRIPE
-
-        row_frame = ctk.CTkFrame(parent, fg_color=bg_color, corner_radius=0, height=48)
-        row_frame.pack(fill="x")
-        row_frame.pack_propagate(False)
-
-        # ใช้ grid layout เดียวกันกับ header
-        col_config = [
-            (0, 0, 50),   # ลำดับ
-            (1, 1, 100),  # รหัส
-            (2, 3, 180),  # ชื่อ
-            (3, 0, 60),   # ห้อง
-            (4, 1, 70),   # มา
-            (5, 1, 70),   # ขาด
-            (6, 1, 70),   # ลา
-            (7, 1, 70),   # สาย
-        ]
-        for col, weight, minsize in col_config:
-            row_frame.grid_columnconfigure(col, weight=weight, minsize=minsize)
-
-        # ลำดับ
-        ctk.CTkLabel(
-            row_frame, text=str(idx + 1),
-            font=ctk.CTkFont(family="TH Sarabun New", size=15),
-            text_color=TEXT_CAPTION, anchor="center"
-        ).grid(row=0, column=0, sticky="ew", padx=1, pady=6)
-
-        # รหัส
-        ctk.CTkLabel(
-            row_frame, text=str(student['student_id']),
-            font=ctk.CTkFont(family="TH Sarabun New", size=15),
-            text_color=TEXT_BODY, anchor="center"
-        ).grid(row=0, column=1, sticky="ew", padx=1, pady=6)
-
-        # ชื่อ-นามสกุล
-        name = f"{student['title']}{student['first_name']} {student['last_name']}"
-        ctk.CTkLabel(
-            row_frame, text=name,
-            font=ctk.CTkFont(family="TH Sarabun New", size=15, weight="bold"),
-            text_color=TEXT_H2, anchor="w"
-        ).grid(row=0, column=2, sticky="ew", padx=(S, 1), pady=6)
-
-        # ห้อง
-        ctk.CTkLabel(
-            row_frame, text=student['class_room'],
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
-            text_color=TEXT_BODY, anchor="center"
-        ).grid(row=0, column=3, sticky="ew", padx=1, pady=6)
-
-        # ปุ่มสถานะ 4 ปุ่ม
-        current_status = attendance_dict.get(student['student_id'], None)
-        student_buttons = {}
-
-        for s_idx, st in enumerate(STATUSES):
-            is_selected = (current_status == st["value"])
-
-            btn = ctk.CTkButton(
-                row_frame, text=st["text"],
-                command=lambda sv=st["value"], sid=student['student_id'], rn=room_name: self._on_select_status(sid, sv, rn),
-                font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
-                height=34,
-                corner_radius=RADIUS_PILL,
-                fg_color=st["color"] if is_selected else "transparent",
-                text_color="#FFFFFF" if is_selected else st["color"],
-                border_width=2,
-                border_color=st["color"],
-                hover_color=st["color"],
-            )
-            btn.grid(row=0, column=4 + s_idx, sticky="ew", padx=3, pady=6)
-            student_buttons[st["value"]] = btn
-
-        self.attendance_buttons[student['student_id']] = {
-            "buttons": student_buttons,
-            "room": room_name
-        }
-
-        # เส้นแบ่งแถว
-        ctk.CTkFrame(parent, fg_color=TABLE_BORDER, height=1).pack(fill="x")
+        self.update_status(f"โหลดข้อมูล {len(students)} คน ({len(self.roster.rooms)} ห้อง)", "success")
 
     # ==================== Actions ====================
 
-    def _on_select_status(self, student_id, status, room_name):
-        """เมื่อกดเลือกสถานะ - อัปเดต UI + สรุป"""
-        data = self.attendance_buttons.get(student_id, {})
-        buttons = data.get("buttons", {})
-
-        for sv, btn in buttons.items():
-            st = STATUS_MAP[sv]
-            if sv == status:
-                btn.configure(fg_color=st["color"], text_color="#FFFFFF")
-            else:
-                btn.configure(fg_color="transparent", text_color=st["color"])
-
-        # อัปเดตสรุป
-        self._update_room_summary(room_name)
-        self._update_global_summary()
+    def _on_select_status(self, student_id, status, room_name=None):
+        """เมื่อกดเลือกสถานะ - อัปเดตข้อมูล แล้ววาดเฉพาะแถวที่มองเห็น + สรุป"""
+        if self.roster.set_status(student_id, status):
+            self.roster_view.refresh()
+            self._update_global_summary()
 
     def _mark_all_room(self, room_name, status_value):
         """เช็คสถานะทั้งห้อง (เช่น มาทั้งหมด)"""
-        for sid, data in self.attendance_buttons.items():
-            if data["room"] == room_name:
-                self._on_select_status(sid, status_value, room_name)
+        if self.roster.mark_room(room_name, status_value):
+            self.roster_view.refresh()
+            self._update_global_summary()
 
     def _clear_all_room(self, room_name):
         """ล้างสถานะทั้งห้อง"""
-        for sid, data in self.attendance_buttons.items():
-            if data["room"] == room_name:
-                buttons = data.get("buttons", {})
-                for sv, btn in buttons.items():
-                    st = STATUS_MAP[sv]
-                    btn.configure(fg_color="transparent", text_color=st["color"])
-
-        self._update_room_summary(room_name)
-        self._update_global_summary()
+        self._mark_all_room(room_name, None)
 
     def _get_selected_status(self, student_id):
         """หาสถานะที่เลือกอยู่ของนักเรียน"""
-        data = self.attendance_buttons.get(student_id, {})
-        buttons = data.get("buttons", {})
-        for sv, btn in buttons.items():
-            st = STATUS_MAP[sv]
-            try:
-                if btn.cget("fg_color") == st["color"]:
-                    return sv
-            except Exception:
-                pass
-        return None
+        return self.roster.status(student_id)
 
     # ==================== สรุป ====================
 
     def _count_statuses(self, room_name=None):
         """นับจำนวนแต่ละสถานะ"""
-        counts = {sv["value"]: 0 for sv in STATUSES}
-        counts["none"] = 0
-        total = 0
-
-        for sid, data in self.attendance_buttons.items():
-            if room_name and data["room"] != room_name:
-                continue
-            total += 1
-            selected = self._get_selected_status(sid)
-            if selected:
-                counts[selected] += 1
-            else:
-                counts["none"] += 1
-
-        return counts, total
-
-    def _update_room_summary(self, room_name):
-        """อัปเดตสรุปท้ายห้อง"""
-        labels = self.room_summary_labels.get(room_name, {})
-        counts, total = self._count_statuses(room_name)
-        for st in STATUSES:
-            lbl = labels.get(st["value"])
-            if lbl:
-                lbl.configure(text=f" {st['text']}: {counts[st['value']]} ")
+        return self.roster.counts(room_name)
 
     def _update_global_summary(self):
         """อัปเดตสรุปรวมด้านบน"""
@@ -625,15 +336,12 @@ class AttendanceModule:
             return
 
         success_count = 0
-        skip_count = 0
+        selected = self.roster.selected()
+        skip_count = len(self.roster) - len(selected)
 
-        for student_id, data in self.attendance_buttons.items():
-            selected = self._get_selected_status(student_id)
-            if selected:
-                if self.db.save_attendance(student_id, date, selected):
-                    success_count += 1
-            else:
-                skip_count += 1
+        for student_id, status in selected:
+            if self.db.save_attendance(student_id, date, status):
+                success_count += 1
 
         if success_count > 0:
             msg = f"✅ บันทึกสำเร็จ {success_count} คน"
@@ -648,7 +356,7 @@ class AttendanceModule:
     def create_absent_report_tab(self):
         """Tab รายงานขาดเรียน"""
 
-        tab = self.tabview.tab("รายงานขาดเรียน")
+        tab = self.tabview.tab(TAB_ABSENT_REPORT)
 
         # Control Card
         control_card = ctk.CTkFrame(
@@ -662,7 +370,7 @@ class AttendanceModule:
 
         ctk.CTkLabel(
             top_frame, text="📋 แสดงนักเรียนที่ขาดมากกว่า:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -670,21 +378,21 @@ class AttendanceModule:
         ctk.CTkEntry(
             top_frame, textvariable=self.absent_days_var,
             width=60, height=40,
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            font=FONTS.font("TH Sarabun New", 16),
             corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
             justify="center"
         ).pack(side="left", padx=(0, S))
 
         ctk.CTkLabel(
             top_frame, text="วัน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            font=FONTS.font("TH Sarabun New", 16),
             text_color=TEXT_BODY
         ).pack(side="left", padx=(0, L))
 
         # ห้อง
         ctk.CTkLabel(
             top_frame, text="🏫 ห้อง:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color=TEXT_BODY
         ).pack(side="left", padx=(0, S))
 
@@ -693,19 +401,19 @@ class AttendanceModule:
         ctk.CTkOptionMenu(
             top_frame, variable=self.absent_class_var,
             values=class_options, width=140, height=40,
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            font=FONTS.font("TH Sarabun New", 16),
             corner_radius=RADIUS_PILL,
             fg_color=PRIMARY_LIGHT, button_color=PRIMARY_LIGHT,
             button_hover_color="#DBEAFE", text_color="#1E40AF",
             dropdown_fg_color="#F0F4FF", dropdown_hover_color="#DBEAFE",
             dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16)
+            dropdown_font=FONTS.font("TH Sarabun New", 16)
         ).pack(side="left", padx=(0, L))
 
         ctk.CTkButton(
             top_frame, text="  🔍 ค้นหา",
             command=self.load_absent_report,
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             width=120, height=40,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color=PRIMARY_HOVER,
@@ -748,7 +456,7 @@ class AttendanceModule:
                                       ("📄 Export PDF", self.export_attendance_pdf, "file-pdf")]:
             ctk.CTkButton(
                 export_frame, text=text, command=cmd,
-                font=ctk.CTkFont(family="TH Sarabun New", size=15, weight="bold"),
+                font=FONTS.font("TH Sarabun New", 15, "bold"),
                 width=140, height=38,
                 corner_radius=RADIUS_BUTTON,
                 fg_color="transparent", border_width=1,
@@ -824,6 +532,9 @@ class AttendanceModule:
             return
 
         try:
+            import openpyxl
+            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+
             wb = openpyxl.Workbook()
             ws = wb.active
             ws.title = "เช็คชื่อ"
@@ -904,6 +615,13 @@ class AttendanceModule:
             return
 
         try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.units import cm
+            from modules.pdf_utils import get_thai_font
+
             font_name = get_thai_font()
 
             doc = SimpleDocTemplate(file_path, pagesize=A4)
@@ -977,3 +695,398 @@ class AttendanceModule:
         except Exception as e:
             self.update_status("ไม่สามารถ Export PDF ได้", "error")
             messagebox.showerror("ผิดพลาด", f"ไม่สามารถ Export PDF ได้\n{str(e)}")
+
+
+# ==================== Virtualized roster ====================
+
+ROSTER_VIEWPORT_HEIGHT = 560
+ROSTER_ROW_HEIGHTS = {ROW_ROOM: 126, ROW_STUDENT: 49, ROW_SUMMARY: 44}
+ROSTER_OVERSCAN = 2
+ROSTER_WHEEL_STEP = 3 * ROSTER_ROW_HEIGHTS[ROW_STUDENT]
+
+# คอลัมน์ตาราง (text, col_idx, weight, minsize) - ใช้ร่วมกันระหว่างหัวตารางและแถวนักเรียน
+ROSTER_COLUMNS = [
+    ("ลำดับ", 0, 0, 50),
+    ("รหัสนักเรียน", 1, 1, 100),
+    ("ชื่อ-นามสกุล", 2, 3, 180),
+    ("ห้อง", 3, 0, 60),
+    ("มา", 4, 1, 70),
+    ("ขาด", 5, 1, 70),
+    ("ลา", 6, 1, 70),
+    ("สาย", 7, 1, 70),
+]
+
+
+class _RosterRoomRow:
+    """แถวหัวห้อง: ชื่อห้อง + Quick Actions + หัวตาราง"""
+
+    kind = ROW_ROOM
+
+    def __init__(self, parent, module):
+        self.room = None
+        self.signature = None
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent", corner_radius=0,
+                                  height=ROSTER_ROW_HEIGHTS[ROW_ROOM])
+        self.frame.pack_propagate(False)
+
+        header_frame = ctk.CTkFrame(self.frame, fg_color=PRIMARY_LIGHT, corner_radius=0)
+        header_frame.pack(fill="x", pady=(M, 0))
+
+        header_inner = ctk.CTkFrame(header_frame, fg_color="transparent")
+        header_inner.pack(fill="x", padx=L, pady=M)
+
+        ctk.CTkFrame(
+            header_inner, fg_color=PRIMARY, width=5, height=28, corner_radius=2
+        ).pack(side="left", padx=(0, S))
+
+        self.title_label = ctk.CTkLabel(
+            header_inner, text="",
+            font=FONTS.style("h2"),
+            text_color=TEXT_H1
+        )
+        self.title_label.pack(side="left")
+
+        self.count_label = ctk.CTkLabel(
+            header_inner, text="",
+            font=FONTS.font("TH Sarabun New", 16),
+            text_color=TEXT_CAPTION
+        )
+        self.count_label.pack(side="left")
+
+        # Quick Action Buttons (ขวา) - ใช้ self.room ตอนกด จึงไม่ต้องตั้ง command ใหม่เมื่อ recycle
+        quick_frame = ctk.CTkFrame(header_inner, fg_color="transparent")
+        quick_frame.pack(side="right")
+
+        ctk.CTkButton(
+            quick_frame, text="  ✅ เช็คมาทั้งหมด",
+            command=lambda: module._mark_all_room(self.room, "มา"),
+            font=FONTS.style("body_bold"),
+            width=150, height=34,
+            corner_radius=RADIUS_PILL,
+            fg_color=SUCCESS, hover_color=SUCCESS_HOVER,
+            text_color="#FFFFFF"
+        ).pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            quick_frame, text="  🔄 ล้างทั้งหมด",
+            command=lambda: module._clear_all_room(self.room),
+            font=FONTS.style("body"),
+            width=120, height=34,
+            corner_radius=RADIUS_PILL,
+            fg_color="transparent", hover_color="#FEE2E2",
+            text_color=DANGER, border_width=1, border_color=DANGER
+        ).pack(side="left")
+
+        table_header = ctk.CTkFrame(self.frame, fg_color="#1E3A5F", corner_radius=0, height=44)
+        table_header.pack(fill="x")
+        table_header.pack_propagate(False)
+
+        for text, col, weight, minsize in ROSTER_COLUMNS:
+            table_header.grid_columnconfigure(col, weight=weight, minsize=minsize)
+            ctk.CTkLabel(
+                table_header, text=text,
+                font=FONTS.font("TH Sarabun New", 15, "bold"),
+                text_color="#FFFFFF", anchor="center"
+            ).grid(row=0, column=col, sticky="ew", padx=1, pady=8)
+
+    def update(self, row, roster):
+        # เทียบข้อความที่แสดง ไม่ใช่แค่ชื่อห้อง - จำนวนนักเรียนเปลี่ยนได้ขณะที่แถวยังอยู่
+        self.room = row.room
+        signature = (row.room, len(roster.rooms[row.room]))
+        if signature == self.signature:
+            return
+        self.signature = signature
+        self.title_label.configure(text=f"ห้อง {row.room}")
+        self.count_label.configure(text=f"  ({signature[1]} คน)")
+
+
+class _RosterStudentRow:
+    """แถวนักเรียน 1 คน: ข้อมูล + ปุ่มสถานะ 4 ปุ่ม"""
+
+    kind = ROW_STUDENT
+
+    def __init__(self, parent, module):
+        self.student_id = None
+        self.signature = None
+        self.index = None
+        self.status = None
+
+        self.frame = ctk.CTkFrame(parent, fg_color="#FFFFFF", corner_radius=0,
+                                  height=ROSTER_ROW_HEIGHTS[ROW_STUDENT])
+        self.frame.grid_propagate(False)
+        for _text, col, weight, minsize in ROSTER_COLUMNS:
+            self.frame.grid_columnconfigure(col, weight=weight, minsize=minsize)
+
+        self.index_label = ctk.CTkLabel(
+            self.frame, text="",
+            font=FONTS.font("TH Sarabun New", 15),
+            text_color=TEXT_CAPTION, anchor="center"
+        )
+        self.index_label.grid(row=0, column=0, sticky="ew", padx=1, pady=6)
+
+        self.id_label = ctk.CTkLabel(
+            self.frame, text="",
+            font=FONTS.font("TH Sarabun New", 15),
+            text_color=TEXT_BODY, anchor="center"
+        )
+        self.id_label.grid(row=0, column=1, sticky="ew", padx=1, pady=6)
+
+        self.name_label = ctk.CTkLabel(
+            self.frame, text="",
+            font=FONTS.font("TH Sarabun New", 15, "bold"),
+            text_color=TEXT_H2, anchor="w"
+        )
+        self.name_label.grid(row=0, column=2, sticky="ew", padx=(S, 1), pady=6)
+
+        self.room_label = ctk.CTkLabel(
+            self.frame, text="",
+            font=FONTS.style("body"),
+            text_color=TEXT_BODY, anchor="center"
+        )
+        self.room_label.grid(row=0, column=3, sticky="ew", padx=1, pady=6)
+
+        self.buttons = {}
+        for s_idx, st in enumerate(STATUSES):
+            btn = ctk.CTkButton(
+                self.frame, text=st["text"],
+                command=lambda sv=st["value"]: module._on_select_status(self.student_id, sv),
+                font=FONTS.style("body_bold"),
+                height=34,
+                corner_radius=RADIUS_PILL,
+                fg_color="transparent",
+                text_color=st["color"],
+                border_width=2,
+                border_color=st["color"],
+                hover_color=st["color"],
+            )
+            btn.grid(row=0, column=4 + s_idx, sticky="ew", padx=3, pady=6)
+            self.buttons[st["value"]] = btn
+
+        # เส้นแบ่งแถว
+        ctk.CTkFrame(self.frame, fg_color=TABLE_BORDER, height=1, corner_radius=0).place(
+            x=0, rely=1.0, relwidth=1.0, anchor="sw")
+
+    def update(self, row, roster):
+        student = row.student
+        sid = student['student_id']
+        self.student_id = sid
+        # เทียบข้อความที่แสดง - แก้ชื่อ/ย้ายห้องแล้ว sid เดิมต้องแสดงค่าใหม่
+        signature = (sid, f"{student['title']}{student['first_name']} {student['last_name']}",
+                     student['class_room'])
+        if signature != self.signature:
+            self.signature = signature
+            self.id_label.configure(text=str(sid))
+            self.name_label.configure(text=signature[1])
+            self.room_label.configure(text=signature[2])
+
+        if row.index != self.index:
+            if self.index is None or row.index % 2 != self.index % 2:
+                self.frame.configure(fg_color="#FFFFFF" if row.index % 2 == 0 else TABLE_STRIPE)
+            self.index = row.index
+            self.index_label.configure(text=str(row.index + 1))
+
+        status = roster.status(sid)
+        if status != self.status:
+            for sv in {self.status, status} - {None}:
+                st = STATUS_MAP[sv]
+                selected = sv == status
+                self.buttons[sv].configure(
+                    fg_color=st["color"] if selected else "transparent",
+                    text_color="#FFFFFF" if selected else st["color"],
+                )
+            self.status = status
+
+
+class _RosterSummaryRow:
+    """แถวสรุปท้ายห้อง"""
+
+    kind = ROW_SUMMARY
+
+    def __init__(self, parent, module):
+        self.signature = None
+        self.frame = ctk.CTkFrame(parent, fg_color="#F0F4FF", corner_radius=0,
+                                  height=ROSTER_ROW_HEIGHTS[ROW_SUMMARY])
+        self.frame.pack_propagate(False)
+
+        summary_inner = ctk.CTkFrame(self.frame, fg_color="transparent")
+        summary_inner.pack(padx=L, pady=S)
+
+        self.title_label = ctk.CTkLabel(
+            summary_inner, text="",
+            font=FONTS.style("body_bold"),
+            text_color=TEXT_H3
+        )
+        self.title_label.pack(side="left", padx=(0, M))
+
+        self.labels = {}
+        for st in STATUSES:
+            pill = ctk.CTkFrame(summary_inner, fg_color=st["light"], corner_radius=RADIUS_PILL)
+            pill.pack(side="left", padx=2)
+            lbl = ctk.CTkLabel(
+                pill, text=f" {st['text']}: 0 ",
+                font=FONTS.style("cell"),
+                text_color=st["color"]
+            )
+            lbl.pack(padx=XS, pady=2)
+            self.labels[st["value"]] = lbl
+
+    def update(self, row, roster):
+        counts, _total = roster.counts(row.room)
+        signature = (row.room,) + tuple(counts[st["value"]] for st in STATUSES)
+        if signature == self.signature:
+            return
+        if self.signature is None or self.signature[0] != row.room:
+            self.title_label.configure(text=f"สรุปห้อง {row.room}:")
+        for st in STATUSES:
+            self.labels[st["value"]].configure(text=f" {st['text']}: {counts[st['value']]} ")
+        self.signature = signature
+
+
+class VirtualRosterView:
+    """
+    รายชื่อเช็คชื่อแบบ virtualized - สร้าง widget เฉพาะแถวที่มองเห็น
+    แถวที่เลื่อนออกนอกจอถูกนำกลับมาใช้กับแถวใหม่ (recycle) จำนวน widget จึงคงที่
+    ไม่ว่าจะมีนักเรียนกี่คน
+    """
+
+    ROW_CLASSES = {ROW_ROOM: _RosterRoomRow, ROW_STUDENT: _RosterStudentRow, ROW_SUMMARY: _RosterSummaryRow}
+
+    def __init__(self, parent, module, height=ROSTER_VIEWPORT_HEIGHT):
+        """
+        Args:
+            parent: widget แม่ (tab เช็คชื่อรายวัน)
+            module: AttendanceModule (รับ action จากปุ่มในแถว)
+            height: ความสูงพื้นที่แสดงรายชื่อ
+        """
+        self.module = module
+        self.roster = AttendanceRoster()
+        self.layout = VirtualLayout()
+        self.top = 0
+        self._active = {}                          # index แถว -> row widget
+        self._pools = {
+            kind: WidgetPool(lambda cls=cls: self._create_row(cls), hide=lambda w: w.frame.place_forget())
+            for kind, cls in self.ROW_CLASSES.items()
+        }
+        self._empty_frame = None
+
+        self.frame = ctk.CTkFrame(
+            parent, fg_color="#F8FAFC",
+            corner_radius=RADIUS_CARD, border_width=1, border_color=TABLE_BORDER
+        )
+        self.viewport = ctk.CTkFrame(self.frame, fg_color="transparent", corner_radius=0, height=height)
+        self.viewport.pack(side="left", fill="both", expand=True, padx=(S, 0), pady=S)
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self.frame, orientation="vertical", command=self._on_scrollbar,
+            button_color="#D1D5DB", button_hover_color=PRIMARY
+        )
+        self.scrollbar.pack(side="right", fill="y", padx=XS, pady=S)
+
+        self.viewport.bind("<Configure>", lambda e: self.refresh())
+        self._bind_wheel(self.viewport)
+
+    # ---------- ข้อมูล ----------
+
+    def set_roster(self, roster):
+        """
+        แสดงรายชื่อชุดใหม่ (เลื่อนกลับไปบนสุด)
+        แถวที่แสดงอยู่ถูกผูกกับข้อมูลใหม่ในตำแหน่งเดิม - ห้องเดิมต่างวันจึงแค่ configure สถานะที่เปลี่ยน
+        """
+        self._hide_empty()
+        self.roster = roster
+        self.layout = VirtualLayout([ROSTER_ROW_HEIGHTS[row.kind] for row in roster.rows])
+        self.top = 0
+        self.refresh()
+
+    def show_empty(self):
+        """แสดง Empty State"""
+        self.set_roster(AttendanceRoster())
+        if self._empty_frame is None:
+            self._empty_frame = ctk.CTkFrame(self.viewport, fg_color="transparent")
+            ctk.CTkLabel(
+                self._empty_frame, text="📋",
+                font=FONTS.font(size=48)
+            ).pack(pady=(XL, M))
+            ctk.CTkLabel(
+                self._empty_frame,
+                text="ยังไม่มีข้อมูลนักเรียน",
+                font=FONTS.style("h2"),
+                text_color=TEXT_H3
+            ).pack()
+            ctk.CTkLabel(
+                self._empty_frame,
+                text="เลือกห้องเรียนและกด 'โหลดข้อมูล' เพื่อเริ่มเช็คชื่อ",
+                font=FONTS.font("TH Sarabun New", 16),
+                text_color="#9CA3AF"
+            ).pack(pady=(S, 0))
+        self._empty_frame.place(relx=0.5, rely=0.4, anchor="center")
+
+    def _hide_empty(self):
+        if self._empty_frame is not None:
+            self._empty_frame.place_forget()
+
+    # ---------- วาด ----------
+
+    def _viewport_height(self):
+        scaling = self.viewport._get_widget_scaling()
+        return max(1, int(self.viewport.winfo_height() / scaling))
+
+    def refresh(self):
+        """วาดเฉพาะแถวที่มองเห็น (แถวที่ข้อมูลไม่เปลี่ยนจะไม่ถูก configure ซ้ำ)"""
+        height = self._viewport_height()
+        self.top = self.layout.clamp_top(self.top, height)
+        first, last = self.layout.visible_range(self.top, height, ROSTER_OVERSCAN)
+
+        for idx in [i for i in self._active if not first <= i < last]:
+            widget = self._active.pop(idx)
+            self._pools[widget.kind].release(widget)
+
+        rows = self.roster.rows
+        for idx in range(first, last):
+            row = rows[idx]
+            widget = self._active.get(idx)
+            if widget is None or widget.kind != row.kind:
+                if widget is not None:
+                    self._pools[widget.kind].release(widget)
+                widget = self._pools[row.kind].acquire()
+                self._active[idx] = widget
+            widget.update(row, self.roster)
+            widget.frame.place(x=0, y=self.layout.offsets[idx] - self.top, relwidth=1.0)
+
+        if self.layout.total > 0:
+            self.scrollbar.set(self.top / self.layout.total,
+                               min(1.0, (self.top + height) / self.layout.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, top):
+        self.top = top
+        self.refresh()
+
+    def _create_row(self, row_class):
+        widget = row_class(self.viewport, self.module)
+        self._bind_wheel(widget.frame)
+        return widget
+
+    # ---------- เลื่อน ----------
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * self.layout.total)
+        elif action == "scroll":
+            step = self._viewport_height() * 0.9 if unit == "pages" else ROSTER_WHEEL_STEP / 3
+            self.scroll_to(self.top + int(value) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.top - ROSTER_WHEEL_STEP)
+        else:
+            self.scroll_to(self.top + ROSTER_WHEEL_STEP)
+        return "break"  # ไม่ให้ CTkScrollableFrame ชั้นนอกเลื่อนตาม
+
+    def _bind_wheel(self, widget):
+        """ผูก mouse wheel กับ widget และลูกทุกตัว (รวม canvas ภายในของ CTk widget)"""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tk.Misc.bind(widget, sequence, self._on_wheel, "+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
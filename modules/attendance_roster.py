@@ -0,0 +1,160 @@
+"""
+modules/attendance_roster.py
+ข้อมูลหน้าเช็คชื่อรายวัน (ไม่ขึ้นกับ widget)
+- AttendanceRoster: รายชื่อแยกห้อง + สถานะที่เลือกของนักเรียนแต่ละคน + จำนวนสรุป
+- VirtualLayout: ตำแหน่ง y ของแต่ละแถว ใช้คำนวณว่าแถวไหนมองเห็นอยู่ (virtualized list)
+UI สร้าง widget เฉพาะแถวที่มองเห็นจากข้อมูลนี้ - ไม่ import customtkinter จึงทดสอบได้
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+
+ROW_ROOM = "room"          # หัวห้อง + Quick Actions + หัวตาราง
+ROW_STUDENT = "student"    # นักเรียน 1 คน
+ROW_SUMMARY = "summary"    # สรุปท้ายห้อง
+
+STATUS_VALUES = ("มา", "ขาด", "ลา", "มาสาย")
+
+
+class RosterRow:
+    """แถวหนึ่งแถวในรายการเช็คชื่อ"""
+
+    __slots__ = ("kind", "room", "student", "index")
+
+    def __init__(self, kind, room, student=None, index=0):
+        self.kind = kind
+        self.room = room
+        self.student = student
+        self.index = index  # ลำดับในห้อง (เฉพาะแถวนักเรียน)
+
+    @property
+    def student_id(self):
+        return self.student['student_id'] if self.student is not None else None
+
+
+class AttendanceRoster:
+    """รายชื่อเช็คชื่อของวันหนึ่ง พร้อมสถานะที่เลือก (ยังไม่บันทึก)"""
+
+    def __init__(self, students=(), statuses=None):
+        """
+        Args:
+            students: รายชื่อนักเรียน (dict/sqlite3.Row ที่มี student_id, class_room)
+            statuses: dict {student_id: สถานะ} ที่บันทึกไว้แล้ว
+        """
+        statuses = statuses or {}
+        grouped = {}
+        for student in students:
+            grouped.setdefault(student['class_room'], []).append(student)
+
+        self.rooms = OrderedDict((room, grouped[room]) for room in sorted(grouped))
+        self._room_of = {}
+        self._status = {}
+        self._counts = {}
+        for room, room_students in self.rooms.items():
+            counts = dict.fromkeys(STATUS_VALUES, 0)
+            counts["none"] = 0
+            for student in room_students:
+                sid = student['student_id']
+                status = statuses.get(sid)
+                status = status if status in STATUS_VALUES else None
+                self._room_of[sid] = room
+                self._status[sid] = status
+                counts[status or "none"] += 1
+            self._counts[room] = counts
+
+        self.rows = []
+        for room, room_students in self.rooms.items():
+            self.rows.append(RosterRow(ROW_ROOM, room))
+            self.rows.extend(RosterRow(ROW_STUDENT, room, student, idx)
+                             for idx, student in enumerate(room_students))
+            self.rows.append(RosterRow(ROW_SUMMARY, room))
+
+    def __len__(self):
+        return len(self._status)
+
+    def status(self, student_id):
+        """สถานะที่เลือกของนักเรียน (None = ยังไม่เลือก)"""
+        return self._status.get(student_id)
+
+    def room_of(self, student_id):
+        return self._room_of.get(student_id)
+
+    def set_status(self, student_id, status):
+        """
+        เลือกสถานะ (None = ล้าง)
+        Returns:
+            True ถ้าสถานะเปลี่ยน
+        """
+        if student_id not in self._status:
+            return False
+        if status is not None and status not in STATUS_VALUES:
+            raise ValueError(f"สถานะไม่ถูกต้อง: {status}")
+        old = self._status[student_id]
+        if old == status:
+            return False
+        counts = self._counts[self._room_of[student_id]]
+        counts[old or "none"] -= 1
+        counts[status or "none"] += 1
+        self._status[student_id] = status
+        return True
+
+    def mark_room(self, room, status):
+        """ตั้งสถานะให้ทั้งห้อง (status=None = ล้างทั้งห้อง)"""
+        changed = 0
+        for student in self.rooms.get(room, ()):
+            changed += self.set_status(student['student_id'], status)
+        return changed
+
+    def counts(self, room=None):
+        """
+        นับจำนวนแต่ละสถานะ
+        Returns:
+            (dict {สถานะ: จำนวน, 'none': ยังไม่เลือก}, จำนวนทั้งหมด)
+        """
+        rooms = [room] if room is not None else list(self._counts)
+        result = dict.fromkeys(STATUS_VALUES, 0)
+        result["none"] = 0
+        for name in rooms:
+            for key, value in self._counts.get(name, {}).items():
+                result[key] += value
+        return result, sum(result.values())
+
+    def selected(self):
+        """list ของ (student_id, สถานะ) ที่เลือกแล้ว ตามลำดับในรายชื่อ"""
+        return [(sid, status) for sid, status in self._status.items() if status]
+
+
+class VirtualLayout:
+    """ตำแหน่งแถวแนวตั้ง (ความสูงไม่เท่ากันได้) สำหรับ virtualized list"""
+
+    def __init__(self, heights=()):
+        self.heights = list(heights)
+        self.offsets = []
+        total = 0
+        for height in self.heights:
+            self.offsets.append(total)
+            total += height
+        self.total = total
+
+    def __len__(self):
+        return len(self.heights)
+
+    def clamp_top(self, top, viewport_height):
+        """จำกัดตำแหน่งเลื่อนให้อยู่ในช่วง 0..(ความสูงรวม - ความสูงที่มองเห็น)"""
+        return max(0, min(top, self.total - viewport_height))
+
+    def visible_range(self, top, viewport_height, overscan=0):
+        """
+        ช่วงแถวที่มองเห็น
+        Args:
+            top: ตำแหน่งเลื่อน (px)
+            viewport_height: ความสูงพื้นที่แสดง (px)
+            overscan: จำนวนแถวเผื่อด้านบน/ล่าง
+        Returns:
+            (first, last) - แถว first ถึง last-1
+        """
+        if not self.heights:
+            return 0, 0
+        first = max(0, bisect_right(self.offsets, top) - 1)
+        last = bisect_right(self.offsets, top + viewport_height - 1) if viewport_height > 0 else first
+        return max(0, first - overscan), min(len(self.heights), max(last, first + 1) + overscan)
@@ -9,7 +9,9 @@ modules/classrooms.py
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from modules.icons import IconManager
+from modules.ui_fonts import FONTS
 from modules.students import StudentForm
+from modules.tree_binding import TreeBinder
 
 # ==================== Design System v4.0 ====================
 PRIMARY = "#3B82F6"
@@ -37,6 +39,8 @@ RADIUS_MODAL = 16
 RADIUS_INPUT = 8
 INPUT_BORDER = "#CBD5E1"
 
+EMPTY_ROW_IID = "__empty__"  # แถวข้อความ "ไม่มีนักเรียนในห้องนี้"
+
 
 class ClassroomsModule:
     """โมดูลจัดการห้องเรียน"""
@@ -50,6 +54,10 @@ class ClassroomsModule:
         self.create_ui()
         self.load_classrooms()
 
+    def on_show(self):
+        """เรียกเมื่อกลับมาที่หน้านี้ (ScreenManager) - โหลดข้อมูลใหม่โดยไม่สร้าง UI ซ้ำ"""
+        self.load_classrooms()
+
     def create_ui(self):
         """สร้าง UI"""
         self.content_frame = ctk.CTkScrollableFrame(
@@ -65,14 +73,14 @@ class ClassroomsModule:
 
         ctk.CTkLabel(
             top_frame, text="🏫 ห้องเรียนทั้งหมด",
-            font=ctk.CTkFont(family="Kanit", size=20, weight="600"),
+            font=FONTS.font("Kanit", 20, "600"),
             text_color=TEXT_H1
         ).pack(side="left")
 
         ctk.CTkButton(
             top_frame, text="+ เพิ่มห้องเรียน",
             command=self.add_classroom,
-            font=ctk.CTkFont(family="Kanit", size=14, weight="500"),
+            font=FONTS.font("Kanit", 14, "500"),
             width=150, height=40,
             corner_radius=RADIUS_INPUT,
             fg_color=PRIMARY, hover_color="#2563EB"
@@ -86,7 +94,7 @@ class ClassroomsModule:
         self.empty_label = ctk.CTkLabel(
             self.cards_frame,
             text="📭 ยังไม่มีห้องเรียน กดปุ่ม '+ เพิ่มห้องเรียน' เพื่อเริ่มต้น",
-            font=ctk.CTkFont(family="Kanit", size=14),
+            font=FONTS.font("Kanit", 14),
             text_color=TEXT_CAPTION
         )
 
@@ -101,7 +109,7 @@ class ClassroomsModule:
 
         self.detail_header = ctk.CTkLabel(
             detail_top, text="",
-            font=ctk.CTkFont(family="Kanit", size=16, weight="600"),
+            font=FONTS.font("Kanit", 16, "600"),
             text_color=TEXT_H2
         )
         self.detail_header.pack(side="left")
@@ -109,7 +117,7 @@ class ClassroomsModule:
         self.add_student_btn = ctk.CTkButton(
             detail_top, text="+ เพิ่มนักเรียน",
             command=self._add_student_to_room,
-            font=ctk.CTkFont(family="Kanit", size=13, weight="500"),
+            font=FONTS.font("Kanit", 13, "500"),
             width=120, height=36, corner_radius=RADIUS_INPUT,
             fg_color=PRIMARY, hover_color="#2563EB"
         )
@@ -148,6 +156,7 @@ class ClassroomsModule:
                         background=TABLE_HEADER_BG)
         self.tree.tag_configure('evenrow', background=SURFACE)
         self.tree.tag_configure('oddrow', background=TABLE_STRIPE)
+        self.tree_binder = TreeBinder(self.tree)
 
     def load_classrooms(self):
         """โหลดห้องเรียนทั้งหมดแสดงเป็น cards"""
@@ -194,7 +203,7 @@ class ClassroomsModule:
         # ชื่อห้อง
         ctk.CTkLabel(
             inner, text=classroom['name'],
-            font=ctk.CTkFont(family="TH Sarabun New", size=18, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 18, "bold"),
             text_color=PRIMARY, anchor="w"
         ).pack(fill="x")
 
@@ -202,7 +211,7 @@ class ClassroomsModule:
         count = classroom['student_count']
         ctk.CTkLabel(
             inner, text=f"{count} คน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_CAPTION, anchor="w"
         ).pack(fill="x", pady=(XS, S))
 
@@ -213,7 +222,7 @@ class ClassroomsModule:
         ctk.CTkButton(
             btn_frame, text="ดูรายชื่อ",
             command=lambda name=classroom['name']: self.show_students(name),
-            font=ctk.CTkFont(family="TH Sarabun New", size=13),
+            font=FONTS.font("TH Sarabun New", 13),
             width=80, height=30, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
         ).pack(side="left", padx=(0, S))
@@ -221,7 +230,7 @@ class ClassroomsModule:
         ctk.CTkButton(
             btn_frame, text="ลบ",
             command=lambda cid=classroom['id'], name=classroom['name']: self.delete_classroom(cid, name),
-            font=ctk.CTkFont(family="TH Sarabun New", size=13),
+            font=FONTS.font("TH Sarabun New", 13),
             width=60, height=30, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=DANGER, text_color=DANGER,
@@ -254,7 +263,7 @@ class ClassroomsModule:
         header.pack_propagate(False)
         ctk.CTkLabel(
             header, text="เพิ่มห้องเรียนใหม่",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color="white"
         ).pack(expand=True)
 
@@ -262,7 +271,7 @@ class ClassroomsModule:
         preview_var = ctk.StringVar(value="ป.1/1")
         preview_label = ctk.CTkLabel(
             frame, textvariable=preview_var,
-            font=ctk.CTkFont(family="TH Sarabun New", size=24, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 24, "bold"),
             text_color=PRIMARY
         )
         preview_label.pack(pady=(M, S))
@@ -274,8 +283,8 @@ class ClassroomsModule:
         select_frame.columnconfigure(1, weight=1)
         select_frame.columnconfigure(2, weight=1)
 
-        font_label = ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold")
-        font_dd = ctk.CTkFont(family="TH Sarabun New", size=14)
+        font_label = FONTS.style("cell")
+        font_dd = FONTS.style("body")
 
         # ระดับชั้น
         col0 = ctk.CTkFrame(select_frame, fg_color="transparent")
@@ -339,7 +348,7 @@ class ClassroomsModule:
 
         ctk.CTkButton(
             btn_frame, text="ยกเลิก", command=dialog.destroy,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=80, height=34, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6"
@@ -347,7 +356,7 @@ class ClassroomsModule:
 
         ctk.CTkButton(
             btn_frame, text="บันทึก", command=save,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=80, height=34, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
         ).pack(side="right")
@@ -385,20 +394,17 @@ class ClassroomsModule:
         # แสดง detail frame
         self.detail_frame.pack(fill="x", padx=L, pady=(0, L))
 
-        # ล้างตาราง
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
         students = self.db.get_all_students(class_room=class_room)
 
         if not students:
-            self.tree.insert("", "end", values=("", "", "ไม่มีนักเรียนในห้องนี้", "", ""))
+            self.tree_binder.bind([(EMPTY_ROW_IID, ("", "", "ไม่มีนักเรียนในห้องนี้", "", ""))])
             return
 
-        for idx, s in enumerate(students):
-            tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
+        # อัปเดตเฉพาะแถวที่เปลี่ยน (เปลี่ยนห้อง = แถวห้องเดิมถูกแทนที่, แก้ไข 1 คน = 1 แถว)
+        self.tree_binder.bind(
+            (s['student_id'], (
                 s['student_id'], s['title'],
                 s['first_name'], s['last_name'],
                 s['parent_phone'] or "-"
-            ), tags=(tag,))
+            )) for s in students
+        )
@@ -0,0 +1,78 @@
+"""
+modules/dashboard_stats.py
+ตัวเลขสรุปสำหรับหน้าแรกและหน้ารายงาน (จำนวนนักเรียนต่อห้อง, นักเรียน/ครู/ห้องทั้งหมด)
+- จำนวนนักเรียนทุกห้องมาจาก GROUP BY query เดียว (แทน COUNT ทีละห้อง)
+- จำนวนรวมใช้ COUNT(*) (แทนการดึงทุกแถวมานับด้วย len())
+- เก็บผลไว้ระหว่างการเปิดหน้า - query ใหม่เฉพาะเมื่อ Database.data_version() เปลี่ยน
+ไม่ import customtkinter
+"""
+
+import weakref
+
+
+class DashboardStats:
+    """ตัวเลขสรุปของฐานข้อมูลหนึ่งตัว พร้อม cache"""
+
+    def __init__(self, db):
+        """
+        Args:
+            db: Database
+        """
+        self.db = db
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._snapshot = None
+
+    def snapshot(self):
+        """
+        Returns:
+            dict {
+                'class_rooms': list ชื่อห้อง (เรียงตามชื่อ),
+                'room_counts': dict {ห้อง: จำนวนนักเรียน} (ครบทุกห้องใน class_rooms),
+                'students': จำนวนนักเรียน, 'teachers': จำนวนครู,
+            }
+        """
+        version = self.db.data_version()
+        if self._snapshot is not None and version == self._version:
+            self.hits += 1
+            return self._snapshot
+
+        self.misses += 1
+        class_rooms = self.db.get_class_rooms()
+        counts = self.db.count_students_per_classroom()
+        self._snapshot = {
+            'class_rooms': class_rooms,
+            'room_counts': {room: counts.get(room, 0) for room in class_rooms},
+            'students': self.db.count_students(),
+            'teachers': self.db.count_teachers(),
+        }
+        self._version = version
+        return self._snapshot
+
+    def summary_counts(self):
+        """
+        Returns:
+            dict {'students', 'teachers', 'class_rooms'} สำหรับ summary cards
+        """
+        snap = self.snapshot()
+        return {
+            'students': snap['students'],
+            'teachers': snap['teachers'],
+            'class_rooms': len(snap['class_rooms']),
+        }
+
+    def invalidate(self):
+        """บังคับให้ query ใหม่ครั้งถัดไป"""
+        self._snapshot = None
+
+
+_providers = weakref.WeakKeyDictionary()
+
+
+def get_dashboard_stats(db):
+    """DashboardStats ของ db (สร้างครั้งแรกแล้วใช้ร่วมกันทุกหน้าจอ)"""
+    stats = _providers.get(db)
+    if stats is None:
+        stats = _providers[db] = DashboardStats(db)
+    return stats
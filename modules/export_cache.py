@@ -0,0 +1,166 @@
+"""
+modules/export_cache.py
+แคชไฟล์ Export บนดิสก์ (Content-addressed)
+- key = sha256 ของข้อมูลที่ใช้สร้างไฟล์ + ชนิดรายงาน + เวอร์ชันเทมเพลต
+- ข้อมูลไม่เปลี่ยน -> คัดลอกไฟล์เดิมจากแคช แทนการสร้างใหม่ด้วย reportlab
+- จำกัดขนาดรวม ลบไฟล์ที่ใช้ล่าสุดนานที่สุดก่อน (LRU ตาม mtime ที่อัปเดตทุกครั้งที่ใช้)
+
+เมื่อแก้หน้าตาของรายงานใด ให้เพิ่มเลขใน TEMPLATE_VERSIONS เพื่อไม่ให้ใช้ไฟล์เก่า
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "exports"
+)
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024  # 100 MB
+
+# เวอร์ชันเทมเพลตของรายงานที่ใช้แคช
+TEMPLATE_VERSIONS = {
+    "class_schedule_pdf": 1,
+    "transcript_pdf": 1,
+}
+
+
+def _normalize(value):
+    """แปลง sqlite3.Row / tuple ให้ json.dumps ได้และได้ผลเหมือนกันทุกครั้ง"""
+    if hasattr(value, "keys") and not isinstance(value, dict):
+        value = {k: value[k] for k in value.keys()}
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class ExportCache:
+    """แคชไฟล์ Export แบบ content-addressed พร้อมจำกัดขนาดแบบ LRU"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: โฟลเดอร์เก็บแคช
+            max_bytes: ขนาดรวมสูงสุดของแคช (ไบต์)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, kind, rows, template_version=None):
+        """
+        สร้าง key จากข้อมูลที่ใช้สร้างไฟล์
+        Args:
+            kind: ชนิดรายงาน เช่น "class_schedule_pdf"
+            rows: ข้อมูลทั้งหมดที่มีผลต่อไฟล์ (list/dict/sqlite3.Row)
+                รวมชื่อฟอนต์ที่ใช้ (get_thai_font) ด้วย - ฟอนต์สำรองไม่มีอักษรไทย
+            template_version: เวอร์ชันเทมเพลต (ค่าเริ่มต้นจาก TEMPLATE_VERSIONS)
+        Returns:
+            str hex digest
+        """
+        if template_version is None:
+            template_version = TEMPLATE_VERSIONS.get(kind, 1)
+        payload = json.dumps(
+            {"kind": kind, "version": template_version, "rows": _normalize(rows)},
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def fetch(self, key, dest_path):
+        """
+        คัดลอกไฟล์จากแคชไปยังปลายทาง
+        Returns:
+            True ถ้ามีในแคช
+        """
+        path = self._path(key)
+        with self._lock:
+            if not os.path.exists(path):
+                self.misses += 1
+                return False
+            now = time.time()
+            os.utime(path, (now, now))
+            self.hits += 1
+        shutil.copyfile(path, dest_path)
+        return True
+
+    def store(self, key, src_path):
+        """เก็บไฟล์ที่สร้างแล้วเข้าแคช แล้วลบไฟล์เก่าถ้าเกินขนาด"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # เขียนไฟล์ชั่วคราวก่อนแล้ว rename เพื่อไม่ให้มีไฟล์ครึ่งๆ กลางๆ ในแคช
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        os.close(fd)
+        shutil.copyfile(src_path, tmp_path)
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def get_or_render(self, kind, rows, dest_path, render, template_version=None):
+        """
+        ใช้ไฟล์จากแคชถ้ามี ไม่เช่นนั้นสร้างใหม่ด้วย render(dest_path) แล้วเก็บเข้าแคช
+        Returns:
+            True ถ้าได้จากแคช, False ถ้าสร้างใหม่
+        """
+        key = self.make_key(kind, rows, template_version)
+        if self.fetch(key, dest_path):
+            return True
+        render(dest_path)
+        self.store(key, dest_path)
+        return False
+
+    def entries(self):
+        """list ของ (path, size, mtime) ของไฟล์ในแคช"""
+        result = []
+        if not os.path.isdir(self.cache_dir):
+            return result
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                result.append((path, st.st_size, st.st_mtime))
+        return result
+
+    def total_bytes(self):
+        return sum(size for _path, size, _mtime in self.entries())
+
+    def _evict(self):
+        """ลบไฟล์ที่ไม่ได้ใช้นานที่สุดจนขนาดรวมไม่เกิน max_bytes"""
+        entries = sorted(self.entries(), key=lambda e: e[2])
+        total = sum(size for _path, size, _mtime in entries)
+        for path, size, _mtime in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """ล้างแคชทั้งหมด"""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+_default_cache = None
+
+
+def get_export_cache():
+    """แคชกลางของโปรแกรม (สร้างครั้งแรกที่เรียกใช้)"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExportCache()
+    return _default_cache
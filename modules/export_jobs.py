@@ -0,0 +1,323 @@
+"""
+modules/export_jobs.py
+ตัวรันงาน Export เบื้องหลัง (Background Export Jobs)
+- สร้างไฟล์ PDF/Excel บน worker thread เพื่อไม่ให้หน้าต่างค้าง
+- รายงานความคืบหน้าผ่าน update_status (ทุก 25%)
+- ยกเลิกงานได้ระหว่างทาง (ลบไฟล์ที่สร้างไม่เสร็จทิ้ง)
+- เขียนลงไฟล์ชั่วคราวข้างไฟล์ปลายทาง (job.output_path) แล้ว os.replace เมื่อสำเร็จ
+  ไฟล์เดิมที่ผู้ใช้เลือกเขียนทับจึงไม่หายถ้างานล้มเหลว/ถูกยกเลิก
+- แจ้ง Toast เมื่อเสร็จ ผ่าน update_status -> show_toast ของหน้าหลัก
+
+หมายเหตุ: การเชื่อมต่อ SQLite ผูกกับ thread ที่สร้าง worker จึงอ่านข้อมูลผ่าน
+job.db ซึ่งเป็น connection แบบอ่านอย่างเดียวที่เปิดใหม่ใน worker เท่านั้น
+"""
+
+import os
+import queue
+import threading
+import uuid
+from tkinter import messagebox
+from database.db import Database
+from modules.ui_fonts import FONTS
+
+# ==================== Design System v4.0 ====================
+PRIMARY = "#3B82F6"
+DANGER = "#EF4444"
+NEUTRAL = "#64748B"
+TEXT_H3 = "#334155"
+TEXT_CAPTION = "#94A3B8"
+
+XS, S, M, L, XL, XXL = 4, 8, 16, 24, 32, 48
+RADIUS_BUTTON = 8
+RADIUS_CARD = 12
+
+POLL_INTERVAL_MS = 100
+PROGRESS_STEP = 25  # แจ้ง update_status ทุกกี่เปอร์เซ็นต์
+
+
+class ExportCancelled(Exception):
+    """ถูกยกเลิกโดยผู้ใช้ระหว่างสร้างไฟล์"""
+
+
+def partial_path(file_path):
+    """ไฟล์ชั่วคราวในโฟลเดอร์เดียวกับปลายทาง (os.replace ได้แบบ atomic, นามสกุลเดิม)"""
+    root, ext = os.path.splitext(file_path)
+    return f"{root}.{uuid.uuid4().hex[:8]}.partial{ext}"
+
+
+class ExportJob:
+    """
+    งาน Export หนึ่งงาน - ใช้ภายในฟังก์ชัน work(job) ที่รันบน worker thread
+    เรียก job.progress()/job.iterate() เป็นระยะ เพื่อรายงานความคืบหน้าและตรวจการยกเลิก
+    work(job) เขียนไฟล์ที่ job.output_path (ไม่ใช่ file_path) - ย้ายไปปลายทางเมื่อสำเร็จ
+    """
+
+    def __init__(self, title, file_path=None):
+        self.title = title
+        self.file_path = file_path
+        self.output_path = partial_path(file_path) if file_path else None
+        self.percent = 0
+        self.note = None  # ข้อความเสริมต่อท้ายเปอร์เซ็นต์ เช่น อัตราไฟล์/วินาที
+        self.state = "pending"  # pending, running, done, cancelled, error
+        self.result = None
+        self.error = None
+        self.db = None  # connection อ่านอย่างเดียวของ worker (เปิดเมื่อ submit ด้วย db)
+        self.error_message = "ไม่สามารถ Export ได้"
+        self.on_done = None
+        self.on_finish = None
+        self.parent = None  # หน้าต่างของ messagebox เมื่อผิดพลาด (เช่น dialog ที่ grab อยู่)
+        self._reported = 0  # เปอร์เซ็นต์ล่าสุดที่แจ้งผ่าน update_status
+        self._cancel_event = threading.Event()
+        self._events = queue.Queue()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """ขอยกเลิกงาน (มีผลที่จุดตรวจถัดไปของ worker)"""
+        self._cancel_event.set()
+
+    def check(self):
+        """ตรวจว่าถูกยกเลิกหรือยัง ถ้าใช่จะ raise ExportCancelled"""
+        if self._cancel_event.is_set():
+            raise ExportCancelled(self.title)
+
+    def progress(self, done, total, note=None):
+        """
+        รายงานความคืบหน้า
+        Args:
+            done: จำนวนที่ทำเสร็จแล้ว
+            total: จำนวนทั้งหมด
+            note: ข้อความเสริม (ไม่บังคับ)
+        """
+        self.check()
+        if note is not None:
+            self.note = note
+        percent = int(done * 100 / total) if total else 100
+        percent = max(0, min(100, percent))
+        if percent != self.percent:
+            self.percent = percent
+            self._events.put(("progress", percent))
+
+    def iterate(self, items):
+        """วนลูปพร้อมรายงานความคืบหน้าและตรวจการยกเลิกทุกรายการ"""
+        items = list(items)
+        total = len(items)
+        for idx, item in enumerate(items):
+            self.progress(idx, total)
+            yield item
+        self.progress(total, total)
+
+    def pdf_page_hook(self, canvas, doc):
+        """
+        ใช้เป็น onFirstPage/onLaterPages ของ reportlab
+        ทำให้ยกเลิกได้ระหว่าง doc.build() ซึ่งเป็นขั้นตอนที่นานที่สุด
+        """
+        self.check()
+
+
+class ExportJobRunner:
+    """
+    ตัวจัดการงาน Export เบื้องหลังของแต่ละโมดูล
+
+    ตัวอย่าง:
+        self.export_jobs = ExportJobRunner(self.parent, self.update_status)
+
+        def build(job):
+            for row in job.iterate(rows):
+                ...
+            wb.save(job.output_path)
+            return "Export สำเร็จ"
+
+        self.export_jobs.submit("Export รายชื่อนักเรียน", build, file_path)
+    """
+
+    def __init__(self, widget, update_status_callback, show_panel=True):
+        """
+        Args:
+            widget: widget ใดๆ ของโมดูล (ใช้ after() ตรวจผลจาก worker)
+            update_status_callback: ฟังก์ชัน update_status ของหน้าหลัก
+            show_panel: แสดงแถบความคืบหน้าพร้อมปุ่มยกเลิกหรือไม่
+        """
+        self.widget = widget
+        self.update_status = update_status_callback
+        self.show_panel = show_panel
+        self.jobs = []
+        self._panel = None
+        self._polling = False
+
+    def submit(self, title, work, file_path=None, db=None,
+               error_message="ไม่สามารถ Export ได้", on_done=None, on_finish=None, parent=None):
+        """
+        เริ่มงาน Export บน worker thread
+        Args:
+            title: ชื่องาน (แสดงใน status)
+            work: ฟังก์ชัน work(job) คืนข้อความเมื่อสำเร็จ
+            file_path: ไฟล์ปลายทาง (work เขียนที่ job.output_path - ไฟล์เดิมไม่ถูกแตะถ้ายกเลิก/ผิดพลาด)
+            db: Database ของโมดูล ถ้าระบุ worker จะได้ job.db ที่เปิดจากไฟล์เดียวกัน
+            error_message: ข้อความนำหน้าใน messagebox เมื่อผิดพลาด
+            on_done: callback(job) บน UI thread เมื่องานสำเร็จ (ไม่บังคับ)
+            on_finish: callback(job) บน UI thread เมื่องานจบทุกกรณี (สำเร็จ/ยกเลิก/ผิดพลาด)
+                ใช้คืนสถานะปุ่มที่ปิดไว้ระหว่างทำงาน - ดู job.state (ไม่บังคับ)
+            parent: หน้าต่างที่เป็นเจ้าของ messagebox เมื่อผิดพลาด (ไม่บังคับ)
+        Returns:
+            ExportJob
+        """
+        job = ExportJob(title, file_path)
+        job.error_message = error_message
+        job.on_done = on_done
+        job.on_finish = on_finish
+        job.parent = parent
+        job.state = "running"
+        self.jobs.append(job)
+
+        db_path = db.db_path if db is not None else None
+        thread = threading.Thread(target=self._run, args=(job, work, db_path), daemon=True)
+        job.thread = thread
+        thread.start()
+
+        self.update_status(f"{title}: กำลังดำเนินการ...", "info")
+        if self.show_panel:
+            self._show_panel(job)
+        self._schedule_poll()
+        return job
+
+    def cancel(self, job=None):
+        """ยกเลิกงานที่ระบุ หรือทุกงานที่กำลังทำ"""
+        for j in ([job] if job else self.jobs):
+            if j.state == "running":
+                j.cancel()
+
+    @property
+    def busy(self):
+        return any(j.state == "running" for j in self.jobs)
+
+    def _run(self, job, work, db_path=None):
+        """ทำงานบน worker thread"""
+        try:
+            job.check()
+            if db_path:
+                job.db = Database.open_readonly(db_path)
+            result = work(job)
+            job.check()
+            if job.output_path and os.path.exists(job.output_path):
+                os.replace(job.output_path, job.file_path)
+            job._events.put(("done", result))
+        except ExportCancelled:
+            job._events.put(("cancelled", None))
+        except Exception as e:
+            job._events.put(("error", e))
+        finally:
+            if job.db is not None:
+                job.db.close()
+                job.db = None
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_INTERVAL_MS, self.poll)
+
+    def poll(self):
+        """ดึงเหตุการณ์จาก worker แล้วอัปเดต UI (เรียกบน UI thread เท่านั้น)"""
+        self._polling = False
+        for job in list(self.jobs):
+            while True:
+                try:
+                    kind, payload = job._events.get_nowait()
+                except queue.Empty:
+                    break
+                self._handle_event(job, kind, payload)
+
+        self.jobs = [j for j in self.jobs if j.state == "running"]
+        if self.jobs:
+            self._schedule_poll()
+        else:
+            self._hide_panel()
+
+    def _handle_event(self, job, kind, payload):
+        if kind == "progress":
+            if payload - job._reported >= PROGRESS_STEP and payload < 100:
+                job._reported = payload - payload % PROGRESS_STEP
+                note = f" ({job.note})" if job.note else ""
+                self.update_status(f"{job.title}: {job._reported}%{note}", "info")
+            self._update_panel(job)
+        elif kind == "done":
+            job.state = "done"
+            job.result = payload
+            self.update_status(payload or f"{job.title} สำเร็จ", "success")
+            if job.on_done:
+                job.on_done(job)
+        elif kind == "cancelled":
+            job.state = "cancelled"
+            self._remove_partial(job)
+            self.update_status(f"ยกเลิก{job.title}แล้ว", "warning")
+        elif kind == "error":
+            job.state = "error"
+            job.error = payload
+            self._remove_partial(job)
+            self.update_status(f"{job.title} ล้มเหลว", "error")
+            messagebox.showerror("ผิดพลาด", f"{job.error_message}\n{str(payload)}", parent=job.parent)
+        if kind != "progress" and job.on_finish:
+            job.on_finish(job)
+
+    def _remove_partial(self, job):
+        """ลบไฟล์ชั่วคราวที่สร้างไม่เสร็จ (ไม่แตะไฟล์ปลายทางเดิม)"""
+        if job.output_path and os.path.exists(job.output_path):
+            try:
+                os.remove(job.output_path)
+            except OSError:
+                pass
+
+    # ==================== Progress Panel ====================
+
+    def _show_panel(self, job):
+        """แถบความคืบหน้าลอยมุมล่างซ้าย พร้อมปุ่มยกเลิก"""
+        import customtkinter as ctk
+
+        self._hide_panel()
+        root = self.widget.winfo_toplevel()
+        panel = ctk.CTkFrame(
+            root, fg_color="#FFFFFF", corner_radius=RADIUS_CARD,
+            border_width=1, border_color="#E2E8F0", width=320
+        )
+
+        ctk.CTkLabel(
+            panel, text=job.title,
+            font=FONTS.style("body_bold"),
+            text_color=TEXT_H3, anchor="w"
+        ).pack(fill="x", padx=M, pady=(S, XS))
+
+        row = ctk.CTkFrame(panel, fg_color="transparent")
+        row.pack(fill="x", padx=M, pady=(0, S))
+
+        bar = ctk.CTkProgressBar(row, width=200, height=8, progress_color=PRIMARY)
+        bar.set(0)
+        bar.pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            row, text="ยกเลิก", command=lambda: self.cancel(job),
+            font=FONTS.font("TH Sarabun New", 13),
+            width=64, height=28, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=DANGER, text_color=DANGER, hover_color="#FEF2F2"
+        ).pack(side="right")
+
+        panel.place(relx=0.0, rely=1.0, x=L, y=-L, anchor="sw")
+        panel.lift()
+        self._panel = (panel, bar, job)
+
+    def _update_panel(self, job):
+        if self._panel and self._panel[2] is job:
+            try:
+                self._panel[1].set(job.percent / 100)
+            except Exception:
+                pass
+
+    def _hide_panel(self):
+        if self._panel:
+            try:
+                self._panel[0].destroy()
+            except Exception:
+                pass
+            self._panel = None
@@ -0,0 +1,301 @@
+"""
+modules/font_discovery.py
+ค้นหาฟอนต์ภาษาไทยสำหรับ PDF ได้ทุกระบบปฏิบัติการ + index ฟอนต์บนดิสก์
+- ลำดับ: ฟอนต์ในโปรเจค -> ฟอนต์ Windows -> fc-list :lang=th -> สแกนโฟลเดอร์ฟอนต์ Linux/macOS
+- ตรวจว่าไฟล์ TTF มีอักษรไทยจริงจากตาราง cmap (อ่านเฉพาะส่วนที่จำเป็น ไม่ parse ทั้งไฟล์)
+- จำผลลัพธ์ (path + metrics ที่ parse แล้ว) ไว้ใน cache/fonts เพื่อให้ process ถัดไป
+  (เช่น worker ของ ProcessPoolExecutor) ไม่ต้องสแกนและ parse TTF ซ้ำ
+ไม่ import reportlab เพื่อให้ทดสอบได้โดยไม่ต้องติดตั้ง
+"""
+
+import json
+import os
+import pickle
+import re
+import struct
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_INDEX_DIR = os.path.join(PROJECT_DIR, "cache", "fonts")
+INDEX_VERSION = 2
+
+# ก, า, ไม้เอก - ฟอนต์ต้องมีครบทั้งสามตัวจึงถือว่ารองรับภาษาไทย
+THAI_TEST_CODEPOINTS = (0x0E01, 0x0E32, 0x0E48)
+
+# ฟอนต์ที่รู้จักและรองรับภาษาไทย (path, ชื่อที่ลงทะเบียน) ตามลำดับความสำคัญ
+KNOWN_FONTS = [
+    (os.path.join(PROJECT_DIR, "THSarabunNew.ttf"), "Sarabun"),
+    (os.path.join(PROJECT_DIR, "fonts", "THSarabunNew.ttf"), "Sarabun"),
+    ("C:/Windows/Fonts/LeelawUI.ttf", "LeelawUI"),
+    ("C:/Windows/Fonts/tahoma.ttf", "Tahoma"),
+    ("C:/Windows/Fonts/leelawad.ttf", "Leelawadee"),
+]
+
+# ตระกูลฟอนต์ไทยที่ต้องการ (ชื่อไฟล์ตัวพิมพ์เล็ก ไม่มีขีด) - อยู่ก่อนได้ก่อน
+PREFERRED_FAMILIES = [
+    "thsarabunnew", "sarabun", "notosansthai", "notoserifthai", "leelawui", "leelawadee",
+    "loma", "garuda", "norasi", "kinnari", "waree", "laksaman", "umpush", "sawasdee",
+    "tlwgtypo", "tahoma",
+]
+
+if sys.platform == "darwin":
+    FONT_DIRS = ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+elif sys.platform.startswith("win"):
+    FONT_DIRS = [os.path.join(os.environ.get("WINDIR", "C:/Windows"), "Fonts")]
+else:
+    FONT_DIRS = [
+        "/usr/share/fonts", "/usr/local/share/fonts",
+        os.path.expanduser("~/.local/share/fonts"), os.path.expanduser("~/.fonts"),
+    ]
+
+
+# ==================== TTF cmap ====================
+
+def _cmap_subtable_has(f, offset, codepoints):
+    """ตรวจ codepoints ใน cmap subtable format 4 หรือ 12"""
+    f.seek(offset)
+    fmt = struct.unpack(">H", f.read(2))[0]
+
+    if fmt == 4:
+        length, _lang, seg_x2 = struct.unpack(">HHH", f.read(6))
+        seg_count = seg_x2 // 2
+        f.seek(offset + 14)
+        ends = struct.unpack(f">{seg_count}H", f.read(seg_x2))
+        f.read(2)  # reservedPad
+        starts = struct.unpack(f">{seg_count}H", f.read(seg_x2))
+        deltas = struct.unpack(f">{seg_count}h", f.read(seg_x2))
+        range_pos = f.tell()
+        range_offsets = struct.unpack(f">{seg_count}H", f.read(seg_x2))
+
+        for cp in codepoints:
+            for i in range(seg_count):
+                if starts[i] <= cp <= ends[i]:
+                    if range_offsets[i] == 0:
+                        glyph = (cp + deltas[i]) & 0xFFFF
+                    else:
+                        f.seek(range_pos + i * 2 + range_offsets[i] + (cp - starts[i]) * 2)
+                        glyph = struct.unpack(">H", f.read(2))[0]
+                        if glyph:
+                            glyph = (glyph + deltas[i]) & 0xFFFF
+                    if glyph:
+                        break
+            else:
+                return False
+        return True
+
+    if fmt == 12:
+        f.seek(offset + 12)
+        n_groups = struct.unpack(">I", f.read(4))[0]
+        groups = [struct.unpack(">III", f.read(12)) for _ in range(n_groups)]
+        return all(any(start <= cp <= end for start, end, _g in groups) for cp in codepoints)
+
+    return False
+
+
+def ttf_supports_codepoints(path, codepoints=THAI_TEST_CODEPOINTS):
+    """
+    ตรวจว่าไฟล์ TTF/OTF มี glyph ของ codepoints ทั้งหมดหรือไม่ (อ่านจากตาราง cmap)
+    Returns:
+        True/False (ไฟล์เสียหรืออ่านไม่ได้ = False)
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+            if len(header) < 12:
+                return False
+            num_tables = struct.unpack(">H", header[4:6])[0]
+            cmap_offset = None
+            for _ in range(num_tables):
+                tag, _checksum, offset, _length = struct.unpack(">4sIII", f.read(16))
+                if tag == b"cmap":
+                    cmap_offset = offset
+                    break
+            if cmap_offset is None:
+                return False
+
+            f.seek(cmap_offset)
+            _version, n = struct.unpack(">HH", f.read(4))
+            records = [struct.unpack(">HHI", f.read(8)) for _ in range(n)]
+            # Unicode subtables ก่อน: (3,10) full, (3,1) BMP, (0,x) Unicode platform
+            records.sort(key=lambda r: {(3, 10): 0, (3, 1): 1}.get((r[0], r[1]), 2 if r[0] == 0 else 9))
+            for platform, encoding, sub_offset in records:
+                if platform not in (0, 3) or (platform == 3 and encoding not in (1, 10)):
+                    continue
+                if _cmap_subtable_has(f, cmap_offset + sub_offset, codepoints):
+                    return True
+    except (OSError, struct.error):
+        return False
+    return False
+
+
+# ==================== Discovery ====================
+
+def _family_key(path):
+    return re.sub(r"[^a-z0-9]", "", os.path.splitext(os.path.basename(path))[0].lower())
+
+
+def _rank(path):
+    """เรียงฟอนต์: ตระกูลที่ต้องการก่อน, ตัวปกติก่อนตัวหนา/เอียง"""
+    key = _family_key(path)
+    family_rank = next((i for i, fam in enumerate(PREFERRED_FAMILIES) if key.startswith(fam)),
+                       len(PREFERRED_FAMILIES))
+    styled = any(s in key for s in ("bold", "italic", "oblique", "light", "thin", "black"))
+    return (family_rank, styled, key)
+
+
+def font_name_for(path):
+    """ชื่อสำหรับลงทะเบียนกับ reportlab จากชื่อไฟล์"""
+    return re.sub(r"[^A-Za-z0-9_-]", "", os.path.splitext(os.path.basename(path))[0]) or "ThaiFont"
+
+
+def fc_list_thai_fonts():
+    """
+    รายชื่อไฟล์ฟอนต์ไทยจาก fontconfig (ถ้ามีคำสั่ง fc-list)
+    Returns:
+        list ของ path (.ttf/.otf) หรือ [] ถ้าไม่มี fc-list
+    """
+    try:
+        output = subprocess.run(
+            ["fc-list", ":lang=th", "file"],
+            capture_output=True, text=True, timeout=10, check=False,
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    paths = []
+    for line in output.splitlines():
+        path = line.split(":", 1)[0].strip()
+        if path.lower().endswith((".ttf", ".otf")):
+            paths.append(path)
+    return paths
+
+
+def scan_font_dirs(font_dirs=None):
+    """สแกนโฟลเดอร์ฟอนต์หาไฟล์ .ttf/.otf ที่มีอักษรไทย"""
+    found = []
+    for font_dir in font_dirs if font_dirs is not None else FONT_DIRS:
+        if not os.path.isdir(font_dir):
+            continue
+        for root, _dirs, files in os.walk(font_dir):
+            for name in files:
+                if name.lower().endswith((".ttf", ".otf")):
+                    path = os.path.join(root, name)
+                    if ttf_supports_codepoints(path):
+                        found.append(path)
+    return found
+
+
+def discover_thai_fonts(font_dirs=None, use_fc_list=True):
+    """
+    ค้นหาฟอนต์ไทยทั้งหมดในเครื่อง เรียงตามความเหมาะสม
+    Returns:
+        list ของ (path, ชื่อที่ลงทะเบียน)
+    """
+    candidates = [(path, name) for path, name in KNOWN_FONTS if os.path.exists(path)]
+    seen = {os.path.normcase(path) for path, _name in candidates}
+
+    discovered = fc_list_thai_fonts() if use_fc_list else []
+    if not discovered:
+        discovered = scan_font_dirs(font_dirs)
+
+    for path in sorted(set(discovered), key=_rank):
+        if os.path.normcase(path) not in seen:
+            seen.add(os.path.normcase(path))
+            candidates.append((path, font_name_for(path)))
+    return candidates
+
+
+def outranked_by_known_font(path, known_fonts=None):
+    """
+    มีฟอนต์ใน KNOWN_FONTS ที่สำคัญกว่า path อยู่ในเครื่องหรือไม่
+    (เช่น เพิ่ม THSarabunNew.ttf ในโปรเจคหลังจาก index จำ Tahoma/ฟอนต์จาก fc-list ไว้แล้ว)
+    Returns:
+        True/False
+    """
+    path = os.path.normcase(os.path.abspath(path))
+    for known_path, _name in known_fonts if known_fonts is not None else KNOWN_FONTS:
+        if os.path.normcase(os.path.abspath(known_path)) == path:
+            return False
+        if os.path.exists(known_path):
+            return True
+    return False
+
+
+# ==================== Persistent index ====================
+
+class FontIndex:
+    """
+    index ฟอนต์บนดิสก์: จำ path ที่เลือกไว้ และเก็บวัตถุฟอนต์ที่ parse แล้ว (pickle)
+    ใช้ได้เมื่อไฟล์ฟอนต์ยังมีขนาดและเวลาแก้ไขเท่าเดิม และ library รุ่นเดิม
+    """
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        self.index_path = os.path.join(index_dir, "font_index.json")
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return {"size": st.st_size, "mtime": int(st.st_mtime)}
+
+    def lookup(self, library_version=""):
+        """
+        Returns:
+            dict {'path', 'name', 'metrics'} ของฟอนต์ที่จำไว้ หรือ None ถ้าไม่มี/ไม่ตรง
+        """
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("version") != INDEX_VERSION or entry.get("library") != library_version:
+                return None
+            if entry["path"] and self._stamp(entry["path"]) != entry["stamp"]:
+                return None
+            return entry
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store(self, path, name, library_version="", font=None):
+        """
+        บันทึกฟอนต์ที่เลือก (path=None หมายถึงไม่มีฟอนต์ไทย ใช้ค่าสำรอง)
+        Args:
+            font: วัตถุฟอนต์ที่ parse แล้ว (เก็บเป็น pickle ถ้าทำได้)
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        entry = {
+            "version": INDEX_VERSION,
+            "library": library_version,
+            "path": path,
+            "name": name,
+            "stamp": self._stamp(path) if path else None,
+            "metrics": None,
+        }
+        if font is not None:
+            metrics_name = f"{name}.pickle"
+            try:
+                with open(os.path.join(self.index_dir, metrics_name), "wb") as f:
+                    pickle.dump(font, f, protocol=pickle.HIGHEST_PROTOCOL)
+                entry["metrics"] = metrics_name
+            except Exception:
+                entry["metrics"] = None
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def load_metrics(self, entry):
+        """
+        โหลดวัตถุฟอนต์ที่ parse แล้วจาก index (None ถ้าไม่มีหรือเสีย)
+        unpickle เฉพาะไฟล์ใน index_dir - index เก็บแค่ชื่อไฟล์ ไม่เชื่อ path อื่น
+        """
+        metrics_name = entry.get("metrics")
+        if not isinstance(metrics_name, str) or not metrics_name.endswith(".pickle"):
+            return None
+        index_dir = os.path.realpath(self.index_dir)
+        metrics_path = os.path.realpath(os.path.join(index_dir, metrics_name))
+        if os.path.dirname(metrics_path) != index_dir:
+            return None
+        try:
+            with open(metrics_path, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return None
@@ -11,15 +11,13 @@ modules/grades.py
 import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from modules.icons import IconManager
-from modules.pdf_utils import get_thai_font
+from modules.ui_fonts import FONTS
+from modules.lazy_tabs import LazyTabs
+from modules.widget_pool import WidgetPool
+from modules.offscreen import build_offscreen
+from modules.export_jobs import ExportJobRunner
+from modules.export_cache import get_export_cache
 
 # ==================== Design System v4.0 ====================
 PRIMARY = "#3B82F6"
@@ -79,11 +77,21 @@ def apply_treeview_style(tree, style_name="Custom.Treeview"):
     tree.tag_configure("even", background="#FFFFFF")
 
 
+def _make_transcript_container(host):
+    """frame ใหม่สำหรับสร้าง Transcript นอกจอ (build_offscreen)"""
+    return ctk.CTkFrame(host, fg_color="transparent", corner_radius=0)
+
+
 def get_grade_color(grade_str):
     """คืนค่าสีตามเกรด"""
     return GRADE_COLORS.get(grade_str, TEXT_CAPTION)
 
 
+# ชื่อ tab (ใช้ทั้งตอน add และ tab())
+TAB_INPUT = "บันทึกเกรด"
+TAB_TRANSCRIPT = "Transcript"
+
+
 class GradesModule:
     """โมดูลบันทึกเกรด - Design System v3.0"""
 
@@ -91,6 +99,7 @@ class GradesModule:
         self.parent = parent
         self.db = db
         self.update_status = update_status_callback
+        self.export_jobs = ExportJobRunner(parent, update_status_callback)
 
         self.subjects = [
             ("TH", "ภาษาไทย"), ("MATH", "คณิตศาสตร์"),
@@ -102,6 +111,13 @@ class GradesModule:
 
         self.create_ui()
 
+    def on_show(self):
+        """เรียกเมื่อกลับมาที่หน้านี้ (ScreenManager) - โหลดข้อมูลใหม่เฉพาะ tab ที่สร้างแล้ว"""
+        if self.tabs.is_built(TAB_INPUT):
+            self._load_students_for_room()
+        if self.tabs.is_built(TAB_TRANSCRIPT):
+            self.load_student_list_for_transcript()
+
     def create_ui(self):
         """สร้าง UI
         ใช้ CTkScrollableFrame ครอบทั้งหมด เพื่อให้เลื่อนดูได้เมื่อเนื้อหาล้น
@@ -128,18 +144,19 @@ class GradesModule:
         )
         self.tabview.pack(fill="both", expand=True, padx=L, pady=L)
 
-        self.tabview.add("บันทึกเกรด")
-        self.create_input_tab()
-
-        self.tabview.add("Transcript")
-        self.create_transcript_tab()
+        # สร้างเนื้อหาแต่ละ tab เมื่อถูกเลือกครั้งแรก
+        self.tabs = LazyTabs(self.tabview)
+        self.tabs.add(TAB_INPUT, self.create_input_tab)
+        self.tabs.add(TAB_TRANSCRIPT, self.create_transcript_tab)
 
     def create_input_tab(self):
         """Tab บันทึกเกรด — Split panel: ซ้าย=รายชื่อนักเรียน, ขวา=ตารางเกรด"""
 
-        tab = self.tabview.tab("บันทึกเกรด")
+        tab = self.tabview.tab(TAB_INPUT)
         self.selected_student_id = None
         self.student_cards = {}
+        self.student_card_pool = None
+        self.student_empty_label = None
 
         # === Main split container ===
         main_container = ctk.CTkFrame(tab, fg_color="transparent")
@@ -164,7 +181,7 @@ class GradesModule:
 
         ctk.CTkLabel(
             room_row, text="ห้อง:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -181,10 +198,10 @@ class GradesModule:
             values=class_options, width=140, height=34,
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             dropdown_fg_color="#F0F4FF", dropdown_hover_color="#DBEAFE",
             dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             command=lambda x: self._load_students_for_room()
         ).pack(side="left", fill="x", expand=True)
 
@@ -211,14 +228,14 @@ class GradesModule:
 
         self.selected_student_label = ctk.CTkLabel(
             header_row, text="เลือกนักเรียนจากรายชื่อด้านซ้าย",
-            font=ctk.CTkFont(family="TH Sarabun New", size=15, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 15, "bold"),
             text_color=TEXT_H2
         )
         self.selected_student_label.pack(side="left", padx=(0, M))
 
         ctk.CTkLabel(
             header_row, text="ปี:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_BODY
         ).pack(side="left", padx=(0, XS))
 
@@ -228,12 +245,12 @@ class GradesModule:
             header_row, textvariable=self.year_var,
             width=70, height=34, corner_radius=RADIUS_BUTTON,
             border_width=1, border_color=INPUT_BORDER,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).pack(side="left", padx=(0, S))
 
         ctk.CTkLabel(
             header_row, text="ภาค:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_BODY
         ).pack(side="left", padx=(0, XS))
 
@@ -244,16 +261,16 @@ class GradesModule:
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             command=lambda x: self.load_grades()
         ).pack(side="left", padx=(0, S))
 
         ctk.CTkButton(
             header_row, text="โหลด",
             command=self.load_grades,
-            font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
+            font=FONTS.style("cell"),
             width=70, height=34,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
@@ -293,7 +310,7 @@ class GradesModule:
         ctk.CTkButton(
             btn_frame, text="บันทึกคะแนน",
             command=self.add_grade,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=130, height=34,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
@@ -303,7 +320,7 @@ class GradesModule:
         ctk.CTkButton(
             btn_frame, text="แก้ไข",
             command=self.edit_grade,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=80, height=34,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -316,7 +333,7 @@ class GradesModule:
         ctk.CTkLabel(
             right_panel,
             text="เกณฑ์: 80+=4.0 | 75+=3.5 | 70+=3.0 | 65+=2.5 | 60+=2.0 | 55+=1.5 | 50+=1.0 | <50=0.0",
-            font=ctk.CTkFont(family="TH Sarabun New", size=11),
+            font=FONTS.style("cell_caption"),
             text_color=TEXT_CAPTION
         ).pack(pady=(0, S))
 
@@ -326,7 +343,7 @@ class GradesModule:
     def create_transcript_tab(self):
         """Tab Transcript"""
 
-        tab = self.tabview.tab("Transcript")
+        tab = self.tabview.tab(TAB_TRANSCRIPT)
 
         # === Control Card (white) ===
         control_card = ctk.CTkFrame(
@@ -340,7 +357,7 @@ class GradesModule:
 
         ctk.CTkLabel(
             top_frame, text="เลือกนักเรียน:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -351,16 +368,16 @@ class GradesModule:
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         )
         self.transcript_student_menu.pack(side="left", padx=(0, M))
 
         ctk.CTkButton(
             top_frame, text="ดู Transcript",
             command=self.show_transcript,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=130, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
@@ -371,13 +388,26 @@ class GradesModule:
         ctk.CTkButton(
             top_frame, text="Export PDF",
             command=self.export_transcript_pdf,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=110, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL,
             hover_color="#F3F4F6",
             image=IconManager.get("file-pdf", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left", padx=(0, S))
+
+        # SECONDARY - Transcript ทั้งห้อง/ทั้งโรงเรียน
+        ctk.CTkButton(
+            top_frame, text="Export ทั้งห้อง",
+            command=self.open_batch_transcript_dialog,
+            font=FONTS.style("body"),
+            width=120, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL,
+            hover_color="#F3F4F6",
+            image=IconManager.get("file-export", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
         ).pack(side="left")
 
         self.transcript_frame = ctk.CTkScrollableFrame(
@@ -391,7 +421,7 @@ class GradesModule:
         ctk.CTkLabel(
             self.transcript_frame,
             text="ยังไม่มีข้อมูลคะแนน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            font=FONTS.font("TH Sarabun New", 16),
             text_color=TEXT_CAPTION
         ).pack(pady=XXL)
 
@@ -400,61 +430,37 @@ class GradesModule:
     # ==================== FUNCTIONS ====================
 
     def _load_students_for_room(self):
-        """โหลดรายชื่อนักเรียนตามห้อง"""
-        # Clear existing cards
-        for widget in self.student_list_frame.winfo_children():
-            widget.destroy()
-        self.student_cards = {}
+        """โหลดรายชื่อนักเรียนตามห้อง (ใช้การ์ดเดิมซ้ำ - สร้างเพิ่มเฉพาะที่ขาด)"""
+        if self.student_card_pool is None:
+            self.student_card_pool = WidgetPool(
+                lambda: _GradeStudentCard(self.student_list_frame, self._select_student),
+                bind=lambda card, student: card.update(student),
+                show=lambda card: card.frame.pack(fill="x", pady=(0, XS)),
+                hide=lambda card: card.frame.pack_forget(),
+            )
+        if self.student_empty_label is not None:
+            self.student_empty_label.pack_forget()
 
         room = self.grade_room_var.get()
-        if not room or room == "ยังไม่มีห้อง":
-            return
+        students = []
+        if room and room != "ยังไม่มีห้อง":
+            students = self.db.get_all_students(class_room=room)
+
+        cards = self.student_card_pool.sync(students)
+        self.student_cards = {card.student_id: card for card in cards}
 
-        students = self.db.get_all_students(class_room=room)
         if not students:
-            ctk.CTkLabel(
-                self.student_list_frame,
-                text="ไม่มีนักเรียนในห้องนี้",
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
-                text_color=TEXT_CAPTION
-            ).pack(pady=L)
+            if room and room != "ยังไม่มีห้อง":
+                if self.student_empty_label is None:
+                    self.student_empty_label = ctk.CTkLabel(
+                        self.student_list_frame,
+                        text="ไม่มีนักเรียนในห้องนี้",
+                        font=FONTS.style("body"),
+                        text_color=TEXT_CAPTION
+                    )
+                self.student_empty_label.pack(pady=L)
             return
 
-        for student in students:
-            sid = student['student_id']
-            name = f"{student['title']}{student['first_name']} {student['last_name']}"
-
-            card = ctk.CTkFrame(
-                self.student_list_frame, fg_color="#FFFFFF",
-                corner_radius=RADIUS_BUTTON, border_width=1, border_color=TABLE_BORDER,
-                height=44, cursor="hand2"
-            )
-            card.pack(fill="x", pady=(0, XS))
-            card.pack_propagate(False)
-
-            inner = ctk.CTkFrame(card, fg_color="transparent")
-            inner.pack(fill="both", expand=True, padx=S, pady=XS)
-
-            id_label = ctk.CTkLabel(
-                inner, text=sid,
-                font=ctk.CTkFont(family="TH Sarabun New", size=12),
-                text_color=TEXT_CAPTION, width=50
-            )
-            id_label.pack(side="left")
-
-            name_label = ctk.CTkLabel(
-                inner, text=name,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
-                text_color=TEXT_BODY, anchor="w"
-            )
-            name_label.pack(side="left", fill="x", expand=True)
-
-            self.student_cards[sid] = card
-
-            # Bind click on card and all children
-            for widget in [card, inner, id_label, name_label]:
-                widget.bind("<Button-1>", lambda e, s=sid: self._select_student(s))
-
         # Auto-select first student
         first_id = students[0]['student_id']
         self._select_student(first_id)
@@ -465,10 +471,7 @@ class GradesModule:
 
         # Update card highlights
         for sid, card in self.student_cards.items():
-            if sid == student_id:
-                card.configure(fg_color="#EFF6FF", border_color=PRIMARY)
-            else:
-                card.configure(fg_color="#FFFFFF", border_color=TABLE_BORDER)
+            card.set_selected(sid == student_id)
 
         # Update header label
         student = self.db.get_student_by_id(student_id)
@@ -555,9 +558,6 @@ class GradesModule:
     def show_transcript(self):
         """แสดง Transcript - GPA H1 (28px bold)"""
 
-        for widget in self.transcript_frame.winfo_children():
-            widget.destroy()
-
         selected = self.transcript_student_var.get()
         if not selected or selected == "เลือกนักเรียน":
             messagebox.showwarning("คำเตือน", "กรุณาเลือกนักเรียน")
@@ -567,108 +567,110 @@ class GradesModule:
         student = self.db.get_student_by_id(student_id)
         transcript_data = self.db.get_transcript(student_id)
 
-        if not transcript_data:
+        # สร้าง Transcript ทั้งหมดใน frame ที่ยังไม่แสดง แล้วแสดงครั้งเดียว
+        with build_offscreen(self.transcript_frame, _make_transcript_container, "transcript",
+                             pack_options={'fill': "x"}) as content:
+            if not transcript_data:
+                ctk.CTkLabel(
+                    content,
+                    text="ยังไม่มีข้อมูลคะแนน",
+                    font=FONTS.font("TH Sarabun New", 16),
+                    text_color=TEXT_CAPTION
+                ).pack(pady=XXL)
+                return
+
+            name = f"{student['title']}{student['first_name']} {student['last_name']}"
+
+            # Header (H2)
             ctk.CTkLabel(
-                self.transcript_frame,
-                text="ยังไม่มีข้อมูลคะแนน",
-                font=ctk.CTkFont(family="TH Sarabun New", size=16),
+                content,
+                text=f"Transcript - {name}",
+                font=FONTS.style("h2"),
+                text_color=TEXT_H2
+            ).pack(pady=(M, XS))
+
+            ctk.CTkLabel(
+                content,
+                text=f"รหัส: {student_id} | ห้อง: {student['class_room']}",
+                font=FONTS.style("body"),
                 text_color=TEXT_CAPTION
-            ).pack(pady=XXL)
-            return
+            ).pack(pady=(0, L))
 
-        name = f"{student['title']}{student['first_name']} {student['last_name']}"
+            # จัดกลุ่ม
+            grouped = {}
+            for grade in transcript_data:
+                key = f"{grade['academic_year']}/{grade['semester']}"
+                if key not in grouped:
+                    grouped[key] = []
+                grouped[key].append(grade)
 
-        # Header (H2)
-        ctk.CTkLabel(
-            self.transcript_frame,
-            text=f"Transcript - {name}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=20, weight="bold"),
-            text_color=TEXT_H2
-        ).pack(pady=(M, XS))
+            for key, grades in sorted(grouped.items()):
+                year, semester = key.split("/")
 
-        ctk.CTkLabel(
-            self.transcript_frame,
-            text=f"รหัส: {student_id} | ห้อง: {student['class_room']}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
-            text_color=TEXT_CAPTION
-        ).pack(pady=(0, L))
-
-        # จัดกลุ่ม
-        grouped = {}
-        for grade in transcript_data:
-            key = f"{grade['academic_year']}/{grade['semester']}"
-            if key not in grouped:
-                grouped[key] = []
-            grouped[key].append(grade)
-
-        for key, grades in sorted(grouped.items()):
-            year, semester = key.split("/")
-
-            semester_frame = ctk.CTkFrame(
-                self.transcript_frame,
-                corner_radius=RADIUS_CARD,
-                border_width=1, border_color=TABLE_BORDER
-            )
-            semester_frame.pack(fill="x", pady=S, padx=L)
+                semester_frame = ctk.CTkFrame(
+                    content,
+                    corner_radius=RADIUS_CARD,
+                    border_width=1, border_color=TABLE_BORDER
+                )
+                semester_frame.pack(fill="x", pady=S, padx=L)
 
-            ctk.CTkLabel(
-                semester_frame,
-                text=f"ปีการศึกษา {year} ภาคเรียนที่ {semester}",
-                font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
-                text_color=TEXT_H2
-            ).pack(pady=M)
+                ctk.CTkLabel(
+                    semester_frame,
+                    text=f"ปีการศึกษา {year} ภาคเรียนที่ {semester}",
+                    font=FONTS.style("h3"),
+                    text_color=TEXT_H2
+                ).pack(pady=M)
 
-            # ตาราง
-            table_frame = ctk.CTkFrame(semester_frame, fg_color="transparent")
-            table_frame.pack(fill="x", padx=M, pady=(0, S))
+                # ตาราง
+                table_frame = ctk.CTkFrame(semester_frame, fg_color="transparent")
+                table_frame.pack(fill="x", padx=M, pady=(0, S))
 
-            headers = ["รหัสวิชา", "ชื่อวิชา", "คะแนน", "เกรด"]
-            for col, header in enumerate(headers):
-                ctk.CTkLabel(
-                    table_frame, text=header,
-                    font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
-                    fg_color=PRIMARY, text_color="#FFFFFF",
-                    corner_radius=XS, width=150 if col == 1 else 100
-                ).grid(row=0, column=col, padx=1, pady=1, sticky="ew")
-
-            for row, grade in enumerate(grades, start=1):
-                grade_str = grade['grade'] if grade['grade'] else "-"
-                grade_color = get_grade_color(grade_str)
-
-                data = [
-                    grade['subject_code'],
-                    grade['subject_name'],
-                    str(grade['score']) if grade['score'] is not None else "-",
-                    grade_str,
-                ]
-                row_bg = TABLE_STRIPE if row % 2 == 1 else "#FFFFFF"
-                for col, value in enumerate(data):
-                    text_c = grade_color if col == 3 and grade_str != "-" else TEXT_BODY
+                headers = ["รหัสวิชา", "ชื่อวิชา", "คะแนน", "เกรด"]
+                for col, header in enumerate(headers):
                     ctk.CTkLabel(
-                        table_frame, text=value,
-                        font=ctk.CTkFont(family="TH Sarabun New", size=14,
-                                         weight="bold" if col == 3 else "normal"),
-                        fg_color=row_bg, text_color=text_c,
+                        table_frame, text=header,
+                        font=FONTS.style("body_bold"),
+                        fg_color=PRIMARY, text_color="#FFFFFF",
                         corner_radius=XS, width=150 if col == 1 else 100
-                    ).grid(row=row, column=col, padx=1, pady=1, sticky="ew")
-
-            # GPA - H1 (28px bold)
-            valid_grades = []
-            for g in grades:
-                try:
-                    if g['grade'] and g['grade'] != '-':
-                        valid_grades.append(float(g['grade']))
-                except (ValueError, TypeError):
-                    pass
-            if valid_grades:
-                gpa = sum(valid_grades) / len(valid_grades)
-                gpa_color = get_grade_color(f"{gpa:.1f}")
-                ctk.CTkLabel(
-                    semester_frame,
-                    text=f"GPA: {gpa:.2f}",
-                    font=ctk.CTkFont(family="TH Sarabun New", size=28, weight="bold"),
-                    text_color=gpa_color
-                ).pack(pady=M)
+                    ).grid(row=0, column=col, padx=1, pady=1, sticky="ew")
+
+                for row, grade in enumerate(grades, start=1):
+                    grade_str = grade['grade'] if grade['grade'] else "-"
+                    grade_color = get_grade_color(grade_str)
+
+                    data = [
+                        grade['subject_code'],
+                        grade['subject_name'],
+                        str(grade['score']) if grade['score'] is not None else "-",
+                        grade_str,
+                    ]
+                    row_bg = TABLE_STRIPE if row % 2 == 1 else "#FFFFFF"
+                    for col, value in enumerate(data):
+                        text_c = grade_color if col == 3 and grade_str != "-" else TEXT_BODY
+                        ctk.CTkLabel(
+                            table_frame, text=value,
+                            font=FONTS.style("body_bold" if col == 3 else "body"),
+                            fg_color=row_bg, text_color=text_c,
+                            corner_radius=XS, width=150 if col == 1 else 100
+                        ).grid(row=row, column=col, padx=1, pady=1, sticky="ew")
+
+                # GPA - H1 (28px bold)
+                valid_grades = []
+                for g in grades:
+                    try:
+                        if g['grade'] and g['grade'] != '-':
+                            valid_grades.append(float(g['grade']))
+                    except (ValueError, TypeError):
+                        pass
+                if valid_grades:
+                    gpa = sum(valid_grades) / len(valid_grades)
+                    gpa_color = get_grade_color(f"{gpa:.1f}")
+                    ctk.CTkLabel(
+                        semester_frame,
+                        text=f"GPA: {gpa:.2f}",
+                        font=FONTS.style("h1"),
+                        text_color=gpa_color
+                    ).pack(pady=M)
 
         self.update_status("แสดง Transcript เรียบร้อย", "success")
 
@@ -696,94 +698,115 @@ class GradesModule:
         if not file_path:
             return
 
-        try:
-            font_name = get_thai_font()
+        student = dict(student)
 
-            doc = SimpleDocTemplate(file_path, pagesize=A4)
-            elements = []
-            styles = getSampleStyleSheet()
+        def build(job):
+            from modules.transcripts import render_transcript_pdf  # reportlab โหลดเมื่อ Export
+            from modules.pdf_utils import get_thai_font
+            # ฟอนต์อยู่ใน key: ไฟล์ที่สร้างด้วย Helvetica ไม่ถูกใช้ซ้ำเมื่อมีฟอนต์ไทยแล้ว
+            cached = get_export_cache().get_or_render(
+                "transcript_pdf", [student, transcript_data, get_thai_font()], job.output_path,
+                lambda path: render_transcript_pdf(student, transcript_data, path, job))
+            if cached:
+                return "Export PDF สำเร็จ (ใช้ไฟล์จากแคช)"
+            return "Export PDF สำเร็จ"
 
-            name = f"{student['title']}{student['first_name']} {student['last_name']}"
-            title = Paragraph(f"Transcript - {name}", ParagraphStyle(
-                'Title', parent=styles['Heading1'],
-                fontName=font_name, fontSize=18, alignment=1
-            ))
-            elements.append(title)
-            elements.append(Spacer(1, 0.3 * cm))
-
-            info = Paragraph(
-                f"รหัส: {student_id} | ห้อง: {student['class_room']}",
-                ParagraphStyle('Info', parent=styles['Normal'],
-                               fontName=font_name, fontSize=12, alignment=1)
+        self.export_jobs.submit("Export Transcript PDF", build, file_path,
+                                error_message="ไม่สามารถสร้าง PDF ได้")
+
+    def open_batch_transcript_dialog(self):
+        """เปิดหน้าต่าง Export Transcript ทั้งห้อง/ทั้งโรงเรียน"""
+        BatchTranscriptDialog(self.parent, self.db, self.export_transcripts_batch)
+
+    def export_transcripts_batch(self, class_room=None, merged=False):
+        """
+        Export Transcript หลายคนพร้อมกัน (เบื้องหลัง)
+        Args:
+            class_room: ห้องที่ต้องการ (None = ทั้งโรงเรียน)
+            merged: True = รวมเป็น PDF เดียวพร้อม bookmark, False = แยกไฟล์รายคน
+        """
+        scope = class_room or "ทั้งโรงเรียน"
+        stamp = datetime.now().strftime('%Y%m%d')
+
+        if merged:
+            out_path = filedialog.asksaveasfilename(
+                title="บันทึกไฟล์ PDF", defaultextension=".pdf",
+                filetypes=[("PDF files", "*.pdf")],
+                initialfile=f"Transcript_{scope.replace('/', '-')}_{stamp}.pdf"
             )
-            elements.append(info)
-            elements.append(Spacer(1, 0.5 * cm))
+        else:
+            out_path = filedialog.askdirectory(title="เลือกโฟลเดอร์สำหรับบันทึก Transcript")
+        if not out_path:
+            return
 
-            grouped = {}
-            for grade in transcript_data:
-                key = f"{grade['academic_year']}/{grade['semester']}"
-                if key not in grouped:
-                    grouped[key] = []
-                grouped[key].append(grade)
+        def build(job):
+            from modules.transcripts import generate_transcripts
+            result = generate_transcripts(job.db, job.output_path if merged else out_path, class_room=class_room,
+                                          merged=merged, job=job)
+            if not result['count']:
+                return f"ไม่มีข้อมูลคะแนนของ{scope}"
+            return (f"Export Transcript {scope} {result['count']} คน สำเร็จ "
+                    f"({result['seconds']:.1f} วินาที, {result['rate']:.1f} ไฟล์/วินาที)")
 
-            for key, grades in sorted(grouped.items()):
-                year, semester = key.split("/")
+        self.export_jobs.submit(f"Export Transcript {scope}", build,
+                                out_path if merged else None, db=self.db,
+                                error_message="ไม่สามารถสร้าง PDF ได้")
 
-                semester_title = Paragraph(
-                    f"ปีการศึกษา {year} ภาคเรียนที่ {semester}",
-                    ParagraphStyle('Sem', parent=styles['Heading2'],
-                                   fontName=font_name, fontSize=14)
-                )
-                elements.append(semester_title)
-                elements.append(Spacer(1, 0.3 * cm))
 
-                data = [["รหัสวิชา", "ชื่อวิชา", "คะแนน", "เกรด"]]
-                for grade in grades:
-                    data.append([
-                        grade['subject_code'], grade['subject_name'],
-                        str(grade['score']) if grade['score'] is not None else "-",
-                        grade['grade'] if grade['grade'] else "-",
-                    ])
-
-                table = Table(data, colWidths=[3 * cm, 8 * cm, 3 * cm, 3 * cm])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PRIMARY)),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), font_name),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(TABLE_STRIPE)),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(TABLE_BORDER)),
-                    ('FONTNAME', (0, 1), (-1, -1), font_name),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ]))
-
-                elements.append(table)
+class _GradeStudentCard:
+    """การ์ดนักเรียนในรายชื่อด้านซ้าย (ถูกนำกลับมาใช้ใหม่เมื่อเปลี่ยนห้อง)"""
 
-                valid_grades = []
-            for g in grades:
-                try:
-                    if g['grade'] and g['grade'] != '-':
-                        valid_grades.append(float(g['grade']))
-                except (ValueError, TypeError):
-                    pass
-                if valid_grades:
-                    gpa = sum(valid_grades) / len(valid_grades)
-                    elements.append(Spacer(1, 0.2 * cm))
-                    elements.append(Paragraph(
-                        f"GPA: {gpa:.2f}",
-                        ParagraphStyle('GPA', parent=styles['Normal'],
-                                       fontName=font_name, fontSize=12, alignment=2)
-                    ))
-                elements.append(Spacer(1, 0.5 * cm))
+    def __init__(self, parent, on_click):
+        self.student_id = None
+        self.name = None
+        self.selected = False
+
+        self.frame = ctk.CTkFrame(
+            parent, fg_color="#FFFFFF",
+            corner_radius=RADIUS_BUTTON, border_width=1, border_color=TABLE_BORDER,
+            height=44, cursor="hand2"
+        )
+        self.frame.pack_propagate(False)
+
+        inner = ctk.CTkFrame(self.frame, fg_color="transparent")
+        inner.pack(fill="both", expand=True, padx=S, pady=XS)
 
-            doc.build(elements)
-            self.update_status("Export PDF สำเร็จ", "success")
-            messagebox.showinfo("สำเร็จ", "Export Transcript PDF เรียบร้อย")
+        self.id_label = ctk.CTkLabel(
+            inner, text="",
+            font=FONTS.style("caption"),
+            text_color=TEXT_CAPTION, width=50
+        )
+        self.id_label.pack(side="left")
 
-        except Exception as e:
-            messagebox.showerror("ผิดพลาด", f"ไม่สามารถสร้าง PDF ได้\n{str(e)}")
+        self.name_label = ctk.CTkLabel(
+            inner, text="",
+            font=FONTS.style("body"),
+            text_color=TEXT_BODY, anchor="w"
+        )
+        self.name_label.pack(side="left", fill="x", expand=True)
+
+        # Bind click on card and all children - อ่าน student_id ตอนกด จึงไม่ต้อง bind ใหม่เมื่อ reuse
+        for widget in [self.frame, inner, self.id_label, self.name_label]:
+            widget.bind("<Button-1>", lambda e: on_click(self.student_id))
+
+    def update(self, student):
+        sid = student['student_id']
+        name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        if sid != self.student_id:
+            self.id_label.configure(text=sid)
+            self.student_id = sid
+        if name != self.name:
+            self.name_label.configure(text=name)
+            self.name = name
+
+    def set_selected(self, selected):
+        if selected == self.selected:
+            return
+        self.selected = selected
+        if selected:
+            self.frame.configure(fg_color="#EFF6FF", border_color=PRIMARY)
+        else:
+            self.frame.configure(fg_color="#FFFFFF", border_color=TABLE_BORDER)
 
 
 class GradeDialog(ctk.CTkToplevel):
@@ -824,7 +847,7 @@ class GradeDialog(ctk.CTkToplevel):
 
         ctk.CTkLabel(
             header, text="บันทึกคะแนน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color="white"
         ).pack(pady=M)
 
@@ -834,7 +857,7 @@ class GradeDialog(ctk.CTkToplevel):
         # วิชา
         ctk.CTkLabel(
             form_frame, text="เลือกวิชา:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_H3
         ).grid(row=0, column=0, sticky="w", pady=S, padx=(0, M))
 
@@ -846,15 +869,15 @@ class GradeDialog(ctk.CTkToplevel):
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).grid(row=0, column=1, pady=S)
 
         # คะแนน
         ctk.CTkLabel(
             form_frame, text="คะแนน:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_H3
         ).grid(row=1, column=0, sticky="w", pady=S, padx=(0, M))
 
@@ -863,19 +886,19 @@ class GradeDialog(ctk.CTkToplevel):
             form_frame, textvariable=self.score_var,
             width=250, height=36, corner_radius=RADIUS_BUTTON,
             border_width=1, border_color=INPUT_BORDER,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).grid(row=1, column=1, pady=S)
 
         # เกรดอัตโนมัติ
         ctk.CTkLabel(
             form_frame, text="เกรด:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_H3
         ).grid(row=2, column=0, sticky="w", pady=S, padx=(0, M))
 
         self.grade_label = ctk.CTkLabel(
             form_frame, text="-",
-            font=ctk.CTkFont(family="TH Sarabun New", size=20, weight="bold"),
+            font=FONTS.style("h2"),
             text_color=PRIMARY
         )
         self.grade_label.grid(row=2, column=1, pady=S, sticky="w")
@@ -888,7 +911,7 @@ class GradeDialog(ctk.CTkToplevel):
 
         ctk.CTkButton(
             btn_frame, text="บันทึก", command=self.save,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
             image=IconManager.get_white("floppy-disk", 14), compound="left"
@@ -896,7 +919,7 @@ class GradeDialog(ctk.CTkToplevel):
 
         ctk.CTkButton(
             btn_frame, text="ยกเลิก", command=self.destroy,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
@@ -953,3 +976,101 @@ class GradeDialog(ctk.CTkToplevel):
             self.destroy()
         else:
             messagebox.showerror("ผิดพลาด", "ไม่สามารถบันทึกได้")
+
+
+class BatchTranscriptDialog(ctk.CTkToplevel):
+    """หน้าต่างเลือกขอบเขต Export Transcript ทั้งห้อง/ทั้งโรงเรียน - radius 16px"""
+
+    def __init__(self, parent, db, on_confirm):
+        super().__init__(parent)
+
+        self.db = db
+        self.on_confirm = on_confirm
+
+        self.title("Export Transcript ทั้งห้อง")
+        self.geometry("440x320")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+
+        self.create_form()
+
+    def create_form(self):
+        """สร้างฟอร์ม"""
+
+        main_frame = ctk.CTkFrame(self, corner_radius=RADIUS_MODAL,
+                                  border_width=1, border_color=TABLE_BORDER)
+        main_frame.pack(fill="both", expand=True, padx=M, pady=M)
+
+        header = ctk.CTkFrame(main_frame, fg_color=PRIMARY, corner_radius=RADIUS_CARD)
+        header.pack(fill="x", padx=M, pady=(M, L))
+
+        ctk.CTkLabel(
+            header, text="Export Transcript ทั้งห้อง / ทั้งโรงเรียน",
+            font=FONTS.style("h3"),
+            text_color="white"
+        ).pack(pady=M)
+
+        form_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        form_frame.pack(pady=S, padx=L)
+
+        ctk.CTkLabel(
+            form_frame, text="ห้องเรียน:",
+            font=FONTS.style("body"),
+            text_color=TEXT_H3
+        ).grid(row=0, column=0, sticky="w", pady=S, padx=(0, M))
+
+        self.room_var = ctk.StringVar(value="ทั้งโรงเรียน")
+        ctk.CTkOptionMenu(
+            form_frame, variable=self.room_var,
+            values=["ทั้งโรงเรียน"] + self.db.get_class_rooms(), width=220, height=36,
+            fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
+            text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
+            dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
+            corner_radius=20,
+            font=FONTS.style("body")
+        ).grid(row=0, column=1, pady=S)
+
+        ctk.CTkLabel(
+            form_frame, text="รูปแบบไฟล์:",
+            font=FONTS.style("body"),
+            text_color=TEXT_H3
+        ).grid(row=1, column=0, sticky="nw", pady=S, padx=(0, M))
+
+        self.mode_var = ctk.StringVar(value="separate")
+        mode_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
+        mode_frame.grid(row=1, column=1, sticky="w", pady=S)
+        for value, text in (("separate", "แยกไฟล์รายคน"), ("merged", "รวมไฟล์เดียว (มี bookmark)")):
+            ctk.CTkRadioButton(
+                mode_frame, text=text, variable=self.mode_var, value=value,
+                font=FONTS.style("body"),
+                fg_color=PRIMARY, text_color=TEXT_H3
+            ).pack(anchor="w", pady=XS)
+
+        btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        btn_frame.pack(pady=L)
+
+        ctk.CTkButton(
+            btn_frame, text="Export", command=self.confirm,
+            font=FONTS.style("body_bold"),
+            width=100, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color=PRIMARY, hover_color="#1D4ED8",
+            image=IconManager.get_white("file-pdf", 14), compound="left"
+        ).pack(side="left", padx=S)
+
+        ctk.CTkButton(
+            btn_frame, text="ยกเลิก", command=self.destroy,
+            font=FONTS.style("body"),
+            width=100, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
+            image=IconManager.get("xmark", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left", padx=S)
+
+    def confirm(self):
+        """ปิดหน้าต่างแล้วเริ่ม Export"""
+        room = self.room_var.get()
+        merged = self.mode_var.get() == "merged"
+        self.destroy()
+        self.on_confirm(None if room == "ทั้งโรงเรียน" else room, merged)
@@ -12,6 +12,8 @@ import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
 from modules.icons import IconManager
+from modules.ui_fonts import FONTS
+from modules.lazy_tabs import LazyTabs
 
 # ==================== Design System v4.0 ====================
 PRIMARY = "#3B82F6"
@@ -60,6 +62,11 @@ def apply_treeview_style(tree, style_name="Custom.Treeview"):
     tree.tag_configure("even", background="#FFFFFF")
 
 
+# ชื่อ tab (ใช้ทั้งตอน add และ tab())
+TAB_DAILY_HEALTH = "🦷 แปรงฟัน/ดื่มนม"
+TAB_WEIGHT_HEIGHT = "📏 น้ำหนัก-ส่วนสูง"
+
+
 class HealthModule:
     """โมดูลสุขภาพ - Design System v4.0"""
 
@@ -70,6 +77,13 @@ class HealthModule:
         self.current_date = datetime.now()
         self.create_ui()
 
+    def on_show(self):
+        """เรียกเมื่อกลับมาที่หน้านี้ (ScreenManager) - โหลดข้อมูลใหม่เฉพาะ tab ที่สร้างแล้ว"""
+        if self.tabs.is_built(TAB_DAILY_HEALTH):
+            self.load_daily_health()
+        if self.tabs.is_built(TAB_WEIGHT_HEIGHT):
+            self.load_student_list_for_weight()
+
     def create_ui(self):
         """สร้าง UI
         ใช้ CTkScrollableFrame ครอบทั้งหมด เพื่อให้เลื่อนดูได้เมื่อเนื้อหาล้น
@@ -93,20 +107,19 @@ class HealthModule:
             segmented_button_selected_hover_color="#2563EB",
             segmented_button_unselected_hover_color="#CBD5E1",
             text_color="#FFFFFF",
-            font=ctk.CTkFont(family="Kanit", size=13, weight="500")
+            font=FONTS.font("Kanit", 13, "500")
         )
         self.tabview.pack(fill="both", expand=True, padx=M, pady=M)
 
-        self.tabview.add("🦷 แปรงฟัน/ดื่มนม")
-        self.create_daily_health_tab()
-
-        self.tabview.add("📏 น้ำหนัก-ส่วนสูง")
-        self.create_weight_height_tab()
+        # สร้างเนื้อหาแต่ละ tab เมื่อถูกเลือกครั้งแรก
+        self.tabs = LazyTabs(self.tabview)
+        self.tabs.add(TAB_DAILY_HEALTH, self.create_daily_health_tab)
+        self.tabs.add(TAB_WEIGHT_HEIGHT, self.create_weight_height_tab)
 
     def create_daily_health_tab(self):
         """Tab แปรงฟัน/ดื่มนม"""
 
-        tab = self.tabview.tab("แปรงฟัน/ดื่มนม")
+        tab = self.tabview.tab(TAB_DAILY_HEALTH)
 
         # === Control Card (white) ===
         control_card = ctk.CTkFrame(
@@ -120,7 +133,7 @@ class HealthModule:
 
         ctk.CTkLabel(
             top_frame, text="วันที่:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -129,12 +142,12 @@ class HealthModule:
             top_frame, textvariable=self.health_date_var,
             width=140, height=36,
             corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).pack(side="left", padx=(0, M))
 
         ctk.CTkLabel(
             top_frame, text="ห้อง:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -148,16 +161,16 @@ class HealthModule:
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).pack(side="left", padx=(0, M))
 
         ctk.CTkButton(
             top_frame, text="โหลดข้อมูล",
             command=self.load_daily_health,
             image=IconManager.get_white("download", 14), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=120, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
@@ -204,7 +217,7 @@ class HealthModule:
             btn_frame, text="ทำทั้งหมด",
             command=self.mark_all_health,
             image=IconManager.get_white("check-double", 14), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=120, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
@@ -215,7 +228,7 @@ class HealthModule:
             btn_frame, text="ติ๊กแปรงฟัน",
             command=lambda: self.toggle_health_status("brushed_teeth"),
             image=IconManager.get("tooth", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=120, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -227,7 +240,7 @@ class HealthModule:
             btn_frame, text="ติ๊กดื่มนม",
             command=lambda: self.toggle_health_status("drank_milk"),
             image=IconManager.get("mug-hot", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=120, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -240,7 +253,7 @@ class HealthModule:
     def create_weight_height_tab(self):
         """Tab น้ำหนัก-ส่วนสูง"""
 
-        tab = self.tabview.tab("น้ำหนัก-ส่วนสูง")
+        tab = self.tabview.tab(TAB_WEIGHT_HEIGHT)
 
         # === Control Card (white) ===
         control_card = ctk.CTkFrame(
@@ -254,7 +267,7 @@ class HealthModule:
 
         ctk.CTkLabel(
             top_frame, text="เลือกนักเรียน:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -265,9 +278,9 @@ class HealthModule:
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             command=lambda x: self.load_weight_height_data()
         )
         self.weight_student_menu.pack(side="left", padx=(0, M))
@@ -276,7 +289,7 @@ class HealthModule:
             top_frame, text="บันทึกข้อมูล",
             command=self.add_weight_height,
             image=IconManager.get_white("plus", 14), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=130, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
@@ -293,7 +306,7 @@ class HealthModule:
         self.bmi_info_label = ctk.CTkLabel(
             self.bmi_frame,
             text="เลือกนักเรียนเพื่อดูข้อมูล BMI",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_CAPTION
         )
         self.bmi_info_label.pack(pady=L)
@@ -481,20 +494,20 @@ class HealthModule:
             # BMI ตัวเลข H1 (28px bold)
             ctk.CTkLabel(
                 info_col, text=f"BMI: {bmi:.2f}",
-                font=ctk.CTkFont(family="TH Sarabun New", size=28, weight="bold"),
+                font=FONTS.style("h1"),
                 text_color=color
             ).pack(anchor="w")
 
             ctk.CTkLabel(
                 info_col, text=f"สถานะ: {status}",
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                font=FONTS.style("body"),
                 text_color=TEXT_CAPTION
             ).pack(anchor="w")
 
             ctk.CTkLabel(
                 self.bmi_frame,
                 text=f"น้ำหนัก: {latest['weight_kg']} kg  |  ส่วนสูง: {latest['height_cm']} cm",
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                font=FONTS.style("body"),
                 text_color=TEXT_CAPTION
             ).pack(pady=(0, M))
         else:
@@ -503,7 +516,7 @@ class HealthModule:
             ctk.CTkLabel(
                 self.bmi_frame,
                 text="ยังไม่มีข้อมูล BMI",
-                font=ctk.CTkFont(family="TH Sarabun New", size=16),
+                font=FONTS.font("TH Sarabun New", 16),
                 text_color=TEXT_CAPTION
             ).pack(pady=L)
 
@@ -571,13 +584,13 @@ class HealthDialog(ctk.CTkToplevel):
 
         ctk.CTkLabel(
             header, text="บันทึกสุขภาพ",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color="white"
         ).pack(pady=(S, XS))
 
         ctk.CTkLabel(
             header, text=name,
-            font=ctk.CTkFont(family="TH Sarabun New", size=12),
+            font=FONTS.style("caption"),
             text_color="#BFDBFE"
         ).pack(pady=(0, S))
 
@@ -587,14 +600,14 @@ class HealthDialog(ctk.CTkToplevel):
         self.brushed_var = ctk.IntVar()
         ctk.CTkCheckBox(
             body, text="แปรงฟัน", variable=self.brushed_var,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_BODY, fg_color=PRIMARY, hover_color="#1D4ED8"
         ).pack(pady=S, anchor="w")
 
         self.drank_var = ctk.IntVar()
         ctk.CTkCheckBox(
             body, text="ดื่มนม", variable=self.drank_var,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             text_color=TEXT_BODY, fg_color=PRIMARY, hover_color="#1D4ED8"
         ).pack(pady=S, anchor="w")
 
@@ -604,7 +617,7 @@ class HealthDialog(ctk.CTkToplevel):
         ctk.CTkButton(
             btn_frame, text="บันทึก", command=self.save,
             image=IconManager.get_white("floppy-disk", 14), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
         ).pack(side="left", padx=S)
@@ -612,7 +625,7 @@ class HealthDialog(ctk.CTkToplevel):
         ctk.CTkButton(
             btn_frame, text="ยกเลิก", command=self.destroy,
             image=IconManager.get("xmark", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6"
@@ -657,13 +670,13 @@ class WeightHeightDialog(ctk.CTkToplevel):
 
         ctk.CTkLabel(
             header, text="บันทึกน้ำหนัก-ส่วนสูง",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color="white"
         ).pack(pady=(S, XS))
 
         ctk.CTkLabel(
             header, text=name,
-            font=ctk.CTkFont(family="TH Sarabun New", size=12),
+            font=FONTS.style("caption"),
             text_color="#BFDBFE"
         ).pack(pady=(0, S))
 
@@ -675,7 +688,7 @@ class WeightHeightDialog(ctk.CTkToplevel):
         ]):
             ctk.CTkLabel(
                 form_frame, text=label,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                font=FONTS.style("body"),
                 text_color=TEXT_H3
             ).grid(row=row_idx, column=0, sticky="w", pady=S, padx=(0, M))
 
@@ -686,7 +699,7 @@ class WeightHeightDialog(ctk.CTkToplevel):
                 form_frame, textvariable=var,
                 width=220, height=36,
                 corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14)
+                font=FONTS.style("body")
             ).grid(row=row_idx, column=1, pady=S)
 
         btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -695,7 +708,7 @@ class WeightHeightDialog(ctk.CTkToplevel):
         ctk.CTkButton(
             btn_frame, text="บันทึก", command=self.save,
             image=IconManager.get_white("floppy-disk", 14), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8"
         ).pack(side="left", padx=S)
@@ -703,7 +716,7 @@ class WeightHeightDialog(ctk.CTkToplevel):
         ctk.CTkButton(
             btn_frame, text="ยกเลิก", command=self.destroy,
             image=IconManager.get("xmark", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6"
@@ -0,0 +1,92 @@
+"""
+modules/icon_atlas.py
+Icon atlas บนดิสก์สำหรับ IconManager
+- เก็บ alpha mask ของ icon ที่ rasterize แล้ว key = (name, size) ภายใต้ tkfontawesome รุ่นเดียวกัน
+- สีไม่อยู่ใน key: ตอนโหลดจะลงสีจาก mask ทำให้ 1 entry ใช้ได้กับทุกสี/ทุกธีม
+- เปิดโปรแกรมครั้งถัดไปโหลดทั้งไฟล์ครั้งเดียว ไม่ต้องเรียก tkfontawesome เลย
+ไม่ import PIL/customtkinter - เก็บเป็น (width, height, bytes) ล้วน
+"""
+
+import os
+import pickle
+import threading
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ATLAS_PATH = os.path.join(PROJECT_DIR, "cache", "icons", "icon_atlas.pickle")
+ATLAS_FORMAT = 1
+
+
+def tfa_version():
+    """รุ่นของ tkfontawesome ที่ติดตั้ง (ไม่ import ตัว package)"""
+    try:
+        from importlib.metadata import version
+        return version("tkfontawesome")
+    except Exception:
+        return "unknown"
+
+
+class IconAtlas:
+    """เก็บ alpha mask ของ icon เป็นไฟล์เดียว"""
+
+    def __init__(self, path=DEFAULT_ATLAS_PATH, library_version=None):
+        """
+        Args:
+            path: ไฟล์ atlas
+            library_version: รุ่น tkfontawesome (ค่าเริ่มต้นอ่านจาก metadata)
+        """
+        self.path = path
+        self.library_version = library_version if library_version is not None else tfa_version()
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("format") == ATLAS_FORMAT and data.get("library") == self.library_version:
+                self._entries = data["icons"]
+        except Exception:
+            # ไม่มีไฟล์/ไฟล์เสีย/รุ่นไม่ตรง -> เริ่มใหม่
+            self._entries = {}
+
+    def get(self, name, size):
+        """
+        Returns:
+            (width, height, alpha_bytes) หรือ None ถ้ายังไม่มี
+        """
+        with self._lock:
+            self._load()
+            return self._entries.get((name, size))
+
+    def put(self, name, size, width, height, alpha_bytes):
+        """เพิ่ม mask ใหม่ (บันทึกลงดิสก์เมื่อเรียก save)"""
+        with self._lock:
+            self._load()
+            self._entries[(name, size)] = (width, height, bytes(alpha_bytes))
+            self._dirty = True
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def save(self):
+        """บันทึกลงดิสก์ถ้ามี icon ใหม่"""
+        with self._lock:
+            if not self._dirty:
+                return False
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({
+                    "format": ATLAS_FORMAT,
+                    "library": self.library_version,
+                    "icons": self._entries,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            return True
@@ -2,21 +2,58 @@
 modules/icons.py
 IconManager - จัดการ Font Awesome icons สำหรับ CustomTkinter
 ใช้ tkfontawesome แปลงเป็น CTkImage พร้อม dark mode support
+- rasterize ครั้งเดียวต่อ (name, size) เป็น alpha mask ในหน่วยความจำ แล้วลงสี light/dark ด้วย PIL
+- เก็บ mask ใน icon atlas บนดิสก์ (modules/icon_atlas.py) เปิดครั้งถัดไปไม่ต้องเรียก tkfontawesome
+- cache CTkImage แบบ LRU จำกัดขนาด (hot reload/เปลี่ยนธีมไม่ทำให้โตไม่สิ้นสุด) + prewarm ตอน idle
 """
 
+import atexit
+import base64
+import io
 import customtkinter as ctk
-import tkfontawesome as tfa
 from PIL import Image
-import tempfile
-import os
+from modules.icon_atlas import IconAtlas
+from modules.lru import LRUCache
+
+ICON_CACHE_SIZE = 256
+PREWARM_BATCH = 4  # จำนวน icon ที่สร้างต่อ idle slice
+
+_NEUTRAL = "#64748B"
+_NEUTRAL_DARK = "#9CA3AF"
+_WHITE = "#FFFFFF"
+_SIDEBAR = "#D1D5DB"
+
+# ชุด icon ของ sidebar และ toolbar ที่ใช้บ่อย (name, size, color, dark_color)
+SIDEBAR_ICONS = [
+    (name, 18, _SIDEBAR, _SIDEBAR)
+    for name in ("users", "chalkboard", "clipboard-check", "heart-pulse",
+                 "graduation-cap", "calendar-days", "chart-bar")
+]
+TOOLBAR_ICONS = [
+    ("floppy-disk", 14, _WHITE, _WHITE),
+    ("download", 14, _WHITE, _WHITE),
+    ("plus", 14, _WHITE, _WHITE),
+    ("user-plus", 14, _WHITE, _WHITE),
+    ("rotate", 14, _WHITE, _WHITE),
+    ("file-pdf", 14, _WHITE, _WHITE),
+    ("file-lines", 14, _WHITE, _WHITE),
+    ("check-double", 14, _WHITE, _WHITE),
+    ("xmark", 14, _NEUTRAL, _NEUTRAL_DARK),
+    ("file-pdf", 14, _NEUTRAL, _NEUTRAL_DARK),
+    ("rotate", 14, _NEUTRAL, _NEUTRAL_DARK),
+    ("file-export", 14, _NEUTRAL, _NEUTRAL_DARK),
+    ("trash", 14, "#EF4444", "#EF4444"),
+    ("pen-to-square", 14, "#3B82F6", "#3B82F6"),
+]
 
 
 class IconManager:
     """Singleton จัดการ icons - cache ตาม (name, size, light_color, dark_color)"""
 
     _instance = None
-    _cache = {}
+    _cache = LRUCache(maxsize=ICON_CACHE_SIZE)
     _tk_root = None
+    _atlas = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -30,18 +67,60 @@ class IconManager:
 
     @classmethod
     def _photo_to_pil(cls, photo_image):
-        """แปลง SvgImage/PhotoImage -> PIL.Image via temp PNG (รองรับ transparency)"""
-        tmpfile = tempfile.mktemp(suffix='.png')
-        try:
-            photo_image.write(tmpfile, format='png')
-            pil_image = Image.open(tmpfile).convert('RGBA')
-            pil_image.load()  # Force load before closing file
-        finally:
+        """แปลง SvgImage/PhotoImage -> PIL.Image ในหน่วยความจำ (PNG ผ่าน `image data`, รองรับ transparency)"""
+        data = photo_image.tk.call(photo_image.name, 'data', '-format', 'png')
+        if isinstance(data, str):
+            raw = base64.b64decode(data)
+        else:
+            raw = bytes(data)
+            if not raw.startswith(b'\x89PNG'):
+                raw = base64.b64decode(raw)
+        pil_image = Image.open(io.BytesIO(raw)).convert('RGBA')
+        pil_image.load()
+        return pil_image
+
+    @classmethod
+    def _get_atlas(cls):
+        """icon atlas บนดิสก์ (โหลดครั้งแรกที่ใช้ และบันทึกตอนปิดโปรแกรม)"""
+        if cls._atlas is None:
+            cls._atlas = IconAtlas()
+            atexit.register(cls.save_atlas)
+        return cls._atlas
+
+    @classmethod
+    def save_atlas(cls):
+        """บันทึก icon ที่ rasterize ใหม่ลง atlas"""
+        if cls._atlas is not None:
             try:
-                os.unlink(tmpfile)
+                cls._atlas.save()
             except OSError:
                 pass
-        return pil_image
+
+    @classmethod
+    def _get_mask(cls, name, size):
+        """
+        alpha mask ของ icon - จาก atlas ถ้ามี ไม่เช่นนั้น rasterize ด้วย tkfontawesome หนึ่งครั้ง
+        Returns:
+            PIL.Image โหมด 'L'
+        """
+        atlas = cls._get_atlas()
+        entry = atlas.get(name, size)
+        if entry is not None:
+            width, height, alpha = entry
+            return Image.frombytes('L', (width, height), alpha)
+
+        import tkfontawesome as tfa  # โหลดเฉพาะเมื่อ atlas ยังไม่มี icon นี้
+        photo = tfa.icon_to_image(name, fill="#000000", scale_to_width=size)
+        mask = cls._photo_to_pil(photo).getchannel('A')
+        atlas.put(name, size, mask.width, mask.height, mask.tobytes())
+        return mask
+
+    @staticmethod
+    def _tint(mask, color):
+        """ลงสี mask เป็นภาพ RGBA"""
+        image = Image.new('RGBA', mask.size, color)
+        image.putalpha(mask)
+        return image
 
     @classmethod
     def get(cls, name, size=16, color="#374151", dark_color="#E5E7EB"):
@@ -58,17 +137,15 @@ class IconManager:
             CTkImage หรือ None ถ้า icon ไม่มี
         """
         cache_key = (name, size, color, dark_color)
-        if cache_key in cls._cache:
-            return cls._cache[cache_key]
+        cached = cls._cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            # สร้าง icon สำหรับ light mode
-            light_photo = tfa.icon_to_image(name, fill=color, scale_to_width=size)
-            light_pil = cls._photo_to_pil(light_photo)
+            mask = cls._get_mask(name, size)
 
-            # สร้าง icon สำหรับ dark mode
-            dark_photo = tfa.icon_to_image(name, fill=dark_color, scale_to_width=size)
-            dark_pil = cls._photo_to_pil(dark_photo)
+            light_pil = cls._tint(mask, color)
+            dark_pil = light_pil if dark_color == color else cls._tint(mask, dark_color)
 
             # สร้าง CTkImage (รองรับ dark/light mode อัตโนมัติ)
             ctk_image = ctk.CTkImage(
@@ -77,7 +154,7 @@ class IconManager:
                 size=(size, size)
             )
 
-            cls._cache[cache_key] = ctk_image
+            cls._cache.put(cache_key, ctk_image)
             return ctk_image
 
         except Exception:
@@ -93,6 +170,45 @@ class IconManager:
         """คืน CTkImage สำหรับ sidebar (สีอ่อนทั้ง light/dark)"""
         return cls.get(name, size, color="#D1D5DB", dark_color="#D1D5DB")
 
+    @classmethod
+    def prewarm(cls, widget, specs=None, batch_size=PREWARM_BATCH, on_done=None):
+        """
+        สร้าง icon ล่วงหน้าทีละชุดเล็กๆ ตอน Tk ว่าง (after_idle) ไม่บล็อก UI
+        Args:
+            widget: widget ใดก็ได้ที่ใช้เรียก after_idle (เช่นหน้าต่างหลัก)
+            specs: list ของ (name, size, color, dark_color) ค่าเริ่มต้น = sidebar + toolbar
+            batch_size: จำนวน icon ต่อหนึ่ง idle slice
+            on_done: callback() เมื่อสร้างครบ (ไม่บังคับ)
+        """
+        pending = [spec for spec in (specs if specs is not None else SIDEBAR_ICONS + TOOLBAR_ICONS)
+                   if spec not in cls._cache]
+
+        def step():
+            try:
+                if not widget.winfo_exists():
+                    return
+            except Exception:
+                return
+            for _ in range(min(batch_size, len(pending))):
+                cls.get(*pending.pop(0))
+            if pending:
+                widget.after_idle(step)
+            elif on_done:
+                on_done()
+
+        if pending:
+            widget.after_idle(step)
+        elif on_done:
+            on_done()
+
+    @classmethod
+    def cache_stats(cls):
+        """
+        Returns:
+            dict สถิติของ cache {'size', 'maxsize', 'hits', 'misses', 'evictions', 'hit_rate'}
+        """
+        return cls._cache.stats()
+
     @classmethod
     def clear_cache(cls):
         """ล้าง cache"""
@@ -0,0 +1,88 @@
+"""
+modules/idle_slices.py
+ทำงานทีละชุดเล็กๆ ตอน Tk ว่าง (after_idle) - ให้หน้าจอแสดงผลได้ทันทีแล้วค่อยเติมส่วนที่เหลือ
+- ระหว่างชุด Tk ได้วาดหน้าจอและรับ event (คลิก/เลื่อน) ตามปกติ
+- หยุดเองเมื่อ widget ถูก destroy หรือเรียก cancel()
+ไม่ import customtkinter
+"""
+
+DEFAULT_BATCH_SIZE = 8
+
+
+class IdleSlices:
+    """งานที่แบ่งทำทีละชุดตอน Tk ว่าง"""
+
+    def __init__(self, widget, items, handle, batch_size=DEFAULT_BATCH_SIZE,
+                 on_done=None, first_batch_now=False):
+        """
+        Args:
+            widget: widget ที่ใช้เรียก after_idle (งานหยุดเมื่อ widget ถูก destroy)
+            items: รายการที่ต้องทำ
+            handle: ฟังก์ชัน (item) ทำงานกับ item หนึ่งตัว
+            batch_size: จำนวน item ต่อหนึ่ง idle slice
+            on_done: callback() เมื่อทำครบ (ไม่บังคับ)
+            first_batch_now: True = ทำชุดแรกทันที (ส่วนที่มองเห็นก่อนแสดงผลครั้งแรก)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size ต้องมากกว่า 0")
+        self.widget = widget
+        self.handle = handle
+        self.batch_size = batch_size
+        self.on_done = on_done
+        self.slices = 0
+        self.done = False
+        self.cancelled = False
+        self._pending = list(items)
+        self._next = 0
+        self._after_id = None
+
+        if first_batch_now:
+            self._step()
+        else:
+            self._schedule()
+
+    @property
+    def remaining(self):
+        return len(self._pending) - self._next
+
+    def _schedule(self):
+        if self.remaining > 0:
+            self._after_id = self.widget.after_idle(self._step)
+        else:
+            self._finish()
+
+    def _alive(self):
+        try:
+            return bool(self.widget.winfo_exists())
+        except Exception:
+            return False
+
+    def _step(self):
+        self._after_id = None
+        if self.cancelled or not self._alive():
+            return
+        end = min(self._next + self.batch_size, len(self._pending))
+        for item in self._pending[self._next:end]:
+            self.handle(item)
+        self._next = end
+        self.slices += 1
+        self._schedule()
+
+    def _finish(self):
+        if self.done:
+            return
+        self.done = True
+        self._pending = []
+        self._next = 0
+        if self.on_done:
+            self.on_done()
+
+    def cancel(self):
+        """หยุดงานที่ยังไม่ได้ทำ"""
+        self.cancelled = True
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
@@ -0,0 +1,50 @@
+"""
+modules/lazy_tabs.py
+LazyTabs - สร้างเนื้อหาของแต่ละ tab ใน CTkTabview เมื่อถูกเลือกครั้งแรก
+- เปิดโมดูล: สร้างเฉพาะ tab ที่แสดงอยู่ (รวมถึง query ข้อมูลครั้งแรกของ tab นั้น)
+- tab อื่นสร้างตอนผู้ใช้กดเลือก
+ไม่ import customtkinter - ใช้กับ tabview ใดก็ได้ที่มี add(), get(), configure(command=...)
+"""
+
+
+class LazyTabs:
+    """ลงทะเบียนฟังก์ชันสร้าง tab แล้วเรียกเมื่อ tab ถูกเลือกครั้งแรก"""
+
+    def __init__(self, tabview):
+        """
+        Args:
+            tabview: CTkTabview (command ของ tabview จะถูกตั้งเป็น build_current)
+        """
+        self.tabview = tabview
+        self._builders = {}
+        self._built = set()
+        tabview.configure(command=self.build_current)
+
+    def add(self, name, builder):
+        """
+        เพิ่ม tab - builder() ถูกเรียกเมื่อ tab นี้ถูกเลือกครั้งแรก
+        (tab แรกที่เพิ่มจะถูกเลือกอัตโนมัติ จึงสร้างทันที)
+        """
+        self.tabview.add(name)
+        self._builders[name] = builder
+        self.build_current()
+
+    def build(self, name):
+        """สร้าง tab name ถ้ายังไม่ได้สร้าง"""
+        if name in self._built or name not in self._builders:
+            return False
+        self._built.add(name)
+        self._builders[name]()
+        return True
+
+    def build_current(self):
+        """สร้าง tab ที่เลือกอยู่ (ใช้เป็น command ของ tabview)"""
+        self.build(self.tabview.get())
+
+    def is_built(self, name):
+        return name in self._built
+
+    def select(self, name):
+        """เลือก tab และสร้างถ้ายังไม่ได้สร้าง"""
+        self.tabview.set(name)
+        self.build_current()
@@ -0,0 +1,103 @@
+"""
+modules/lru.py
+LRUCache - แคชในหน่วยความจำแบบจำกัดจำนวน ลบรายการที่ไม่ได้ใช้นานที่สุดก่อน
+- เก็บสถิติ hits / misses / evictions สำหรับดูว่าขนาดแคชเหมาะสมหรือไม่
+- ไม่ผูกกับ UI ใช้ได้ทั้ง IconManager และส่วนอื่นของโปรแกรม
+"""
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """แคชแบบ LRU ขนาดจำกัด (thread-safe)"""
+
+    def __init__(self, maxsize=128, on_evict=None):
+        """
+        Args:
+            maxsize: จำนวนรายการสูงสุด
+            on_evict: callback(key, value) เรียกเมื่อรายการถูกลบเพราะแคชเต็ม (ไม่บังคับ)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize ต้องมากกว่า 0")
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """
+        คืนค่าของ key และย้ายไปเป็นรายการที่ใช้ล่าสุด
+        Returns:
+            ค่าที่เก็บไว้ หรือ default ถ้าไม่มี
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """เพิ่ม/แทนที่ค่า แล้วลบรายการเก่าสุดถ้าเกิน maxsize"""
+        evicted = []
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+                self.evictions += 1
+        if self.on_evict:
+            for old_key, old_value in evicted:
+                self.on_evict(old_key, old_value)
+
+    def pop(self, key, default=None):
+        """ลบ key ออกจากแคช (ไม่นับเป็น eviction)"""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def peek(self, key, default=None):
+        """ดูค่าโดยไม่เปลี่ยนลำดับและไม่นับสถิติ"""
+        with self._lock:
+            return self._data.get(key, default)
+
+    def keys(self):
+        """key ทั้งหมด เรียงจากใช้นานที่สุด -> ใช้ล่าสุด"""
+        with self._lock:
+            return list(self._data.keys())
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        """ล้างแคช (สถิติยังคงอยู่)"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict {'size', 'maxsize', 'hits', 'misses', 'evictions', 'hit_rate'}
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
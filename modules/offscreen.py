@@ -0,0 +1,132 @@
+"""
+modules/offscreen.py
+สร้างเนื้อหาขนาดใหญ่ (ตารางเรียน, Transcript) ใน frame ที่ยังไม่แสดงผล แล้วค่อยแสดงในครั้งเดียว
+- ระหว่างสร้าง frame ยังไม่ถูก pack และปิด geometry propagation ไว้
+  grid()/pack() ของ widget ลูกจึงไม่ทำให้ frame ที่แสดงอยู่คำนวณ layout ใหม่ทุกครั้ง (ไม่กระพริบ)
+- เนื้อหาเดิมถูกลบหลังเนื้อหาใหม่สร้างเสร็จ (ไม่เห็นหน้าว่างระหว่างสร้าง)
+- Timing hooks: วัดเวลาสร้าง/จัด layout ของแต่ละหน้าจอ
+  SCHOOL_PROFILE_BUILD=1 พิมพ์เวลาทาง console, SCHOOL_OFFSCREEN_BUILD=0 สร้างใน frame ที่แสดงอยู่
+  (แบบเดิม) เพื่อเปรียบเทียบ
+ไม่ import customtkinter - frame ใหม่สร้างผ่าน make_container ที่ส่งเข้ามา
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+ENV_OFFSCREEN = "SCHOOL_OFFSCREEN_BUILD"
+ENV_PROFILE = "SCHOOL_PROFILE_BUILD"
+
+_hooks = []
+timings = {}    # ชื่อ -> สถิติล่าสุด (ดู _record)
+
+
+def _truthy(value, default):
+    if value is None or not value.strip():
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+def offscreen_enabled(environ=None):
+    """สร้างนอกจอหรือไม่ (ค่าเริ่มต้น: ใช่)"""
+    environ = os.environ if environ is None else environ
+    return _truthy(environ.get(ENV_OFFSCREEN), True)
+
+
+def add_timing_hook(hook):
+    """
+    ลงทะเบียน hook(name, entry) ที่ถูกเรียกหลังสร้างแต่ละครั้ง
+    เมื่อมี hook จะรอ layout เสร็จ (update_idletasks) ก่อนจับเวลา เพื่อให้รวมเวลาจัด layout
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_timing_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def print_timing(name, entry):
+    """hook สำหรับพิมพ์ทาง console"""
+    mode = "offscreen" if entry['offscreen'] else "direct"
+    print(f"[Build] {name:<24} {entry['total_ms']:7.1f} ms "
+          f"(build {entry['build_ms']:.1f} + layout {entry['layout_ms']:.1f}, "
+          f"{entry['widgets']} widgets, {mode})")
+
+
+def count_widgets(widget):
+    """จำนวน widget ทั้งหมดภายใต้ widget (ไม่นับตัวเอง)"""
+    children = widget.winfo_children()
+    return len(children) + sum(count_widgets(child) for child in children)
+
+
+def _set_propagate(widget, flag):
+    widget.pack_propagate(flag)
+    widget.grid_propagate(flag)
+
+
+def _record(name, entry):
+    previous = timings.get(name)
+    entry['count'] = previous['count'] + 1 if previous else 1
+    timings[name] = entry
+    for hook in list(_hooks):
+        hook(name, entry)
+
+
+@contextmanager
+def build_offscreen(host, make_container, name, pack_options=None, clock=time.perf_counter):
+    """
+    แทนที่เนื้อหาของ host ด้วยเนื้อหาที่สร้างใน with block
+    Args:
+        host: frame ที่แสดงอยู่ (ลูกเดิมทั้งหมดจะถูกลบ)
+        make_container: ฟังก์ชัน (host) -> frame ใหม่ที่ยังไม่ pack
+        name: ชื่อหน้าจอสำหรับ timing เช่น "class_schedule"
+        pack_options: option ของ pack() ตอนแสดง (ค่าเริ่มต้น fill="both", expand=True)
+        clock: ฟังก์ชันเวลา (วินาที) - เปลี่ยนได้สำหรับทดสอบ
+    Yields:
+        frame ใหม่สำหรับสร้าง widget ลงไป
+    """
+    pack_options = pack_options or {'fill': "both", 'expand': True}
+    offscreen = offscreen_enabled()
+    start = clock()
+
+    old_children = list(host.winfo_children())
+    if not offscreen:
+        for child in old_children:
+            child.destroy()
+        old_children = []
+
+    container = make_container(host)
+    if offscreen:
+        _set_propagate(container, False)
+    else:
+        container.pack(**pack_options)
+
+    try:
+        yield container
+    except BaseException:
+        container.destroy()
+        raise
+
+    built = clock()
+    if offscreen:
+        _set_propagate(container, True)
+        for child in old_children:
+            child.destroy()
+        container.pack(**pack_options)
+
+    if _hooks:
+        host.update_idletasks()
+    end = clock()
+    _record(name, {
+        'build_ms': (built - start) * 1000.0,
+        'layout_ms': (end - built) * 1000.0,
+        'total_ms': (end - start) * 1000.0,
+        'widgets': count_widgets(container) if _hooks else None,
+        'offscreen': offscreen,
+    })
+
+
+if _truthy(os.environ.get(ENV_PROFILE), False):
+    add_timing_hook(print_timing)
@@ -3,22 +3,44 @@ modules/pdf_utils.py
 PDF utility - Thai font registration helper
 """
 
-import os
+import reportlab
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from modules.font_discovery import FontIndex, discover_thai_fonts, outranked_by_known_font
 
 _font_registered = False
 _font_name = 'Helvetica'
 
 
+def _register_from_index(index):
+    """Register the font remembered in the on-disk index, skipping scan and (if possible) TTF parse.
+
+    The entry is ignored when a higher-priority known font (e.g. THSarabunNew.ttf
+    added to the project later) now exists, so the priority order still holds.
+    """
+    entry = index.lookup(reportlab.Version)
+    if entry is None or not entry['path'] or outranked_by_known_font(entry['path']):
+        return None
+
+    font = index.load_metrics(entry)
+    if not isinstance(font, TTFont) or font.fontName != entry['name']:
+        font = TTFont(entry['name'], entry['path'])
+    pdfmetrics.registerFont(font)
+    return entry['name']
+
+
 def get_thai_font():
     """Register and return a Thai-capable font name for ReportLab PDF.
 
     Searches for fonts in this priority order:
     1. THSarabunNew.ttf in project directory
-    2. Leelawadee UI (Windows system font)
-    3. Tahoma (Windows system font)
-    4. Fallback to Helvetica (no Thai support)
+    2. Leelawadee UI / Tahoma / Leelawadee (Windows system fonts)
+    3. Thai fonts reported by fc-list (Linux/macOS with fontconfig)
+    4. Thai-capable TTFs found in the standard font directories
+    5. Fallback to Helvetica (no Thai support)
+
+    The resolved path and the parsed font are kept in cache/fonts, so later
+    processes (e.g. export workers) skip both the scan and the TTF parse.
 
     Returns:
         str: Registered font name
@@ -28,31 +50,31 @@ def get_thai_font():
     if _font_registered:
         return _font_name
 
-    # Search paths for Thai fonts
-    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    font_candidates = [
-        # Project-bundled font
-        (os.path.join(project_dir, 'THSarabunNew.ttf'), 'Sarabun'),
-        (os.path.join(project_dir, 'fonts', 'THSarabunNew.ttf'), 'Sarabun'),
-        # Windows system fonts - Leelawadee UI (modern Thai)
-        ('C:/Windows/Fonts/LeelawUI.ttf', 'LeelawUI'),
-        # Windows system fonts - Tahoma (supports Thai)
-        ('C:/Windows/Fonts/tahoma.ttf', 'Tahoma'),
-        # Windows system fonts - Leelawadee
-        ('C:/Windows/Fonts/leelawad.ttf', 'Leelawadee'),
-    ]
-
-    for font_path, name in font_candidates:
+    index = FontIndex()
+    try:
+        name = _register_from_index(index)
+    except Exception:
+        name = None
+    if name:
+        _font_name = name
+        _font_registered = True
+        return _font_name
+
+    for font_path, name in discover_thai_fonts():
         try:
-            if os.path.exists(font_path):
-                pdfmetrics.registerFont(TTFont(name, font_path))
-                _font_name = name
-                _font_registered = True
-                return _font_name
+            font = TTFont(name, font_path)
+            pdfmetrics.registerFont(font)
         except Exception:
             continue
+        try:
+            index.store(font_path, name, reportlab.Version, font)
+        except OSError:
+            pass
+        _font_name = name
+        _font_registered = True
+        return _font_name
 
-    # Fallback - Helvetica (no Thai support)
+    # Fallback - Helvetica (no Thai support); not indexed so a newly installed font is found next run
     _font_registered = True
     _font_name = 'Helvetica'
     return _font_name
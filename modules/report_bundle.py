@@ -0,0 +1,113 @@
+"""
+modules/report_bundle.py
+Export ชุดรายงานทั้งหมด (ปลายภาคเรียน) เป็นไฟล์ ZIP เดียว
+- สร้างรายงานแต่ละไฟล์ใน ProcessPoolExecutor (ใช้ได้ทุก core)
+- worker แต่ละตัวเปิด connection แบบอ่านอย่างเดียวของตัวเอง
+- ZIP มี manifest.json บอกรายการไฟล์, ขนาด, sha256 และเวลาที่ใช้
+เวลารวมจึงใกล้เคียงกับรายงานที่ช้าที่สุดเพียงไฟล์เดียว
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from database.db import Database
+
+MANIFEST_NAME = "manifest.json"
+
+
+def default_artifacts():
+    """
+    รายการรายงานทั้งหมดในชุด Export (ทุกรายงาน ทั้ง Excel และ PDF)
+    Returns:
+        list ของ (ชื่อไฟล์, ฟังก์ชันสร้างไฟล์ render(db, file_path))
+    """
+    from modules.report_renderers import REPORT_RENDERERS
+    return [(file_name, render) for render, file_name in REPORT_RENDERERS.values()]
+
+
+def _render_artifact(db_path, render, out_path):
+    """
+    ทำงานใน worker process: เปิด db แบบอ่านอย่างเดียวแล้วสร้างไฟล์หนึ่งไฟล์
+    Returns:
+        (ข้อความจาก render, เวลาที่ใช้เป็นวินาที)
+    """
+    started = time.perf_counter()
+    db = Database.open_readonly(db_path)
+    try:
+        message = render(db, out_path)
+    finally:
+        db.close()
+    return message, time.perf_counter() - started
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_bundle(db_path, zip_path, job=None, artifacts=None, max_workers=None):
+    """
+    สร้างชุดรายงานทั้งหมดเป็น ZIP
+    Args:
+        db_path: ที่อยู่ไฟล์ฐานข้อมูล
+        zip_path: ไฟล์ ZIP ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+        artifacts: list ของ (ชื่อไฟล์, render) ค่าเริ่มต้นคือ default_artifacts()
+        max_workers: จำนวน process (ค่าเริ่มต้น = จำนวน core)
+    Returns:
+        dict manifest ที่เขียนลงใน ZIP
+    """
+    artifacts = artifacts if artifacts is not None else default_artifacts()
+    started = time.perf_counter()
+    work_dir = tempfile.mkdtemp(prefix="report_bundle_")
+    entries = []
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {}
+            for file_name, render in artifacts:
+                out_path = os.path.join(work_dir, file_name)
+                futures[executor.submit(_render_artifact, db_path, render, out_path)] = (file_name, out_path)
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                file_name, out_path = futures[future]
+                message, seconds = future.result()
+                entries.append({
+                    "file": file_name,
+                    "bytes": os.path.getsize(out_path),
+                    "sha256": _sha256(out_path),
+                    "seconds": round(seconds, 3),
+                    "message": message,
+                })
+                if job:
+                    job.progress(done, len(futures))
+        finally:
+            # ถูกยกเลิก/ผิดพลาด: ไม่ต้องรองานที่ยังไม่เริ่ม
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        entries.sort(key=lambda e: e["file"])
+        manifest = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "database": os.path.basename(db_path),
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "artifacts": entries,
+        }
+
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for entry in entries:
+                zf.write(os.path.join(work_dir, entry["file"]), entry["file"])
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+        return manifest
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,1117 @@
+"""
+modules/report_renderers.py
+ฟังก์ชันสร้างไฟล์รายงาน (Excel/PDF) ของหน้ารายงาน
+- แยกออกจาก ReportsModule เพื่อให้เรียกได้ทั้งจาก worker thread และ worker process
+- ไม่ import customtkinter จึงใช้ใน ProcessPoolExecutor ได้โดยไม่ต้องโหลด UI
+- ทุกฟังก์ชันรับ (db, file_path, job=None) และคืนข้อความสรุปเมื่อสำเร็จ
+"""
+
+from datetime import datetime
+import openpyxl
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from modules.pdf_utils import get_thai_font
+
+
+class _NullJob:
+    """ใช้แทน ExportJob เมื่อเรียกนอก ExportJobRunner (เช่นใน worker process)"""
+
+    def iterate(self, items):
+        return iter(items)
+
+    def check(self):
+        pass
+
+    def pdf_page_hook(self, canvas, doc):
+        pass
+
+
+NULL_JOB = _NullJob()
+
+
+def render_students_excel(db, file_path, job=None):
+    """
+    Export รายชื่อนักเรียนเป็น Excel
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "รายชื่อนักเรียน"
+
+    # Style - design system colors (blue header, white text)
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    border = Border(
+        left=Side(style='thin', color="E5E7EB"),
+        right=Side(style='thin', color="E5E7EB"),
+        top=Side(style='thin', color="E5E7EB"),
+        bottom=Side(style='thin', color="E5E7EB"),
+    )
+    stripe_fill = PatternFill(start_color="F9FAFB", end_color="F9FAFB", fill_type="solid")
+
+    # Header row
+    headers = ["รหัสนักเรียน", "คำนำหน้า", "ชื่อ", "นามสกุล", "ห้อง", "ปีการศึกษา", "วันเกิด", "ผู้ปกครอง", "เบอร์ติดต่อ"]
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+
+    # Data rows
+    for row_idx, student in enumerate(job.iterate(students), start=2):
+        data = [
+            student['student_id'],
+            student['title'],
+            student['first_name'],
+            student['last_name'],
+            student['class_room'],
+            student['class_year'],
+            student['birth_date'] or "-",
+            student['parent_name'] or "-",
+            student['parent_phone'] or "-",
+        ]
+
+        for col_idx, value in enumerate(data, start=1):
+            cell = ws.cell(row=row_idx, column=col_idx)
+            cell.value = value
+            cell.border = border
+            cell.alignment = Alignment(horizontal='center' if col_idx in [1, 2, 5, 6] else 'left')
+            # Stripe pattern
+            if row_idx % 2 == 0:
+                cell.fill = stripe_fill
+
+    # Column widths
+    for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
+        ws.column_dimensions[col].width = 15
+
+    wb.save(file_path)
+    return f"Export รายชื่อนักเรียน {len(students)} รายการเป็น Excel สำเร็จ"
+
+
+def render_students_pdf(db, file_path, job=None):
+    """
+    Export รายชื่อนักเรียนเป็น PDF
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+
+    # Title
+    styles = getSampleStyleSheet()
+    title = Paragraph("รายชื่อนักเรียนทั้งหมด", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        alignment=1,
+    ))
+    elements.append(title)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    # Table data
+    data = [["รหัส", "คำนำหน้า", "ชื่อ", "นามสกุล", "ห้อง", "ปีการศึกษา"]]
+
+    for s in job.iterate(students):
+        data.append([
+            s['student_id'],
+            s['title'],
+            s['first_name'],
+            s['last_name'],
+            s['class_room'],
+            s['class_year'],
+        ])
+
+    table = Table(data, colWidths=[3 * cm, 2 * cm, 4 * cm, 4 * cm, 2.5 * cm, 2.5 * cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#F9FAFB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor("#111827")),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+
+    elements.append(table)
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+
+    return f"Export รายชื่อนักเรียน {len(students)} รายการเป็น PDF สำเร็จ"
+
+
+def render_attendance_excel(db, file_path, job=None):
+    """
+    Export การเช็คชื่อเป็น Excel
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "สถิติการเช็คชื่อ"
+
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    border = Border(
+        left=Side(style='thin', color='E5E7EB'),
+        right=Side(style='thin', color='E5E7EB'),
+        top=Side(style='thin', color='E5E7EB'),
+        bottom=Side(style='thin', color='E5E7EB')
+    )
+    stripe_fill = PatternFill(start_color="F9FAFB", end_color="F9FAFB", fill_type="solid")
+
+    headers = ["รหัส", "ชื่อ-สกุล", "ห้อง", "มา", "ขาด", "ลา", "มาสาย", "รวม"]
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+
+    for row_idx, student in enumerate(job.iterate(students), start=2):
+        stats = db.get_attendance_stats(student['student_id'])
+        total = stats['มา'] + stats['ขาด'] + stats['ลา'] + stats['มาสาย']
+        full_name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        data = [
+            student['student_id'],
+            full_name,
+            student['class_room'],
+            stats['มา'],
+            stats['ขาด'],
+            stats['ลา'],
+            stats['มาสาย'],
+            total,
+        ]
+        for col_idx, value in enumerate(data, start=1):
+            cell = ws.cell(row=row_idx, column=col_idx)
+            cell.value = value
+            cell.border = border
+            cell.alignment = Alignment(horizontal='center' if col_idx != 2 else 'left')
+            if row_idx % 2 == 0:
+                cell.fill = stripe_fill
+
+    col_widths = {'A': 12, 'B': 24, 'C': 10, 'D': 8, 'E': 8, 'F': 8, 'G': 10, 'H': 8}
+    for col_letter, width in col_widths.items():
+        ws.column_dimensions[col_letter].width = width
+
+    wb.save(file_path)
+    return f"Export สถิติการเช็คชื่อ {len(students)} รายการเป็น Excel สำเร็จ"
+
+
+def render_attendance_pdf(db, file_path, job=None):
+    """
+    Export การเช็คชื่อเป็น PDF
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    title = Paragraph("สถิติการเช็คชื่อนักเรียน", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        alignment=1,
+    ))
+    elements.append(title)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    data = [["รหัส", "ชื่อ-สกุล", "ห้อง", "มา", "ขาด", "ลา", "มาสาย", "รวม"]]
+    for student in job.iterate(students):
+        stats = db.get_attendance_stats(student['student_id'])
+        total = stats['มา'] + stats['ขาด'] + stats['ลา'] + stats['มาสาย']
+        full_name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        data.append([
+            student['student_id'],
+            full_name,
+            student['class_room'],
+            str(stats['มา']),
+            str(stats['ขาด']),
+            str(stats['ลา']),
+            str(stats['มาสาย']),
+            str(total),
+        ])
+
+    table = Table(data, colWidths=[2.5*cm, 5*cm, 2*cm, 1.5*cm, 1.5*cm, 1.5*cm, 1.8*cm, 1.5*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+
+    elements.append(table)
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+    return f"Export สถิติการเช็คชื่อ {len(students)} รายการเป็น PDF สำเร็จ"
+
+
+def render_health_excel(db, file_path, job=None):
+    """
+    Export ข้อมูลสุขภาพเป็น Excel
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "ข้อมูลสุขภาพ"
+
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    border = Border(
+        left=Side(style='thin', color='E5E7EB'),
+        right=Side(style='thin', color='E5E7EB'),
+        top=Side(style='thin', color='E5E7EB'),
+        bottom=Side(style='thin', color='E5E7EB')
+    )
+    stripe_fill = PatternFill(start_color="F9FAFB", end_color="F9FAFB", fill_type="solid")
+
+    headers = ["รหัส", "ชื่อ-สกุล", "ห้อง", "น้ำหนัก(kg)", "ส่วนสูง(cm)", "BMI", "สถานะ"]
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+
+    for row_idx, student in enumerate(job.iterate(students), start=2):
+        health = db.get_latest_health(student['student_id'])
+        full_name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        if health:
+            weight = health['weight_kg'] if health['weight_kg'] is not None else "-"
+            height = health['height_cm'] if health['height_cm'] is not None else "-"
+            bmi_val = health['bmi'] if health['bmi'] is not None else "-"
+            if isinstance(bmi_val, (int, float)):
+                bmi_str = f"{bmi_val:.2f}"
+                if bmi_val < 18.5:
+                    status = "น้ำหนักต่ำกว่าเกณฑ์"
+                elif bmi_val < 23:
+                    status = "น้ำหนักปกติ"
+                elif bmi_val < 25:
+                    status = "น้ำหนักเกิน"
+                else:
+                    status = "อ้วน"
+            else:
+                bmi_str = "-"
+                status = "-"
+        else:
+            weight = "-"
+            height = "-"
+            bmi_str = "-"
+            status = "-"
+
+        data = [
+            student['student_id'],
+            full_name,
+            student['class_room'],
+            weight,
+            height,
+            bmi_str,
+            status,
+        ]
+        for col_idx, value in enumerate(data, start=1):
+            cell = ws.cell(row=row_idx, column=col_idx)
+            cell.value = value
+            cell.border = border
+            cell.alignment = Alignment(horizontal='center' if col_idx != 2 else 'left')
+            if row_idx % 2 == 0:
+                cell.fill = stripe_fill
+
+    col_widths = {'A': 12, 'B': 24, 'C': 10, 'D': 14, 'E': 14, 'F': 10, 'G': 20}
+    for col_letter, width in col_widths.items():
+        ws.column_dimensions[col_letter].width = width
+
+    wb.save(file_path)
+    return f"Export ข้อมูลสุขภาพ {len(students)} รายการเป็น Excel สำเร็จ"
+
+
+def render_health_pdf(db, file_path, job=None):
+    """
+    Export ข้อมูลสุขภาพเป็น PDF
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    title = Paragraph("ข้อมูลสุขภาพนักเรียน", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        alignment=1,
+    ))
+    elements.append(title)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    data = [["รหัส", "ชื่อ-สกุล", "ห้อง", "น้ำหนัก(kg)", "ส่วนสูง(cm)", "BMI", "สถานะ"]]
+    for student in job.iterate(students):
+        health = db.get_latest_health(student['student_id'])
+        full_name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        if health:
+            weight = f"{health['weight_kg']:.1f}" if health['weight_kg'] is not None else "-"
+            height = f"{health['height_cm']:.1f}" if health['height_cm'] is not None else "-"
+            bmi_val = health['bmi']
+            if bmi_val is not None:
+                bmi_str = f"{bmi_val:.2f}"
+                if bmi_val < 18.5:
+                    status = "ต่ำกว่าเกณฑ์"
+                elif bmi_val < 23:
+                    status = "ปกติ"
+                elif bmi_val < 25:
+                    status = "น้ำหนักเกิน"
+                else:
+                    status = "อ้วน"
+            else:
+                bmi_str = "-"
+                status = "-"
+        else:
+            weight = "-"
+            height = "-"
+            bmi_str = "-"
+            status = "-"
+
+        data.append([
+            student['student_id'],
+            full_name,
+            student['class_room'],
+            weight,
+            height,
+            bmi_str,
+            status,
+        ])
+
+    table = Table(data, colWidths=[2.5*cm, 4.5*cm, 1.8*cm, 2.2*cm, 2.2*cm, 1.8*cm, 2.5*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+
+    elements.append(table)
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+    return f"Export ข้อมูลสุขภาพ {len(students)} รายการเป็น PDF สำเร็จ"
+
+
+def render_grades_excel(db, file_path, job=None):
+    """
+    Export เกรดเป็น Excel
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "ผลการเรียน"
+
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    border = Border(
+        left=Side(style='thin', color='E5E7EB'),
+        right=Side(style='thin', color='E5E7EB'),
+        top=Side(style='thin', color='E5E7EB'),
+        bottom=Side(style='thin', color='E5E7EB')
+    )
+    stripe_fill = PatternFill(start_color="F9FAFB", end_color="F9FAFB", fill_type="solid")
+
+    headers = ["รหัส", "ชื่อ-สกุล", "ห้อง", "รหัสวิชา", "ชื่อวิชา", "คะแนน", "เกรด", "ปีการศึกษา", "ภาคเรียน"]
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+
+    row_idx = 2
+    total_rows = 0
+    for student in job.iterate(students):
+        grades = db.get_grades(student['student_id'])
+        if not grades:
+            continue
+        full_name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        for grade in grades:
+            data = [
+                student['student_id'],
+                full_name,
+                student['class_room'],
+                grade['subject_code'],
+                grade['subject_name'],
+                grade['score'] if grade['score'] is not None else "-",
+                grade['grade'] if grade['grade'] else "-",
+                grade['academic_year'],
+                grade['semester'],
+            ]
+            for col_idx, value in enumerate(data, start=1):
+                cell = ws.cell(row=row_idx, column=col_idx)
+                cell.value = value
+                cell.border = border
+                cell.alignment = Alignment(horizontal='center' if col_idx not in [2, 5] else 'left')
+                if row_idx % 2 == 0:
+                    cell.fill = stripe_fill
+            row_idx += 1
+            total_rows += 1
+
+    if total_rows == 0:
+        messagebox.showwarning("คำเตือน", "ไม่มีข้อมูลเกรด")
+        return
+
+    col_widths = {'A': 12, 'B': 24, 'C': 10, 'D': 12, 'E': 24, 'F': 10, 'G': 8, 'H': 14, 'I': 10}
+    for col_letter, width in col_widths.items():
+        ws.column_dimensions[col_letter].width = width
+
+    wb.save(file_path)
+    return f"Export ผลการเรียน {total_rows} รายการเป็น Excel สำเร็จ"
+
+
+def render_grades_pdf(db, file_path, job=None):
+    """
+    Export เกรดเป็น PDF
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    students = db.get_all_students()
+
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    title = Paragraph("ผลการเรียนนักเรียน", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        alignment=1,
+    ))
+    elements.append(title)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    data = [["รหัส", "ชื่อ-สกุล", "ห้อง", "รหัสวิชา", "ชื่อวิชา", "คะแนน", "เกรด", "ปีการศึกษา", "ภาคเรียน"]]
+    total_rows = 0
+    for student in job.iterate(students):
+        grades = db.get_grades(student['student_id'])
+        if not grades:
+            continue
+        full_name = f"{student['title']}{student['first_name']} {student['last_name']}"
+        for grade in grades:
+            data.append([
+                student['student_id'],
+                full_name,
+                student['class_room'],
+                grade['subject_code'],
+                grade['subject_name'],
+                str(grade['score']) if grade['score'] is not None else "-",
+                grade['grade'] if grade['grade'] else "-",
+                grade['academic_year'],
+                grade['semester'],
+            ])
+            total_rows += 1
+
+    if total_rows == 0:
+        messagebox.showwarning("คำเตือน", "ไม่มีข้อมูลเกรด")
+        return
+
+    table = Table(data, colWidths=[2*cm, 4*cm, 1.5*cm, 2*cm, 3.5*cm, 1.8*cm, 1.5*cm, 2*cm, 1.5*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
+        ('ALIGN', (4, 1), (4, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+
+    elements.append(table)
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+    return f"Export ผลการเรียน {total_rows} รายการเป็น PDF สำเร็จ"
+
+
+def render_schedule_excel(db, file_path, job=None):
+    """
+    Export ตารางเรียนเป็น Excel
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    schedules = db.get_all_schedules()
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "ตารางเรียน"
+
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    border = Border(
+        left=Side(style='thin', color='E5E7EB'),
+        right=Side(style='thin', color='E5E7EB'),
+        top=Side(style='thin', color='E5E7EB'),
+        bottom=Side(style='thin', color='E5E7EB')
+    )
+    stripe_fill = PatternFill(start_color="F9FAFB", end_color="F9FAFB", fill_type="solid")
+
+    headers = ["ห้อง", "วัน", "คาบ", "วิชา", "ครู", "เวลาเริ่ม", "เวลาสิ้นสุด"]
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col)
+        cell.value = header
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.border = border
+
+    for row_idx, sched in enumerate(job.iterate(schedules), start=2):
+        teacher_name = f"{sched.get('title', '')}{sched.get('first_name', '')} {sched.get('last_name', '')}".strip()
+        data = [
+            sched['class_room'],
+            sched['day_of_week'],
+            sched['period_no'],
+            sched['subject_name'],
+            teacher_name,
+            sched.get('start_time') or "-",
+            sched.get('end_time') or "-",
+        ]
+        for col_idx, value in enumerate(data, start=1):
+            cell = ws.cell(row=row_idx, column=col_idx)
+            cell.value = value
+            cell.border = border
+            cell.alignment = Alignment(horizontal='center' if col_idx not in [4, 5] else 'left')
+            if row_idx % 2 == 0:
+                cell.fill = stripe_fill
+
+    col_widths = {'A': 10, 'B': 14, 'C': 6, 'D': 24, 'E': 22, 'F': 12, 'G': 14}
+    for col_letter, width in col_widths.items():
+        ws.column_dimensions[col_letter].width = width
+
+    wb.save(file_path)
+    return f"Export ตารางเรียน {len(schedules)} รายการเป็น Excel สำเร็จ"
+
+
+def render_schedule_pdf(db, file_path, job=None):
+    """
+    Export ตารางเรียนเป็น PDF
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    schedules = db.get_all_schedules()
+
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    title = Paragraph("ตารางเรียน/ตารางสอน", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        alignment=1,
+    ))
+    elements.append(title)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    data = [["ห้อง", "วัน", "คาบ", "วิชา", "ครู", "เวลาเริ่ม", "เวลาสิ้นสุด"]]
+    for sched in job.iterate(schedules):
+        teacher_name = f"{sched.get('title', '')}{sched.get('first_name', '')} {sched.get('last_name', '')}".strip()
+        data.append([
+            sched['class_room'],
+            sched['day_of_week'],
+            str(sched['period_no']),
+            sched['subject_name'],
+            teacher_name,
+            sched.get('start_time') or "-",
+            sched.get('end_time') or "-",
+        ])
+
+    table = Table(data, colWidths=[2*cm, 2.5*cm, 1.2*cm, 4.5*cm, 4*cm, 2*cm, 2.5*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('ALIGN', (3, 1), (4, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+
+    elements.append(table)
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+    return f"Export ตารางเรียน {len(schedules)} รายการเป็น PDF สำเร็จ"
+
+
+def render_all_excel(db, file_path, job=None):
+    """
+    Export ข้อมูลทั้งหมดเป็น Excel (Multiple Sheets)
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    wb = openpyxl.Workbook()
+
+    # Style
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    border = Border(
+        left=Side(style='thin', color="E5E7EB"),
+        right=Side(style='thin', color="E5E7EB"),
+        top=Side(style='thin', color="E5E7EB"),
+        bottom=Side(style='thin', color="E5E7EB"),
+    )
+    stripe_fill = PatternFill(start_color="F9FAFB", end_color="F9FAFB", fill_type="solid")
+
+    # ========== Sheet 1: Students ==========
+    ws1 = wb.active
+    ws1.title = "รายชื่อนักเรียน"
+
+    students = db.get_all_students()
+    headers1 = ["รหัส", "คำนำหน้า", "ชื่อ", "นามสกุล", "ห้อง", "ปีการศึกษา"]
+    for col, h in enumerate(headers1, start=1):
+        cell = ws1.cell(row=1, column=col)
+        cell.value = h
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center')
+
+    for row, s in enumerate(students, start=2):
+        values = [s['student_id'], s['title'], s['first_name'], s['last_name'], s['class_room'], s['class_year']]
+        for col_idx, val in enumerate(values, start=1):
+            cell = ws1.cell(row=row, column=col_idx)
+            cell.value = val
+            cell.border = border
+            if row % 2 == 0:
+                cell.fill = stripe_fill
+
+    for col_letter in ['A', 'B', 'C', 'D', 'E', 'F']:
+        ws1.column_dimensions[col_letter].width = 15
+
+    # ========== Sheet 2: Teachers ==========
+    ws2 = wb.create_sheet("ครู")
+    teachers = db.get_all_teachers()
+    headers2 = ["รหัสครู", "คำนำหน้า", "ชื่อ", "นามสกุล", "เบอร์ติดต่อ"]
+    for col, h in enumerate(headers2, start=1):
+        cell = ws2.cell(row=1, column=col)
+        cell.value = h
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center')
+
+    for row, t in enumerate(teachers, start=2):
+        values = [t['teacher_id'], t['title'], t['first_name'], t['last_name'], t['phone'] or "-"]
+        for col_idx, val in enumerate(values, start=1):
+            cell = ws2.cell(row=row, column=col_idx)
+            cell.value = val
+            cell.border = border
+            if row % 2 == 0:
+                cell.fill = stripe_fill
+
+    for col_letter in ['A', 'B', 'C', 'D', 'E']:
+        ws2.column_dimensions[col_letter].width = 15
+
+    # ========== Sheet 3: Stats ==========
+    ws3 = wb.create_sheet("สถิติ")
+
+    stats_headers = ["รายการ", "จำนวน"]
+    for col, h in enumerate(stats_headers, start=1):
+        cell = ws3.cell(row=1, column=col)
+        cell.value = h
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center')
+
+    class_rooms = db.get_class_rooms()
+    stats_data = [
+        ("จำนวนนักเรียน", f"{len(students)} คน"),
+        ("จำนวนครู", f"{len(teachers)} คน"),
+        ("จำนวนห้องเรียน", f"{len(class_rooms)} ห้อง"),
+    ]
+    for row_idx, (label, value) in enumerate(stats_data, start=2):
+        cell_label = ws3.cell(row=row_idx, column=1)
+        cell_label.value = label
+        cell_label.border = border
+
+        cell_value = ws3.cell(row=row_idx, column=2)
+        cell_value.value = value
+        cell_value.border = border
+        cell_value.alignment = Alignment(horizontal='center')
+
+        if row_idx % 2 == 0:
+            cell_label.fill = stripe_fill
+            cell_value.fill = stripe_fill
+
+    ws3.column_dimensions['A'].width = 20
+    ws3.column_dimensions['B'].width = 15
+
+    wb.save(file_path)
+    return "Export สรุปข้อมูลทั้งหมดเป็น Excel สำเร็จ"
+
+
+def render_all_pdf(db, file_path, job=None):
+    """
+    Export สรุปข้อมูลทั้งหมดเป็น PDF
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    job = job or NULL_JOB
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Title
+    title = Paragraph("สรุปข้อมูลระบบบริหารจัดการโรงเรียน", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=20,
+        alignment=1,
+    ))
+    elements.append(title)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    # Stats data
+    students = db.get_all_students()
+    teachers = db.get_all_teachers()
+    class_rooms = db.get_class_rooms()
+
+    stats_data = [
+        ["รายการ", "จำนวน"],
+        ["นักเรียนทั้งหมด", f"{len(students)} คน"],
+        ["ครูทั้งหมด", f"{len(teachers)} คน"],
+        ["ห้องเรียน", f"{len(class_rooms)} ห้อง"],
+    ]
+
+    stats_table = Table(stats_data, colWidths=[10 * cm, 5 * cm])
+    stats_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#F9FAFB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor("#111827")),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ('FONTSIZE', (0, 1), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+
+    elements.append(stats_table)
+    elements.append(Spacer(1, 1 * cm))
+
+    # Footer info
+    info = Paragraph(
+        f"รายงานนี้สร้างเมื่อ: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}",
+        ParagraphStyle('Info', parent=styles['Normal'], fontName=font_name, fontSize=10, alignment=1)
+    )
+    elements.append(info)
+
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+
+    return "Export สรุปข้อมูลเป็น PDF สำเร็จ"
+
+
+# (key, format) -> (ฟังก์ชันสร้างไฟล์, ชื่อไฟล์ในชุด Export)
+REPORT_RENDERERS = {
+    ("students", "excel"): (render_students_excel, "รายชื่อนักเรียน.xlsx"),
+    ("students", "pdf"): (render_students_pdf, "รายชื่อนักเรียน.pdf"),
+    ("attendance", "excel"): (render_attendance_excel, "สถิติการเช็คชื่อ.xlsx"),
+    ("attendance", "pdf"): (render_attendance_pdf, "สถิติการเช็คชื่อ.pdf"),
+    ("health", "excel"): (render_health_excel, "ข้อมูลสุขภาพ.xlsx"),
+    ("health", "pdf"): (render_health_pdf, "ข้อมูลสุขภาพ.pdf"),
+    ("grades", "excel"): (render_grades_excel, "ผลการเรียน.xlsx"),
+    ("grades", "pdf"): (render_grades_pdf, "ผลการเรียน.pdf"),
+    ("schedule", "excel"): (render_schedule_excel, "ตารางเรียน.xlsx"),
+    ("schedule", "pdf"): (render_schedule_pdf, "ตารางเรียน.pdf"),
+    ("all", "excel"): (render_all_excel, "สรุปข้อมูลทั้งหมด.xlsx"),
+    ("all", "pdf"): (render_all_pdf, "สรุปข้อมูลทั้งหมด.pdf"),
+}
+
+
+def render_room_usage_excel(db, file_path, job=None, version_id=None):
+    """
+    Export อัตราการใช้ห้องเป็น Excel (ต่อห้อง × คาบ + รายการห้องที่ถูกใช้ซ้อน)
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+        version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    from openpyxl.utils import get_column_letter
+    from modules.room_usage import summarize_room_usage
+    from modules.timetable_model import DAYS
+
+    job = job or NULL_JOB
+    periods = [row['period_no'] for row in db.get_bell_schedule()]
+    summary = summarize_room_usage(db.get_room_usage(version_id), DAYS, periods)
+    conflicts = db.get_room_conflicts(version_id)
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "การใช้ห้อง"
+
+    header_fill = PatternFill(start_color="2563EB", end_color="2563EB", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=12)
+    total_fill = PatternFill(start_color="EFF6FF", end_color="EFF6FF", fill_type="solid")
+    danger_font = Font(bold=True, color="EF4444")
+
+    headers = ["ห้อง"] + [f"คาบ {p}" for p in periods] + ["ใช้ (ช่อง)", "อัตราการใช้ (%)", "ใช้ซ้อน"]
+    for col, header in enumerate(headers, start=1):
+        cell = ws.cell(row=1, column=col, value=header)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    row_idx = 1
+    for row_idx, room in enumerate(job.iterate(summary['rooms']), start=2):
+        values = ([room['room_no']] + [room['by_period'][p] for p in periods]
+                  + [f"{room['used']}/{room['capacity']}", room['percent'], room['double_booked']])
+        for col, value in enumerate(values, start=1):
+            cell = ws.cell(row=row_idx, column=col, value=value)
+            cell.alignment = Alignment(horizontal='left' if col == 1 else 'center')
+        if room['double_booked']:
+            ws.cell(row=row_idx, column=len(headers)).font = danger_font
+
+    total_row = row_idx + 1
+    totals = ["รวม (%)"] + [summary['by_period'][p] for p in periods] + ["", summary['percent'], ""]
+    for col, value in enumerate(totals, start=1):
+        cell = ws.cell(row=total_row, column=col, value=value)
+        cell.fill = total_fill
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='left' if col == 1 else 'center')
+
+    ws.column_dimensions['A'].width = 14
+    for col in range(2, len(headers) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 10
+    ws.column_dimensions[get_column_letter(len(headers) - 1)].width = 16
+
+    if conflicts:
+        ws2 = wb.create_sheet("ห้องซ้อน")
+        for col, header in enumerate(["ห้อง", "วัน", "คาบ", "จำนวน", "ห้องเรียน"], start=1):
+            cell = ws2.cell(row=1, column=col, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+        for r, c in enumerate(conflicts, start=2):
+            for col, value in enumerate([c['room_no'], c['day_of_week'], c['period_no'],
+                                         c['bookings'], c['class_rooms']], start=1):
+                ws2.cell(row=r, column=col, value=value)
+        ws2.column_dimensions['E'].width = 30
+
+    wb.save(file_path)
+    return f"Export การใช้ห้อง {len(summary['rooms'])} ห้องเป็น Excel สำเร็จ"
+
+
+def render_substitution_pdf(db, file_path, teacher_id, date, job=None):
+    """
+    พิมพ์ใบสอนแทนของครูที่ลา (คาบที่ต้องหาครูสอนแทน + ครูที่ว่าง เรียงตามภาระงาน)
+    Args:
+        db: Database (ใน worker ใช้ connection อ่านอย่างเดียว)
+        file_path: ไฟล์ปลายทาง
+        teacher_id: รหัสครูที่ลา
+        date: วันที่ลา (YYYY-MM-DD)
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+    Returns:
+        ข้อความสรุปเมื่อสำเร็จ
+    """
+    from xml.sax.saxutils import escape
+    from modules.substitutes import find_substitutes
+
+    job = job or NULL_JOB
+    result = find_substitutes(db, teacher_id, date)
+    teacher = db.get_teacher_by_id(teacher_id) or {}
+    teacher_name = f"{teacher.get('title') or ''}{teacher.get('first_name') or ''} {teacher.get('last_name') or ''}".strip()
+    period_times = {row['period_no']: (row['start_time'], row['end_time'])
+                    for row in db.get_bell_schedule()}
+
+    font_name = get_thai_font()
+
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = []
+    styles = getSampleStyleSheet()
+    body_style = ParagraphStyle('Body', parent=styles['Normal'], fontName=font_name, fontSize=10, leading=13)
+
+    elements.append(Paragraph("ใบมอบหมายสอนแทน", ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontName=font_name,
+        fontSize=18,
+        alignment=1,
+    )))
+    elements.append(Paragraph(
+        f"ครูที่ลา: {escape(teacher_name or teacher_id)}  วันที่: {result['date']} "
+        f"(วัน{result['day_of_week'] or 'หยุด'})",
+        ParagraphStyle('Sub', parent=body_style, fontSize=13, alignment=1)
+    ))
+    elements.append(Spacer(1, 0.5 * cm))
+
+    data = [["คาบ", "เวลา", "ห้องเรียน", "วิชา", "ครูที่ว่าง (ภาระงานน้อยก่อน)", "ครูสอนแทน / ลงชื่อ"]]
+    for item in job.iterate(result['periods']):
+        entry = item['entry']
+        start, end = period_times.get(item['period_no'], ("", ""))
+        names = [escape(f"{c['name']} ({c['periods_per_week']})") for c in item['candidates'][:3]]
+        if len(item['candidates']) > 3:
+            names.append(f"และอีก {len(item['candidates']) - 3} คน")
+        data.append([
+            str(item['period_no']),
+            f"{start}-{end}" if start else "-",
+            entry['class_room'],
+            Paragraph(escape(entry['subject_name']), body_style),
+            Paragraph("<br/>".join(names) or "ไม่มีครูว่าง", body_style),
+            "",
+        ])
+    if len(data) == 1:
+        data.append(["-", "-", "-", "ไม่มีคาบสอนในวันนี้", "", ""])
+
+    table = Table(data, colWidths=[1.2*cm, 2.4*cm, 2*cm, 3.5*cm, 5.4*cm, 4*cm])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (2, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
+        ('FONTSIZE', (0, 0), (-1, 0), 11),
+        ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('TOPPADDING', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ]))
+    elements.append(table)
+
+    elements.append(Spacer(1, 1.5 * cm))
+    elements.append(Paragraph(
+        "ลงชื่อ ........................................ ผู้จัดครูสอนแทน"
+        "&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;"
+        "ลงชื่อ ........................................ ผู้อนุมัติ",
+        ParagraphStyle('Sign', parent=body_style, fontSize=12, alignment=1)
+    ))
+
+    doc.build(elements, onFirstPage=job.pdf_page_hook,
+              onLaterPages=job.pdf_page_hook)
+    return f"พิมพ์ใบสอนแทน {len(result['periods'])} คาบ สำเร็จ"
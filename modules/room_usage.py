@@ -0,0 +1,59 @@
+"""
+modules/room_usage.py
+สรุปการใช้ห้อง (Lab, ห้องพิเศษ) ต่อห้องและต่อคาบ จากผลของ Database.get_room_usage()
+- อัตราการใช้ = จำนวนช่อง (วัน × คาบ) ที่ห้องถูกใช้ / จำนวนช่องทั้งสัปดาห์
+- นับการใช้ซ้อน (หลายห้องเรียนในห้องเดียวกัน วัน/คาบเดียวกัน) จาก bookings - days_used
+ไม่ import customtkinter
+"""
+
+from modules.timetable_model import DAYS, PERIODS
+
+
+def summarize_room_usage(rows, days=DAYS, periods=PERIODS):
+    """
+    Args:
+        rows: list of dict {room_no, period_no, days_used, bookings} จาก get_room_usage()
+        days, periods: แกนของตาราง
+    Returns:
+        dict {
+            'rooms': list of dict {room_no, by_period {คาบ: จำนวนวัน}, used, capacity,
+                                   percent, double_booked} เรียงตามชื่อห้อง,
+            'by_period': dict {คาบ: เปอร์เซ็นต์การใช้ของทุกห้องรวมกัน},
+            'percent': อัตราการใช้รวมของทุกห้อง,
+        }
+    """
+    day_count = len(days)
+    capacity = day_count * len(periods)
+    rooms = {}
+    for row in rows:
+        period = row['period_no']
+        if period not in periods:
+            continue
+        room = rooms.setdefault(row['room_no'], {
+            'room_no': row['room_no'],
+            'by_period': {p: 0 for p in periods},
+            'used': 0,
+            'capacity': capacity,
+            'double_booked': 0,
+        })
+        days_used = min(row['days_used'], day_count)
+        room['by_period'][period] = days_used
+        room['used'] += days_used
+        room['double_booked'] += row['bookings'] - row['days_used']
+
+    ordered = [rooms[name] for name in sorted(rooms)]
+    for room in ordered:
+        room['percent'] = _percent(room['used'], capacity)
+
+    room_count = len(ordered)
+    by_period = {p: _percent(sum(r['by_period'][p] for r in ordered), day_count * room_count)
+                 for p in periods}
+    return {
+        'rooms': ordered,
+        'by_period': by_period,
+        'percent': _percent(sum(r['used'] for r in ordered), capacity * room_count),
+    }
+
+
+def _percent(part, whole):
+    return round(part * 100.0 / whole, 1) if whole else 0.0
@@ -12,15 +12,21 @@ modules/schedule.py
 import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from modules.icons import IconManager
-from modules.pdf_utils import get_thai_font
+from modules.ui_fonts import FONTS
+from modules.lazy_tabs import LazyTabs
+from modules.tree_binding import TreeBinder
+from modules.timetable_canvas import TimetableCanvas, TimetableCell
+from modules.timetable_model import get_timetable, DAYS
+from modules.room_usage import summarize_room_usage
+from modules.substitutes import find_substitutes
+from modules.timetable_import import plan_import
+from modules.timetable_generator import (
+    TimetableGenerator, requirements_from_schedule, load_requirements_csv,
+    load_availability_csv, check_teachers, diff_schedules
+)
+from modules.export_jobs import ExportJobRunner
+from modules.export_cache import get_export_cache
 
 # ==================== Design System v4.0 ====================
 PRIMARY = "#3B82F6"
@@ -58,9 +64,6 @@ SUBJECT_PASTELS = [
     "#FEF9C3",  # เหลืองครีม
 ]
 
-PERIOD_LABEL_BG = "#1F2937"
-CELL_EMPTY_BG = "#F9FAFB"
-
 
 def apply_treeview_style(tree, style_name="Custom.Treeview"):
     """สไตล์ตารางตาม Design System"""
@@ -84,12 +87,27 @@ def apply_treeview_style(tree, style_name="Custom.Treeview"):
     tree.tag_configure("even", background="#FFFFFF")
 
 
+# (tag แถวคู่, tag แถวคี่) - แถวแรก (index 0) ใช้ "odd" ตามสีเดิมของตาราง
+STRIPE_TAGS = ("odd", "even")
+
+
 def get_pastel_for_subject(subject_name):
     """คืนค่า pastel color ตามชื่อวิชา (hash-based)"""
     idx = hash(subject_name) % len(SUBJECT_PASTELS)
     return SUBJECT_PASTELS[idx]
 
 
+# ชื่อ tab (ใช้ทั้งตอน add และ tab())
+TAB_CLASS_VIEW = "มุมมองห้องเรียน"
+TAB_TEACHER_VIEW = "มุมมองครู"
+TAB_TEACHER_MANAGEMENT = "จัดการครู"
+TAB_WORKLOAD = "ภาระงานครู"
+TAB_ROOM_USAGE = "การใช้ห้อง"
+TAB_SUBSTITUTES = "ครูสอนแทน"
+
+VERSION_STATUS_LABELS = {'live': "ใช้อยู่", 'draft': "ฉบับร่าง", 'archived': "เก็บถาวร"}
+
+
 class ScheduleModule:
     """โมดูลตารางเรียน - Design System v3.0"""
 
@@ -97,18 +115,41 @@ class ScheduleModule:
         self.parent = parent
         self.db = db
         self.update_status = update_status_callback
+        self.export_jobs = ExportJobRunner(parent, update_status_callback)
 
-        self.days = ["จันทร์", "อังคาร", "พุธ", "พฤหัสบดี", "ศุกร์"]
-        self.periods = list(range(1, 9))
-        self.period_times = [
-            ("08:00", "09:00"), ("09:00", "10:00"),
-            ("10:00", "11:00"), ("11:00", "12:00"),
-            ("13:00", "14:00"), ("14:00", "15:00"),
-            ("15:00", "16:00"), ("16:00", "17:00"),
-        ]
+        self.days = list(DAYS)
+        self.version_id = None      # รุ่นของตารางที่กำลังดู/แก้ไข (None = รุ่นที่ใช้อยู่)
+        self.version_options = {}
+        self.load_bell_schedule()
 
         self.create_ui()
 
+    def load_bell_schedule(self):
+        """คาบ + เวลาเรียนจากตาราง bell_schedule"""
+        bell = self.db.get_bell_schedule()
+        self.periods = [row['period_no'] for row in bell]
+        self.period_times = [(row['start_time'], row['end_time']) for row in bell]
+
+    def on_show(self):
+        """เรียกเมื่อกลับมาที่หน้านี้ (ScreenManager) - โหลดข้อมูลใหม่เฉพาะ tab ที่สร้างแล้ว"""
+        self.load_versions()
+        self.reload_tabs()
+
+    def reload_tabs(self):
+        """โหลดข้อมูลใหม่เฉพาะ tab ที่สร้างแล้ว"""
+        if self.tabs.is_built(TAB_CLASS_VIEW):
+            self.load_class_schedule()
+        if self.tabs.is_built(TAB_TEACHER_VIEW):
+            self.load_teacher_list()
+        if self.tabs.is_built(TAB_TEACHER_MANAGEMENT):
+            self.load_teachers()
+        if self.tabs.is_built(TAB_WORKLOAD):
+            self.load_workload()
+        if self.tabs.is_built(TAB_ROOM_USAGE):
+            self.load_room_usage()
+        if self.tabs.is_built(TAB_SUBSTITUTES):
+            self.load_substitute_teacher_list()
+
     def create_ui(self):
         """สร้าง UI
         ใช้ CTkScrollableFrame ครอบทั้งหมด เพื่อให้เลื่อนดูได้เมื่อเนื้อหาล้น
@@ -123,6 +164,8 @@ class ScheduleModule:
         )
         self.content_frame.pack(fill="both", expand=True)
 
+        self.create_version_bar()
+
         self.tabview = ctk.CTkTabview(
             self.content_frame, corner_radius=RADIUS_CARD,
             fg_color="#FFFFFF", border_width=1, border_color=TABLE_BORDER,
@@ -135,22 +178,90 @@ class ScheduleModule:
         )
         self.tabview.pack(fill="both", expand=True, padx=M, pady=M)
 
-        self.tabview.add("มุมมองห้องเรียน")
-        self.create_class_view_tab()
+        # สร้างเนื้อหาแต่ละ tab เมื่อถูกเลือกครั้งแรก
+        self.tabs = LazyTabs(self.tabview)
+        self.tabs.add(TAB_CLASS_VIEW, self.create_class_view_tab)
+        self.tabs.add(TAB_TEACHER_VIEW, self.create_teacher_view_tab)
+        self.tabs.add(TAB_TEACHER_MANAGEMENT, self.create_teacher_management_tab)
+        self.tabs.add(TAB_WORKLOAD, self.create_workload_tab)
+        self.tabs.add(TAB_ROOM_USAGE, self.create_room_usage_tab)
+        self.tabs.add(TAB_SUBSTITUTES, self.create_substitutes_tab)
 
-        self.tabview.add("มุมมองครู")
-        self.create_teacher_view_tab()
+    def create_version_bar(self):
+        """แถบเลือกรุ่นของตาราง (ตามภาคเรียน) + ฉบับร่าง + เวลาเรียน"""
+
+        bar = ctk.CTkFrame(
+            self.content_frame, fg_color="#F8FAFC", corner_radius=RADIUS_CARD,
+            border_width=1, border_color="#E5E7EB"
+        )
+        bar.pack(fill="x", padx=M, pady=(M, 0))
 
-        self.tabview.add("จัดการครู")
-        self.create_teacher_management_tab()
+        inner = ctk.CTkFrame(bar, fg_color="transparent")
+        inner.pack(fill="x", padx=M, pady=S)
 
-        self.tabview.add("ภาระงานครู")
-        self.create_workload_tab()
+        ctk.CTkLabel(
+            inner, text="รุ่นตาราง:",
+            font=FONTS.style("body_bold"),
+            text_color=TEXT_H3
+        ).pack(side="left", padx=(0, S))
+
+        self.version_var = ctk.StringVar()
+        self.version_menu = ctk.CTkOptionMenu(
+            inner, variable=self.version_var,
+            values=["-"], width=300, height=36,
+            fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
+            text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
+            dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
+            corner_radius=20,
+            font=FONTS.style("body"),
+            command=self.on_version_change
+        )
+        self.version_menu.pack(side="left", padx=(0, M))
+
+        ctk.CTkButton(
+            inner, text="สร้างฉบับร่าง",
+            command=self.create_timetable_draft,
+            font=FONTS.style("body"),
+            width=120, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=PRIMARY, text_color=PRIMARY,
+            hover_color="#EFF6FF",
+            image=IconManager.get("plus", 14, color=PRIMARY, dark_color=PRIMARY), compound="left"
+        ).pack(side="left", padx=(0, S))
+
+        self.publish_btn = ctk.CTkButton(
+            inner, text="ใช้เป็นตารางปัจจุบัน",
+            command=self.publish_timetable_version,
+            font=FONTS.style("body"),
+            width=150, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=SUCCESS, text_color=SUCCESS,
+            hover_color="#F0FDF4",
+            image=IconManager.get("check-double", 14, color=SUCCESS, dark_color=SUCCESS), compound="left"
+        )
+        self.publish_btn.pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            inner, text="เวลาเรียน",
+            command=self.open_bell_schedule,
+            font=FONTS.style("body"),
+            width=100, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL,
+            hover_color="#F3F4F6",
+            image=IconManager.get("clock", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="right")
+
+        self.load_versions()
 
     def create_class_view_tab(self):
         """Tab มุมมองห้องเรียน"""
 
-        tab = self.tabview.tab("มุมมองห้องเรียน")
+        tab = self.tabview.tab(TAB_CLASS_VIEW)
 
         # การ์ดควบคุม: ปุ่ม action + ปุ่มเลือกห้อง
         control_card = ctk.CTkFrame(
@@ -166,7 +277,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="โหลดข้อมูล",
             command=self.load_class_schedule,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=110, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
@@ -176,7 +287,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="เพิ่มคาบเรียน",
             command=self.add_schedule,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=130, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -185,10 +296,34 @@ class ScheduleModule:
             image=IconManager.get("plus", 14, color=SUCCESS, dark_color=SUCCESS), compound="left"
         ).pack(side="left", padx=(0, S))
 
+        ctk.CTkButton(
+            top_frame, text="จัดตารางอัตโนมัติ",
+            command=self.open_timetable_generator,
+            font=FONTS.style("body"),
+            width=150, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=PRIMARY, text_color=PRIMARY,
+            hover_color="#EFF6FF",
+            image=IconManager.get("wand-magic-sparkles", 14, color=PRIMARY, dark_color=PRIMARY), compound="left"
+        ).pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            top_frame, text="นำเข้าตาราง",
+            command=self.import_timetable,
+            font=FONTS.style("body"),
+            width=120, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL,
+            hover_color="#F3F4F6",
+            image=IconManager.get("file-import", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left", padx=(0, S))
+
         ctk.CTkButton(
             top_frame, text="Export PDF",
             command=self.export_class_schedule_pdf,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -203,7 +338,7 @@ class ScheduleModule:
 
         ctk.CTkLabel(
             room_frame, text="เลือกห้อง:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -220,10 +355,10 @@ class ScheduleModule:
             values=class_options, width=160, height=36,
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             dropdown_fg_color="#F0F4FF", dropdown_hover_color="#DBEAFE",
             dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             command=lambda x: self.load_class_schedule()
         )
         self.class_room_menu.pack(side="left")
@@ -243,7 +378,7 @@ class ScheduleModule:
     def create_teacher_view_tab(self):
         """Tab มุมมองครู"""
 
-        tab = self.tabview.tab("มุมมองครู")
+        tab = self.tabview.tab(TAB_TEACHER_VIEW)
 
         # การ์ดควบคุม: ตัวเลือกครู + ปุ่ม action
         control_card = ctk.CTkFrame(
@@ -257,7 +392,7 @@ class ScheduleModule:
 
         ctk.CTkLabel(
             top_frame, text="เลือกครู:",
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             text_color=TEXT_H3
         ).pack(side="left", padx=(0, S))
 
@@ -268,9 +403,9 @@ class ScheduleModule:
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             command=lambda x: self.load_teacher_schedule()
         )
         self.teacher_menu.pack(side="left", padx=(0, M))
@@ -278,7 +413,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="โหลดข้อมูล",
             command=self.load_teacher_schedule,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=110, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
@@ -288,7 +423,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="Export PDF",
             command=self.export_teacher_schedule_pdf,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -310,7 +445,7 @@ class ScheduleModule:
     def create_teacher_management_tab(self):
         """Tab จัดการครู"""
 
-        tab = self.tabview.tab("จัดการครู")
+        tab = self.tabview.tab(TAB_TEACHER_MANAGEMENT)
 
         # การ์ดควบคุม: ปุ่ม action
         control_card = ctk.CTkFrame(
@@ -325,7 +460,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="เพิ่มครู",
             command=self.add_teacher,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=110, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
@@ -335,7 +470,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="รีเฟรช",
             command=self.load_teachers,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=90, height=36,
             corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
@@ -362,6 +497,7 @@ class ScheduleModule:
         self.teacher_tree.column("phone", width=150, anchor="center")
 
         apply_treeview_style(self.teacher_tree, "Teacher.Treeview")
+        self.teacher_binder = TreeBinder(self.teacher_tree, stripe_tags=STRIPE_TAGS)
 
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.teacher_tree.yview)
         self.teacher_tree.configure(yscrollcommand=scrollbar.set)
@@ -375,7 +511,7 @@ class ScheduleModule:
 
         ctk.CTkButton(
             btn_frame, text="แก้ไข", command=self.edit_teacher,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=90, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=PRIMARY, text_color=PRIMARY, hover_color="#EFF6FF",
@@ -384,7 +520,7 @@ class ScheduleModule:
 
         ctk.CTkButton(
             btn_frame, text="ลบ", command=self.delete_teacher,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=80, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=DANGER, text_color=DANGER, hover_color="#FEF2F2",
@@ -396,7 +532,7 @@ class ScheduleModule:
     def create_workload_tab(self):
         """Tab ภาระงานครู"""
 
-        tab = self.tabview.tab("ภาระงานครู")
+        tab = self.tabview.tab(TAB_WORKLOAD)
 
         # การ์ดควบคุม: ปุ่ม action
         control_card = ctk.CTkFrame(
@@ -411,7 +547,7 @@ class ScheduleModule:
         ctk.CTkButton(
             top_frame, text="รีเฟรช",
             command=self.load_workload,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=90, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
@@ -436,6 +572,7 @@ class ScheduleModule:
         self.workload_tree.column("periods", width=200, anchor="center")
 
         apply_treeview_style(self.workload_tree, "Workload.Treeview")
+        self.workload_binder = TreeBinder(self.workload_tree, stripe_tags=STRIPE_TAGS)
 
         scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.workload_tree.yview)
         self.workload_tree.configure(yscrollcommand=scrollbar.set)
@@ -444,117 +581,292 @@ class ScheduleModule:
 
         self.load_workload()
 
-    # ==================== FUNCTIONS ====================
+    def create_room_usage_tab(self):
+        """Tab การใช้ห้อง: อัตราการใช้ต่อห้อง × คาบ + ห้องที่ถูกใช้ซ้อน"""
 
-    def load_class_schedule(self):
-        """โหลดตารางเรียน - Pastel cells, radius 8px, min height 60px"""
+        tab = self.tabview.tab(TAB_ROOM_USAGE)
 
-        for widget in self.class_schedule_frame.winfo_children():
-            widget.destroy()
+        control_card = ctk.CTkFrame(
+            tab, fg_color="#F8FAFC", corner_radius=RADIUS_CARD,
+            border_width=1, border_color="#E5E7EB"
+        )
+        control_card.pack(fill="x", padx=M, pady=(M, S))
 
-        class_room = self.class_var.get()
-        if not class_room:
-            ctk.CTkLabel(
-                self.class_schedule_frame,
-                text="กรุณาเลือกห้องเรียน",
-                font=ctk.CTkFont(family="TH Sarabun New", size=16),
-                text_color=TEXT_CAPTION
-            ).pack(pady=XXL)
-            return
+        top_frame = ctk.CTkFrame(control_card, fg_color="transparent")
+        top_frame.pack(fill="x", padx=M, pady=M)
+
+        ctk.CTkButton(
+            top_frame, text="รีเฟรช",
+            command=self.load_room_usage,
+            font=FONTS.style("body"),
+            width=90, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
+            image=IconManager.get("rotate", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            top_frame, text="Export Excel",
+            command=self.export_room_usage_excel,
+            font=FONTS.style("body"),
+            width=110, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
+            image=IconManager.get("file-export", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left")
+
+        self.room_usage_summary = ctk.CTkLabel(
+            top_frame, text="",
+            font=FONTS.style("body"),
+            text_color=TEXT_BODY
+        )
+        self.room_usage_summary.pack(side="right")
+
+        self.room_conflict_label = ctk.CTkLabel(
+            tab, text="",
+            font=FONTS.style("body_bold"),
+            text_color=DANGER, anchor="w", justify="left"
+        )
+
+        table_frame = ctk.CTkFrame(
+            tab, fg_color="#FFFFFF", corner_radius=RADIUS_CARD,
+            border_width=1, border_color=TABLE_BORDER
+        )
+        table_frame.pack(fill="both", expand=True, padx=M, pady=S)
+        self.room_usage_table = table_frame
+
+        self.room_usage_tree = ttk.Treeview(table_frame, show="headings", height=15)
+        self._configure_room_usage_columns()
+
+        apply_treeview_style(self.room_usage_tree, "RoomUsage.Treeview")
+        self.room_usage_binder = TreeBinder(self.room_usage_tree, stripe_tags=STRIPE_TAGS)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.room_usage_tree.yview)
+        self.room_usage_tree.configure(yscrollcommand=scrollbar.set)
+        self.room_usage_tree.pack(side="left", fill="both", expand=True, padx=(S, 0), pady=S)
+        scrollbar.pack(side="right", fill="y", pady=S, padx=(0, XS))
+
+        self.load_room_usage()
+
+    def create_substitutes_tab(self):
+        """Tab ครูสอนแทน: เลือกครูที่ลา + วันที่ -> คาบที่ต้องหาคนสอนแทนและครูที่ว่าง"""
+
+        tab = self.tabview.tab(TAB_SUBSTITUTES)
 
-        schedules = self.db.get_schedule_by_class(class_room)
+        control_card = ctk.CTkFrame(
+            tab, fg_color="#F8FAFC", corner_radius=RADIUS_CARD,
+            border_width=1, border_color="#E5E7EB"
+        )
+        control_card.pack(fill="x", padx=M, pady=(M, S))
+
+        top_frame = ctk.CTkFrame(control_card, fg_color="transparent")
+        top_frame.pack(fill="x", padx=M, pady=M)
 
-        # หัวข้อ (H2)
         ctk.CTkLabel(
-            self.class_schedule_frame,
-            text=f"ตารางเรียนห้อง {class_room}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=20, weight="bold"),
-            text_color=TEXT_H2
-        ).grid(row=0, column=0, columnspan=6, pady=(M, S))
+            top_frame, text="ครูที่ลา:",
+            font=FONTS.style("body_bold"),
+            text_color=TEXT_H3
+        ).pack(side="left", padx=(0, S))
+
+        self.absent_teacher_var = ctk.StringVar()
+        self.absent_teacher_menu = ctk.CTkOptionMenu(
+            top_frame, variable=self.absent_teacher_var,
+            values=["เลือกครู"], width=280, height=36,
+            fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
+            text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
+            dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
+            corner_radius=20,
+            font=FONTS.style("body"),
+            command=lambda x: self.load_substitutes()
+        )
+        self.absent_teacher_menu.pack(side="left", padx=(0, M))
 
-        # หัวคอลัมน์
         ctk.CTkLabel(
-            self.class_schedule_frame, text="คาบ/วัน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
-            fg_color=PERIOD_LABEL_BG, text_color="white",
-            corner_radius=RADIUS_BUTTON, width=90, height=40
-        ).grid(row=1, column=0, padx=2, pady=2, sticky="nsew")
+            top_frame, text="วันที่:",
+            font=FONTS.style("body_bold"),
+            text_color=TEXT_H3
+        ).pack(side="left", padx=(0, S))
 
-        for col, day in enumerate(self.days, start=1):
-            ctk.CTkLabel(
-                self.class_schedule_frame, text=day,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
-                fg_color=PRIMARY, text_color="#FFFFFF",
-                corner_radius=RADIUS_BUTTON, height=40
-            ).grid(row=1, column=col, padx=2, pady=2, sticky="nsew")
-            self.class_schedule_frame.grid_columnconfigure(col, weight=1)
-
-        schedule_dict = {}
-        for s in schedules:
-            key = (s['day_of_week'], s['period_no'])
-            schedule_dict[key] = s
+        self.absent_date_var = ctk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+        ctk.CTkEntry(
+            top_frame, textvariable=self.absent_date_var,
+            width=130, height=36,
+            font=FONTS.style("body"),
+            corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
+            placeholder_text="YYYY-MM-DD"
+        ).pack(side="left", padx=(0, M))
 
-        if not schedules:
-            ctk.CTkLabel(
-                self.class_schedule_frame,
-                text="ยังไม่มีตารางเรียน กด '+ เพิ่มคาบเรียน' เพื่อเริ่มต้น",
-                font=ctk.CTkFont(family="TH Sarabun New", size=16),
-                text_color=TEXT_CAPTION
-            ).grid(row=2, column=0, columnspan=6, pady=XXL)
+        ctk.CTkButton(
+            top_frame, text="ค้นหาครูว่าง",
+            command=self.load_substitutes,
+            font=FONTS.style("body_bold"),
+            width=120, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color=PRIMARY, hover_color="#1D4ED8",
+            image=IconManager.get_white("magnifying-glass", 14), compound="left"
+        ).pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            top_frame, text="พิมพ์ใบสอนแทน",
+            command=self.export_substitution_pdf,
+            font=FONTS.style("body"),
+            width=130, height=36,
+            corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL,
+            hover_color="#F3F4F6",
+            image=IconManager.get("file-pdf", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left")
+
+        self.substitute_summary = ctk.CTkLabel(
+            tab, text="",
+            font=FONTS.style("body"),
+            text_color=TEXT_BODY, anchor="w"
+        )
+        self.substitute_summary.pack(fill="x", padx=M, pady=(0, S))
+
+        table_frame = ctk.CTkFrame(
+            tab, fg_color="#FFFFFF", corner_radius=RADIUS_CARD,
+            border_width=1, border_color=TABLE_BORDER
+        )
+        table_frame.pack(fill="both", expand=True, padx=M, pady=S)
+
+        columns = ("period", "time", "class_room", "subject", "room", "candidates")
+        self.substitute_tree = ttk.Treeview(table_frame, columns=columns, show="headings", height=10)
+        for column, text, width, anchor in (
+            ("period", "คาบ", 60, "center"),
+            ("time", "เวลา", 110, "center"),
+            ("class_room", "ห้องเรียน", 90, "center"),
+            ("subject", "วิชา", 160, "w"),
+            ("room", "ห้อง", 80, "center"),
+            ("candidates", "ครูที่ว่าง (ภาระงานน้อยก่อน)", 420, "w"),
+        ):
+            self.substitute_tree.heading(column, text=text)
+            self.substitute_tree.column(column, width=width, anchor=anchor)
+
+        apply_treeview_style(self.substitute_tree, "Substitute.Treeview")
+        self.substitute_binder = TreeBinder(self.substitute_tree, stripe_tags=STRIPE_TAGS)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.substitute_tree.yview)
+        self.substitute_tree.configure(yscrollcommand=scrollbar.set)
+        self.substitute_tree.pack(side="left", fill="both", expand=True, padx=(S, 0), pady=S)
+        scrollbar.pack(side="right", fill="y", pady=S, padx=(0, XS))
+
+        self.load_substitute_teacher_list()
+
+    # ==================== FUNCTIONS ====================
+
+    def load_versions(self):
+        """โหลดรายการรุ่นของตาราง - คงรุ่นที่เลือกไว้ถ้ายังมีอยู่ ไม่งั้นกลับไปรุ่นที่ใช้อยู่"""
+        versions = self.db.get_timetable_versions()
+        self.version_options = {}
+        for v in versions:
+            label = f"{v['term']} - {v['name'] or 'ไม่มีชื่อ'} ({VERSION_STATUS_LABELS.get(v['status'], v['status'])})"
+            self.version_options[label] = v['id']
+
+        live_id = self.db.live_version_id()
+        if self.version_id not in self.version_options.values() or self.version_id == live_id:
+            self.version_id = None
+        current = self.version_id or live_id
+        self.version_menu.configure(values=list(self.version_options) or ["-"])
+        self.version_var.set(next((label for label, vid in self.version_options.items() if vid == current), "-"))
+        self.publish_btn.configure(state="normal" if self.version_id else "disabled")
+
+    def on_version_change(self, choice):
+        """เปลี่ยนรุ่นของตารางที่ดู/แก้ไข"""
+        version_id = self.version_options.get(choice)
+        self.version_id = None if version_id in (None, self.db.live_version_id()) else version_id
+        self.publish_btn.configure(state="normal" if self.version_id else "disabled")
+        self.reload_tabs()
+        self.update_status(f"แสดงตารางรุ่น {choice}", "info")
+
+    def create_timetable_draft(self):
+        """สร้างฉบับร่างจากรุ่นที่เลือกอยู่ (ยังไม่คัดลอกแถว - คัดลอกเมื่อแก้ไขครั้งแรก)"""
+        dialog = ctk.CTkInputDialog(
+            title="สร้างฉบับร่างตารางเรียน",
+            text="ภาคเรียนของฉบับร่าง (เช่น 2569/2):"
+        )
+        term = (dialog.get_input() or "").strip()
+        if not term:
             return
 
-        for row, period in enumerate(self.periods, start=2):
-            start_time, end_time = self.period_times[period - 1]
-            ctk.CTkLabel(
-                self.class_schedule_frame,
-                text=f"คาบ {period}\n{start_time}-{end_time}",
-                font=ctk.CTkFont(family="TH Sarabun New", size=12, weight="bold"),
-                fg_color=PERIOD_LABEL_BG, text_color="white",
-                corner_radius=RADIUS_BUTTON, height=60
-            ).grid(row=row, column=0, padx=2, pady=2, sticky="nsew")
-
-            for col, day in enumerate(self.days, start=1):
-                key = (day, period)
-                if key in schedule_dict:
-                    s = schedule_dict[key]
-                    teacher_name = f"{s['title']}{s['first_name']} {s['last_name']}"
-                    fg_color = get_pastel_for_subject(s['subject_name'])
-
-                    cell = ctk.CTkFrame(
-                        self.class_schedule_frame,
-                        fg_color=fg_color, corner_radius=RADIUS_BUTTON,
-                        height=60
-                    )
-                    cell.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
-                    cell.grid_propagate(False)
-                    cell.pack_propagate(False)
-
-                    ctk.CTkLabel(
-                        cell, text=s['subject_name'],
-                        font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
-                        text_color=TEXT_H2, fg_color="transparent"
-                    ).pack(anchor="w", padx=S, pady=(S, 0))
-
-                    ctk.CTkLabel(
-                        cell, text=teacher_name,
-                        font=ctk.CTkFont(family="TH Sarabun New", size=11),
-                        text_color=TEXT_CAPTION, fg_color="transparent"
-                    ).pack(anchor="w", padx=S, pady=(0, S))
-
-                    schedule_id = s['id']
-                    cell.bind("<Button-1>", lambda e, sid=schedule_id: self.edit_schedule_entry(sid))
-                    for child in cell.winfo_children():
-                        child.bind("<Button-1>", lambda e, sid=schedule_id: self.edit_schedule_entry(sid))
-                else:
-                    ctk.CTkLabel(
-                        self.class_schedule_frame, text="-",
-                        font=ctk.CTkFont(family="TH Sarabun New", size=13),
-                        fg_color=CELL_EMPTY_BG, text_color="#D1D5DB",
-                        corner_radius=RADIUS_BUTTON, height=60
-                    ).grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
+        based_on = self.version_id or self.db.live_version_id()
+        version_id = self.db.create_timetable_version(term, f"ฉบับร่าง {term}", based_on)
+        if version_id is None:
+            messagebox.showerror("ผิดพลาด", "ไม่สามารถสร้างฉบับร่างได้")
+            return
+        self.version_id = version_id
+        self.load_versions()
+        self.reload_tabs()
+        self.update_status(f"สร้างฉบับร่างภาคเรียน {term} เรียบร้อย", "success")
+
+    def publish_timetable_version(self):
+        """ใช้รุ่นที่เลือกเป็นตารางเรียนปัจจุบัน"""
+        if not self.version_id:
+            return
+        label = self.version_var.get()
+        if not messagebox.askyesno("ยืนยัน", f"ใช้ '{label}' เป็นตารางเรียนปัจจุบัน?\n"
+                                              "ตารางที่ใช้อยู่เดิมจะถูกเก็บถาวร"):
+            return
+
+        if self.db.publish_timetable_version(self.version_id):
+            self.version_id = None
+            self.load_versions()
+            self.reload_tabs()
+            self.update_status("เปลี่ยนตารางเรียนปัจจุบันเรียบร้อย", "success")
+        else:
+            messagebox.showerror("ผิดพลาด", "ไม่สามารถเปลี่ยนตารางเรียนปัจจุบันได้")
+
+    def open_bell_schedule(self):
+        """เปิดหน้าต่างตั้งเวลาเรียน"""
+        BellScheduleDialog(self.parent, self.db, self.on_bell_schedule_saved, self.update_status)
+
+    def on_bell_schedule_saved(self):
+        """จำนวนคาบ/เวลาเปลี่ยน - สร้างตารางใหม่ตามแกนใหม่"""
+        self.load_bell_schedule()
+        for attr in ("class_timetable", "teacher_timetable"):
+            panel = getattr(self, attr, None)
+            if panel is not None:
+                panel.destroy()
+                setattr(self, attr, None)
+        self.reload_tabs()
+
+    def load_class_schedule(self):
+        """โหลดตารางเรียน - Pastel cells, radius 8px, min height 60px (วาดบน Canvas ตัวเดียว)"""
+
+        class_room = self.class_var.get()
+        panel = self._get_timetable_panel("class_timetable", self.class_schedule_frame,
+                                          self._on_class_cell_click)
+        if not class_room:
+            panel.show_message("กรุณาเลือกห้องเรียน")
+            return
+
+        grid = get_timetable(self.db, self.version_id).class_grid(class_room)
+        title = f"ตารางเรียนห้อง {class_room}"
+        if not grid:
+            panel.show_message("ยังไม่มีตารางเรียน กด '+ เพิ่มคาบเรียน' เพื่อเริ่มต้น", title=title)
+        else:
+            cells = {}
+            for key, s in grid.items():
+                cells[key] = TimetableCell(
+                    s['subject_name'], f"{s['title']}{s['first_name']} {s['last_name']}",
+                    get_pastel_for_subject(s['subject_name']), payload=s['id'])
+            panel.show_cells(title, cells)
 
         self.update_status(f"โหลดตารางห้อง {class_room} เรียบร้อย", "success")
 
+    def _get_timetable_panel(self, attr, host, on_cell_click=None):
+        """_TimetablePanel ของ host (สร้างครั้งแรก แล้วใช้ตัวเดิมทุกครั้งที่โหลดใหม่)"""
+        panel = getattr(self, attr, None)
+        if panel is None or not panel.winfo_exists():
+            panel = _TimetablePanel(host, self.days, self.periods, self.period_times, on_cell_click)
+            setattr(self, attr, panel)
+        return panel
+
+    def _on_class_cell_click(self, day, period, schedule_id):
+        self.edit_schedule_entry(schedule_id)
+
     def load_teacher_list(self):
         """โหลดรายชื่อครู"""
         teachers = self.db.get_all_teachers()
@@ -565,124 +877,207 @@ class ScheduleModule:
             self.load_teacher_schedule()
 
     def load_teacher_schedule(self):
-        """โหลดตารางสอน - Pastel cells, radius 8px, min height 60px"""
-
-        for widget in self.teacher_schedule_frame.winfo_children():
-            widget.destroy()
+        """โหลดตารางสอน - Pastel cells, radius 8px, min height 60px (วาดบน Canvas ตัวเดียว)"""
 
+        panel = self._get_timetable_panel("teacher_timetable", self.teacher_schedule_frame)
         selected = self.teacher_var.get()
         if not selected or selected == "เลือกครู":
+            panel.clear()
             return
 
         teacher_id = selected.split(" - ")[0]
         teacher = self.db.get_teacher_by_id(teacher_id)
         teacher_name = f"{teacher['title']}{teacher['first_name']} {teacher['last_name']}"
 
-        schedules = self.db.get_schedule_by_teacher(teacher_id)
-
-        ctk.CTkLabel(
-            self.teacher_schedule_frame,
-            text=f"ตารางสอนของครู {teacher_name}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=20, weight="bold"),
-            text_color=TEXT_H2
-        ).grid(row=0, column=0, columnspan=6, pady=(M, S))
-
-        ctk.CTkLabel(
-            self.teacher_schedule_frame, text="คาบ/วัน",
-            font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
-            fg_color=PERIOD_LABEL_BG, text_color="white",
-            corner_radius=RADIUS_BUTTON, width=90, height=40
-        ).grid(row=1, column=0, padx=2, pady=2, sticky="nsew")
-
-        for col, day in enumerate(self.days, start=1):
-            ctk.CTkLabel(
-                self.teacher_schedule_frame, text=day,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
-                fg_color=PRIMARY, text_color="#FFFFFF",
-                corner_radius=RADIUS_BUTTON, height=40
-            ).grid(row=1, column=col, padx=2, pady=2, sticky="nsew")
-            self.teacher_schedule_frame.grid_columnconfigure(col, weight=1)
-
-        schedule_dict = {}
-        for s in schedules:
-            key = (s['day_of_week'], s['period_no'])
-            schedule_dict[key] = s
-
-        for row, period in enumerate(self.periods, start=2):
-            start_time, end_time = self.period_times[period - 1]
-            ctk.CTkLabel(
-                self.teacher_schedule_frame,
-                text=f"คาบ {period}\n{start_time}-{end_time}",
-                font=ctk.CTkFont(family="TH Sarabun New", size=12, weight="bold"),
-                fg_color=PERIOD_LABEL_BG, text_color="white",
-                corner_radius=RADIUS_BUTTON, height=60
-            ).grid(row=row, column=0, padx=2, pady=2, sticky="nsew")
-
-            for col, day in enumerate(self.days, start=1):
-                key = (day, period)
-                if key in schedule_dict:
-                    s = schedule_dict[key]
-                    fg_color = get_pastel_for_subject(s['subject_name'])
-
-                    cell = ctk.CTkFrame(
-                        self.teacher_schedule_frame,
-                        fg_color=fg_color, corner_radius=RADIUS_BUTTON,
-                        height=60
-                    )
-                    cell.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
-                    cell.grid_propagate(False)
-                    cell.pack_propagate(False)
-
-                    ctk.CTkLabel(
-                        cell, text=s['subject_name'],
-                        font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
-                        text_color=TEXT_H2, fg_color="transparent"
-                    ).pack(anchor="w", padx=S, pady=(S, 0))
-
-                    ctk.CTkLabel(
-                        cell, text=f"ห้อง {s['class_room']}",
-                        font=ctk.CTkFont(family="TH Sarabun New", size=11),
-                        text_color=TEXT_CAPTION, fg_color="transparent"
-                    ).pack(anchor="w", padx=S, pady=(0, S))
-                else:
-                    ctk.CTkLabel(
-                        self.teacher_schedule_frame, text="-",
-                        font=ctk.CTkFont(family="TH Sarabun New", size=13),
-                        fg_color=CELL_EMPTY_BG, text_color="#D1D5DB",
-                        corner_radius=RADIUS_BUTTON, height=60
-                    ).grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
+        cells = {}
+        for key, s in get_timetable(self.db, self.version_id).teacher_grid(teacher_id).items():
+            cells[key] = TimetableCell(
+                s['subject_name'], f"ห้อง {s['class_room']}",
+                get_pastel_for_subject(s['subject_name']), payload=s['id'])
+        panel.show_cells(f"ตารางสอนของครู {teacher_name}", cells)
 
         self.update_status(f"โหลดตารางสอน {teacher_name} เรียบร้อย", "success")
 
     def load_teachers(self):
         """โหลดข้อมูลครู"""
-        for item in self.teacher_tree.get_children():
-            self.teacher_tree.delete(item)
-
         teachers = self.db.get_all_teachers()
-        for idx, teacher in enumerate(teachers):
-            name = f"{teacher['title']}{teacher['first_name']} {teacher['last_name']}"
-            tag = "odd" if idx % 2 == 0 else "even"
-            self.teacher_tree.insert("", "end", values=(
-                teacher['teacher_id'], name, teacher['phone'] or "-"
-            ), tags=(tag,))
+        self.teacher_binder.bind(
+            (teacher['teacher_id'], (
+                teacher['teacher_id'],
+                f"{teacher['title']}{teacher['first_name']} {teacher['last_name']}",
+                teacher['phone'] or "-"
+            )) for teacher in teachers
+        )
 
         self.update_status(f"โหลดข้อมูลครู {len(teachers)} คน", "success")
 
     def load_workload(self):
         """โหลดภาระงานครู"""
-        for item in self.workload_tree.get_children():
-            self.workload_tree.delete(item)
-
-        workloads = self.db.get_teacher_workload()
-        for idx, w in enumerate(workloads):
-            tag = "odd" if idx % 2 == 0 else "even"
-            self.workload_tree.insert("", "end", values=(
-                w['teacher_id'], w['name'], f"{w['periods_per_week']} คาบ"
-            ), tags=(tag,))
+        workloads = self.db.get_teacher_workload(self.version_id)
+        self.workload_binder.bind(
+            (w['teacher_id'], (w['teacher_id'], w['name'], f"{w['periods_per_week']} คาบ"))
+            for w in workloads
+        )
 
         self.update_status("โหลดภาระงานครูเรียบร้อย", "success")
 
+    def _configure_room_usage_columns(self):
+        """คอลัมน์ของตารางการใช้ห้องตามคาบใน bell_schedule (ตั้งใหม่เมื่อจำนวนคาบเปลี่ยน)"""
+        tree = self.room_usage_tree
+        columns = ("room_no",) + tuple(f"p{p}" for p in self.periods) + ("used", "percent", "double")
+        if tuple(tree["columns"]) == columns:
+            return
+        tree.configure(columns=columns)
+        tree.heading("room_no", text="ห้อง")
+        tree.column("room_no", width=120)
+        for p in self.periods:
+            tree.heading(f"p{p}", text=f"คาบ {p}")
+            tree.column(f"p{p}", width=70, anchor="center")
+        tree.heading("used", text="ใช้ (ช่อง)")
+        tree.heading("percent", text="อัตราการใช้")
+        tree.heading("double", text="ใช้ซ้อน")
+        tree.column("used", width=90, anchor="center")
+        tree.column("percent", width=100, anchor="center")
+        tree.column("double", width=80, anchor="center")
+
+    def load_room_usage(self):
+        """โหลดการใช้ห้อง - ตัวเลขต่อคาบ = จำนวนวันที่ห้องถูกใช้ (เต็ม 5)"""
+        self._configure_room_usage_columns()
+        summary = summarize_room_usage(self.db.get_room_usage(self.version_id), self.days, self.periods)
+        day_count = len(self.days)
+        rows = [(room['room_no'], (
+            room['room_no'],
+            *(f"{room['by_period'][p]}/{day_count}" for p in self.periods),
+            f"{room['used']}/{room['capacity']}",
+            f"{room['percent']:.1f}%",
+            room['double_booked'] or "-",
+        )) for room in summary['rooms']]
+        self.room_usage_binder.bind(rows)
+        self.room_usage_summary.configure(
+            text=f"{len(summary['rooms'])} ห้อง - ใช้รวม {summary['percent']:.1f}%")
+
+        conflicts = self.db.get_room_conflicts(self.version_id)
+        if conflicts:
+            lines = [f"ห้อง {c['room_no']} วัน{c['day_of_week']} คาบ {c['period_no']}: {c['class_rooms']}"
+                     for c in conflicts[:5]]
+            if len(conflicts) > 5:
+                lines.append(f"และอีก {len(conflicts) - 5} ช่อง")
+            self.room_conflict_label.configure(text="ห้องถูกใช้ซ้อน:\n" + "\n".join(lines))
+            self.room_conflict_label.pack(fill="x", padx=M, pady=(0, S), before=self.room_usage_table)
+        else:
+            self.room_conflict_label.pack_forget()
+
+        self.update_status("โหลดการใช้ห้องเรียบร้อย", "success")
+
+    def export_room_usage_excel(self):
+        """Export การใช้ห้องเป็น Excel"""
+        file_path = filedialog.asksaveasfilename(
+            title="บันทึกไฟล์ Excel",
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")],
+            initialfile=f"การใช้ห้อง_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+        if not file_path:
+            return
+
+        version_id = self.version_id
+
+        def build(job):
+            from modules.report_renderers import render_room_usage_excel
+            return render_room_usage_excel(job.db, job.output_path, job, version_id=version_id)
+
+        self.export_jobs.submit("Export การใช้ห้องเป็น Excel", build, file_path, db=self.db,
+                                error_message="ไม่สามารถ Export ได้")
+
+    def load_substitute_teacher_list(self):
+        """โหลดรายชื่อครูสำหรับเลือกครูที่ลา (คงครูที่เลือกไว้ถ้ายังอยู่)"""
+        teachers = self.db.get_all_teachers()
+        options = [f"{t['teacher_id']} - {t['title']}{t['first_name']} {t['last_name']}" for t in teachers]
+        if not options:
+            return
+        self.absent_teacher_menu.configure(values=options)
+        if self.absent_teacher_var.get() not in options:
+            self.absent_teacher_var.set(options[0])
+        self.load_substitutes()
+
+    def _selected_absence(self):
+        """
+        Returns:
+            (teacher_id, date) ที่เลือก หรือ None (แจ้งเตือนแล้ว)
+        """
+        selected = self.absent_teacher_var.get()
+        if not selected or selected == "เลือกครู":
+            messagebox.showwarning("คำเตือน", "กรุณาเลือกครู")
+            return None
+        date = self.absent_date_var.get().strip()
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            messagebox.showwarning("รูปแบบวันที่ผิด", "กรุณากรอกวันที่ในรูปแบบ YYYY-MM-DD\nเช่น 2026-02-24")
+            return None
+        return selected.split(" - ")[0], date
+
+    def load_substitutes(self):
+        """หาครูที่ว่างสำหรับทุกคาบของครูที่ลาในวันนั้น"""
+        absence = self._selected_absence()
+        if absence is None:
+            return
+        teacher_id, date = absence
+
+        result = find_substitutes(self.db, teacher_id, date)
+        period_times = dict(zip(self.periods, self.period_times))
+        rows = []
+        for item in result['periods']:
+            entry = item['entry']
+            start, end = period_times.get(item['period_no'], ("", ""))
+            names = [f"{c['name']} ({c['periods_per_week']} คาบ/สัปดาห์)" for c in item['candidates'][:5]]
+            if len(item['candidates']) > 5:
+                names.append(f"+{len(item['candidates']) - 5}")
+            rows.append((entry['id'], (
+                item['period_no'],
+                f"{start}-{end}" if start else "-",
+                entry['class_room'],
+                entry['subject_name'],
+                entry.get('room_no') or "-",
+                ", ".join(names) or "ไม่มีครูว่าง",
+            )))
+        self.substitute_binder.bind(rows)
+
+        if result['day_of_week'] is None:
+            summary = f"{date} เป็นวันหยุด - ไม่มีคาบสอน"
+        elif not rows:
+            summary = f"วัน{result['day_of_week']} ที่ {date} ไม่มีคาบสอน"
+        else:
+            uncovered = sum(1 for item in result['periods'] if not item['candidates'])
+            summary = f"วัน{result['day_of_week']} ที่ {date}: ต้องหาครูสอนแทน {len(rows)} คาบ"
+            if uncovered:
+                summary += f" (ไม่มีครูว่าง {uncovered} คาบ)"
+        self.substitute_summary.configure(text=summary)
+        self.update_status(summary, "success")
+
+    def export_substitution_pdf(self):
+        """พิมพ์ใบสอนแทนเป็น PDF"""
+        absence = self._selected_absence()
+        if absence is None:
+            return
+        teacher_id, date = absence
+
+        file_path = filedialog.asksaveasfilename(
+            title="บันทึกไฟล์ PDF",
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf")],
+            initialfile=f"สอนแทน_{teacher_id}_{date.replace('-', '')}.pdf"
+        )
+        if not file_path:
+            return
+
+        def build(job):
+            from modules.report_renderers import render_substitution_pdf
+            return render_substitution_pdf(job.db, job.output_path, teacher_id, date, job)
+
+        self.export_jobs.submit("พิมพ์ใบสอนแทน", build, file_path, db=self.db,
+                                error_message="ไม่สามารถ Export PDF ได้")
+
     def add_teacher(self):
         """เพิ่มครู"""
         TeacherDialog(self.parent, self.db, None, self.load_teachers, self.update_status)
@@ -725,17 +1120,70 @@ class ScheduleModule:
             return
         ScheduleDialog(
             self.parent, self.db, class_room, None,
-            self.load_class_schedule, self.update_status
+            self.load_class_schedule, self.update_status, self.version_id
+        )
+
+    def open_timetable_generator(self):
+        """เปิดหน้าต่างจัดตารางอัตโนมัติ"""
+        class_room = self.class_var.get()
+        if class_room == "ยังไม่มีห้องเรียน":
+            class_room = None
+        TimetableGeneratorDialog(
+            self.parent, self.db, class_room,
+            self.load_class_schedule, self.update_status, self.version_id
         )
 
+    def import_timetable(self):
+        """
+        นำเข้าตารางเรียนทั้งชุดจาก Excel/CSV (ห้องเรียน × วัน × คาบ)
+        ตรวจครูซ้ำ/ห้องซ้อนทั้งไฟล์ในหน่วยความจำ แสดงปัญหาทั้งหมด แล้วบันทึกใน transaction เดียว
+        """
+        file_path = filedialog.askopenfilename(
+            title="เลือกไฟล์ตารางเรียน",
+            filetypes=[("Excel/CSV", "*.xlsx *.csv"), ("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+        )
+        if not file_path:
+            return
+
+        try:
+            result = plan_import(self.db, file_path, self.version_id)
+        except Exception as e:
+            self.update_status("ไม่สามารถอ่านไฟล์ตารางเรียนได้", "error")
+            messagebox.showerror("ผิดพลาด", f"ไม่สามารถอ่านไฟล์ตารางเรียนได้\n{str(e)}")
+            return
+
+        if not result.entries:
+            report = "\n".join(result.problems[:15]) or "ไม่พบคาบเรียนในไฟล์"
+            messagebox.showwarning("นำเข้าไม่ได้", report)
+            return
+
+        message = (f"พบ {result.cells} คาบ ใน {len(result.class_rooms)} ห้อง "
+                   f"({', '.join(result.class_rooms[:6])}{' ...' if len(result.class_rooms) > 6 else ''})\n"
+                   f"ตารางเดิมของห้องเหล่านี้จะถูกแทนที่ด้วย {len(result.entries)} คาบ")
+        if result.problems:
+            lines = result.problems[:15]
+            if len(result.problems) > 15:
+                lines.append(f"และอีก {len(result.problems) - 15} รายการ")
+            message += f"\n\nข้าม {len(result.problems)} รายการที่มีปัญหา:\n" + "\n".join(lines)
+        if not messagebox.askyesno("ยืนยันการนำเข้าตารางเรียน", message + "\n\nต้องการบันทึกหรือไม่?"):
+            return
+
+        if self.db.replace_class_schedules(result.class_rooms, result.entries, self.version_id):
+            self.load_class_schedule()
+            self.update_status(
+                f"นำเข้าตารางเรียน {len(result.entries)} คาบ ({len(result.class_rooms)} ห้อง)"
+                + (f" - ข้าม {result.skipped} คาบ" if result.skipped else ""), "success")
+        else:
+            self.update_status("ไม่สามารถบันทึกตารางเรียนได้", "error")
+            messagebox.showerror("ผิดพลาด", "ไม่สามารถบันทึกตารางเรียนได้ (ตารางเดิมไม่เปลี่ยน)")
+
     def edit_schedule_entry(self, schedule_id):
         """แก้ไขคาบเรียน"""
-        schedules = self.db.get_all_schedules()
-        schedule = next((s for s in schedules if s['id'] == schedule_id), None)
+        schedule = get_timetable(self.db, self.version_id).get(schedule_id)
         if schedule:
             ScheduleDialog(
                 self.parent, self.db, schedule['class_room'], schedule,
-                self.load_class_schedule, self.update_status
+                self.load_class_schedule, self.update_status, self.version_id
             )
 
     def export_class_schedule_pdf(self):
@@ -746,7 +1194,9 @@ class ScheduleModule:
             messagebox.showwarning("คำเตือน", "กรุณาเลือกห้องเรียน")
             return
 
-        schedules = self.db.get_schedule_by_class(class_room)
+        grid = get_timetable(self.db, self.version_id).class_grid(class_room)
+        schedules = list(grid.values())
+        days, periods = list(self.days), list(self.periods)
         if not schedules:
             messagebox.showwarning("คำเตือน", f"ไม่มีตารางเรียนของห้อง {class_room}")
             return
@@ -760,91 +1210,96 @@ class ScheduleModule:
         if not file_path:
             return
 
-        try:
-            font_name = get_thai_font()
-
-            doc = SimpleDocTemplate(file_path, pagesize=landscape(A4))
-            elements = []
-            styles = getSampleStyleSheet()
-
-            title = Paragraph(f"ตารางเรียน ห้อง {class_room}", ParagraphStyle(
-                'Title', parent=styles['Heading1'],
-                fontName=font_name, fontSize=18, alignment=1
-            ))
-            elements.append(title)
-            elements.append(Spacer(1, 0.5 * cm))
-
-            # Build grid: days x periods
-            days = ["จันทร์", "อังคาร", "พุธ", "พฤหัสบดี", "ศุกร์"]
-            periods = list(range(1, 9))
-
-            # Header row
-            header = ["วัน/คาบ"] + [f"คาบ {p}" for p in periods]
-            data = [header]
-
-            for day in days:
-                row = [day]
-                for period in periods:
-                    entry = next(
-                        (s for s in schedules if s['day_of_week'] == day and s['period_no'] == period),
-                        None
-                    )
-                    if entry:
-                        teacher_name = f"{entry['title']}{entry['first_name']}"
-                        cell_text = f"{entry['subject_name']}\n{teacher_name}"
-                    else:
-                        cell_text = "-"
-                    row.append(cell_text)
-                data.append(row)
-
-            col_widths = [2.5 * cm] + [3 * cm] * 8
-            table = Table(data, colWidths=col_widths)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('BACKGROUND', (0, 1), (0, -1), colors.HexColor("#EFF6FF")),
-                ('TEXTCOLOR', (0, 1), (0, -1), colors.HexColor("#1E40AF")),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, -1), font_name),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
-            ]))
-
-            elements.append(table)
-            doc.build(elements)
+        def build(job):
+            from modules.pdf_utils import get_thai_font
 
-            self.update_status(f"Export ตารางเรียนห้อง {class_room} สำเร็จ", "success")
-            messagebox.showinfo("สำเร็จ", f"Export ตารางเรียนห้อง {class_room} เรียบร้อย")
+            # ฟอนต์อยู่ใน key: PDF ที่สร้างด้วย Helvetica (ไม่มีฟอนต์ไทย) ไม่ถูกใช้ซ้ำเมื่อมีฟอนต์ไทยแล้ว
+            font_name = get_thai_font()
 
-        except Exception as e:
-            self.update_status("ไม่สามารถ Export PDF ได้", "error")
-            messagebox.showerror("ผิดพลาด", f"ไม่สามารถ Export PDF ได้\n{str(e)}")
+            def render(path):
+                from reportlab.lib.pagesizes import A4, landscape
+                from reportlab.lib import colors
+                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                from reportlab.lib.units import cm
+
+                doc = SimpleDocTemplate(path, pagesize=landscape(A4))
+                elements = []
+                styles = getSampleStyleSheet()
+
+                title = Paragraph(f"ตารางเรียน ห้อง {class_room}", ParagraphStyle(
+                    'Title', parent=styles['Heading1'],
+                    fontName=font_name, fontSize=18, alignment=1
+                ))
+                elements.append(title)
+                elements.append(Spacer(1, 0.5 * cm))
+
+                # Build grid: days x periods (ตาม bell_schedule)
+
+                # Header row
+                header = ["วัน/คาบ"] + [f"คาบ {p}" for p in periods]
+                data = [header]
+
+                for day in job.iterate(days):
+                    row = [day]
+                    for period in periods:
+                        entry = grid.get((day, period))
+                        if entry:
+                            teacher_name = f"{entry['title']}{entry['first_name']}"
+                            cell_text = f"{entry['subject_name']}\n{teacher_name}"
+                        else:
+                            cell_text = "-"
+                        row.append(cell_text)
+                    data.append(row)
+
+                col_widths = [2.5 * cm] + [min(3, 24 / len(periods)) * cm] * len(periods)
+                table = Table(data, colWidths=col_widths)
+                table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('BACKGROUND', (0, 1), (0, -1), colors.HexColor("#EFF6FF")),
+                    ('TEXTCOLOR', (0, 1), (0, -1), colors.HexColor("#1E40AF")),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                    ('FONTNAME', (0, 0), (-1, -1), font_name),
+                    ('FONTSIZE', (0, 0), (-1, 0), 11),
+                    ('FONTSIZE', (0, 1), (-1, -1), 9),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#E5E7EB")),
+                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+                ]))
+
+                elements.append(table)
+                doc.build(elements, onFirstPage=job.pdf_page_hook,
+                          onLaterPages=job.pdf_page_hook)
+
+            cached = get_export_cache().get_or_render(
+                "class_schedule_pdf", [class_room, schedules, days, periods, font_name], job.output_path, render)
+            if cached:
+                return f"Export ตารางเรียนห้อง {class_room} สำเร็จ (ใช้ไฟล์จากแคช)"
+            return f"Export ตารางเรียนห้อง {class_room} สำเร็จ"
+
+        self.export_jobs.submit("Export ตารางเรียนห้องเรียนเป็น PDF", build, file_path,
+                                error_message="ไม่สามารถ Export PDF ได้")
 
     def export_teacher_schedule_pdf(self):
         """Export ตารางสอนครูเป็น PDF"""
 
-        teacher_name = self.teacher_var.get()
-        if not teacher_name or teacher_name == "เลือกครู":
+        selected = self.teacher_var.get()
+        if not selected or selected == "เลือกครู":
             messagebox.showwarning("คำเตือน", "กรุณาเลือกครู")
             return
 
-        # Find teacher_id from name
-        teachers = self.db.get_all_teachers()
-        teacher = next(
-            (t for t in teachers
-             if f"{t['title']}{t['first_name']} {t['last_name']}" == teacher_name),
-            None
-        )
+        # ตัวเลือกเป็น "รหัส - ชื่อ"
+        teacher = self.db.get_teacher_by_id(selected.split(" - ")[0])
         if not teacher:
             messagebox.showwarning("คำเตือน", "ไม่พบข้อมูลครู")
             return
+        teacher_name = f"{teacher['title']}{teacher['first_name']} {teacher['last_name']}"
 
-        schedules = self.db.get_schedule_by_teacher(teacher['teacher_id'])
-        if not schedules:
+        grid = get_timetable(self.db, self.version_id).teacher_grid(teacher['teacher_id'])
+        days, periods = list(self.days), list(self.periods)
+        if not grid:
             messagebox.showwarning("คำเตือน", f"ไม่มีตารางสอนของ {teacher_name}")
             return
 
@@ -857,10 +1312,17 @@ class ScheduleModule:
         if not file_path:
             return
 
-        try:
+        def build(job):
+            from reportlab.lib.pagesizes import A4, landscape
+            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.units import cm
+            from modules.pdf_utils import get_thai_font
+
             font_name = get_thai_font()
 
-            doc = SimpleDocTemplate(file_path, pagesize=landscape(A4))
+            doc = SimpleDocTemplate(job.output_path, pagesize=landscape(A4))
             elements = []
             styles = getSampleStyleSheet()
 
@@ -871,20 +1333,15 @@ class ScheduleModule:
             elements.append(title)
             elements.append(Spacer(1, 0.5 * cm))
 
-            # Build grid
-            days = ["จันทร์", "อังคาร", "พุธ", "พฤหัสบดี", "ศุกร์"]
-            periods = list(range(1, 9))
+            # Build grid (ตาม bell_schedule)
 
             header = ["วัน/คาบ"] + [f"คาบ {p}" for p in periods]
             data = [header]
 
-            for day in days:
+            for day in job.iterate(days):
                 row = [day]
                 for period in periods:
-                    entry = next(
-                        (s for s in schedules if s['day_of_week'] == day and s['period_no'] == period),
-                        None
-                    )
+                    entry = grid.get((day, period))
                     if entry:
                         cell_text = f"{entry['subject_name']}\n{entry['class_room']}"
                     else:
@@ -892,7 +1349,7 @@ class ScheduleModule:
                     row.append(cell_text)
                 data.append(row)
 
-            col_widths = [2.5 * cm] + [3 * cm] * 8
+            col_widths = [2.5 * cm] + [min(3, 24 / len(periods)) * cm] * len(periods)
             table = Table(data, colWidths=col_widths)
             table.setStyle(TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#2563EB")),
@@ -910,14 +1367,13 @@ class ScheduleModule:
             ]))
 
             elements.append(table)
-            doc.build(elements)
+            doc.build(elements, onFirstPage=job.pdf_page_hook,
+                      onLaterPages=job.pdf_page_hook)
 
-            self.update_status(f"Export ตารางสอน {teacher_name} สำเร็จ", "success")
-            messagebox.showinfo("สำเร็จ", f"Export ตารางสอน {teacher_name} เรียบร้อย")
+            return f"Export ตารางสอน {teacher_name} สำเร็จ"
 
-        except Exception as e:
-            self.update_status("ไม่สามารถ Export PDF ได้", "error")
-            messagebox.showerror("ผิดพลาด", f"ไม่สามารถ Export PDF ได้\n{str(e)}")
+        self.export_jobs.submit("Export ตารางสอนครูเป็น PDF", build, file_path,
+                                error_message="ไม่สามารถ Export PDF ได้")
 
 
 class TeacherDialog(ctk.CTkToplevel):
@@ -954,7 +1410,7 @@ class TeacherDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             header,
             text="แก้ไขข้อมูลครู" if self.teacher else "เพิ่มครูใหม่",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color="white"
         ).pack(pady=M)
 
@@ -972,7 +1428,7 @@ class TeacherDialog(ctk.CTkToplevel):
         for row_idx, (label, var_name) in enumerate(fields):
             ctk.CTkLabel(
                 form_frame, text=label,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                font=FONTS.style("body"),
                 text_color=TEXT_H3
             ).grid(row=row_idx, column=0, sticky="w", pady=S, padx=(0, M))
 
@@ -985,9 +1441,9 @@ class TeacherDialog(ctk.CTkToplevel):
                     fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
                     text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
                     dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-                    dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+                    dropdown_font=FONTS.font("TH Sarabun New", 16),
                     corner_radius=RADIUS_BUTTON,
-                    font=ctk.CTkFont(family="TH Sarabun New", size=14)
+                    font=FONTS.style("body")
                 ).grid(row=row_idx, column=1, pady=S)
             else:
                 var = ctk.StringVar()
@@ -996,7 +1452,7 @@ class TeacherDialog(ctk.CTkToplevel):
                     form_frame, textvariable=var,
                     width=250, height=36,
                     corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
-                    font=ctk.CTkFont(family="TH Sarabun New", size=14)
+                    font=FONTS.style("body")
                 ).grid(row=row_idx, column=1, pady=S)
 
         btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -1004,7 +1460,7 @@ class TeacherDialog(ctk.CTkToplevel):
 
         ctk.CTkButton(
             btn_frame, text="บันทึก", command=self.save,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
             image=IconManager.get_white("floppy-disk", 14), compound="left"
@@ -1012,7 +1468,7 @@ class TeacherDialog(ctk.CTkToplevel):
 
         ctk.CTkButton(
             btn_frame, text="ยกเลิก", command=self.destroy,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
@@ -1066,7 +1522,7 @@ class ScheduleDialog(ctk.CTkToplevel):
     """หน้าต่างเพิ่ม/แก้ไขตารางเรียน
     Conflict modal: radius 16px, header สีแดง (DANGER)"""
 
-    def __init__(self, parent, db, class_room, schedule, callback, update_status):
+    def __init__(self, parent, db, class_room, schedule, callback, update_status, version_id=None):
         super().__init__(parent)
 
         self.db = db
@@ -1074,6 +1530,9 @@ class ScheduleDialog(ctk.CTkToplevel):
         self.schedule = schedule
         self.callback = callback
         self.update_status = update_status
+        self.version_id = version_id
+        self.bell = {row['period_no']: (row['start_time'], row['end_time'])
+                     for row in db.get_bell_schedule()}
 
         self.title("แก้ไขคาบเรียน" if schedule else "เพิ่มคาบเรียน")
         self.geometry("520x560")
@@ -1098,7 +1557,7 @@ class ScheduleDialog(ctk.CTkToplevel):
         ctk.CTkLabel(
             header,
             text=f"{'แก้ไข' if self.schedule else 'เพิ่ม'}คาบเรียน - ห้อง {self.class_room}",
-            font=ctk.CTkFont(family="TH Sarabun New", size=16, weight="bold"),
+            font=FONTS.style("h3"),
             text_color="white"
         ).pack(pady=M)
 
@@ -1107,53 +1566,53 @@ class ScheduleDialog(ctk.CTkToplevel):
 
         # วัน
         ctk.CTkLabel(form_frame, text="วัน:",
-                     font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                     font=FONTS.style("body"),
                      text_color=TEXT_H3).grid(row=0, column=0, sticky="w", pady=S, padx=(0, M))
         self.day_var = ctk.StringVar(value="จันทร์")
         ctk.CTkOptionMenu(
             form_frame, variable=self.day_var,
-            values=["จันทร์", "อังคาร", "พุธ", "พฤหัสบดี", "ศุกร์"],
+            values=list(DAYS),
             width=250, height=36,
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).grid(row=0, column=1, pady=S)
 
         # คาบ
         ctk.CTkLabel(form_frame, text="คาบที่:",
-                     font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                     font=FONTS.style("body"),
                      text_color=TEXT_H3).grid(row=1, column=0, sticky="w", pady=S, padx=(0, M))
         self.period_var = ctk.StringVar(value="1")
         ctk.CTkOptionMenu(
             form_frame, variable=self.period_var,
-            values=[str(i) for i in range(1, 9)],
+            values=[str(p) for p in self.bell],
             width=250, height=36,
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).grid(row=1, column=1, pady=S)
 
         # วิชา
         ctk.CTkLabel(form_frame, text="วิชา:",
-                     font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                     font=FONTS.style("body"),
                      text_color=TEXT_H3).grid(row=2, column=0, sticky="w", pady=S, padx=(0, M))
         self.subject_var = ctk.StringVar()
         ctk.CTkEntry(
             form_frame, textvariable=self.subject_var,
             width=250, height=36, corner_radius=RADIUS_BUTTON,
             border_width=1, border_color=INPUT_BORDER,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).grid(row=2, column=1, pady=S)
 
         # ครู
         ctk.CTkLabel(form_frame, text="ครูผู้สอน:",
-                     font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                     font=FONTS.style("body"),
                      text_color=TEXT_H3).grid(row=3, column=0, sticky="w", pady=S, padx=(0, M))
         teachers = self.db.get_all_teachers()
         teacher_options = [f"{t['teacher_id']} - {t['title']}{t['first_name']} {t['last_name']}" for t in teachers]
@@ -1167,21 +1626,21 @@ class ScheduleDialog(ctk.CTkToplevel):
             fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
             text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
             dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16),
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
             corner_radius=20,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14)
+            font=FONTS.style("body")
         ).grid(row=3, column=1, pady=S)
 
         # ห้องเรียน
         ctk.CTkLabel(form_frame, text="ห้องเรียน:",
-                     font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                     font=FONTS.style("body"),
                      text_color=TEXT_H3).grid(row=4, column=0, sticky="w", pady=S, padx=(0, M))
         self.room_var = ctk.StringVar()
         ctk.CTkEntry(
             form_frame, textvariable=self.room_var,
             width=250, height=36, corner_radius=RADIUS_BUTTON,
             border_width=1, border_color=INPUT_BORDER,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             placeholder_text="เช่น 301, Lab1"
         ).grid(row=4, column=1, pady=S)
 
@@ -1191,7 +1650,7 @@ class ScheduleDialog(ctk.CTkToplevel):
 
         ctk.CTkButton(
             btn_frame, text="บันทึก", command=self.save,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
             image=IconManager.get_white("floppy-disk", 14), compound="left"
@@ -1200,7 +1659,7 @@ class ScheduleDialog(ctk.CTkToplevel):
         if self.schedule:
             ctk.CTkButton(
                 btn_frame, text="ลบ", command=self.delete,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                font=FONTS.style("body"),
                 width=80, height=36, corner_radius=RADIUS_BUTTON,
                 fg_color="transparent", border_width=1,
                 border_color=DANGER, text_color=DANGER, hover_color="#FEF2F2",
@@ -1209,7 +1668,7 @@ class ScheduleDialog(ctk.CTkToplevel):
 
         ctk.CTkButton(
             btn_frame, text="ยกเลิก", command=self.destroy,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=100, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
@@ -1238,10 +1697,7 @@ class ScheduleDialog(ctk.CTkToplevel):
 
         teacher_id = teacher_text.split(" - ")[0]
         period = int(self.period_var.get())
-        start_time, end_time = [
-            ("08:00", "09:00"), ("09:00", "10:00"), ("10:00", "11:00"), ("11:00", "12:00"),
-            ("13:00", "14:00"), ("14:00", "15:00"), ("15:00", "16:00"), ("16:00", "17:00"),
-        ][period - 1]
+        start_time, end_time = self.bell.get(period, (None, None))
 
         schedule_data = {
             'class_room': self.class_room,
@@ -1253,10 +1709,22 @@ class ScheduleDialog(ctk.CTkToplevel):
             'room_no': self.room_var.get().strip() or None,
         }
 
+        # ตรวจครูสอนซ้ำ/ห้องซ้อนจากตารางในหน่วยความจำก่อน (ไม่ต้อง query)
+        model = get_timetable(self.db, self.version_id)
+        exclude_id = self.schedule['id'] if self.schedule else None
+        conflict = (
+            model.conflict_message(teacher_id, schedule_data['day_of_week'], period, exclude_id)
+            or model.room_conflict_message(schedule_data['room_no'], schedule_data['day_of_week'],
+                                           period, exclude_id)
+        )
+        if conflict:
+            messagebox.showerror("ความขัดแย้ง", conflict)
+            return
+
         if self.schedule:
-            result = self.db.update_schedule(self.schedule['id'], schedule_data)
+            result = self.db.update_schedule(self.schedule['id'], schedule_data, self.version_id)
         else:
-            result = self.db.add_schedule(schedule_data)
+            result = self.db.add_schedule(schedule_data, self.version_id)
 
         if result is True:
             self.update_status("บันทึกตารางเรียนเรียบร้อย", "success")
@@ -1272,9 +1740,468 @@ class ScheduleDialog(ctk.CTkToplevel):
         """ลบคาบเรียน"""
         confirm = messagebox.askyesno("ยืนยันการลบ", "ต้องการลบคาบเรียนนี้หรือไม่?")
         if confirm:
-            if self.db.delete_schedule(self.schedule['id']):
+            if self.db.delete_schedule(self.schedule['id'], self.version_id):
                 self.update_status("ลบคาบเรียนเรียบร้อย", "success")
                 self.callback()
                 self.destroy()
             else:
                 messagebox.showerror("ผิดพลาด", "ไม่สามารถลบได้")
+
+
+class TimetableGeneratorDialog(ctk.CTkToplevel):
+    """หน้าต่างจัดตารางอัตโนมัติ: เลือกห้อง/ความต้องการ -> สร้าง -> ดูความต่างจากตารางเดิม -> บันทึก"""
+
+    ALL_ROOMS = "ทุกห้อง"
+
+    def __init__(self, parent, db, class_room, callback, update_status, version_id=None):
+        super().__init__(parent)
+
+        self.db = db
+        self.version_id = version_id
+        self.callback = callback
+        self.update_status = update_status
+        self.jobs = ExportJobRunner(self, update_status, show_panel=False)
+        self.csv_requirements = None
+        self.availability = {}
+        self.result = None
+        self.scope = []
+        self._seed = 0
+
+        self.title("จัดตารางอัตโนมัติ")
+        self.geometry("900x660")
+        self.transient(parent)
+        self.grab_set()
+
+        self.create_form(class_room)
+
+    def create_form(self, class_room):
+        """สร้างฟอร์ม"""
+
+        main_frame = ctk.CTkFrame(self, corner_radius=RADIUS_MODAL,
+                                  border_width=1, border_color=TABLE_BORDER)
+        main_frame.pack(fill="both", expand=True, padx=M, pady=M)
+
+        header = ctk.CTkFrame(main_frame, fg_color=PRIMARY, corner_radius=RADIUS_CARD)
+        header.pack(fill="x", padx=M, pady=(M, S))
+
+        ctk.CTkLabel(
+            header, text="จัดตารางอัตโนมัติ",
+            font=FONTS.style("h3"),
+            text_color="white"
+        ).pack(pady=M)
+
+        # ตัวเลือก
+        options = ctk.CTkFrame(main_frame, fg_color="transparent")
+        options.pack(fill="x", padx=M, pady=S)
+
+        ctk.CTkLabel(options, text="ห้องเรียน:",
+                     font=FONTS.style("body"),
+                     text_color=TEXT_H3).pack(side="left", padx=(0, S))
+        self.room_var = ctk.StringVar(value=class_room or self.ALL_ROOMS)
+        ctk.CTkOptionMenu(
+            options, variable=self.room_var,
+            values=[self.ALL_ROOMS] + self.db.get_class_rooms(),
+            width=140, height=36,
+            fg_color="#EFF6FF", button_color="#EFF6FF", button_hover_color="#DBEAFE",
+            text_color="#1E40AF", dropdown_fg_color="#F0F4FF",
+            dropdown_hover_color="#DBEAFE", dropdown_text_color="#1E40AF",
+            dropdown_font=FONTS.font("TH Sarabun New", 16),
+            corner_radius=20,
+            font=FONTS.style("body")
+        ).pack(side="left", padx=(0, M))
+
+        ctk.CTkButton(
+            options, text="ความต้องการ (CSV)...", command=self.load_requirements,
+            font=FONTS.style("body"),
+            width=150, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6"
+        ).pack(side="left", padx=(0, S))
+
+        ctk.CTkButton(
+            options, text="เวลาที่ครูไม่ว่าง (CSV)...", command=self.load_availability,
+            font=FONTS.style("body"),
+            width=170, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6"
+        ).pack(side="left", padx=(0, S))
+
+        self.generate_btn = ctk.CTkButton(
+            options, text="สร้างตาราง", command=self.generate,
+            font=FONTS.style("body_bold"),
+            width=110, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color=PRIMARY, hover_color="#1D4ED8"
+        )
+        self.generate_btn.pack(side="right")
+
+        self.source_label = ctk.CTkLabel(
+            main_frame, text="ความต้องการ: จำนวนคาบต่อวิชาจากตารางปัจจุบัน",
+            font=FONTS.style("caption"),
+            text_color=TEXT_CAPTION, anchor="w"
+        )
+        self.source_label.pack(fill="x", padx=M)
+
+        self.summary_label = ctk.CTkLabel(
+            main_frame, text="กด 'สร้างตาราง' เพื่อดูตัวอย่างก่อนบันทึก",
+            font=FONTS.style("body"),
+            text_color=TEXT_BODY, anchor="w", justify="left"
+        )
+        self.summary_label.pack(fill="x", padx=M, pady=(S, 0))
+
+        # ตัวอย่างความต่างจากตารางเดิม
+        tree_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        tree_frame.pack(fill="both", expand=True, padx=M, pady=S)
+
+        columns = ("status", "class_room", "day", "period", "before", "after")
+        self.preview_tree = ttk.Treeview(tree_frame, columns=columns, show="headings", height=12)
+        apply_treeview_style(self.preview_tree)
+        headings = {
+            "status": ("สถานะ", 80), "class_room": ("ห้อง", 80), "day": ("วัน", 90),
+            "period": ("คาบ", 50), "before": ("เดิม", 260), "after": ("ใหม่", 260),
+        }
+        for col, (text, width) in headings.items():
+            self.preview_tree.heading(col, text=text)
+            self.preview_tree.column(col, width=width, anchor="center" if width < 100 else "w")
+
+        scrollbar = ctk.CTkScrollbar(tree_frame, command=self.preview_tree.yview)
+        self.preview_tree.configure(yscrollcommand=scrollbar.set)
+        self.preview_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        btn_frame.pack(pady=(S, M))
+
+        self.save_btn = ctk.CTkButton(
+            btn_frame, text="บันทึกตาราง", command=self.save,
+            font=FONTS.style("body_bold"),
+            width=120, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color=PRIMARY, hover_color="#1D4ED8", state="disabled",
+            image=IconManager.get_white("floppy-disk", 14), compound="left"
+        )
+        self.save_btn.pack(side="left", padx=S)
+
+        ctk.CTkButton(
+            btn_frame, text="ยกเลิก", command=self.destroy,
+            font=FONTS.style("body"),
+            width=100, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6",
+            image=IconManager.get("xmark", 14, color=NEUTRAL, dark_color="#9CA3AF"), compound="left"
+        ).pack(side="left", padx=S)
+
+    def load_requirements(self):
+        """อ่านจำนวนคาบต่อวิชา/ห้อง/ครู จากไฟล์ CSV"""
+        path = filedialog.askopenfilename(
+            title="เลือกไฟล์ความต้องการ", filetypes=[("CSV files", "*.csv")], parent=self)
+        if not path:
+            return
+        try:
+            requirements = load_requirements_csv(path)
+            check_teachers(requirements, self.db.get_all_teachers(active_only=False))
+        except (ValueError, OSError) as e:
+            messagebox.showerror("ผิดพลาด", f"อ่านไฟล์ไม่ได้\n{e}", parent=self)
+            return
+        self.csv_requirements = requirements
+        rooms = {r.class_room for r in requirements}
+        periods = sum(r.periods for r in requirements)
+        self.source_label.configure(
+            text=f"ความต้องการ: {path} ({len(rooms)} ห้อง, {periods} คาบ - ใช้แทนการเลือกห้อง)")
+
+    def load_availability(self):
+        """อ่านช่องที่ครูไม่ว่างจากไฟล์ CSV"""
+        path = filedialog.askopenfilename(
+            title="เลือกไฟล์เวลาที่ครูไม่ว่าง", filetypes=[("CSV files", "*.csv")], parent=self)
+        if not path:
+            return
+        try:
+            self.availability = load_availability_csv(
+                path, periods=[row['period_no'] for row in self.db.get_bell_schedule()])
+        except (ValueError, OSError) as e:
+            messagebox.showerror("ผิดพลาด", f"อ่านไฟล์ไม่ได้\n{e}", parent=self)
+            return
+        self.update_status(f"โหลดเวลาที่ครูไม่ว่างของครู {len(self.availability)} คน", "info")
+
+    def generate(self):
+        """จัดตารางบน worker thread แล้วแสดงตัวอย่าง"""
+        model = get_timetable(self.db, self.version_id)
+        entries = list(model.entries.values())
+        if self.csv_requirements is not None:
+            requirements = self.csv_requirements
+            scope = sorted({r.class_room for r in requirements})
+        else:
+            room = self.room_var.get()
+            scope = sorted({e['class_room'] for e in entries}) if room == self.ALL_ROOMS else [room]
+            requirements = requirements_from_schedule(e for e in entries if e['class_room'] in scope)
+        if not requirements:
+            messagebox.showwarning("คำเตือน", "ไม่มีข้อมูลวิชาของห้องที่เลือก", parent=self)
+            return
+        try:
+            # ครูอาจถูกลบหลังโหลดไฟล์ - ตรวจอีกครั้งก่อนจัด
+            check_teachers(requirements, self.db.get_all_teachers(active_only=False))
+        except ValueError as e:
+            messagebox.showerror("ผิดพลาด", f"จัดตารางไม่ได้\n{e}", parent=self)
+            return
+
+        scope_set = set(scope)
+        current = [e for e in entries if e['class_room'] in scope_set]
+        bell = self.db.get_bell_schedule()
+        generator = TimetableGenerator(
+            requirements, availability=self.availability, seed=self._seed,
+            fixed=[e for e in entries if e['class_room'] not in scope_set],
+            periods=model.periods,
+            period_times=[(row['start_time'], row['end_time']) for row in bell]
+        )
+        self._seed += 1     # กดซ้ำได้ตารางแบบอื่น
+
+        def work(job):
+            self.result = generator.generate()
+            return f"จัดตาราง {len(self.result.entries)} คาบ ใน {self.result.seconds:.1f} วินาที"
+
+        self.result = None
+        self.generate_btn.configure(state="disabled")
+        self.save_btn.configure(state="disabled")
+        self.summary_label.configure(text="กำลังจัดตาราง...")
+        self.jobs.submit("จัดตารางอัตโนมัติ", work, error_message="ไม่สามารถจัดตารางได้",
+                         on_done=lambda job: self.show_preview(scope, current),
+                         on_finish=self._on_generate_finished, parent=self)
+
+    def _on_generate_finished(self, job):
+        """งานจัดตารางล้มเหลว/ถูกยกเลิก - คืนปุ่มให้กดจัดใหม่ได้"""
+        if job.state == "done" or not self.winfo_exists():
+            return
+        self.generate_btn.configure(state="normal")
+        self.summary_label.configure(
+            text="จัดตารางไม่สำเร็จ ลองใหม่อีกครั้ง" if job.state == "error" else "ยกเลิกการจัดตารางแล้ว",
+            text_color=DANGER)
+
+    def show_preview(self, scope, current):
+        """แสดงความต่างจากตารางเดิม (เฉพาะช่องที่เปลี่ยน)"""
+        if not self.winfo_exists():
+            return
+        self.generate_btn.configure(state="normal")
+        result = self.result
+        diff = diff_schedules(current, result.entries)
+        self.scope = scope
+
+        def describe(e):
+            return f"{e['subject_name']} ({e['teacher_id']})" if e else "-"
+
+        rows = [("ใหม่", None, e) for e in diff['added']]
+        rows += [("เปลี่ยน", old, new) for old, new in diff['changed']]
+        rows += [("ลบ", e, None) for e in diff['removed']]
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        for idx, (status, old, new) in enumerate(rows):
+            e = new or old
+            self.preview_tree.insert("", "end", values=(
+                status, e['class_room'], e['day_of_week'], e['period_no'], describe(old), describe(new)
+            ), tags=(STRIPE_TAGS[idx % 2],))
+
+        lines = [f"{len(scope)} ห้อง {len(result.entries)} คาบ - ใหม่ {len(diff['added'])}, "
+                 f"เปลี่ยน {len(diff['changed'])}, ลบ {len(diff['removed'])}, "
+                 f"เหมือนเดิม {diff['unchanged']} ({result.seconds:.1f} วินาที)"]
+        if not result.complete:
+            missing = sum(count for _, count in result.unplaced)
+            lines.append(f"จัดไม่ครบ {missing} คาบ: " + ", ".join(
+                f"{r.class_room} {r.subject_name} ({count})" for r, count in result.unplaced[:5]))
+            lines.extend(result.problems[:3])
+        self.summary_label.configure(text="\n".join(lines),
+                                     text_color=TEXT_BODY if result.complete else DANGER)
+        if result.entries:
+            self.save_btn.configure(state="normal")
+
+    def save(self):
+        """แทนที่ตารางของห้องที่จัดใหม่"""
+        if not self.result:
+            return
+        message = f"แทนที่ตารางเรียนของ {len(self.scope)} ห้องด้วยตารางใหม่หรือไม่?"
+        if not self.result.complete:
+            message += "\n(ตารางใหม่ยังจัดไม่ครบทุกคาบ)"
+        if not messagebox.askyesno("ยืนยัน", message, parent=self):
+            return
+        if self.db.replace_class_schedules(self.scope, self.result.entries, self.version_id):
+            self.update_status(f"บันทึกตารางที่จัดอัตโนมัติ {len(self.result.entries)} คาบเรียบร้อย", "success")
+            self.callback()
+            self.destroy()
+        else:
+            messagebox.showerror("ผิดพลาด", "ไม่สามารถบันทึกได้", parent=self)
+
+
+class BellScheduleDialog(ctk.CTkToplevel):
+    """หน้าต่างตั้งเวลาเรียน (จำนวนคาบ + เวลาเริ่ม/สิ้นสุดของแต่ละคาบ) - radius 16px"""
+
+    def __init__(self, parent, db, callback, update_status):
+        super().__init__(parent)
+
+        self.db = db
+        self.callback = callback
+        self.update_status = update_status
+        self.rows = []
+
+        self.title("ตั้งเวลาเรียน")
+        self.geometry("460x620")
+        self.resizable(False, False)
+        self.transient(parent)
+        self.grab_set()
+
+        self.create_form()
+        for row in self.db.get_bell_schedule():
+            self.add_row(row['start_time'], row['end_time'])
+
+    def create_form(self):
+        """สร้างฟอร์ม"""
+
+        main_frame = ctk.CTkFrame(self, corner_radius=RADIUS_MODAL,
+                                  border_width=1, border_color=TABLE_BORDER)
+        main_frame.pack(fill="both", expand=True, padx=M, pady=M)
+
+        header = ctk.CTkFrame(main_frame, fg_color=PRIMARY, corner_radius=RADIUS_CARD)
+        header.pack(fill="x", padx=M, pady=(M, S))
+
+        ctk.CTkLabel(
+            header, text="ตั้งเวลาเรียน",
+            font=FONTS.style("h3"),
+            text_color="white"
+        ).pack(pady=M)
+
+        ctk.CTkLabel(
+            main_frame, text="เวลาในรูปแบบ HH:MM - ใช้กับทุกรุ่นของตาราง",
+            font=FONTS.style("caption"),
+            text_color=TEXT_CAPTION
+        ).pack(pady=(0, S))
+
+        self.rows_frame = ctk.CTkScrollableFrame(main_frame, fg_color="transparent", height=360)
+        self.rows_frame.pack(fill="both", expand=True, padx=L)
+
+        btn_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        btn_frame.pack(pady=M)
+
+        ctk.CTkButton(
+            btn_frame, text="เพิ่มคาบ", command=self.add_row,
+            font=FONTS.style("body"),
+            width=90, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=PRIMARY, text_color=PRIMARY, hover_color="#EFF6FF",
+            image=IconManager.get("plus", 14, color=PRIMARY, dark_color=PRIMARY), compound="left"
+        ).pack(side="left", padx=XS)
+
+        ctk.CTkButton(
+            btn_frame, text="ลบคาบสุดท้าย", command=self.remove_row,
+            font=FONTS.style("body"),
+            width=110, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color="transparent", border_width=1,
+            border_color=DANGER, text_color=DANGER, hover_color="#FEF2F2",
+            image=IconManager.get("trash", 14, color=DANGER, dark_color=DANGER), compound="left"
+        ).pack(side="left", padx=XS)
+
+        ctk.CTkButton(
+            btn_frame, text="บันทึก", command=self.save,
+            font=FONTS.style("body_bold"),
+            width=90, height=36, corner_radius=RADIUS_BUTTON,
+            fg_color=PRIMARY, hover_color="#1D4ED8",
+            image=IconManager.get_white("floppy-disk", 14), compound="left"
+        ).pack(side="left", padx=XS)
+
+    def add_row(self, start_time="", end_time=""):
+        """เพิ่มแถวของคาบถัดไป (ค่าเริ่มต้นต่อจากคาบก่อนหน้า)"""
+        if not start_time and self.rows:
+            start_time = self.rows[-1][2].get()
+        period_no = len(self.rows) + 1
+        frame = ctk.CTkFrame(self.rows_frame, fg_color="transparent")
+        frame.pack(fill="x", pady=XS)
+
+        ctk.CTkLabel(
+            frame, text=f"คาบ {period_no}",
+            font=FONTS.style("body"),
+            text_color=TEXT_H3, width=60, anchor="w"
+        ).pack(side="left", padx=(0, S))
+
+        start_var = ctk.StringVar(value=start_time)
+        end_var = ctk.StringVar(value=end_time)
+        for var in (start_var, end_var):
+            ctk.CTkEntry(
+                frame, textvariable=var,
+                width=110, height=36,
+                corner_radius=RADIUS_BUTTON, border_width=1, border_color=INPUT_BORDER,
+                font=FONTS.style("body")
+            ).pack(side="left", padx=(0, S))
+        self.rows.append((frame, start_var, end_var))
+
+    def remove_row(self):
+        """ลบคาบสุดท้าย"""
+        if len(self.rows) > 1:
+            frame, _, _ = self.rows.pop()
+            frame.destroy()
+
+    def save(self):
+        """บันทึก - ตรวจรูปแบบเวลาและคาบซ้อนใน Database.save_bell_schedule()"""
+        result = self.db.save_bell_schedule([(start.get(), end.get()) for _, start, end in self.rows])
+        if result is True:
+            self.update_status(f"บันทึกเวลาเรียน {len(self.rows)} คาบเรียบร้อย", "success")
+            self.callback()
+            self.destroy()
+        elif isinstance(result, str):
+            messagebox.showwarning("คำเตือน", result, parent=self)
+        else:
+            messagebox.showerror("ผิดพลาด", "ไม่สามารถบันทึกเวลาเรียนได้", parent=self)
+
+
+class _TimetablePanel:
+    """หัวข้อ + ตาราง Canvas + ข้อความว่าง ใน frame ของมุมมองห้องเรียน/ครู (สร้างครั้งเดียว)"""
+
+    def __init__(self, host, days, periods, period_times, on_cell_click=None):
+        """
+        Args:
+            host: frame ที่แสดงตาราง
+            days, periods, period_times: แกนของตาราง
+            on_cell_click: callback(day, period, schedule_id) (ไม่บังคับ)
+        """
+        self.title_label = ctk.CTkLabel(
+            host, text="",
+            font=FONTS.style("h2"),
+            text_color=TEXT_H2
+        )
+        self.message_label = ctk.CTkLabel(
+            host, text="",
+            font=FONTS.font("TH Sarabun New", 16),
+            text_color=TEXT_CAPTION
+        )
+        self.canvas = TimetableCanvas(
+            host, days, periods, period_times,
+            on_cell_click=on_cell_click,
+            scaling=host._get_widget_scaling()
+        )
+
+    def winfo_exists(self):
+        return self.canvas.winfo_exists()
+
+    def destroy(self):
+        for widget in (self.title_label, self.message_label, self.canvas):
+            widget.destroy()
+
+    def clear(self):
+        """ซ่อนทุกอย่าง"""
+        for widget in (self.title_label, self.message_label, self.canvas):
+            widget.pack_forget()
+
+    def show_message(self, text, title=None):
+        """แสดงข้อความแทนตาราง (เช่น ยังไม่มีตารางเรียน)"""
+        self.clear()
+        if title:
+            self.title_label.configure(text=title)
+            self.title_label.pack(pady=(M, S))
+        self.message_label.configure(text=text)
+        self.message_label.pack(pady=XXL)
+
+    def show_cells(self, title, cells):
+        """
+        แสดงตาราง - เปลี่ยนเฉพาะข้อความ/สีของช่อง ไม่สร้าง widget ใหม่
+        Args:
+            title: หัวข้อเหนือตาราง
+            cells: dict {(วัน, คาบ): TimetableCell}
+        """
+        self.title_label.configure(text=title)
+        if self.canvas.winfo_manager() != "pack":
+            self.clear()
+            self.title_label.pack(pady=(M, S))
+            self.canvas.pack(fill="x", padx=S, pady=(0, S))
+        self.canvas.set_cells(cells)
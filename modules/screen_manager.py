@@ -0,0 +1,146 @@
+"""
+modules/screen_manager.py
+ScreenManager - เก็บหน้าจอของแต่ละโมดูลไว้ (keep-alive) แทนการสร้างใหม่ทุกครั้งที่กดเมนู
+- สร้างโมดูลครั้งแรกที่เปิด แล้วซ่อน/แสดงด้วย grid_remove() / grid()
+- เปิดหน้าเดิมซ้ำ: เรียก module.on_show() ให้โหลดเฉพาะข้อมูลใหม่
+- จำกัดจำนวนหน้าที่เก็บไว้ (LRU) - หน้าที่ไม่ได้เปิดนานที่สุดถูก destroy ก่อน
+  (ยกเว้นหน้าที่กำลังแสดงและหน้าที่มีงาน Export ค้างอยู่)
+ไม่ import customtkinter - frame สร้างผ่าน make_frame ที่ส่งเข้ามา
+"""
+
+from collections import OrderedDict
+
+DEFAULT_MAX_ALIVE = 4
+
+
+class Screen:
+    """หน้าจอหนึ่งหน้า: frame ที่ใส่โมดูล + วัตถุโมดูล"""
+
+    def __init__(self, key, frame, module=None):
+        self.key = key
+        self.frame = frame
+        self.module = module
+
+
+class ScreenManager:
+    """จัดการหน้าจอโมดูลแบบ keep-alive พร้อมจำกัดจำนวน (LRU)"""
+
+    def __init__(self, make_frame, max_alive=DEFAULT_MAX_ALIVE, grid_options=None):
+        """
+        Args:
+            make_frame: ฟังก์ชัน () -> frame ใหม่ (ยังไม่ grid) สำหรับใส่โมดูล
+            max_alive: จำนวนหน้าจอสูงสุดที่เก็บไว้
+            grid_options: option ของ grid() ตอนวาง frame (ค่าเริ่มต้น row 0, column 0, nsew)
+        """
+        if max_alive < 1:
+            raise ValueError("max_alive ต้องมากกว่า 0")
+        self.make_frame = make_frame
+        self.max_alive = max_alive
+        self.grid_options = grid_options or {'row': 0, 'column': 0, 'sticky': "nsew"}
+        self.current = None
+        self.builds = 0
+        self.reuses = 0
+        self._screens = OrderedDict()
+
+    @property
+    def current_screen(self):
+        return self._screens.get(self.current)
+
+    def show(self, key, build, refresh=True):
+        """
+        แสดงหน้าจอ key - สร้างด้วย build(frame) ถ้ายังไม่มี
+        Args:
+            key: ชื่อหน้าจอ เช่น "students"
+            build: ฟังก์ชัน (frame) -> วัตถุโมดูล
+            refresh: เรียก module.on_show() เมื่อใช้หน้าจอเดิม
+        Returns:
+            วัตถุโมดูลของหน้าจอ
+        """
+        screen = self._screens.get(key)
+        if screen is not None and not self._alive(screen):
+            self._screens.pop(key)
+            screen = None
+
+        previous = self.current_screen
+        if previous is not None and previous is not screen:
+            previous.frame.grid_remove()
+
+        if screen is None:
+            frame = self.make_frame()
+            screen = Screen(key, frame)
+            self._screens[key] = screen
+            self.current = key
+            frame.grid(**self.grid_options)
+            try:
+                screen.module = build(frame)
+            except Exception:
+                self.discard(key)
+                raise
+            self.builds += 1
+        else:
+            self.current = key
+            screen.frame.grid()
+            self.reuses += 1
+            on_show = getattr(screen.module, "on_show", None)
+            if refresh and on_show:
+                on_show()
+
+        self._screens.move_to_end(key)
+        self._evict()
+        return screen.module
+
+    def discard(self, key):
+        """ทิ้งหน้าจอ key (สร้างใหม่ในครั้งถัดไป) เช่นหลัง hot reload"""
+        screen = self._screens.pop(key, None)
+        if screen is None:
+            return False
+        if self.current == key:
+            self.current = None
+        self._destroy(screen)
+        return True
+
+    def clear(self):
+        """ทิ้งหน้าจอทั้งหมด"""
+        for key in list(self._screens):
+            self.discard(key)
+
+    def keys(self):
+        """key ของหน้าจอที่เก็บไว้ เรียงจากใช้นานที่สุด -> ล่าสุด"""
+        return list(self._screens)
+
+    def __contains__(self, key):
+        return key in self._screens
+
+    def __len__(self):
+        return len(self._screens)
+
+    @staticmethod
+    def _alive(screen):
+        try:
+            return bool(screen.frame.winfo_exists())
+        except Exception:
+            return False
+
+    @staticmethod
+    def _busy(screen):
+        """มีงาน Export ที่ยังทำไม่เสร็จ -> ห้ามทิ้ง (widget ใช้ poll ความคืบหน้า)"""
+        jobs = getattr(screen.module, "export_jobs", None)
+        return bool(jobs is not None and jobs.busy)
+
+    @staticmethod
+    def _destroy(screen):
+        try:
+            screen.frame.destroy()
+        except Exception:
+            pass  # CTkOptionMenu dropdown บางตัว destroy ซ้ำแล้ว error
+
+    def _evict(self):
+        """ทิ้งหน้าจอที่ใช้นานที่สุดจนเหลือไม่เกิน max_alive"""
+        for key in list(self._screens):
+            if len(self._screens) <= self.max_alive:
+                break
+            screen = self._screens[key]
+            if key == self.current or self._busy(screen):
+                continue
+            self._screens.pop(key)
+            self._destroy(screen)
@@ -0,0 +1,75 @@
+"""
+modules/search_index.py
+StudentSearchIndex - ค้นหานักเรียนในหน่วยความจำจากรายชื่อที่โหลดไว้แล้ว (แทน LIKE query ทุกครั้งที่พิมพ์)
+- ค้นจากรหัส, ชื่อ, นามสกุล และชื่อเต็ม "ชื่อ นามสกุล" (ไม่สนตัวพิมพ์เล็ก/ใหญ่)
+- n-gram index (1-3 ตัวอักษร) หาผู้สมัครก่อน แล้วตรวจ substring เฉพาะผู้สมัคร
+- พิมพ์ต่อจากคำเดิม (คำค้นแคบลง): กรองจากผลลัพธ์ครั้งก่อนแทนการค้นใหม่
+- ผลลัพธ์: ตรงกับต้นคำ (prefix) ก่อน แล้วตามลำดับรายชื่อเดิม
+ไม่ import customtkinter - ทดสอบได้
+"""
+
+MAX_GRAM = 3
+
+
+def normalize(text):
+    """ตัวพิมพ์เล็ก + ยุบช่องว่าง"""
+    return " ".join(str(text or "").casefold().split())
+
+
+class StudentSearchIndex:
+    """index ของรายชื่อนักเรียนสำหรับค้นหาแบบ realtime"""
+
+    def __init__(self, students=()):
+        """
+        Args:
+            students: รายชื่อนักเรียน (dict ที่มี student_id, first_name, last_name)
+        """
+        self.students = list(students)
+        self._fields = []      # ต่อคน: (รหัส, ชื่อ, นามสกุล, ชื่อเต็ม) ที่ normalize แล้ว
+        self._grams = {}       # n-gram -> set ของ index นักเรียน
+        for idx, student in enumerate(self.students):
+            first = normalize(student.get('first_name'))
+            last = normalize(student.get('last_name'))
+            fields = (normalize(student.get('student_id')), first, last, f"{first} {last}")
+            self._fields.append(fields)
+            for field in fields:
+                for n in range(1, MAX_GRAM + 1):
+                    for pos in range(len(field) - n + 1):
+                        self._grams.setdefault(field[pos:pos + n], set()).add(idx)
+        self._last_keyword = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self.students)
+
+    def _candidates(self, keyword):
+        """index ที่อาจตรง (จาก n-gram) - ถ้าคำค้นแคบลงจากครั้งก่อนใช้ผลครั้งก่อน"""
+        if self._last_keyword and self._last_keyword in keyword:
+            return self._last_matches
+        grams = {keyword[pos:pos + MAX_GRAM] for pos in range(max(1, len(keyword) - MAX_GRAM + 1))}
+        sets = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(sets[0]).intersection(*sets[1:]) if sets else set()
+        return sorted(candidates)
+
+    def search(self, keyword):
+        """
+        ค้นหานักเรียน
+        Args:
+            keyword: คำค้นหา (ว่าง = ทุกคน)
+        Returns:
+            list ของนักเรียนที่ตรง (prefix ก่อน substring)
+        """
+        keyword = normalize(keyword)
+        if not keyword:
+            self._last_keyword = self._last_matches = None
+            return list(self.students)
+
+        matches = [idx for idx in self._candidates(keyword)
+                   if any(keyword in field for field in self._fields[idx])]
+        self._last_keyword, self._last_matches = keyword, matches
+
+        prefix = [idx for idx in matches
+                  if any(field.startswith(keyword) for field in self._fields[idx])]
+        prefix_set = set(prefix)
+        ordered = prefix + [idx for idx in matches if idx not in prefix_set]
+        return [self.students[idx] for idx in ordered]
@@ -0,0 +1,185 @@
+"""
+modules/startup_profiler.py
+Startup profiler - จับเวลาแต่ละช่วงของการเปิดโปรแกรม (import, Database, sidebar, หน้าแรก, frame แรก)
+- เปิดใช้ด้วย environment variable SCHOOL_PROFILE_STARTUP=1 หรือ argument --profile-startup
+- กำหนดไฟล์ผลลัพธ์ได้ด้วย --profile-startup=path.json หรือ SCHOOL_PROFILE_STARTUP_OUT
+- เมื่อ frame แรกแสดงผล จะเขียน timeline เป็น JSON (cache/profile/) และพิมพ์สรุปทาง console
+ปิดอยู่ (ค่าเริ่มต้น) แทบไม่มีค่าใช้จ่าย - ไม่ import customtkinter
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROFILE_DIR = os.path.join(PROJECT_DIR, "cache", "profile")
+ENV_FLAG = "SCHOOL_PROFILE_STARTUP"
+ENV_OUTPUT = "SCHOOL_PROFILE_STARTUP_OUT"
+CLI_FLAG = "--profile-startup"
+REPORT_VERSION = 1
+
+
+class StartupProfiler:
+    """เก็บ timeline ของการเปิดโปรแกรม (เวลาเป็น ms นับจากตอนสร้าง profiler)"""
+
+    def __init__(self, enabled=False, output_path=None, clock=time.perf_counter):
+        """
+        Args:
+            enabled: False = ไม่บันทึกอะไรเลย
+            output_path: ไฟล์ JSON ผลลัพธ์ (ค่าเริ่มต้น cache/profile/startup_<เวลา>.json)
+            clock: ฟังก์ชันเวลา (วินาที) - เปลี่ยนได้สำหรับทดสอบ
+        """
+        self.enabled = enabled
+        self.output_path = output_path
+        self.clock = clock
+        self.started_at = datetime.now()
+        self.t0 = clock()
+        self.phases = []
+        self.marks = []
+        self.annotations = {}
+        self.finished = False
+        self._depth = 0
+
+    def _now_ms(self):
+        return (self.clock() - self.t0) * 1000.0
+
+    @contextmanager
+    def phase(self, name):
+        """จับเวลาช่วงหนึ่ง (ซ้อนกันได้) ใช้กับ with"""
+        if not self.enabled:
+            yield
+            return
+        entry = {'name': name, 'depth': self._depth, 'start_ms': self._now_ms()}
+        self.phases.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry['end_ms'] = self._now_ms()
+            entry['duration_ms'] = entry['end_ms'] - entry['start_ms']
+
+    def mark(self, name):
+        """บันทึกจุดเวลา (เช่น import เสร็จ, frame แรก)"""
+        if self.enabled:
+            self.marks.append({'name': name, 'at_ms': self._now_ms()})
+
+    def annotate(self, key, value):
+        """แนบข้อมูลเพิ่มเติมในรายงาน (ต้อง json.dumps ได้)"""
+        if self.enabled:
+            self.annotations[key] = value
+
+    def watch_first_frame(self, window, on_first_frame=None):
+        """
+        บันทึก frame แรกเมื่อหน้าต่างแสดงผล (<Map> + วาดที่ค้างอยู่เสร็จ) แล้วเขียนรายงาน
+        Args:
+            window: หน้าต่างหลัก (Tk)
+            on_first_frame: callback(profiler) ก่อนเขียนรายงาน เช่นแนบสถิติ cache (ไม่บังคับ)
+        """
+        if not self.enabled:
+            return
+        state = {'mapped': False}
+
+        def drawn():
+            self.mark("first_frame")
+            if on_first_frame:
+                on_first_frame(self)
+            self.finish()
+
+        def mapped(event):
+            # ไม่ unbind: ก่อน Python 3.13 unbind(funcid) ลบ <Map> binding อื่นของหน้าต่างไปด้วย
+            # handler จึงไม่ทำอะไรหลังจาก map ครั้งแรกแทน
+            if event.widget is not window or state['mapped'] or self.finished:
+                return
+            state['mapped'] = True
+            self.mark("window_mapped")
+            window.after_idle(drawn)
+
+        window.bind("<Map>", mapped, add="+")
+
+    def report(self):
+        """
+        Returns:
+            dict ของ timeline ทั้งหมด
+        """
+        first_frame = next((m['at_ms'] for m in self.marks if m['name'] == "first_frame"), None)
+        return {
+            'version': REPORT_VERSION,
+            'started_at': self.started_at.isoformat(timespec="seconds"),
+            'python': platform.python_version(),
+            'platform': sys.platform,
+            'first_frame_ms': first_frame,
+            'total_ms': self._now_ms(),
+            'phases': self.phases,
+            'marks': self.marks,
+            'annotations': self.annotations,
+        }
+
+    def summary(self, report=None):
+        """ข้อความสรุปสำหรับพิมพ์ทาง console"""
+        report = report or self.report()
+        lines = ["[Startup] timeline (ms)"]
+        events = [(p['start_ms'], f"{'  ' * p['depth']}{p['name']:<32} {p.get('duration_ms', 0):8.1f}")
+                  for p in report['phases']]
+        events += [(m['at_ms'], f"@ {m['name']:<30} {m['at_ms']:8.1f}") for m in report['marks']]
+        lines += [f"  {text}" for _at, text in sorted(events, key=lambda e: e[0])]
+        if report['first_frame_ms'] is not None:
+            lines.append(f"  first frame: {report['first_frame_ms']:.1f} ms")
+        return "\n".join(lines)
+
+    def write(self, report=None):
+        """
+        เขียนรายงานเป็น JSON
+        Returns:
+            path ของไฟล์
+        """
+        report = report or self.report()
+        path = self.output_path or os.path.join(
+            DEFAULT_PROFILE_DIR, f"startup_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return path
+
+    def finish(self):
+        """เขียน JSON และพิมพ์สรุป (ครั้งเดียว)"""
+        if not self.enabled or self.finished:
+            return None
+        self.finished = True
+        report = self.report()
+        print(self.summary(report))
+        try:
+            path = self.write(report)
+        except OSError as e:
+            print(f"[Startup] เขียนรายงานไม่สำเร็จ: {e}")
+            return None
+        print(f"[Startup] report: {path}")
+        return path
+
+
+def profiler_from_environment(argv=None, environ=None):
+    """
+    สร้าง profiler ตาม environment variable / argument ของโปรแกรม
+    Returns:
+        StartupProfiler (enabled=False ถ้าไม่ได้สั่งเปิด)
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    environ = os.environ if environ is None else environ
+
+    enabled = environ.get(ENV_FLAG, "").strip().lower() in ("1", "true", "yes", "on")
+    output_path = environ.get(ENV_OUTPUT) or None
+    for arg in argv:
+        if arg == CLI_FLAG:
+            enabled = True
+        elif arg.startswith(CLI_FLAG + "="):
+            enabled = True
+            output_path = arg.split("=", 1)[1] or output_path
+    return StartupProfiler(enabled=enabled, output_path=output_path)
+
+
+# profiler ของการเปิดโปรแกรมครั้งนี้ (main.py import เป็นอย่างแรก)
+STARTUP = profiler_from_environment()
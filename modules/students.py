@@ -12,18 +12,12 @@ modules/students.py
 import customtkinter as ctk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 import os
 from modules.icons import IconManager
-from modules.pdf_utils import get_thai_font
+from modules.ui_fonts import FONTS
+from modules.export_jobs import ExportJobRunner
+from modules.search_index import StudentSearchIndex
+from modules.tree_binding import TreeBinder
 
 # ==================== Design System v4.0 ====================
 # Accent Colors (10%) - Updated
@@ -59,6 +53,9 @@ RADIUS_INPUT = 8
 INPUT_BORDER = "#CBD5E1"  # Slate-300
 INPUT_FOCUS = PRIMARY
 
+# Search
+SEARCH_DEBOUNCE_MS = 150  # รอให้หยุดพิมพ์ก่อนค้นหา
+
 
 class StudentsModule:
     """โมดูลจัดการนักเรียน - Design System v3.0"""
@@ -67,13 +64,20 @@ class StudentsModule:
         self.parent = parent
         self.db = db
         self.update_status = update_status_callback
+        self.export_jobs = ExportJobRunner(parent, update_status_callback)
         self.students_data = []
+        self.search_index = StudentSearchIndex()
+        self._search_after_id = None
         self.selected_student_id = None
 
         self.create_ui()
         self.setup_table_style()
         self.load_students()
 
+    def on_show(self):
+        """เรียกเมื่อกลับมาที่หน้านี้ (ScreenManager) - โหลดข้อมูลใหม่โดยไม่สร้าง UI ซ้ำ"""
+        self.load_students()
+
     def create_ui(self):
         """สร้าง UI ตาม Design System
         ใช้ CTkScrollableFrame ครอบเนื้อหาทั้งหมด เพื่อให้เลื่อนดูได้เมื่อหน้าจอเล็ก
@@ -100,14 +104,14 @@ class StudentsModule:
 
         # กล่องค้นหา (with icon)
         self.search_var = ctk.StringVar()
-        self.search_var.trace("w", lambda *args: self.search_students())
+        self.search_var.trace("w", lambda *args: self._schedule_search())
         search_entry = ctk.CTkEntry(
             search_frame,
             textvariable=self.search_var,
             placeholder_text="🔍 ค้นหาชื่อ, นามสกุล หรือรหัส...",
             width=320,
             height=42,
-            font=ctk.CTkFont(family="Kanit", size=14),
+            font=FONTS.font("Kanit", 14),
             corner_radius=RADIUS_INPUT,
             border_width=1,
             border_color=INPUT_BORDER,
@@ -132,7 +136,7 @@ class StudentsModule:
             command=lambda x: self.load_students(),
             width=140,
             height=38,
-            font=ctk.CTkFont(family="Kanit", size=13),
+            font=FONTS.font("Kanit", 13),
             corner_radius=RADIUS_INPUT,
             fg_color="#F8FAFC",
             button_color=PRIMARY,
@@ -141,7 +145,7 @@ class StudentsModule:
             dropdown_fg_color="#FFFFFF",
             dropdown_hover_color="#E0F2FE",
             dropdown_text_color=TEXT_H1,
-            dropdown_font=ctk.CTkFont(family="Kanit", size=13)
+            dropdown_font=FONTS.font("Kanit", 13)
         ).pack(side="left", padx=(0, M))
 
         # กรองปีการศึกษา
@@ -161,7 +165,7 @@ class StudentsModule:
             command=lambda x: self.load_students(),
             width=110,
             height=38,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             corner_radius=20,
             fg_color="#EFF6FF",
             button_color="#EFF6FF",
@@ -170,7 +174,7 @@ class StudentsModule:
             dropdown_fg_color="#FFFFFF",
             dropdown_hover_color="#E0F2FE",
             dropdown_text_color=TEXT_H1,
-            dropdown_font=ctk.CTkFont(family="Kanit", size=13)
+            dropdown_font=FONTS.font("Kanit", 13)
         ).pack(side="left")
 
         # ปุ่ม Refresh - Modern style
@@ -180,7 +184,7 @@ class StudentsModule:
             width=100,
             height=38,
             command=self.refresh_data,
-            font=ctk.CTkFont(family="Kanit", size=13),
+            font=FONTS.font("Kanit", 13),
             corner_radius=RADIUS_INPUT,
             fg_color="#F8FAFC",
             border_width=1,
@@ -224,12 +228,13 @@ class StudentsModule:
         scrollbar.pack(side="right", fill="y", pady=1, padx=(0, 1))
 
         self.tree.bind("<Double-1>", lambda e: self.edit_student())
+        self.tree_binder = TreeBinder(self.tree, keep_detached=True)
 
         # Empty state label (จะแสดง/ซ่อนตามข้อมูล)
         self.empty_label = ctk.CTkLabel(
             table_card,
             text="📋 ยังไม่มีข้อมูลนักเรียน กด + เพื่อเพิ่ม",
-            font=ctk.CTkFont(family="Kanit", size=14),
+            font=FONTS.font("Kanit", 14),
             text_color=TEXT_CAPTION
         )
 
@@ -246,7 +251,7 @@ class StudentsModule:
             left_buttons,
             text="+ เพิ่มนักเรียน",
             command=self.add_student,
-            font=ctk.CTkFont(family="Kanit", size=14, weight="500"),
+            font=FONTS.font("Kanit", 14, "500"),
             width=150,
             height=44,
             corner_radius=RADIUS_INPUT,
@@ -259,7 +264,7 @@ class StudentsModule:
             left_buttons,
             text="✏️ แก้ไข",
             command=self.edit_student,
-            font=ctk.CTkFont(family="Kanit", size=13),
+            font=FONTS.font("Kanit", 13),
             width=110,
             height=40,
             corner_radius=RADIUS_INPUT,
@@ -275,7 +280,7 @@ class StudentsModule:
             left_buttons,
             text="🗑️ ลบ",
             command=self.delete_student,
-            font=ctk.CTkFont(family="Kanit", size=13),
+            font=FONTS.font("Kanit", 13),
             width=90,
             height=40,
             corner_radius=RADIUS_INPUT,
@@ -297,7 +302,7 @@ class StudentsModule:
                 right_buttons,
                 text=text,
                 command=cmd,
-                font=ctk.CTkFont(family="TH Sarabun New", size=14),
+                font=FONTS.style("body"),
                 width=120,
                 height=40,
                 corner_radius=RADIUS_BUTTON,
@@ -343,61 +348,51 @@ class StudentsModule:
         self.tree.tag_configure("evenrow", background="#FFFFFF")
 
     def load_students(self):
-        """โหลดข้อมูลนักเรียนลงตาราง พร้อม empty state"""
-
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """โหลดข้อมูลนักเรียนลงตาราง พร้อม empty state (ถ้ามีคำค้นค้างอยู่จะกรองตามคำค้น)"""
 
         class_room = None if self.class_var.get() == "ทั้งหมด" else self.class_var.get()
         class_year = None if self.year_var.get() == "ทั้งหมด" else self.year_var.get()
 
         self.students_data = self.db.get_all_students(class_room=class_room, class_year=class_year)
+        self.search_index = StudentSearchIndex(self.students_data)
+        self.tree_binder.drop_detached()
 
-        if not self.students_data:
-            # แสดง Empty State
-            self.empty_label.place(relx=0.5, rely=0.5, anchor="center")
+        if self.search_var.get().strip():
+            self.search_students()
             return
-        else:
-            self.empty_label.place_forget()
-
-        # แสดงในตาราง Striped Rows
-        for idx, student in enumerate(self.students_data):
-            tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
-                student['student_id'],
-                student['title'],
-                student['first_name'],
-                student['last_name'],
-                student['class_room'],
-                student['class_year'],
-                student['parent_phone'] or "-"
-            ), tags=(tag,))
 
+        self._show_rows(self.students_data, "📋 ยังไม่มีข้อมูลนักเรียน กด + เพื่อเพิ่ม")
         self.update_status(f"โหลดข้อมูลนักเรียน {len(self.students_data)} คน", "success")
 
+    def _schedule_search(self):
+        """เรียกทุกครั้งที่พิมพ์ - รอ SEARCH_DEBOUNCE_MS หลังพิมพ์ตัวสุดท้ายแล้วค่อยค้นหา"""
+        if self._search_after_id is not None:
+            self.parent.after_cancel(self._search_after_id)
+        self._search_after_id = self.parent.after(SEARCH_DEBOUNCE_MS, self.search_students)
+
     def search_students(self):
-        """ค้นหานักเรียนแบบ realtime"""
+        """ค้นหานักเรียนแบบ realtime จากรายชื่อที่โหลดไว้ (ไม่ query ฐานข้อมูล)"""
+        self._search_after_id = None
+        if not self.tree.winfo_exists():
+            return  # หน้าจอถูกปิดระหว่างรอ
 
         keyword = self.search_var.get().strip()
+        results = self.search_index.search(keyword)
         if not keyword:
-            self.load_students()
+            self._show_rows(results, "📋 ยังไม่มีข้อมูลนักเรียน กด + เพื่อเพิ่ม")
             return
 
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        results = self.db.search_students(keyword)
+        self._show_rows(results, "ไม่พบข้อมูลที่ค้นหา")
+        if results:
+            self.update_status(f"พบ {len(results)} รายการ", "info")
 
-        if not results:
-            self.empty_label.configure(text="ไม่พบข้อมูลที่ค้นหา")
-            self.empty_label.place(relx=0.5, rely=0.5, anchor="center")
-            return
-        else:
-            self.empty_label.place_forget()
-
-        for idx, student in enumerate(results):
-            tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-            self.tree.insert("", "end", values=(
+    def _show_rows(self, students, empty_text):
+        """
+        แสดงรายชื่อในตาราง (TreeBinder อัปเดตเฉพาะแถวที่เปลี่ยน)
+        แถวที่ไม่ตรงคำค้นถูก detach ไว้ ค้นหาแคบลง/กว้างขึ้นจึงแค่จัดลำดับแถวใหม่
+        """
+        self.tree_binder.bind(
+            (student['student_id'], (
                 student['student_id'],
                 student['title'],
                 student['first_name'],
@@ -405,9 +400,15 @@ class StudentsModule:
                 student['class_room'],
                 student['class_year'],
                 student['parent_phone'] or "-"
-            ), tags=(tag,))
+            )) for student in students
+        )
 
-        self.update_status(f"พบ {len(results)} รายการ", "info")
+        if not students:
+            # แสดง Empty State
+            self.empty_label.configure(text=empty_text)
+            self.empty_label.place(relx=0.5, rely=0.5, anchor="center")
+        else:
+            self.empty_label.place_forget()
 
     def refresh_data(self):
         """รีเฟรชข้อมูล"""
@@ -423,14 +424,11 @@ class StudentsModule:
                     default_class_room=default_room)
 
     def _get_selected_student_id(self):
-        """ดึง student_id จากแถวที่เลือก (ใช้ index เพื่อหลีกเลี่ยง Treeview ตัดเลข 0 นำหน้า)"""
+        """ดึง student_id จากแถวที่เลือก (ใช้ iid ที่เป็นข้อความ เพื่อหลีกเลี่ยง Treeview ตัดเลข 0 นำหน้า)"""
         selected = self.tree.selection()
         if not selected:
             return None
-        idx = self.tree.index(selected[0])
-        if idx < len(self.students_data):
-            return self.students_data[idx]['student_id']
-        return None
+        return selected[0]
 
     def edit_student(self):
         """เปิดฟอร์มแก้ไขนักเรียน"""
@@ -476,6 +474,7 @@ class StudentsModule:
             return
 
         try:
+            import openpyxl  # โหลดเฉพาะตอนนำเข้า ไม่ให้ช้าตอนเปิดโปรแกรม
             wb = openpyxl.load_workbook(file_path)
             ws = wb.active
             success_count = 0
@@ -525,7 +524,12 @@ class StudentsModule:
         if not file_path:
             return
 
-        try:
+        students = list(self.students_data)
+
+        def build(job):
+            import openpyxl
+            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+
             wb = openpyxl.Workbook()
             ws = wb.active
             ws.title = "รายชื่อนักเรียน"
@@ -549,7 +553,7 @@ class StudentsModule:
                 cell.alignment = Alignment(horizontal='center', vertical='center')
                 cell.border = border
 
-            for row_idx, student in enumerate(self.students_data, start=2):
+            for row_idx, student in enumerate(job.iterate(students), start=2):
                 data = [
                     student['student_id'], student['title'],
                     student['first_name'], student['last_name'],
@@ -570,13 +574,11 @@ class StudentsModule:
             for col_letter in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
                 ws.column_dimensions[col_letter].width = 15
 
-            wb.save(file_path)
-            self.update_status("ส่งออก Excel สำเร็จ", "success")
-            messagebox.showinfo("สำเร็จ", f"ส่งออกข้อมูล {len(self.students_data)} รายการเรียบร้อย")
+            wb.save(job.output_path)
+            return f"ส่งออก Excel สำเร็จ {len(students)} รายการ"
 
-        except Exception as e:
-            self.update_status("ไม่สามารถส่งออกข้อมูลได้", "error")
-            messagebox.showerror("ผิดพลาด", f"ไม่สามารถส่งออกข้อมูลได้\n{str(e)}")
+        self.export_jobs.submit("ส่งออกข้อมูลเป็น Excel", build, file_path,
+                                error_message="ไม่สามารถส่งออกข้อมูลได้")
 
     def export_pdf(self):
         """ส่งออกข้อมูลเป็น PDF"""
@@ -594,10 +596,19 @@ class StudentsModule:
         if not file_path:
             return
 
-        try:
+        students = list(self.students_data)
+
+        def build(job):
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.units import cm
+            from modules.pdf_utils import get_thai_font
+
             font_name = get_thai_font()
 
-            doc = SimpleDocTemplate(file_path, pagesize=A4)
+            doc = SimpleDocTemplate(job.output_path, pagesize=A4)
             elements = []
             styles = getSampleStyleSheet()
 
@@ -610,7 +621,7 @@ class StudentsModule:
             elements.append(Spacer(1, 0.5 * cm))
 
             data = [["รหัส", "คำนำหน้า", "ชื่อ", "นามสกุล", "ห้อง", "ปีการศึกษา", "เบอร์ติดต่อ"]]
-            for student in self.students_data:
+            for student in job.iterate(students):
                 data.append([
                     student['student_id'], student['title'],
                     student['first_name'], student['last_name'],
@@ -633,14 +644,13 @@ class StudentsModule:
             ]))
 
             elements.append(table)
-            doc.build(elements)
+            doc.build(elements, onFirstPage=job.pdf_page_hook,
+                      onLaterPages=job.pdf_page_hook)
 
-            self.update_status("ส่งออก PDF สำเร็จ", "success")
-            messagebox.showinfo("สำเร็จ", f"ส่งออกข้อมูล {len(self.students_data)} รายการเรียบร้อย")
+            return f"ส่งออก PDF สำเร็จ {len(students)} รายการ"
 
-        except Exception as e:
-            self.update_status("ไม่สามารถส่งออก PDF ได้", "error")
-            messagebox.showerror("ผิดพลาด", f"ไม่สามารถส่งออก PDF ได้\n{str(e)}")
+        self.export_jobs.submit("ส่งออกข้อมูลเป็น PDF", build, file_path,
+                                error_message="ไม่สามารถส่งออก PDF ได้")
 
 
 class StudentForm(ctk.CTkToplevel):
@@ -690,7 +700,7 @@ class StudentForm(ctk.CTkToplevel):
         title_text = "แก้ไขข้อมูลนักเรียน" if self.student else "เพิ่มนักเรียนใหม่"
         ctk.CTkLabel(
             header_frame, text=title_text,
-            font=ctk.CTkFont(family="TH Sarabun New", size=18, weight="bold"),
+            font=FONTS.font("TH Sarabun New", 18, "bold"),
             text_color="white"
         ).pack(expand=True)
 
@@ -744,13 +754,13 @@ class StudentForm(ctk.CTkToplevel):
 
         ctk.CTkLabel(
             button_frame, text="* = จำเป็นต้องกรอก",
-            font=ctk.CTkFont(family="TH Sarabun New", size=12),
+            font=FONTS.style("caption"),
             text_color=TEXT_CAPTION
         ).pack(side="left")
 
         ctk.CTkButton(
             button_frame, text="ยกเลิก", command=self.destroy,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             width=90, height=36, corner_radius=RADIUS_BUTTON,
             fg_color="transparent", border_width=1,
             border_color=NEUTRAL, text_color=NEUTRAL, hover_color="#F3F4F6"
@@ -758,7 +768,7 @@ class StudentForm(ctk.CTkToplevel):
 
         ctk.CTkButton(
             button_frame, text="บันทึก", command=self.save,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14, weight="bold"),
+            font=FONTS.style("body_bold"),
             width=90, height=36, corner_radius=RADIUS_BUTTON,
             fg_color=PRIMARY, hover_color="#1D4ED8",
             image=IconManager.get_white("floppy-disk", 14), compound="left"
@@ -775,7 +785,7 @@ class StudentForm(ctk.CTkToplevel):
 
         ctk.CTkLabel(
             container, text="คำนำหน้า *",
-            font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
+            font=FONTS.style("cell"),
             text_color=TEXT_H3, anchor="w"
         ).pack(fill="x")
 
@@ -783,13 +793,13 @@ class StudentForm(ctk.CTkToplevel):
         ctk.CTkOptionMenu(
             container, variable=self.title_var,
             values=["เด็กชาย", "เด็กหญิง", "นาย", "นางสาว", "นาง"],
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             height=36, corner_radius=20,
             fg_color="#EFF6FF", button_color="#EFF6FF",
             button_hover_color="#DBEAFE", text_color="#1E40AF",
             dropdown_fg_color="#F0F4FF", dropdown_hover_color="#DBEAFE",
             dropdown_text_color="#1E40AF",
-            dropdown_font=ctk.CTkFont(family="TH Sarabun New", size=16)
+            dropdown_font=FONTS.font("TH Sarabun New", 16)
         ).pack(fill="x", pady=(XS, 0))
 
     def create_field(self, parent, label, field_name, placeholder="", default="", required=False, grid_pos=None):
@@ -804,7 +814,7 @@ class StudentForm(ctk.CTkToplevel):
         label_text = f"{label} *" if required else label
         ctk.CTkLabel(
             container, text=label_text,
-            font=ctk.CTkFont(family="TH Sarabun New", size=13, weight="bold"),
+            font=FONTS.style("cell"),
             text_color=TEXT_H3, anchor="w"
         ).pack(fill="x")
 
@@ -813,7 +823,7 @@ class StudentForm(ctk.CTkToplevel):
 
         entry = ctk.CTkEntry(
             container, textvariable=var, placeholder_text=placeholder,
-            font=ctk.CTkFont(family="TH Sarabun New", size=14),
+            font=FONTS.style("body"),
             height=34, corner_radius=RADIUS_BUTTON,
             border_width=1, border_color=INPUT_BORDER
         )
@@ -822,7 +832,7 @@ class StudentForm(ctk.CTkToplevel):
 
         error_label = ctk.CTkLabel(
             container, text="",
-            font=ctk.CTkFont(family="TH Sarabun New", size=11),
+            font=FONTS.style("cell_caption"),
             text_color=DANGER, anchor="w", height=14
         )
         error_label.pack(fill="x", pady=0)
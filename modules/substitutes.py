@@ -0,0 +1,124 @@
+"""
+modules/substitutes.py
+หาครูสอนแทน - เมื่อครูลา ดึงคาบของครูในวันนั้น (get_schedule_by_teacher)
+แล้วหาครูที่ว่างในแต่ละคาบด้วย bitset ของ TimetableModel
+- ครูที่ว่าง = ช่องของวันนั้น AND NOT ช่องที่ครูสอน (ตรวจทั้งวันในครั้งเดียวต่อครู)
+- เรียงผู้สอนแทนตามภาระงาน (get_teacher_workload) น้อยไปมาก แล้วตามจำนวนคาบในวันนั้น
+ไม่ import customtkinter
+"""
+
+from datetime import date as _date, datetime
+
+from modules.timetable_model import DAYS, get_timetable
+
+
+def weekday_of(date, days=DAYS):
+    """
+    ชื่อวันในตารางของวันที่
+    Args:
+        date: datetime.date/datetime หรือ str รูปแบบ YYYY-MM-DD
+        days: ชื่อวันจันทร์-ศุกร์ตามลำดับ
+    Returns:
+        ชื่อวัน หรือ None ถ้าเป็นวันหยุด (ไม่มีในตาราง)
+    Raises:
+        ValueError: รูปแบบวันที่ไม่ถูกต้อง
+    """
+    if isinstance(date, str):
+        date = datetime.strptime(date.strip(), "%Y-%m-%d").date()
+    elif isinstance(date, datetime):
+        date = date.date()
+    elif not isinstance(date, _date):
+        raise ValueError(f"วันที่ไม่ถูกต้อง: {date!r}")
+    weekday = date.weekday()
+    return days[weekday] if weekday < len(days) else None
+
+
+def plan_substitutes(model, absent_id, day_of_week, entries, workload, limit=None):
+    """
+    หาครูที่ว่างสำหรับแต่ละคาบของครูที่ลา
+    Args:
+        model: TimetableModel
+        absent_id: รหัสครูที่ลา (ไม่นับเป็นผู้สอนแทน)
+        day_of_week: ชื่อวัน
+        entries: คาบของครูที่ลา (เฉพาะคาบที่ไม่ใช่วันนั้นจะถูกข้าม)
+        workload: list of dict {teacher_id, name, periods_per_week} จาก get_teacher_workload()
+        limit: จำนวนผู้สอนแทนสูงสุดต่อคาบ (None = ทั้งหมด)
+    Returns:
+        list of dict {entry, period_no, candidates} เรียงตามคาบ
+        candidates: list of dict {teacher_id, name, periods_per_week, periods_today}
+    """
+    slot_bits = {}
+    for entry in entries:
+        if entry.get('day_of_week') != day_of_week:
+            continue
+        bit = model.slot_bit(day_of_week, entry.get('period_no'))
+        if bit is not None:
+            slot_bits[bit] = entry
+    if not slot_bits:
+        return []
+
+    day_index = model.days.index(day_of_week)
+    width = len(model.periods)
+    day_mask = ((1 << width) - 1) << (day_index * width)
+
+    pool = []
+    for teacher in workload:
+        if teacher['teacher_id'] == absent_id:
+            continue
+        busy = model.teacher_mask(teacher['teacher_id']) & day_mask
+        free = day_mask & ~busy
+        if not free:
+            continue
+        candidate = {
+            'teacher_id': teacher['teacher_id'],
+            'name': teacher['name'],
+            'periods_per_week': teacher['periods_per_week'],
+            'periods_today': busy.bit_count(),
+        }
+        pool.append((free, candidate))
+    pool.sort(key=lambda item: (item[1]['periods_per_week'], item[1]['periods_today'],
+                                item[1]['name'] or "", item[1]['teacher_id']))
+
+    plan = []
+    for bit in sorted(slot_bits):
+        entry = slot_bits[bit]
+        candidates = [candidate for free, candidate in pool if (free >> bit) & 1]
+        if limit is not None:
+            candidates = candidates[:limit]
+        plan.append({
+            'entry': entry,
+            'period_no': model.slot_of(bit)[1],
+            'candidates': candidates,
+        })
+    return plan
+
+
+def find_substitutes(db, teacher_id, date, limit=None):
+    """
+    หาครูสอนแทนของครูที่ลาในวันที่ระบุ
+    Args:
+        db: Database
+        teacher_id: รหัสครูที่ลา
+        date: วันที่ (datetime.date หรือ YYYY-MM-DD)
+        limit: จำนวนผู้สอนแทนสูงสุดต่อคาบ
+    Returns:
+        dict {teacher_id, date, day_of_week, periods} (periods ว่างถ้าเป็นวันหยุด)
+    Raises:
+        ValueError: รูปแบบวันที่ไม่ถูกต้อง
+    """
+    day_of_week = weekday_of(date)
+    if isinstance(date, str):
+        date = date.strip()
+    elif hasattr(date, 'strftime'):
+        date = date.strftime("%Y-%m-%d")
+    result = {'teacher_id': teacher_id, 'date': date, 'day_of_week': day_of_week, 'periods': []}
+    if day_of_week is None:
+        return result
+
+    entries = db.get_schedule_by_teacher(teacher_id)
+    if any(e['day_of_week'] == day_of_week for e in entries):
+        result['periods'] = plan_substitutes(
+            get_timetable(db), teacher_id, day_of_week, entries,
+            db.get_teacher_workload(), limit
+        )
+    return result
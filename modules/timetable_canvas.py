@@ -0,0 +1,296 @@
+"""
+modules/timetable_canvas.py
+TimetableCanvas - ตารางเรียน/ตารางสอน (วัน × คาบ) วาดบน Canvas ตัวเดียว
+- ทุกช่องเป็น canvas item (สี่เหลี่ยมมุมมน + ข้อความ) สร้างครั้งเดียวตอนสร้าง widget
+- เปลี่ยนห้อง/ครู = itemconfigure เฉพาะช่องที่ข้อความ/สีเปลี่ยน ไม่ต้องสร้าง widget ใหม่
+- คลิกช่อง: หาช่องจากพิกัด (hit-test แบบคำนวณ) แล้วเรียก on_cell_click(day, period, payload)
+- ใช้ได้ทั้งมุมมองห้องเรียนและมุมมองครู
+TimetableLayout (คำนวณตำแหน่ง) ไม่ขึ้นกับ Tk จึงทดสอบได้
+"""
+
+import tkinter as tk
+
+from modules.ui_fonts import STYLES
+
+# ==================== Design System ====================
+PRIMARY = "#3B82F6"
+TEXT_H2 = "#1E293B"
+TEXT_CAPTION = "#94A3B8"
+PERIOD_LABEL_BG = "#1F2937"
+CELL_EMPTY_BG = "#F9FAFB"
+CELL_EMPTY_TEXT = "#D1D5DB"
+CANVAS_BG = "#F8FAFC"
+
+RADIUS_CELL = 8
+CELL_PADDING = 8
+
+ROW_HEADER_WIDTH = 90
+HEADER_HEIGHT = 40
+ROW_HEIGHT = 60
+GAP = 4
+MIN_CELL_WIDTH = 80
+
+CANVAS_FONTS = {
+    "header": (STYLES["body_bold"][0], 14, "bold"),
+    "period": (STYLES["caption"][0], 12, "bold"),
+    "title": STYLES["cell"],
+    "subtitle": STYLES["cell_caption"],
+    "empty": (STYLES["cell"][0], 13, "normal"),
+}
+
+
+class TimetableCell:
+    """ข้อมูลของช่องหนึ่งช่อง"""
+
+    __slots__ = ("title", "subtitle", "fill", "payload")
+
+    def __init__(self, title, subtitle="", fill=CELL_EMPTY_BG, payload=None):
+        """
+        Args:
+            title: ข้อความบรรทัดแรก (เช่นชื่อวิชา)
+            subtitle: ข้อความบรรทัดที่สอง (เช่นชื่อครู / ห้อง)
+            fill: สีพื้นของช่อง
+            payload: ค่าที่ส่งให้ on_cell_click (เช่น schedule id)
+        """
+        self.title = title
+        self.subtitle = subtitle
+        self.fill = fill
+        self.payload = payload
+
+
+class TimetableLayout:
+    """ตำแหน่งของหัวตาราง/หัวแถว/ช่อง (หน่วย px ก่อน scaling)"""
+
+    def __init__(self, columns, rows, width, row_header_width=ROW_HEADER_WIDTH,
+                 header_height=HEADER_HEIGHT, row_height=ROW_HEIGHT, gap=GAP):
+        """
+        Args:
+            columns: จำนวนวัน
+            rows: จำนวนคาบ
+            width: ความกว้างที่มี (คอลัมน์วันยืดเต็มความกว้าง)
+        """
+        self.columns = columns
+        self.rows = rows
+        self.row_header_width = row_header_width
+        self.header_height = header_height
+        self.row_height = row_height
+        self.gap = gap
+        usable = width - row_header_width - gap * (columns + 2)
+        self.cell_width = max(MIN_CELL_WIDTH, usable / columns if columns else MIN_CELL_WIDTH)
+        self.width = row_header_width + gap * (columns + 2) + self.cell_width * columns
+        self.height = header_height + gap * (rows + 2) + row_height * rows
+
+    def _x(self, col):
+        """ขอบซ้ายของคอลัมน์ (col = -1 คือหัวแถว)"""
+        if col < 0:
+            return self.gap
+        return self.gap * (col + 2) + self.row_header_width + self.cell_width * col
+
+    def _y(self, row):
+        """ขอบบนของแถว (row = -1 คือหัวตาราง)"""
+        if row < 0:
+            return self.gap
+        return self.gap * (row + 2) + self.header_height + self.row_height * row
+
+    def rect(self, col, row):
+        """
+        Args:
+            col: คอลัมน์ (-1 = หัวแถว "คาบ")
+            row: แถว (-1 = หัวตาราง "วัน")
+        Returns:
+            (x1, y1, x2, y2)
+        """
+        x1, y1 = self._x(col), self._y(row)
+        width = self.row_header_width if col < 0 else self.cell_width
+        height = self.header_height if row < 0 else self.row_height
+        return (x1, y1, x1 + width, y1 + height)
+
+    def hit(self, x, y):
+        """
+        ช่องที่พิกัด (x, y) อยู่ (ไม่นับหัวตาราง/หัวแถว และช่องว่างระหว่างช่อง)
+        Returns:
+            (col, row) หรือ None
+        """
+        col_offset = x - self._x(0)
+        row_offset = y - self._y(0)
+        if col_offset < 0 or row_offset < 0:
+            return None
+        col = int(col_offset // (self.cell_width + self.gap))
+        row = int(row_offset // (self.row_height + self.gap))
+        if col >= self.columns or row >= self.rows:
+            return None
+        x1, y1, x2, y2 = self.rect(col, row)
+        if x1 <= x <= x2 and y1 <= y <= y2:
+            return col, row
+        return None
+
+
+def rounded_rect_points(x1, y1, x2, y2, radius):
+    """จุดของ polygon (smooth=True) ที่เป็นสี่เหลี่ยมมุมมน"""
+    r = max(0, min(radius, (x2 - x1) / 2, (y2 - y1) / 2))
+    return (x1 + r, y1, x2 - r, y1, x2, y1, x2, y1 + r,
+            x2, y2 - r, x2, y2, x2 - r, y2, x1 + r, y2,
+            x1, y2, x1, y2 - r, x1, y1 + r, x1, y1)
+
+
+class TimetableCanvas(tk.Canvas):
+    """ตารางวัน × คาบ บน Canvas ตัวเดียว"""
+
+    def __init__(self, master, days, periods, period_times, on_cell_click=None,
+                 scaling=1.0, fonts=None, bg=CANVAS_BG):
+        """
+        Args:
+            master: widget แม่
+            days: list ชื่อวัน (คอลัมน์)
+            periods: list เลขคาบ (แถว)
+            period_times: list ของ (เวลาเริ่ม, เวลาจบ) ตามลำดับคาบ
+            on_cell_click: callback(day, period, payload) เมื่อคลิกช่องที่มี payload (ไม่บังคับ)
+            scaling: widget scaling ของ CustomTkinter
+            fonts: dict ชื่อ -> (family, size, weight) (ค่าเริ่มต้น CANVAS_FONTS)
+        """
+        self.days = list(days)
+        self.periods = list(periods)
+        self.period_times = list(period_times)
+        self.on_cell_click = on_cell_click
+        self.scaling = scaling
+        fonts = dict(CANVAS_FONTS, **(fonts or {}))
+        self.fonts = {name: (family, -round(size * scaling), weight)
+                      for name, (family, size, weight) in fonts.items()}
+
+        self.layout = TimetableLayout(len(self.days), len(self.periods), 0)
+        super().__init__(master, bg=bg, highlightthickness=0, bd=0,
+                         height=round(self.layout.height * scaling))
+
+        self._items = {}      # (col, row) -> (rect, title, subtitle, center)
+        self._headers = []    # (col, row, rect, text) ของหัวตาราง/หัวแถว
+        self._cells = {}      # (col, row) -> TimetableCell ที่แสดงอยู่
+        self.updates = 0      # จำนวนช่องที่ถูก itemconfigure (สำหรับวัดผล)
+        self._create_items()
+
+        self.bind("<Configure>", self._on_resize)
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<Motion>", self._on_motion)
+
+    # ---------- สร้าง item ----------
+
+    def _create_items(self):
+        self._headers.append((-1, -1, self.create_polygon(0, 0, 0, 0, smooth=True, fill=PERIOD_LABEL_BG),
+                              self.create_text(0, 0, text="คาบ/วัน", fill="#FFFFFF",
+                                               font=self.fonts["period"])))
+        for col, day in enumerate(self.days):
+            self._headers.append((col, -1, self.create_polygon(0, 0, 0, 0, smooth=True, fill=PRIMARY),
+                                  self.create_text(0, 0, text=day, fill="#FFFFFF",
+                                                   font=self.fonts["header"])))
+        for row, period in enumerate(self.periods):
+            start_time, end_time = self.period_times[row]
+            self._headers.append((-1, row, self.create_polygon(0, 0, 0, 0, smooth=True, fill=PERIOD_LABEL_BG),
+                                  self.create_text(0, 0, text=f"คาบ {period}\n{start_time}-{end_time}",
+                                                   fill="#FFFFFF", justify="center",
+                                                   font=self.fonts["period"])))
+        for row in range(len(self.periods)):
+            for col in range(len(self.days)):
+                self._items[(col, row)] = (
+                    self.create_polygon(0, 0, 0, 0, smooth=True, fill=CELL_EMPTY_BG),
+                    self.create_text(0, 0, text="", anchor="nw", fill=TEXT_H2, font=self.fonts["title"]),
+                    self.create_text(0, 0, text="", anchor="sw", fill=TEXT_CAPTION, font=self.fonts["subtitle"]),
+                    self.create_text(0, 0, text="-", fill=CELL_EMPTY_TEXT, font=self.fonts["empty"]),
+                )
+        self._place_items()
+
+    def _scaled(self, rect):
+        return tuple(v * self.scaling for v in rect)
+
+    def _place_items(self):
+        """ย้าย item ตาม layout ปัจจุบัน (หลังเปลี่ยนขนาด)"""
+        radius = RADIUS_CELL * self.scaling
+        pad = CELL_PADDING * self.scaling
+        for col, row, rect_id, text_id in self._headers:
+            x1, y1, x2, y2 = self._scaled(self.layout.rect(col, row))
+            self.coords(rect_id, *rounded_rect_points(x1, y1, x2, y2, radius))
+            self.coords(text_id, (x1 + x2) / 2, (y1 + y2) / 2)
+        for (col, row), (rect_id, title_id, subtitle_id, center_id) in self._items.items():
+            x1, y1, x2, y2 = self._scaled(self.layout.rect(col, row))
+            self.coords(rect_id, *rounded_rect_points(x1, y1, x2, y2, radius))
+            self.coords(title_id, x1 + pad, y1 + pad)
+            self.coords(subtitle_id, x1 + pad, y2 - pad)
+            self.coords(center_id, (x1 + x2) / 2, (y1 + y2) / 2)
+            self.itemconfigure(title_id, width=max(1, x2 - x1 - 2 * pad))
+
+    def _on_resize(self, event):
+        width = event.width / self.scaling
+        if abs(width - self.layout.width) < 1:
+            return
+        self.layout = TimetableLayout(len(self.days), len(self.periods), width)
+        self._place_items()
+
+    # ---------- ข้อมูล ----------
+
+    def set_cells(self, cells):
+        """
+        แสดงข้อมูลตาราง - configure เฉพาะช่องที่เปลี่ยน
+        Args:
+            cells: dict {(วัน, คาบ): TimetableCell} ช่องที่ไม่มีใน dict = ช่องว่าง
+        Returns:
+            จำนวนช่องที่เปลี่ยน
+        """
+        changed = 0
+        for row, period in enumerate(self.periods):
+            for col, day in enumerate(self.days):
+                cell = cells.get((day, period))
+                previous = self._cells.get((col, row))
+                if _same_cell(cell, previous):
+                    if cell is not None:
+                        self._cells[(col, row)] = cell  # payload อาจเปลี่ยน
+                    continue
+                rect_id, title_id, subtitle_id, center_id = self._items[(col, row)]
+                if cell is None:
+                    self.itemconfigure(rect_id, fill=CELL_EMPTY_BG)
+                    self.itemconfigure(title_id, text="")
+                    self.itemconfigure(subtitle_id, text="")
+                    self.itemconfigure(center_id, text="-")
+                    self._cells.pop((col, row), None)
+                else:
+                    self.itemconfigure(rect_id, fill=cell.fill)
+                    self.itemconfigure(title_id, text=cell.title)
+                    self.itemconfigure(subtitle_id, text=cell.subtitle)
+                    self.itemconfigure(center_id, text="")
+                    self._cells[(col, row)] = cell
+                changed += 1
+        self.updates += changed
+        return changed
+
+    def cell_at(self, x, y):
+        """
+        Returns:
+            (วัน, คาบ, TimetableCell หรือ None) ที่พิกัดบน canvas หรือ None ถ้าไม่ใช่ช่อง
+        """
+        hit = self.layout.hit(self.canvasx(x) / self.scaling, self.canvasy(y) / self.scaling)
+        if hit is None:
+            return None
+        col, row = hit
+        return self.days[col], self.periods[row], self._cells.get(hit)
+
+    # ---------- event ----------
+
+    def _on_click(self, event):
+        found = self.cell_at(event.x, event.y)
+        if found is None or self.on_cell_click is None:
+            return
+        day, period, cell = found
+        if cell is not None and cell.payload is not None:
+            self.on_cell_click(day, period, cell.payload)
+
+    def _on_motion(self, event):
+        if self.on_cell_click is None:
+            return
+        found = self.cell_at(event.x, event.y)
+        clickable = found is not None and found[2] is not None and found[2].payload is not None
+        cursor = "hand2" if clickable else ""
+        if self.cget("cursor") != cursor:
+            self.configure(cursor=cursor)
+
+
+def _same_cell(a, b):
+    if a is None or b is None:
+        return a is b
+    return (a.title, a.subtitle, a.fill) == (b.title, b.subtitle, b.fill)
@@ -0,0 +1,603 @@
+"""
+modules/timetable_generator.py
+จัดตารางเรียนอัตโนมัติ - จากจำนวนคาบต่อสัปดาห์ของแต่ละวิชา/ห้อง + ครูผู้สอน + เวลาที่ครูว่าง
+- ช่องว่างของห้องเรียน/ครู/ห้อง เก็บเป็น bitset (5 วัน × 8 คาบ) แบบเดียวกับ TimetableModel
+- Backtracking: เลือกวิชาที่เหลือทางเลือกน้อยที่สุดก่อน (MRV) และตัดกิ่งทันทีเมื่อช่องว่างไม่พอ
+  (forward checking) ไม่ครบในจำนวนก้าวที่กำหนด = เริ่มใหม่ด้วย seed อื่น
+- ไม่ให้ครูสอนซ้ำคาบ (ตรงกับ UNIQUE(teacher_id, day_of_week, period_no)), ห้องเรียน/ห้องไม่ซ้อน,
+  วิชาเดียวกันไม่เกิน max_per_day คาบต่อวัน
+- จัดไม่ครบ (เช่นครูมีคาบว่างไม่พอ): คืนรอบที่จัดได้มากที่สุด แล้วเติมคาบที่ยังวางได้แบบ greedy
+  พร้อมรายการวิชาที่ยังขาดและสาเหตุที่ตรวจพบล่วงหน้า (capacity_problems)
+- diff_schedules(): เปรียบเทียบกับตารางปัจจุบันก่อนบันทึก
+- Benchmark: python -m modules.timetable_generator --benchmark [จำนวนห้อง]
+ไม่ import customtkinter
+"""
+
+import csv
+import random
+import sys
+import time
+from collections import OrderedDict
+
+from modules.timetable_model import DAYS, PERIODS, PERIOD_TIMES
+
+DEFAULT_MAX_PER_DAY = 2
+DEFAULT_MAX_STEPS = 20000
+DEFAULT_RESTARTS = 8
+DEFAULT_BRANCHING = 3   # จำนวนช่องที่ลองต่อการตัดสินใจหนึ่งครั้งก่อนย้อนกลับต่อ
+DEFAULT_TIME_LIMIT = 10.0
+
+REQUIREMENT_COLUMNS = ("class_room", "subject_name", "teacher_id", "periods_per_week", "room_no")
+
+
+class Requirement:
+    """วิชาหนึ่งของห้องหนึ่ง: สอนโดยครูคนเดียว จำนวน periods คาบต่อสัปดาห์"""
+
+    __slots__ = ("class_room", "subject_name", "teacher_id", "periods", "room_no")
+
+    def __init__(self, class_room, subject_name, teacher_id, periods, room_no=None):
+        """
+        Args:
+            class_room: ห้องเรียน เช่น "ป.1/1"
+            subject_name: ชื่อวิชา
+            teacher_id: รหัสครูผู้สอน
+            periods: จำนวนคาบต่อสัปดาห์
+            room_no: ห้องที่ใช้สอน (ไม่บังคับ - ระบุเมื่อห้องใช้ร่วมกันหลายห้องเรียน เช่นห้อง Lab)
+        """
+        self.class_room = class_room
+        self.subject_name = subject_name
+        self.teacher_id = teacher_id
+        self.periods = int(periods)
+        self.room_no = room_no or None
+
+    def __repr__(self):
+        return (f"Requirement({self.class_room!r}, {self.subject_name!r}, "
+                f"{self.teacher_id!r}, {self.periods})")
+
+
+class GenerationResult:
+    """ผลการจัดตาราง"""
+
+    def __init__(self, entries, unplaced, steps, attempts, seconds, problems=()):
+        """
+        Args:
+            entries: list of dict ในรูปแบบ schedule_data (class_room, day_of_week, period_no, ...)
+            unplaced: list ของ (Requirement, จำนวนคาบที่ยังจัดไม่ได้)
+            steps: จำนวนก้าวของการค้นหาทั้งหมด
+            attempts: จำนวนรอบที่ค้นหา (1 + จำนวนครั้งที่เริ่มใหม่)
+            seconds: เวลาที่ใช้
+            problems: ข้อความสาเหตุที่จัดครบไม่ได้แน่นอน (จาก capacity_problems)
+        """
+        self.entries = entries
+        self.unplaced = unplaced
+        self.problems = list(problems)
+        self.steps = steps
+        self.attempts = attempts
+        self.seconds = seconds
+
+    @property
+    def complete(self):
+        return not self.unplaced
+
+
+class TimetableGenerator:
+    """จัดตารางเรียนจาก list ของ Requirement"""
+
+    def __init__(self, requirements, fixed=(), availability=None, days=DAYS, periods=PERIODS,
+                 period_times=PERIOD_TIMES, max_per_day=DEFAULT_MAX_PER_DAY, seed=0,
+                 max_steps=DEFAULT_MAX_STEPS, restarts=DEFAULT_RESTARTS,
+                 branching=DEFAULT_BRANCHING, time_limit=DEFAULT_TIME_LIMIT,
+                 clock=time.perf_counter):
+        """
+        Args:
+            requirements: list ของ Requirement ที่ต้องจัด
+            fixed: คาบที่มีอยู่แล้วและไม่เปลี่ยน (dict แบบ schedule) เช่นตารางของห้องอื่น
+            availability: dict {teacher_id: bitset ของช่องที่ครูสอนได้} (ไม่ระบุ = ว่างทุกช่อง)
+            days, periods, period_times: แกนของตาราง
+            max_per_day: จำนวนคาบสูงสุดของวิชาเดียวกันในหนึ่งวัน
+            seed: seed ของการสุ่มลำดับ (ผลเหมือนเดิมทุกครั้งเมื่อ seed เดิม)
+            max_steps: จำนวนก้าวสูงสุดต่อรอบก่อนเริ่มใหม่
+            restarts: จำนวนครั้งที่เริ่มใหม่ได้
+            branching: จำนวนช่องที่ลองต่อการตัดสินใจ
+            time_limit: เวลาสูงสุดของการค้นหา (วินาที) - เกินแล้วหยุดและคืนผลที่ดีที่สุด
+            clock: ฟังก์ชันเวลา (วินาที)
+        """
+        self.requirements = [r for r in requirements if r.periods > 0]
+        self.days = tuple(days)
+        self.periods = tuple(periods)
+        self.period_times = list(period_times)
+        self.max_per_day = max_per_day
+        self.seed = seed
+        self.max_steps = max_steps
+        self.restarts = restarts
+        self.branching = max(1, branching)
+        self.time_limit = time_limit
+        self.clock = clock
+
+        self.period_count = len(self.periods)
+        self.full_mask = (1 << (len(self.days) * self.period_count)) - 1
+        day_bits = (1 << self.period_count) - 1
+        self.day_masks = [day_bits << (d * self.period_count) for d in range(len(self.days))]
+        self.availability = dict(availability or {})
+
+        self._fixed_class, self._fixed_teacher, self._fixed_room = {}, {}, {}
+        day_index = {day: i for i, day in enumerate(self.days)}
+        period_index = {period: i for i, period in enumerate(self.periods)}
+        for entry in fixed:
+            day = day_index.get(entry.get('day_of_week'))
+            period = period_index.get(entry.get('period_no'))
+            if day is None or period is None:
+                continue
+            bit = 1 << (day * self.period_count + period)
+            _or(self._fixed_class, entry.get('class_room'), bit)
+            _or(self._fixed_teacher, entry.get('teacher_id'), bit)
+            if entry.get('room_no'):
+                _or(self._fixed_room, entry['room_no'], bit)
+
+    # ---------- ค้นหา ----------
+
+    def generate(self):
+        """
+        Returns:
+            GenerationResult (ถ้าจัดไม่ครบ จะคืนรอบที่จัดได้มากที่สุด)
+        """
+        started = self.clock()
+        deadline = started + self.time_limit
+        problems = self.capacity_problems()
+        total_steps = 0
+        best = None
+        best_attempt = 0
+        solved = False
+        attempts = 0
+        # จัดครบไม่ได้แน่นอน - ไม่ต้องค้นหา เติมแบบ greedy ให้ได้มากที่สุด
+        for attempt in range(0 if problems else self.restarts + 1):
+            attempts += 1
+            search = _Search(self, random.Random(self.seed + attempt), deadline)
+            placed = search.run()
+            total_steps += search.steps
+            if best is None or len(placed) > len(best):
+                best, best_attempt = placed, attempt
+            solved = search.solved
+            if solved or self.clock() >= deadline:
+                break
+
+        if not solved:
+            best = _Search(self, random.Random(self.seed + best_attempt)).fill(best or [])
+
+        counts = [0] * len(self.requirements)
+        entries = []
+        for req_index, bit in best:
+            counts[req_index] += 1
+            entries.append(self._entry(self.requirements[req_index], bit))
+        entries.sort(key=lambda e: (e['class_room'], self.days.index(e['day_of_week']), e['period_no']))
+        unplaced = [(req, req.periods - counts[i]) for i, req in enumerate(self.requirements)
+                    if counts[i] < req.periods]
+        return GenerationResult(entries, unplaced, total_steps, attempts, self.clock() - started,
+                                problems)
+
+    def capacity_problems(self):
+        """
+        ตรวจล่วงหน้าว่าจำนวนคาบเกินช่องว่างของห้องเรียน/ครู/ห้องหรือไม่
+        Returns:
+            list ของข้อความ (ว่าง = อาจจัดได้ครบ)
+        """
+        slot_count = self.full_mask.bit_count()
+        need = {}
+        for req in self.requirements:
+            keys = [("ห้องเรียน", req.class_room), ("ครู", req.teacher_id)]
+            if req.room_no:
+                keys.append(("ห้อง", req.room_no))
+            for key in keys:
+                need[key] = need.get(key, 0) + req.periods
+        fixed = {"ห้องเรียน": self._fixed_class, "ครู": self._fixed_teacher, "ห้อง": self._fixed_room}
+        problems = []
+        for (kind, value), count in need.items():
+            free = self.full_mask & ~fixed[kind].get(value, 0)
+            if kind == "ครู":
+                free &= self.availability.get(value, self.full_mask)
+            if count > free.bit_count():
+                problems.append(f"{kind} {value} ต้องใช้ {count} คาบ แต่มีช่องว่าง {free.bit_count()} จาก {slot_count} ช่อง")
+        return problems
+
+    def _entry(self, req, bit):
+        day, period = divmod(bit, self.period_count)
+        start_time, end_time = self.period_times[period]
+        return {
+            'class_room': req.class_room,
+            'day_of_week': self.days[day],
+            'period_no': self.periods[period],
+            'start_time': start_time,
+            'end_time': end_time,
+            'subject_name': req.subject_name,
+            'teacher_id': req.teacher_id,
+            'room_no': req.room_no,
+        }
+
+
+class _Search:
+    """หนึ่งรอบของ backtracking (สถานะ bitset แยกจากรอบอื่น)"""
+
+    def __init__(self, generator, rng, deadline=None):
+        self.g = generator
+        self.rng = rng
+        self.deadline = deadline
+        self.steps = 0
+        self.solved = False
+        reqs = generator.requirements
+        self.remaining = [r.periods for r in reqs]
+        self.class_busy = dict(generator._fixed_class)
+        self.teacher_busy = dict(generator._fixed_teacher)
+        self.room_busy = dict(generator._fixed_room)
+        self.day_counts = [[0] * len(generator.days) for _ in reqs]
+        self.blocked = [0] * len(reqs)      # วันที่วิชานี้ครบ max_per_day แล้ว (bitset ของช่อง)
+        # ลำดับสุ่มของวิชา ใช้ตัดสินเมื่อทางเลือกเท่ากัน
+        self.order = list(range(len(reqs)))
+        rng.shuffle(self.order)
+
+    def _domain(self, i):
+        req = self.g.requirements[i]
+        mask = (self.g.full_mask
+                & self.g.availability.get(req.teacher_id, self.g.full_mask)
+                & ~self.class_busy.get(req.class_room, 0)
+                & ~self.teacher_busy.get(req.teacher_id, 0)
+                & ~self.blocked[i])
+        if req.room_no:
+            mask &= ~self.room_busy.get(req.room_no, 0)
+        return mask
+
+    def _assign(self, i, bit):
+        req = self.g.requirements[i]
+        flag = 1 << bit
+        self.class_busy[req.class_room] = self.class_busy.get(req.class_room, 0) | flag
+        self.teacher_busy[req.teacher_id] = self.teacher_busy.get(req.teacher_id, 0) | flag
+        if req.room_no:
+            self.room_busy[req.room_no] = self.room_busy.get(req.room_no, 0) | flag
+        self.remaining[i] -= 1
+        day = bit // self.g.period_count
+        self.day_counts[i][day] += 1
+        if self.day_counts[i][day] >= self.g.max_per_day:
+            self.blocked[i] |= self.g.day_masks[day]
+
+    def _unassign(self, i, bit):
+        req = self.g.requirements[i]
+        flag = ~(1 << bit)
+        self.class_busy[req.class_room] &= flag
+        self.teacher_busy[req.teacher_id] &= flag
+        if req.room_no:
+            self.room_busy[req.room_no] &= flag
+        self.remaining[i] += 1
+        day = bit // self.g.period_count
+        self.day_counts[i][day] -= 1
+        self.blocked[i] &= ~self.g.day_masks[day]
+
+    def _select(self):
+        """
+        Returns:
+            (i, domain) ของวิชาที่มีทางเลือกเหลือน้อยที่สุด, (None, None) เมื่อจัดครบ
+            หรือ (i, 0) เมื่อมีวิชาที่ช่องว่างไม่พอแล้ว (ต้องย้อนกลับ)
+        """
+        best = None
+        best_key = None
+        for i in self.order:
+            need = self.remaining[i]
+            if not need:
+                continue
+            domain = self._domain(i)
+            size = domain.bit_count()
+            if size < need:
+                return i, 0
+            key = (size - need, size)
+            if best_key is None or key < best_key:
+                best, best_key = (i, domain), key
+                if key[0] == 0 and size == need:
+                    break
+        return best if best is not None else (None, None)
+
+    def _candidates(self, i, domain):
+        """ช่องที่จะลอง เรียงจากวันที่วิชานี้/ห้องนี้มีคาบน้อยที่สุด"""
+        req = self.g.requirements[i]
+        class_busy = self.class_busy.get(req.class_room, 0)
+        day_load = [(class_busy & mask).bit_count() for mask in self.g.day_masks]
+        counts = self.day_counts[i]
+        scored = []
+        bits = domain
+        while bits:
+            low = bits & -bits
+            bit = low.bit_length() - 1
+            bits ^= low
+            day = bit // self.g.period_count
+            scored.append((counts[day], day_load[day], self.rng.random(), bit))
+        scored.sort()
+        return [bit for *_, bit in scored[:self.g.branching]]
+
+    def run(self):
+        """
+        Returns:
+            list ของ (index ของ requirement, bit) ที่จัดได้มากที่สุดในรอบนี้
+        """
+        frames = []     # [i, candidates, position]
+        best = []
+        while self.steps < self.g.max_steps:
+            self.steps += 1
+            if self.deadline is not None and not self.steps & 0xFF and self.g.clock() >= self.deadline:
+                break
+            i, domain = self._select()
+            if i is None:
+                self.solved = True
+                return [(f[0], f[1][f[2]]) for f in frames]
+            if domain:
+                candidates = self._candidates(i, domain)
+                frames.append([i, candidates, 0])
+                self._assign(i, candidates[0])
+                continue
+
+            # ทางตัน - เก็บผลที่ดีที่สุดไว้ แล้วย้อนกลับไปลองช่องถัดไป
+            if len(frames) > len(best):
+                best = [(f[0], f[1][f[2]]) for f in frames]
+            while frames:
+                frame = frames[-1]
+                self._unassign(frame[0], frame[1][frame[2]])
+                frame[2] += 1
+                if frame[2] < len(frame[1]):
+                    self._assign(frame[0], frame[1][frame[2]])
+                    break
+                frames.pop()
+            else:
+                return best
+        if len(frames) > len(best):
+            best = [(f[0], f[1][f[2]]) for f in frames]
+        return best
+
+    def fill(self, placed):
+        """
+        วางผลเดิม แล้วเติมคาบที่ยังวางได้ทีละคาบ (ไม่ย้อนกลับ) จนไม่มีช่องว่างให้วิชาใดอีก
+        Returns:
+            list ของ (index ของ requirement, bit)
+        """
+        placed = list(placed)
+        for i, bit in placed:
+            self._assign(i, bit)
+        while True:
+            best = None
+            for i in self.order:
+                if not self.remaining[i]:
+                    continue
+                domain = self._domain(i)
+                if domain and (best is None or domain.bit_count() < best[1].bit_count()):
+                    best = (i, domain)
+            if best is None:
+                return placed
+            bit = self._candidates(*best)[0]
+            self._assign(best[0], bit)
+            placed.append((best[0], bit))
+
+
+def _or(masks, key, bit):
+    masks[key] = masks.get(key, 0) | bit
+
+
+# ==================== ข้อมูลเข้า/ตรวจสอบ ====================
+
+def requirements_from_schedule(schedules):
+    """
+    จำนวนคาบต่อวิชาจากตารางที่มีอยู่ (ใช้จัดตารางเดิมใหม่)
+    Args:
+        schedules: list of dict แบบ schedule
+    Returns:
+        list ของ Requirement เรียงตามห้อง
+    """
+    grouped = OrderedDict()
+    for s in sorted(schedules, key=lambda s: s['class_room']):
+        key = (s['class_room'], s['subject_name'], s['teacher_id'], s.get('room_no') or None)
+        grouped[key] = grouped.get(key, 0) + 1
+    return [Requirement(c, subject, teacher, count, room)
+            for (c, subject, teacher, room), count in grouped.items()]
+
+
+def load_requirements_csv(path):
+    """
+    อ่าน Requirement จากไฟล์ CSV (UTF-8, หัวคอลัมน์ตาม REQUIREMENT_COLUMNS - room_no ไม่บังคับ)
+    Raises:
+        ValueError: หัวคอลัมน์ไม่ครบ หรือจำนวนคาบไม่ใช่จำนวนเต็มบวก (ระบุบรรทัด)
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in REQUIREMENT_COLUMNS[:4] if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"ไม่พบคอลัมน์: {', '.join(missing)}")
+        requirements = []
+        for line_no, row in enumerate(reader, start=2):
+            values = {c: (row.get(c) or "").strip() for c in REQUIREMENT_COLUMNS}
+            if not (values['class_room'] and values['subject_name'] and values['teacher_id']):
+                raise ValueError(f"บรรทัด {line_no}: ต้องระบุห้อง วิชา และรหัสครู")
+            try:
+                periods = int(values['periods_per_week'])
+            except ValueError:
+                periods = 0
+            if periods <= 0:
+                raise ValueError(f"บรรทัด {line_no}: จำนวนคาบต่อสัปดาห์ไม่ถูกต้อง")
+            requirements.append(Requirement(values['class_room'], values['subject_name'],
+                                            values['teacher_id'], periods, values['room_no']))
+    return requirements
+
+
+def check_teachers(requirements, teachers):
+    """
+    ตรวจว่ารหัสครูทุกตัวใน Requirement มีอยู่ในระบบ
+    (คาบของครูที่ไม่มีในระบบถูกบันทึกได้ แต่ไม่แสดงในทุกมุมมองเพราะ JOIN teachers)
+    Args:
+        requirements: list ของ Requirement
+        teachers: ครูทั้งหมดในระบบ (get_all_teachers(active_only=False))
+    Raises:
+        ValueError: มีรหัสครูที่ไม่พบ (ระบุทุกรหัส)
+    """
+    known = {t['teacher_id'] for t in teachers}
+    unknown = sorted({r.teacher_id for r in requirements} - known)
+    if unknown:
+        raise ValueError(f"ไม่พบรหัสครู: {', '.join(unknown)}")
+
+
+def load_availability_csv(path, days=DAYS, periods=PERIODS):
+    """
+    อ่านช่องที่ครูไม่ว่างจากไฟล์ CSV (คอลัมน์ teacher_id, day_of_week, period_no)
+    period_no ว่าง = ไม่ว่างทั้งวัน
+    Returns:
+        dict {teacher_id: bitset ของช่องที่สอนได้} สำหรับ TimetableGenerator(availability=...)
+    Raises:
+        ValueError: หัวคอลัมน์ไม่ครบ หรือวัน/คาบไม่ถูกต้อง (ระบุบรรทัด)
+    """
+    day_index = {day: i for i, day in enumerate(days)}
+    period_index = {period: i for i, period in enumerate(periods)}
+    full = (1 << (len(days) * len(periods))) - 1
+    availability = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in ("teacher_id", "day_of_week") if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"ไม่พบคอลัมน์: {', '.join(missing)}")
+        for line_no, row in enumerate(reader, start=2):
+            teacher_id = (row.get('teacher_id') or "").strip()
+            day = day_index.get((row.get('day_of_week') or "").strip())
+            period_text = (row.get('period_no') or "").strip()
+            if not teacher_id or day is None:
+                raise ValueError(f"บรรทัด {line_no}: ต้องระบุรหัสครูและวัน (จันทร์-ศุกร์)")
+            if period_text:
+                period = period_index.get(int(period_text)) if period_text.isdigit() else None
+                if period is None:
+                    raise ValueError(f"บรรทัด {line_no}: คาบไม่ถูกต้อง")
+                busy = 1 << (day * len(periods) + period)
+            else:
+                busy = ((1 << len(periods)) - 1) << (day * len(periods))
+            availability[teacher_id] = availability.get(teacher_id, full) & ~busy
+    return availability
+
+
+def find_conflicts(entries):
+    """
+    ตรวจตาราง: ครูสอนซ้ำ, ห้องเรียนมีสองวิชาในคาบเดียว, ห้องถูกใช้ซ้อน
+    Returns:
+        list ของข้อความ (ว่าง = ไม่มีปัญหา)
+    """
+    seen = {}
+    problems = []
+    for e in entries:
+        slot = (e['day_of_week'], e['period_no'])
+        keys = [("ครู", e['teacher_id']), ("ห้องเรียน", e['class_room'])]
+        if e.get('room_no'):
+            keys.append(("ห้อง", e['room_no']))
+        for kind, value in keys:
+            key = (kind, value) + slot
+            if key in seen:
+                problems.append(f"{kind} {value} ซ้ำในวัน {slot[0]} คาบที่ {slot[1]}")
+            seen[key] = e
+    return problems
+
+
+def diff_schedules(current, proposed):
+    """
+    เปรียบเทียบตารางปัจจุบันกับตารางใหม่ (ต่อช่อง ห้องเรียน × วัน × คาบ)
+    Returns:
+        dict {
+            'added': list ของคาบใหม่ในช่องที่เคยว่าง,
+            'removed': list ของคาบเดิมในช่องที่จะว่าง,
+            'changed': list ของ (เดิม, ใหม่) ที่วิชา/ครู/ห้องต่างกัน,
+            'unchanged': จำนวนช่องที่เหมือนเดิม,
+        }
+    """
+    def key(e):
+        return (e['class_room'], e['day_of_week'], int(e['period_no']))
+
+    def content(e):
+        return (e['subject_name'], e['teacher_id'], e.get('room_no') or None)
+
+    old = {key(e): e for e in current}
+    new = {key(e): e for e in proposed}
+    diff = {'added': [], 'removed': [], 'changed': [], 'unchanged': 0}
+    for k, e in new.items():
+        before = old.get(k)
+        if before is None:
+            diff['added'].append(e)
+        elif content(before) != content(e):
+            diff['changed'].append((before, e))
+        else:
+            diff['unchanged'] += 1
+    diff['removed'] = [e for k, e in old.items() if k not in new]
+    return diff
+
+
+# ==================== Benchmark ====================
+
+SYNTHETIC_SUBJECTS = (
+    ("ภาษาไทย", 5), ("คณิตศาสตร์", 5), ("วิทยาศาสตร์", 4), ("ภาษาอังกฤษ", 4),
+    ("สังคมศึกษา", 3), ("สุขศึกษา", 2), ("ศิลปะ", 2), ("การงานอาชีพ", 2),
+    ("คอมพิวเตอร์", 2), ("ดนตรี", 1),
+)
+SYNTHETIC_LABS = {"คอมพิวเตอร์": ("Lab1", "Lab2", "Lab3")}
+
+
+def synthetic_school(class_count=40, max_teacher_load=24, unavailable_ratio=0.1, seed=0,
+                     days=DAYS, periods=PERIODS):
+    """
+    โรงเรียนจำลองสำหรับ benchmark/ทดสอบ
+    Args:
+        class_count: จำนวนห้องเรียน
+        max_teacher_load: คาบสอนสูงสุดต่อสัปดาห์ของครูหนึ่งคน
+        unavailable_ratio: สัดส่วนครูที่ไม่ว่างหนึ่งวัน
+    Returns:
+        (list ของ Requirement, dict availability)
+    """
+    rng = random.Random(seed)
+    slot_count = len(days) * len(periods)
+    full = (1 << slot_count) - 1
+    day_bits = (1 << len(periods)) - 1
+    classes = [f"ม.{1 + i // 10}/{1 + i % 10}" for i in range(class_count)]
+
+    requirements = []
+    availability = {}
+    teacher_no = 0
+    for subject, count in SYNTHETIC_SUBJECTS:
+        per_teacher = max(1, max_teacher_load // count)
+        labs = SYNTHETIC_LABS.get(subject)
+        for start in range(0, class_count, per_teacher):
+            teacher_no += 1
+            teacher_id = f"T{teacher_no:03d}"
+            if rng.random() < unavailable_ratio:
+                availability[teacher_id] = full & ~(day_bits << (rng.randrange(len(days)) * len(periods)))
+            for offset, class_room in enumerate(classes[start:start + per_teacher]):
+                room_no = labs[(start + offset) % len(labs)] if labs else None
+                requirements.append(Requirement(class_room, subject, teacher_id, count, room_no))
+    return requirements, availability
+
+
+def benchmark(class_counts=(10, 20, 40), seed=0, out=sys.stdout):
+    """
+    จับเวลาจัดตารางโรงเรียนจำลองหลายขนาด
+    Returns:
+        list of dict {classes, lessons, seconds, steps, attempts, complete}
+    """
+    rows = []
+    for class_count in class_counts:
+        requirements, availability = synthetic_school(class_count, seed=seed)
+        result = TimetableGenerator(requirements, availability=availability, seed=seed).generate()
+        row = {
+            'classes': class_count,
+            'lessons': sum(r.periods for r in requirements),
+            'seconds': result.seconds,
+            'steps': result.steps,
+            'attempts': result.attempts,
+            'complete': result.complete,
+        }
+        rows.append(row)
+        if out is not None:
+            print(f"[Generator] {class_count:>3} ห้อง {row['lessons']:>5} คาบ "
+                  f"{row['seconds']:7.2f} s  {row['steps']:>6} steps  "
+                  f"{row['attempts']} รอบ  {'ครบ' if row['complete'] else 'ไม่ครบ'}", file=out)
+    return rows
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        sizes = [int(a) for a in sys.argv[1:] if a.isdigit()]
+        benchmark(tuple(sizes) if sizes else (10, 20, 40))
+    else:
+        print("usage: python -m modules.timetable_generator --benchmark [จำนวนห้อง ...]")
@@ -0,0 +1,231 @@
+"""
+modules/timetable_import.py
+นำเข้าตารางเรียนทั้งชุดจาก Excel/CSV (ตาราง ห้องเรียน × วัน × คาบ)
+- แต่ละแถว = ห้องเรียน + วัน, คอลัมน์คาบ 1-8, ช่อง = "วิชา / รหัสครู / ห้อง" (ห้องไม่บังคับ)
+- Excel อ่านทุกชีต (แบ่งชีตตามชั้นได้) CSV ใช้หัวตารางแบบเดียวกัน
+- ตรวจทุกช่องในหน่วยความจำด้วย TimetableModel: ครูสอนซ้ำ/ห้องซ้อน เทียบกับทั้งไฟล์
+  และตารางเดิมของห้องเรียนอื่น แล้วรายงานปัญหาทั้งหมดในครั้งเดียว
+- ห้องเรียนที่มีข้อมูลในไฟล์ถูกแทนที่ทั้งตาราง (ช่องว่าง = ไม่มีคาบ) ด้วย replace_class_schedules()
+  ใน transaction เดียว - ช่องที่มีปัญหาไม่ถูกบันทึก
+ไม่ import customtkinter
+"""
+
+import csv
+import os
+import re
+
+from modules.timetable_model import DAYS, PERIODS, PERIOD_TIMES, TimetableModel
+
+CLASS_HEADERS = ("class_room", "ห้องเรียน")
+DAY_HEADERS = ("day_of_week", "วัน", "วัน/คาบ")
+
+_CELL_SEPARATOR = re.compile(r"\s*(?:/|\n)\s*")
+_PERIOD_HEADER = re.compile(r"^(?:คาบ(?:ที่)?\s*)?(\d+)$")
+
+
+class TimetableImport:
+    """ผลการอ่าน + ตรวจไฟล์ตารางเรียน (ยังไม่บันทึก)"""
+
+    def __init__(self, class_rooms, entries, problems, cells):
+        """
+        Args:
+            class_rooms: ห้องเรียนที่อยู่ในไฟล์ (ตารางเดิมของห้องเหล่านี้จะถูกแทนที่)
+            entries: list of dict ในรูปแบบ schedule_data ที่ผ่านการตรวจ
+            problems: list ของข้อความปัญหา (ระบุตำแหน่งในไฟล์)
+            cells: จำนวนช่องที่มีข้อมูลในไฟล์
+        """
+        self.class_rooms = class_rooms
+        self.entries = entries
+        self.problems = problems
+        self.cells = cells
+
+    @property
+    def skipped(self):
+        return self.cells - len(self.entries)
+
+
+def parse_cell(value):
+    """
+    แยกช่องของตาราง
+    Args:
+        value: "วิชา / รหัสครู" หรือ "วิชา / รหัสครู / ห้อง" (คั่นด้วย / หรือขึ้นบรรทัดใหม่)
+    Returns:
+        (subject_name, teacher_id, room_no) หรือ None ถ้าช่องว่าง
+    Raises:
+        ValueError: ไม่มีรหัสครู
+    """
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text or text == "-":
+        return None
+    parts = [p for p in _CELL_SEPARATOR.split(text) if p]
+    if len(parts) < 2:
+        raise ValueError(f"ต้องระบุ 'วิชา / รหัสครู' แต่พบ '{text}'")
+    if len(parts) == 2:
+        return parts[0], parts[1], None
+    return "/".join(parts[:-2]), parts[-2], parts[-1]
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _cell(row, col):
+    return _text(row[col]) if col is not None and col < len(row) else ""
+
+
+def read_grid(rows, source, days=DAYS, periods=PERIODS, period_times=PERIOD_TIMES):
+    """
+    อ่านตารางจากแถวของชีต/CSV (แถวแรกเป็นหัวตาราง)
+    Args:
+        rows: iterable ของ tuple/list ค่าในแต่ละแถว
+        source: ชื่อที่ใช้ระบุตำแหน่งในข้อความปัญหา (ชื่อชีตหรือชื่อไฟล์)
+        periods, period_times: คาบและเวลา (start, end) ตามตารางเวลาเรียน
+    Returns:
+        (cells, problems) - cells เป็น list ของ (ตำแหน่ง, entry)
+    """
+    rows = iter(rows)
+    header = [_text(h) for h in next(rows, ())]
+    class_col = next((i for i, h in enumerate(header) if h in CLASS_HEADERS), None)
+    day_col = next((i for i, h in enumerate(header) if h in DAY_HEADERS), None)
+    period_cols = {}
+    for i, h in enumerate(header):
+        match = _PERIOD_HEADER.match(h)
+        if match and i not in (class_col, day_col):
+            period_cols[i] = int(match.group(1))
+
+    if class_col is None or day_col is None or not period_cols:
+        return [], [f"{source}: ต้องมีคอลัมน์ห้องเรียน, วัน และคาบ (1, 2, ... {len(periods)})"]
+
+    cells = []
+    problems = [f"{source}: ไม่มีคาบที่ {p} ในตาราง" for p in sorted(set(period_cols.values()))
+                if p not in periods]
+    for row_no, row in enumerate(rows, start=2):
+        row = list(row)
+        class_room = _cell(row, class_col)
+        day = _cell(row, day_col)
+        if not class_room and not day and not any(_cell(row, col) for col in period_cols):
+            continue
+        if day not in days:
+            problems.append(f"{source} แถว {row_no}: วัน '{day}' ไม่ถูกต้อง (จันทร์-ศุกร์)")
+            continue
+        if not class_room:
+            problems.append(f"{source} แถว {row_no}: ไม่ระบุห้องเรียน")
+            continue
+        for col, period in period_cols.items():
+            if period not in periods:
+                continue
+            location = f"{source} แถว {row_no} {class_room} วัน{day} คาบ {period}"
+            try:
+                parsed = parse_cell(row[col] if col < len(row) else None)
+            except ValueError as e:
+                problems.append(f"{location}: {e}")
+                continue
+            if parsed is None:
+                continue
+            subject_name, teacher_id, room_no = parsed
+            start_time, end_time = dict(zip(periods, period_times)).get(period, (None, None))
+            cells.append((location, {
+                'class_room': class_room,
+                'day_of_week': day,
+                'period_no': period,
+                'start_time': start_time,
+                'end_time': end_time,
+                'subject_name': subject_name,
+                'teacher_id': teacher_id,
+                'room_no': room_no,
+            }))
+    return cells, problems
+
+
+def read_timetable_csv(path, periods=PERIODS, period_times=PERIOD_TIMES):
+    """อ่านไฟล์ CSV (UTF-8)"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return read_grid(csv.reader(f), os.path.basename(path), DAYS, periods, period_times)
+
+
+def read_timetable_excel(path, periods=PERIODS, period_times=PERIOD_TIMES):
+    """อ่านทุกชีตของไฟล์ Excel (ทุกชีตใช้หัวตารางแบบเดียวกัน)"""
+    import openpyxl  # โหลดเฉพาะตอนนำเข้า ไม่ให้ช้าตอนเปิดโปรแกรม
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        cells, problems = [], []
+        for ws in wb.worksheets:
+            sheet_cells, sheet_problems = read_grid(
+                ws.iter_rows(values_only=True), f"ชีต {ws.title}", DAYS, periods, period_times)
+            cells.extend(sheet_cells)
+            problems.extend(sheet_problems)
+        return cells, problems
+    finally:
+        wb.close()
+
+
+def read_timetable_file(path, periods=PERIODS, period_times=PERIOD_TIMES):
+    """
+    อ่านไฟล์ตารางเรียนตามนามสกุล (.csv หรือ .xlsx)
+    Returns:
+        (cells, problems)
+    """
+    if path.lower().endswith(".csv"):
+        return read_timetable_csv(path, periods, period_times)
+    return read_timetable_excel(path, periods, period_times)
+
+
+def validate_import(cells, existing, teachers, problems=(), periods=PERIODS):
+    """
+    ตรวจทุกช่องในหน่วยความจำ (ไม่แตะฐานข้อมูล)
+    Args:
+        cells: list ของ (ตำแหน่ง, entry) จาก read_grid()
+        existing: ตารางเดิมทั้งหมด (get_all_schedules) - ห้องเรียนที่อยู่ในไฟล์จะถูกแทนที่
+        teachers: ครูทั้งหมดในระบบ (get_all_teachers) ใช้ตรวจรหัสครูและแสดงชื่อ
+        problems: ปัญหาจากการอ่านไฟล์ (นำมารวมในรายงาน)
+        periods: คาบตามตารางเวลาเรียน (ต้องตรงกับที่ใช้อ่านไฟล์ ไม่งั้นคาบที่เกินไม่ถูกตรวจ)
+    Returns:
+        TimetableImport - ช่องที่ชนกันในไฟล์ ช่องแรกตามลำดับไฟล์ผ่าน ช่องหลังถูกรายงาน
+    """
+    class_rooms = list(dict.fromkeys(entry['class_room'] for _, entry in cells))
+    replaced = set(class_rooms)
+    model = TimetableModel((e for e in existing if e['class_room'] not in replaced), periods=periods)
+    teachers = {t['teacher_id']: t for t in teachers}
+    problems = list(problems)
+    entries = []
+
+    for next_id, (location, entry) in enumerate(cells, start=-len(cells)):
+        day, period = entry['day_of_week'], entry['period_no']
+        teacher = teachers.get(entry['teacher_id'])
+        if teacher is None:
+            problems.append(f"{location}: ไม่พบรหัสครู {entry['teacher_id']}")
+            continue
+        taken = model.class_entry(entry['class_room'], day, period)
+        if taken is not None:
+            problems.append(f"{location}: ช่องนี้มีวิชา {taken['subject_name']} อยู่แล้ว")
+            continue
+        message = (model.conflict_message(entry['teacher_id'], day, period)
+                   or model.room_conflict_message(entry['room_no'], day, period))
+        if message:
+            problems.append(f"{location}: {message}")
+            continue
+        # id ติดลบชั่วคราว ไม่ชนกับ id ของตารางเดิม
+        model.add(dict(entry, id=next_id, title=teacher.get('title'),
+                       first_name=teacher.get('first_name'), last_name=teacher.get('last_name')))
+        entries.append(entry)
+
+    return TimetableImport(class_rooms, entries, problems, len(cells))
+
+
+def plan_import(db, path, version_id=None):
+    """
+    อ่าน + ตรวจไฟล์ตารางเรียนเทียบกับฐานข้อมูล (ยังไม่บันทึก)
+    Args:
+        version_id: รุ่นของตารางที่จะนำเข้า (None = รุ่นที่ใช้อยู่)
+    Returns:
+        TimetableImport - บันทึกด้วย db.replace_class_schedules(result.class_rooms, result.entries, version_id)
+    Raises:
+        OSError / ValueError: อ่านไฟล์ไม่ได้
+    """
+    bell = db.get_bell_schedule()
+    periods = [b['period_no'] for b in bell]
+    cells, problems = read_timetable_file(path, periods, [(b['start_time'], b['end_time']) for b in bell])
+    return validate_import(cells, db.get_all_schedules(version_id),
+                           db.get_all_teachers(active_only=False), problems, periods)
@@ -0,0 +1,306 @@
+"""
+modules/timetable_model.py
+TimetableModel - ตารางเรียนทั้งโรงเรียนในหน่วยความจำ (โหลดจากตาราง schedule ครั้งเดียว)
+- ดัชนี bitset (5 วัน × 8 คาบ = 40 bit) ต่อครู, ต่อห้องเรียน (class_room) และต่อห้อง (room_no)
+- ตรวจครูซ้ำ/ห้องซ้อน, หาคาบว่าง, หาคาบจาก id, ดึงตารางของห้อง/ครู ได้โดยไม่ต้อง query
+- get_timetable(db, version_id): model ต่อรุ่นของตาราง ใช้ร่วมกันทุกหน้าจอ
+  โหลดใหม่เฉพาะเมื่อ Database.data_version() เปลี่ยน (จำนวนคาบตาม bell_schedule)
+ไม่ import customtkinter
+"""
+
+import weakref
+
+DAYS = ("จันทร์", "อังคาร", "พุธ", "พฤหัสบดี", "ศุกร์")
+PERIODS = tuple(range(1, 9))
+PERIOD_TIMES = (
+    ("08:00", "09:00"), ("09:00", "10:00"),
+    ("10:00", "11:00"), ("11:00", "12:00"),
+    ("13:00", "14:00"), ("14:00", "15:00"),
+    ("15:00", "16:00"), ("16:00", "17:00"),
+)
+
+
+def iter_bits(mask):
+    """เลข bit ที่เป็น 1 ใน mask (จากน้อยไปมาก)"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def conflict_message(entry, day_of_week, period_no):
+    """ข้อความแจ้งครูสอนซ้ำ (รูปแบบเดียวกับ Database.check_teacher_conflict)"""
+    teacher_name = f"{entry.get('title') or ''}{entry.get('first_name') or ''} {entry.get('last_name') or ''}"
+    return (f"ครู {teacher_name} มีคาบสอนอยู่แล้วในวัน {day_of_week} คาบที่ {period_no} "
+            f"ที่ห้อง {entry['class_room']} กรุณาเลือกคาบอื่น")
+
+
+class _SlotIndex:
+    """key (ครู/ห้อง) -> bitset ของคาบที่ไม่ว่าง + รายการคาบในแต่ละช่อง"""
+
+    def __init__(self):
+        self.masks = {}
+        self.slots = {}     # (key, bit) -> list ของ entry
+
+    def add(self, key, bit, entry):
+        self.slots.setdefault((key, bit), []).append(entry)
+        self.masks[key] = self.masks.get(key, 0) | (1 << bit)
+
+    def remove(self, key, bit, entry):
+        entries = self.slots.get((key, bit), [])
+        for i, existing in enumerate(entries):
+            if existing is entry:
+                del entries[i]
+                break
+        if entries:
+            return
+        self.slots.pop((key, bit), None)
+        mask = self.masks.get(key, 0) & ~(1 << bit)
+        if mask:
+            self.masks[key] = mask
+        else:
+            self.masks.pop(key, None)
+
+    def mask(self, key):
+        return self.masks.get(key, 0)
+
+    def at(self, key, bit):
+        return self.slots.get((key, bit), [])
+
+
+class TimetableModel:
+    """ตารางเรียนทั้งหมด + ดัชนี bitset ต่อครู/ห้องเรียน/ห้อง"""
+
+    def __init__(self, schedules=(), days=DAYS, periods=PERIODS):
+        """
+        Args:
+            schedules: list of dict จาก Database.get_all_schedules()
+            days: ชื่อวันตามลำดับ
+            periods: เลขคาบตามลำดับ
+        """
+        self.days = tuple(days)
+        self.periods = tuple(periods)
+        self.slot_count = len(self.days) * len(self.periods)
+        self.full_mask = (1 << self.slot_count) - 1
+        self._day_index = {day: i for i, day in enumerate(self.days)}
+        self._period_index = {period: i for i, period in enumerate(self.periods)}
+
+        self.entries = {}   # id -> entry
+        self._teachers = _SlotIndex()
+        self._classes = _SlotIndex()
+        self._rooms = _SlotIndex()
+        for entry in schedules:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ---------- ช่อง (bit) ----------
+
+    def slot_bit(self, day_of_week, period_no):
+        """
+        Returns:
+            เลข bit ของ (วัน, คาบ) หรือ None ถ้าไม่อยู่ในตาราง
+        """
+        day = self._day_index.get(day_of_week)
+        try:
+            period = self._period_index.get(int(period_no))
+        except (TypeError, ValueError):
+            return None
+        if day is None or period is None:
+            return None
+        return day * len(self.periods) + period
+
+    def slot_of(self, bit):
+        """(วัน, คาบ) ของเลข bit"""
+        day, period = divmod(bit, len(self.periods))
+        return self.days[day], self.periods[period]
+
+    def slots(self, mask):
+        """list ของ (วัน, คาบ) ที่ bit เป็น 1 เรียงตามวันแล้วคาบ"""
+        return [self.slot_of(bit) for bit in iter_bits(mask)]
+
+    # ---------- แก้ไข ----------
+
+    def _indexes(self, entry):
+        bit = self.slot_bit(entry.get('day_of_week'), entry.get('period_no'))
+        if bit is None:
+            return bit, ()
+        pairs = [(self._teachers, entry.get('teacher_id')), (self._classes, entry.get('class_room'))]
+        if entry.get('room_no'):
+            pairs.append((self._rooms, entry['room_no']))
+        return bit, pairs
+
+    def add(self, entry):
+        """เพิ่มคาบ (entry ต้องมี 'id')"""
+        if entry['id'] in self.entries:
+            self.remove(entry['id'])
+        self.entries[entry['id']] = entry
+        bit, pairs = self._indexes(entry)
+        for index, key in pairs:
+            index.add(key, bit, entry)
+
+    def remove(self, schedule_id):
+        """
+        ลบคาบ
+        Returns:
+            entry ที่ถูกลบ หรือ None
+        """
+        entry = self.entries.pop(schedule_id, None)
+        if entry is None:
+            return None
+        bit, pairs = self._indexes(entry)
+        for index, key in pairs:
+            index.remove(key, bit, entry)
+        return entry
+
+    # ---------- ค้นหา ----------
+
+    def get(self, schedule_id):
+        """คาบจาก id หรือ None"""
+        return self.entries.get(schedule_id)
+
+    def teacher_mask(self, teacher_id):
+        return self._teachers.mask(teacher_id)
+
+    def class_mask(self, class_room):
+        return self._classes.mask(class_room)
+
+    def room_mask(self, room_no):
+        return self._rooms.mask(room_no)
+
+    def teacher_entry(self, teacher_id, day_of_week, period_no):
+        """คาบที่ครูสอนในช่องนั้น หรือ None"""
+        entries = self._at(self._teachers, teacher_id, day_of_week, period_no)
+        return entries[-1] if entries else None
+
+    def class_entry(self, class_room, day_of_week, period_no):
+        """คาบของห้องเรียนในช่องนั้น หรือ None (ถ้ามีหลายคาบ ใช้คาบที่เพิ่มล่าสุด)"""
+        entries = self._at(self._classes, class_room, day_of_week, period_no)
+        return entries[-1] if entries else None
+
+    def room_entries(self, room_no, day_of_week, period_no):
+        """ทุกคาบที่ใช้ห้อง room_no ในช่องนั้น"""
+        return list(self._at(self._rooms, room_no, day_of_week, period_no))
+
+    def _at(self, index, key, day_of_week, period_no):
+        bit = self.slot_bit(day_of_week, period_no)
+        if bit is None or not (index.mask(key) >> bit) & 1:
+            return []
+        return index.at(key, bit)
+
+    def teacher_conflict(self, teacher_id, day_of_week, period_no, exclude_id=None):
+        """
+        ตรวจครูสอนซ้ำ
+        Args:
+            exclude_id: id ที่ไม่ต้องตรวจ (กรณีแก้ไขคาบเดิม)
+        Returns:
+            entry ที่ชนกัน หรือ None
+        """
+        for entry in self._at(self._teachers, teacher_id, day_of_week, period_no):
+            if entry['id'] != exclude_id:
+                return entry
+        return None
+
+    def conflict_message(self, teacher_id, day_of_week, period_no, exclude_id=None):
+        """
+        Returns:
+            error message หรือ None (แทน Database.check_teacher_conflict)
+        """
+        entry = self.teacher_conflict(teacher_id, day_of_week, period_no, exclude_id)
+        if entry is None:
+            return None
+        return conflict_message(entry, day_of_week, period_no)
+
+    def room_conflict(self, room_no, day_of_week, period_no, exclude_id=None):
+        """
+        ตรวจห้องถูกใช้ซ้อน
+        Returns:
+            entry ที่ใช้ห้องอยู่แล้ว หรือ None (room_no ว่าง = ไม่ตรวจ)
+        """
+        if not room_no:
+            return None
+        for entry in self._at(self._rooms, room_no, day_of_week, period_no):
+            if entry['id'] != exclude_id:
+                return entry
+        return None
+
+    def room_conflict_message(self, room_no, day_of_week, period_no, exclude_id=None):
+        """
+        Returns:
+            error message หรือ None (รูปแบบเดียวกับ Database.check_room_conflict)
+        """
+        entry = self.room_conflict(room_no, day_of_week, period_no, exclude_id)
+        if entry is None:
+            return None
+        return (f"ห้อง {room_no} ถูกใช้อยู่แล้วในวัน {day_of_week} คาบที่ {period_no} "
+                f"(ห้องเรียน {entry['class_room']} วิชา {entry['subject_name']}) "
+                f"กรุณาเลือกห้องหรือคาบอื่น")
+
+    def free_mask(self, teacher_id=None, class_room=None, room_no=None):
+        """bitset ของช่องที่ว่างพร้อมกันสำหรับทุกเงื่อนไขที่ระบุ"""
+        busy = 0
+        if teacher_id is not None:
+            busy |= self._teachers.mask(teacher_id)
+        if class_room is not None:
+            busy |= self._classes.mask(class_room)
+        if room_no:
+            busy |= self._rooms.mask(room_no)
+        return self.full_mask & ~busy
+
+    def free_slots(self, teacher_id=None, class_room=None, room_no=None):
+        """
+        Returns:
+            list ของ (วัน, คาบ) ที่ครู/ห้องเรียน/ห้อง ที่ระบุว่างพร้อมกัน
+        """
+        return self.slots(self.free_mask(teacher_id, class_room, room_no))
+
+    def class_grid(self, class_room):
+        """
+        Returns:
+            dict {(วัน, คาบ): entry} ของห้องเรียน
+        """
+        return self._grid(self._classes, class_room)
+
+    def teacher_grid(self, teacher_id):
+        """
+        Returns:
+            dict {(วัน, คาบ): entry} ของครู
+        """
+        return self._grid(self._teachers, teacher_id)
+
+    def _grid(self, index, key):
+        grid = {}
+        for bit in iter_bits(index.mask(key)):
+            grid[self.slot_of(bit)] = index.at(key, bit)[-1]
+        return grid
+
+    def class_entries(self, class_room):
+        """คาบของห้องเรียนเรียงตามวันแล้วคาบ"""
+        return list(self.class_grid(class_room).values())
+
+    def teacher_entries(self, teacher_id):
+        """คาบของครูเรียงตามวันแล้วคาบ"""
+        return list(self.teacher_grid(teacher_id).values())
+
+
+_models = weakref.WeakKeyDictionary()
+
+
+def get_timetable(db, version_id=None):
+    """
+    TimetableModel ของ db (ใช้ร่วมกันทุกหน้าจอ)
+    โหลดใหม่จาก get_all_schedules() เฉพาะเมื่อ db.data_version() เปลี่ยน
+    Args:
+        version_id: รุ่นของตาราง (None = รุ่นที่ใช้อยู่) - รุ่นที่ยังไม่มีแถวของตัวเองใช้ model ของรุ่นต้นแบบ
+    """
+    version = db.data_version()
+    source = db.read_version_id(version_id)
+    models = _models.setdefault(db, {})
+    cached = models.get(source)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    periods = tuple(row['period_no'] for row in db.get_bell_schedule()) or PERIODS
+    model = TimetableModel(db.get_all_schedules(source), periods=periods)
+    models[source] = (version, model)
+    return model
@@ -0,0 +1,249 @@
+"""
+modules/transcripts.py
+สร้าง Transcript PDF - ใช้ร่วมกันระหว่าง Export รายคนและ Export ทั้งห้อง/ทั้งโรงเรียน
+- ดึงคะแนนทุกคนด้วย query เดียว (Database.get_all_transcripts)
+- แยกไฟล์รายคน: render ใน ProcessPoolExecutor
+- ไฟล์เดียว: รวมทุกคนพร้อม bookmark (outline) รายคน
+- ไม่ import customtkinter จึงใช้ใน worker process ได้
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.platypus import (SimpleDocTemplate, Table, TableStyle, Paragraph,
+                                Spacer, PageBreak, Flowable)
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from modules.pdf_utils import get_thai_font
+
+# ==================== Design System v4.0 ====================
+PRIMARY = "#3B82F6"
+TABLE_STRIPE = "#F8FAFC"
+TABLE_BORDER = "#E2E8F0"
+
+
+class _Bookmark(Flowable):
+    """Flowable ขนาด 0 ที่ใส่ bookmark + outline ให้หน้าปัจจุบัน (ใช้ในไฟล์รวม)"""
+
+    def __init__(self, key, title):
+        super().__init__()
+        self.key = key
+        self.title = title
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=0)
+
+
+def student_display_name(student):
+    return f"{student['title']}{student['first_name']} {student['last_name']}"
+
+
+def transcript_file_name(student):
+    """ชื่อไฟล์ของนักเรียนแต่ละคน (ตัดอักขระที่ใช้ในชื่อไฟล์ไม่ได้)"""
+    name = f"Transcript_{student['student_id']}_{student['first_name']}_{student['last_name']}.pdf"
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", name)
+
+
+def semester_gpa(grades):
+    """
+    GPA ของภาคเรียน (เฉลี่ยเกรดที่เป็นตัวเลข)
+    Returns:
+        float หรือ None ถ้าไม่มีเกรด
+    """
+    valid_grades = []
+    for g in grades:
+        try:
+            if g['grade'] and g['grade'] != '-':
+                valid_grades.append(float(g['grade']))
+        except (ValueError, TypeError):
+            pass
+    if not valid_grades:
+        return None
+    return sum(valid_grades) / len(valid_grades)
+
+
+def build_transcript_elements(student, transcript_data, font_name, job=None):
+    """
+    สร้าง flowables ของ Transcript หนึ่งคน
+    Args:
+        student: dict ข้อมูลนักเรียน (student_id, title, first_name, last_name, class_room)
+        transcript_data: list ของคะแนน (เรียงตามปี ภาค วิชา)
+        font_name: ฟอนต์ไทยจาก get_thai_font()
+        job: ExportJob (ไม่บังคับ) สำหรับรายงานความคืบหน้ารายภาคเรียน
+    Returns:
+        list ของ flowables
+    """
+    elements = []
+    styles = getSampleStyleSheet()
+
+    name = student_display_name(student)
+    elements.append(Paragraph(f"Transcript - {name}", ParagraphStyle(
+        'Title', parent=styles['Heading1'],
+        fontName=font_name, fontSize=18, alignment=1
+    )))
+    elements.append(Spacer(1, 0.3 * cm))
+
+    elements.append(Paragraph(
+        f"รหัส: {student['student_id']} | ห้อง: {student['class_room']}",
+        ParagraphStyle('Info', parent=styles['Normal'],
+                       fontName=font_name, fontSize=12, alignment=1)
+    ))
+    elements.append(Spacer(1, 0.5 * cm))
+
+    grouped = {}
+    for grade in transcript_data:
+        key = f"{grade['academic_year']}/{grade['semester']}"
+        grouped.setdefault(key, []).append(grade)
+
+    semesters = sorted(grouped.items())
+    if job:
+        semesters = job.iterate(semesters)
+
+    for key, grades in semesters:
+        year, semester = key.split("/")
+
+        elements.append(Paragraph(
+            f"ปีการศึกษา {year} ภาคเรียนที่ {semester}",
+            ParagraphStyle('Sem', parent=styles['Heading2'],
+                           fontName=font_name, fontSize=14)
+        ))
+        elements.append(Spacer(1, 0.3 * cm))
+
+        data = [["รหัสวิชา", "ชื่อวิชา", "คะแนน", "เกรด"]]
+        for grade in grades:
+            data.append([
+                grade['subject_code'], grade['subject_name'],
+                str(grade['score']) if grade['score'] is not None else "-",
+                grade['grade'] if grade['grade'] else "-",
+            ])
+
+        table = Table(data, colWidths=[3 * cm, 8 * cm, 3 * cm, 3 * cm])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(PRIMARY)),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), font_name),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(TABLE_STRIPE)),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(TABLE_BORDER)),
+            ('FONTNAME', (0, 1), (-1, -1), font_name),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+        ]))
+        elements.append(table)
+
+        gpa = semester_gpa(grades)
+        if gpa is not None:
+            elements.append(Spacer(1, 0.2 * cm))
+            elements.append(Paragraph(
+                f"GPA: {gpa:.2f}",
+                ParagraphStyle('GPA', parent=styles['Normal'],
+                               fontName=font_name, fontSize=12, alignment=2)
+            ))
+        elements.append(Spacer(1, 0.5 * cm))
+
+    return elements
+
+
+def render_transcript_pdf(student, transcript_data, file_path, job=None):
+    """
+    สร้าง Transcript PDF ของนักเรียนหนึ่งคน
+    Returns:
+        file_path
+    """
+    font_name = get_thai_font()
+    doc = SimpleDocTemplate(file_path, pagesize=A4)
+    elements = build_transcript_elements(student, transcript_data, font_name, job)
+    if job:
+        doc.build(elements, onFirstPage=job.pdf_page_hook, onLaterPages=job.pdf_page_hook)
+    else:
+        doc.build(elements)
+    return file_path
+
+
+def _render_transcript_worker(student, transcript_data, file_path):
+    """ทำงานใน worker process"""
+    return render_transcript_pdf(student, transcript_data, file_path)
+
+
+def _throughput_note(done, started):
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    return f"{done} คน, {rate:.1f} ไฟล์/วินาที"
+
+
+def generate_transcripts(db, out_path, class_room=None, merged=False,
+                         job=None, max_workers=None):
+    """
+    สร้าง Transcript ของทั้งห้อง/ทั้งโรงเรียน
+    Args:
+        db: Database
+        out_path: โฟลเดอร์ปลายทาง (แยกไฟล์) หรือไฟล์ PDF (merged=True)
+        class_room: ห้องที่ต้องการ (None = ทั้งโรงเรียน)
+        merged: True = รวมเป็น PDF เดียวพร้อม bookmark รายคน
+        job: ExportJob สำหรับรายงานความคืบหน้า/ยกเลิก (ไม่บังคับ)
+        max_workers: จำนวน process (ค่าเริ่มต้น = จำนวน core)
+    Returns:
+        dict {'count', 'seconds', 'rate', 'files'}
+    """
+    started = time.perf_counter()
+    transcripts = db.get_all_transcripts(class_room)
+    total = len(transcripts)
+    files = []
+    if not transcripts:
+        # ไม่มีข้อมูล - ไม่สร้าง PDF ว่างทับไฟล์ที่ผู้ใช้เลือก
+        return {'count': 0, 'seconds': time.perf_counter() - started, 'rate': 0.0, 'files': files}
+
+    if merged:
+        # ไฟล์รวม: reportlab ต่อ PDF หลายไฟล์เข้าด้วยกันไม่ได้ จึงสร้างเป็นเอกสารเดียว
+        font_name = get_thai_font()
+        elements = []
+        for idx, item in enumerate(transcripts):
+            student = item['student']
+            if elements:
+                elements.append(PageBreak())
+            elements.append(_Bookmark(
+                f"s{student['student_id']}",
+                f"{student['student_id']} {student_display_name(student)} ({student['class_room']})"
+            ))
+            elements.extend(build_transcript_elements(student, item['grades'], font_name))
+            if job:
+                job.progress(idx + 1, total, _throughput_note(idx + 1, started))
+
+        doc = SimpleDocTemplate(out_path, pagesize=A4, title="Transcript")
+        if job:
+            doc.build(elements, onFirstPage=job.pdf_page_hook, onLaterPages=job.pdf_page_hook)
+        else:
+            doc.build(elements)
+        files.append(out_path)
+    else:
+        os.makedirs(out_path, exist_ok=True)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(_render_transcript_worker, item['student'], item['grades'],
+                                os.path.join(out_path, transcript_file_name(item['student'])))
+                for item in transcripts
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                files.append(future.result())
+                if job:
+                    job.progress(done, total, _throughput_note(done, started))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    seconds = time.perf_counter() - started
+    return {
+        'count': total,
+        'seconds': seconds,
+        'rate': total / seconds if seconds > 0 else 0.0,
+        'files': sorted(files),
+    }
@@ -0,0 +1,156 @@
+"""
+modules/tree_binding.py
+TreeBinder - อัปเดต ttk.Treeview แบบ diff แทนการลบทุกแถวแล้ว insert ใหม่
+- แถวอ้างอิงด้วย id ที่คงที่ (student_id, teacher_id) ใช้เป็น iid ของ Treeview
+- เทียบกับแถวที่แสดงอยู่: insert แถวใหม่, ลบแถวที่หายไป, ย้ายเฉพาะแถวที่ลำดับเปลี่ยน
+  (แถวที่อยู่ใน longest increasing subsequence ไม่ต้องย้าย), configure เฉพาะแถวที่ค่าเปลี่ยน
+- tag สีสลับแถว (striped) คำนวณตามตำแหน่ง และ configure เฉพาะแถวที่ tag เปลี่ยน
+ไม่ import customtkinter - ใช้กับ widget ใดก็ได้ที่มี insert/delete/move/detach/item
+"""
+
+from bisect import bisect_left
+
+BIND_STATS = ("inserted", "deleted", "moved", "updated")
+
+
+def longest_increasing_run(keys):
+    """
+    index ของ keys ที่เป็น longest increasing subsequence (O(n log n))
+    Args:
+        keys: list ของตัวเลขที่ไม่ซ้ำกัน
+    Returns:
+        set ของ index
+    """
+    tails = []       # ค่าสุดท้ายของลำดับยาว k+1
+    tail_idx = []    # index ใน keys ของ tails[k]
+    parent = [-1] * len(keys)
+    for i, key in enumerate(keys):
+        k = bisect_left(tails, key)
+        if k == len(tails):
+            tails.append(key)
+            tail_idx.append(i)
+        else:
+            tails[k] = key
+            tail_idx[k] = i
+        parent[i] = tail_idx[k - 1] if k > 0 else -1
+
+    result = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        result.add(i)
+        i = parent[i]
+    return result
+
+
+class TreeBinder:
+    """ผูกรายการแถว (iid, values) กับ Treeview แล้วอัปเดตเฉพาะส่วนที่เปลี่ยน"""
+
+    def __init__(self, tree, stripe_tags=("evenrow", "oddrow"), keep_detached=False):
+        """
+        Args:
+            tree: ttk.Treeview (แถวทั้งหมดต้องถูกจัดการผ่าน binder นี้)
+            stripe_tags: (tag แถวคู่, tag แถวคี่) - None = ไม่ใส่สีสลับแถว
+            keep_detached: True = แถวที่หายไปถูก detach เก็บไว้ (เช่นตอนกรองคำค้น)
+                           กลับมาแสดงอีกครั้งได้โดยไม่ต้อง insert ใหม่
+        """
+        self.tree = tree
+        self.stripe_tags = stripe_tags
+        self.keep_detached = keep_detached
+        self._order = []     # iid ที่แสดงอยู่ตามลำดับ
+        self._values = {}    # iid -> values (รวมแถวที่ detach)
+        self._tags = {}      # iid -> stripe tag
+
+    def __contains__(self, iid):
+        return str(iid) in self._values
+
+    def __len__(self):
+        return len(self._order)
+
+    @property
+    def order(self):
+        """iid ที่แสดงอยู่ตามลำดับ"""
+        return list(self._order)
+
+    def _tag(self, position):
+        return self.stripe_tags[position % 2] if self.stripe_tags else None
+
+    def bind(self, rows):
+        """
+        แสดง rows ใน Treeview (อัปเดตเฉพาะส่วนที่ต่างจากที่แสดงอยู่)
+        Args:
+            rows: iterable ของ (iid, values) ตามลำดับที่ต้องการ
+        Returns:
+            dict จำนวน {inserted, deleted, moved, updated}
+        """
+        rows = [(str(iid), tuple(values)) for iid, values in rows]
+        new_order = [iid for iid, _values in rows]
+        position = {iid: pos for pos, iid in enumerate(new_order)}
+        if len(position) != len(new_order):
+            raise ValueError("iid ของแถวซ้ำกัน")
+        stats = dict.fromkeys(BIND_STATS, 0)
+
+        removed = [iid for iid in self._order if iid not in position]
+        if removed:
+            if self.keep_detached:
+                self.tree.detach(*removed)
+            else:
+                self.tree.delete(*removed)
+                for iid in removed:
+                    del self._values[iid]
+                    del self._tags[iid]
+            stats['deleted'] = len(removed)
+
+        # แถวเดิมที่ลำดับสัมพัทธ์ยังถูกต้อง (LIS) อยู่กับที่ - ที่เหลือย้ายไปต่อท้ายแถวก่อนหน้า
+        current = [iid for iid in self._order if iid in position]
+        attached = set(current)
+        stable = {current[i] for i in longest_increasing_run([position[iid] for iid in current])}
+
+        for pos, (iid, values) in enumerate(rows):
+            tag = self._tag(pos)
+            if iid not in stable:
+                if iid in attached:
+                    current.remove(iid)
+                index = current.index(new_order[pos - 1]) + 1 if pos > 0 else 0
+                current.insert(index, iid)
+                if iid not in self._values:
+                    self.tree.insert("", index, iid=iid, values=values,
+                                     tags=(tag,) if tag else ())
+                    self._values[iid] = values
+                    self._tags[iid] = tag
+                    stats['inserted'] += 1
+                    continue
+                self.tree.move(iid, "", index)
+                stats['moved'] += 1
+
+            changes = {}
+            if self._values[iid] != values:
+                changes['values'] = values
+                self._values[iid] = values
+                stats['updated'] += 1
+            if self._tags[iid] != tag:
+                changes['tags'] = (tag,) if tag else ()
+                self._tags[iid] = tag
+            if changes:
+                self.tree.item(iid, **changes)
+
+        self._order = new_order
+        return stats
+
+    def drop_detached(self):
+        """ลบแถวที่ detach เก็บไว้ทั้งหมด (เช่นหลังโหลดข้อมูลชุดใหม่)"""
+        shown = set(self._order)
+        detached = [iid for iid in self._values if iid not in shown]
+        if detached:
+            self.tree.delete(*detached)
+            for iid in detached:
+                del self._values[iid]
+                del self._tags[iid]
+        return len(detached)
+
+    def clear(self):
+        """ลบทุกแถว"""
+        if self._values:
+            self.tree.delete(*self._values)
+        self._order = []
+        self._values = {}
+        self._tags = {}
@@ -0,0 +1,88 @@
+"""
+modules/ui_fonts.py
+FontRegistry - ใช้ CTkFont ร่วมกันทั้งโปรแกรม แทนการสร้าง CTkFont ใหม่ให้ทุก label
+- font(family, size, weight): CTkFont หนึ่งตัวต่อหนึ่งชุด (family, size, weight) สร้างครั้งแรกที่ใช้
+- style(name): font ตามชื่อใน Design System (h1, h2, h3, body, body_bold, caption, cell, cell_caption)
+- ห้าม configure() font ที่ได้จาก registry (ใช้ร่วมกันหลาย widget) - ต้องการขนาดอื่นให้ขอ font ใหม่
+ไม่ import customtkinter ตอน import module - สร้าง CTkFont ผ่าน factory ตอนขอครั้งแรก (ต้องมี Tk root แล้ว)
+"""
+
+import threading
+
+UI_FAMILY = "TH Sarabun New"
+
+# ชื่อ style -> (family, size, weight)
+STYLES = {
+    "h1": (UI_FAMILY, 28, "bold"),
+    "h2": (UI_FAMILY, 20, "bold"),
+    "h3": (UI_FAMILY, 16, "bold"),
+    "body": (UI_FAMILY, 14, "normal"),
+    "body_bold": (UI_FAMILY, 14, "bold"),
+    "caption": (UI_FAMILY, 12, "normal"),
+    "cell": (UI_FAMILY, 13, "bold"),
+    "cell_caption": (UI_FAMILY, 11, "normal"),
+}
+
+
+def _ctk_font(**options):
+    import customtkinter as ctk
+    return ctk.CTkFont(**options)
+
+
+class FontRegistry:
+    """เก็บ font ที่สร้างแล้ว key = (family, size, weight)"""
+
+    def __init__(self, factory=_ctk_font, styles=None):
+        """
+        Args:
+            factory: ฟังก์ชัน (**options) -> font ใหม่ (ค่าเริ่มต้น ctk.CTkFont)
+            styles: dict ชื่อ style -> (family, size, weight) (ค่าเริ่มต้น STYLES)
+        """
+        self.factory = factory
+        self.styles = dict(STYLES if styles is None else styles)
+        self.created = 0
+        self.requests = 0
+        self._fonts = {}
+        self._lock = threading.Lock()
+
+    def font(self, family=None, size=None, weight="normal"):
+        """
+        Returns:
+            font ของ (family, size, weight) - ตัวเดิมทุกครั้งที่ขอชุดเดียวกัน
+        """
+        key = (family, size, weight)
+        with self._lock:
+            self.requests += 1
+            font = self._fonts.get(key)
+            if font is None:
+                options = {'weight': weight}
+                if family is not None:
+                    options['family'] = family
+                if size is not None:
+                    options['size'] = size
+                font = self._fonts[key] = self.factory(**options)
+                self.created += 1
+            return font
+
+    def style(self, name):
+        """font ตามชื่อ style เช่น "h2", "cell" (KeyError ถ้าไม่มี)"""
+        return self.font(*self.styles[name])
+
+    def __len__(self):
+        return len(self._fonts)
+
+    def stats(self):
+        """
+        Returns:
+            dict {fonts, created, requests}
+        """
+        return {'fonts': len(self._fonts), 'created': self.created, 'requests': self.requests}
+
+    def clear(self):
+        """ทิ้ง font ทั้งหมด (เช่นเมื่อสร้าง Tk root ใหม่)"""
+        with self._lock:
+            self._fonts.clear()
+
+
+# registry ของโปรแกรม (ใช้ร่วมกันทุกโมดูล)
+FONTS = FontRegistry()
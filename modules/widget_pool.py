@@ -0,0 +1,91 @@
+"""
+modules/widget_pool.py
+WidgetPool - นำ widget แถว/การ์ดกลับมาใช้ใหม่แทน destroy แล้วสร้างใหม่ทุกครั้ง
+- sync(items): รายการเรียงตามลำดับ (pack) - configure widget เดิมตามข้อมูลใหม่
+  ซ่อนตัวที่เกิน และสร้างเพิ่มเฉพาะที่ขาด
+- acquire()/release(): สำหรับ virtualized list ที่วาง widget เอง (place)
+ไม่ import customtkinter - การสร้าง/ผูกข้อมูล/แสดง/ซ่อน ทำผ่านฟังก์ชันที่ส่งเข้ามา
+"""
+
+
+class WidgetPool:
+    """คลัง widget ชนิดเดียวกันที่นำกลับมาใช้ใหม่ได้"""
+
+    def __init__(self, create, bind=None, show=None, hide=None):
+        """
+        Args:
+            create: ฟังก์ชัน () -> widget ใหม่
+            bind: ฟังก์ชัน (widget, item) ตั้งค่า widget ตามข้อมูล (ใช้กับ sync)
+            show: ฟังก์ชัน (widget) แสดง widget เช่น pack (ใช้กับ sync)
+            hide: ฟังก์ชัน (widget) ซ่อน widget เช่น pack_forget
+        """
+        self.create = create
+        self.bind = bind
+        self.show = show
+        self.hide = hide
+        self.created = 0
+        self.reused = 0
+        self._slots = []    # widget ของ sync() เรียงตามลำดับ
+        self._shown = 0     # จำนวน widget ใน _slots ที่แสดงอยู่ (เป็น prefix เสมอ)
+        self._free = []     # widget ว่างของ acquire()/release()
+
+    def _new(self):
+        self.created += 1
+        return self.create()
+
+    def sync(self, items):
+        """
+        ผูก widget กับ items ตามลำดับ
+        widget ที่แสดงอยู่แล้วไม่ถูกย้าย และตัวที่แสดงเพิ่มต่อท้ายตามลำดับ
+        ลำดับ pack จึงตรงกับ items เสมอ
+        Returns:
+            list ของ widget ที่ใช้ (ตำแหน่งตรงกับ items)
+        """
+        items = list(items)
+        for idx, item in enumerate(items):
+            if idx < len(self._slots):
+                widget = self._slots[idx]
+                self.reused += 1
+            else:
+                widget = self._new()
+                self._slots.append(widget)
+            if self.bind:
+                self.bind(widget, item)
+            if idx >= self._shown and self.show:
+                self.show(widget)
+
+        for widget in self._slots[len(items):self._shown]:
+            if self.hide:
+                self.hide(widget)
+        self._shown = len(items)
+        return self._slots[:len(items)]
+
+    def acquire(self):
+        """widget ว่างหนึ่งตัว (สร้างใหม่ถ้าไม่มี)"""
+        if self._free:
+            self.reused += 1
+            return self._free.pop()
+        return self._new()
+
+    def release(self, widget):
+        """ซ่อน widget แล้วคืนเข้าคลัง"""
+        if self.hide:
+            self.hide(widget)
+        self._free.append(widget)
+
+    @property
+    def active(self):
+        """widget ของ sync() ที่แสดงอยู่"""
+        return self._slots[:self._shown]
+
+    def stats(self):
+        """
+        Returns:
+            dict {created, reused, shown, free}
+        """
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'shown': self._shown,
+            'free': len(self._free),
+        }
@@ -65,6 +65,57 @@ def create_sample_teachers_excel():
     print(f"Created {file_path}")
 
 
+TIMETABLE_HEADERS = ['ห้องเรียน', 'วัน', 1, 2, 3, 4, 5, 6, 7, 8]
+
+# ช่อง = "วิชา / รหัสครู / ห้อง" (ห้องไม่บังคับ) - ครู T101-T103 ตรงกับ teachers.xlsx
+SAMPLE_TIMETABLE = [
+    ['ป.1/1', 'จันทร์', 'ภาษาไทย / T101', 'คณิตศาสตร์ / T102', 'วิทยาศาสตร์ / T103', None,
+     'คอมพิวเตอร์ / T103 / Lab1', None, None, None],
+    ['ป.1/1', 'อังคาร', 'คณิตศาสตร์ / T102', 'ภาษาไทย / T101', None, None, None, None, None, None],
+    ['ป.1/1', 'พุธ', 'ภาษาไทย / T101', None, 'คณิตศาสตร์ / T102', None, None, None, None, None],
+    ['ป.1/1', 'พฤหัสบดี', 'วิทยาศาสตร์ / T103', None, None, None, None, None, None, None],
+    ['ป.1/1', 'ศุกร์', None, 'ภาษาไทย / T101', None, None, None, None, None, None],
+    ['ป.2/1', 'จันทร์', 'คณิตศาสตร์ / T102', 'ภาษาไทย / T101', None, None,
+     None, 'คอมพิวเตอร์ / T103 / Lab1', None, None],
+    ['ป.2/1', 'อังคาร', 'ภาษาไทย / T101', 'คณิตศาสตร์ / T102', None, None, None, None, None, None],
+    ['ป.2/1', 'พุธ', 'วิทยาศาสตร์ / T103', None, None, None, None, None, None, None],
+    ['ป.2/1', 'พฤหัสบดี', None, 'คณิตศาสตร์ / T102', None, None, None, None, None, None],
+    ['ป.2/1', 'ศุกร์', 'ภาษาไทย / T101', None, None, None, None, None, None, None],
+]
+
+# ตารางที่มีปัญหา: ครูสอนซ้ำ, ห้องซ้อน, ไม่พบรหัสครู, วันผิด, ช่องไม่มีรหัสครู
+SAMPLE_TIMETABLE_CONFLICTS = [
+    ['ป.1/1', 'จันทร์', 'ภาษาไทย / T101', 'คอมพิวเตอร์ / T103 / Lab1', None, None, None, None, None, None],
+    ['ป.2/1', 'จันทร์', 'คณิตศาสตร์ / T101', 'คอมพิวเตอร์ / T102 / Lab1', 'ศิลปะ / T999', None, None, None, None, None],
+    ['ป.2/1', 'เสาร์', 'ภาษาไทย / T101', None, None, None, None, None, None, None],
+    ['ป.3/1', 'อังคาร', 'ภาษาไทย', 'คณิตศาสตร์ / T102', None, None, None, None, None, None],
+]
+
+
+def create_sample_timetable_files():
+    """สร้างไฟล์ตารางเรียนตัวอย่าง (Excel + CSV) สำหรับทดสอบการนำเข้าตารางเรียน"""
+    import csv
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Timetable"
+    ws.append(TIMETABLE_HEADERS)
+    for row in SAMPLE_TIMETABLE:
+        ws.append(row)
+    file_path = os.path.join(os.path.dirname(__file__), 'timetable.xlsx')
+    wb.save(file_path)
+    print(f"Created {file_path}")
+
+    for name, rows in (('timetable.csv', SAMPLE_TIMETABLE),
+                       ('timetable_conflicts.csv', SAMPLE_TIMETABLE_CONFLICTS)):
+        file_path = os.path.join(os.path.dirname(__file__), name)
+        with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(TIMETABLE_HEADERS)
+            writer.writerows([['' if v is None else v for v in row] for row in rows])
+        print(f"Created {file_path}")
+
+
 def create_invalid_excel():
     """สร้างไฟล์ Excel ที่มีรูปแบบผิดสำหรับทดสอบ error handling"""
     wb = Workbook()
@@ -88,3 +139,4 @@ if __name__ == '__main__':
     create_sample_students_excel()
     create_sample_teachers_excel()
     create_invalid_excel()
+    create_sample_timetable_files()
@@ -484,6 +484,26 @@ class TestGrades:
         assert len(transcript) == 4
         assert transcript[0]['subject_name'] == 'ภาษาอังกฤษ'  # เรียงตาม subject_code
 
+    def test_get_all_transcripts_grouped_by_student(self, db_with_students):
+        """ทดสอบดึง Transcript หลายคนด้วย query เดียว - ผลต้องตรงกับ get_transcript รายคน"""
+        for sid in ['65001', '65002', '65003']:
+            for code, score in [('TH101', 80), ('MA101', 72)]:
+                db_with_students.save_grade({
+                    'student_id': sid, 'academic_year': '2567', 'semester': '1',
+                    'subject_code': code, 'subject_name': code, 'full_score': 100,
+                    'score': score, 'grade': db_with_students.calculate_grade(score)
+                })
+
+        transcripts = db_with_students.get_all_transcripts()
+        assert [t['student']['student_id'] for t in transcripts] == ['65001', '65002', '65003']
+        for item in transcripts:
+            sid = item['student']['student_id']
+            assert item['grades'] == db_with_students.get_transcript(sid)
+
+        room = db_with_students.get_all_transcripts(class_room='ป.1/1')
+        assert all(t['student']['class_room'] == 'ป.1/1' for t in room)
+        assert len(room) == 2
+
     def test_get_grades_by_year_semester(self, db_with_students):
         """ทดสอบดึงเกรดกรองตามปีและภาคเรียน"""
         # บันทึกหลายภาค
@@ -858,3 +878,392 @@ class TestSchedule:
         # ตรวจสอบว่าถูกลบจริง
         schedules = db_with_teachers.get_all_schedules()
         assert len(schedules) == 0
+
+
+class TestDashboardStats:
+    """ทดสอบตัวเลขสรุปของหน้าแรก/หน้ารายงาน"""
+
+    def test_grouped_counts(self, db_with_students):
+        """จำนวนนักเรียนต่อห้องจาก query เดียว ตรงกับการนับทีละห้อง"""
+        counts = db_with_students.count_students_per_classroom()
+        for room in db_with_students.get_class_rooms():
+            assert counts.get(room, 0) == db_with_students.count_students_by_classroom(room)
+        assert db_with_students.count_students() == len(db_with_students.get_all_students())
+
+    def test_count_teachers(self, db_with_teachers):
+        """จำนวนครูด้วย COUNT(*)"""
+        assert db_with_teachers.count_teachers() == len(db_with_teachers.get_all_teachers())
+
+    def test_snapshot_cached_until_data_changes(self, db_with_students):
+        """ใช้ผลเดิมจนกว่าจะมีการเขียนข้อมูล"""
+        from modules.dashboard_stats import DashboardStats, get_dashboard_stats
+        stats = DashboardStats(db_with_students)
+        first = stats.snapshot()
+        assert stats.snapshot() is first
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.summary_counts() == {
+            'students': len(db_with_students.get_all_students()),
+            'teachers': 0,
+            'class_rooms': 3,
+        }
+
+        db_with_students.delete_student('65001')
+        second = stats.snapshot()
+        assert second is not first
+        assert second['room_counts']['ป.1/1'] == first['room_counts']['ป.1/1'] - 1
+        assert get_dashboard_stats(db_with_students) is get_dashboard_stats(db_with_students)
+
+
+class TestTimetableModel:
+    """ทดสอบตารางเรียนในหน่วยความจำเทียบกับฐานข้อมูล"""
+
+    @staticmethod
+    def _add(db, class_room, day, period, teacher_id, subject="คณิตศาสตร์", room_no=None):
+        return db.add_schedule({
+            'class_room': class_room, 'day_of_week': day, 'period_no': period,
+            'start_time': None, 'end_time': None,
+            'subject_name': subject, 'teacher_id': teacher_id, 'room_no': room_no,
+        })
+
+    def test_conflict_message_matches_db(self, db_with_teachers):
+        """ข้อความครูซ้ำจาก model ตรงกับ check_teacher_conflict"""
+        from modules.timetable_model import get_timetable
+        self._add(db_with_teachers, 'ป.1/1', 'อังคาร', 3, 'T001')
+        model = get_timetable(db_with_teachers)
+        assert model.conflict_message('T001', 'อังคาร', 3) == \
+            db_with_teachers.check_teacher_conflict('T001', 'อังคาร', 3)
+        assert model.conflict_message('T001', 'อังคาร', 4) is None
+        entry_id = model.teacher_entry('T001', 'อังคาร', 3)['id']
+        assert model.conflict_message('T001', 'อังคาร', 3, exclude_id=entry_id) is None
+
+    def test_reloads_after_write(self, db_with_teachers):
+        """ใช้ model เดิมจนกว่าจะมีการเขียนข้อมูล"""
+        from modules.timetable_model import get_timetable
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 1, 'T001')
+        first = get_timetable(db_with_teachers)
+        assert get_timetable(db_with_teachers) is first
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 2, 'T002', subject="ภาษาไทย")
+        second = get_timetable(db_with_teachers)
+        assert second is not first
+        assert len(second) == 2
+        grid = second.class_grid('ป.1/1')
+        assert [(key, s['subject_name']) for key, s in grid.items()] == [
+            (('จันทร์', 1), "คณิตศาสตร์"), (('จันทร์', 2), "ภาษาไทย")]
+        assert second.class_entries('ป.1/1') == db_with_teachers.get_schedule_by_class('ป.1/1')
+        schedule_id = grid[('จันทร์', 2)]['id']
+        assert second.get(schedule_id)['teacher_id'] == 'T002'
+
+    def test_update_schedule_conflict_from_constraint(self, db_with_teachers):
+        """แก้ไขคาบให้ครูสอนซ้ำ - ได้ข้อความแจ้งจาก UNIQUE constraint"""
+        self._add(db_with_teachers, 'ป.1/1', 'พุธ', 1, 'T001')
+        self._add(db_with_teachers, 'ป.2/1', 'พุธ', 2, 'T001')
+        moved = db_with_teachers.get_schedule_by_class('ป.2/1')[0]
+        data = dict(moved, period_no=1)
+        result = db_with_teachers.update_schedule(moved['id'], data)
+        assert isinstance(result, str)
+        assert 'ป.1/1' in result
+        # แก้ไขคาบเดิมโดยไม่เปลี่ยนช่อง ไม่นับว่าชนกับตัวเอง
+        assert db_with_teachers.update_schedule(moved['id'], dict(moved, subject_name="ดนตรี")) is True
+
+    def test_replace_class_schedules_with_generated(self, db_with_teachers):
+        """จัดตารางห้องหนึ่งใหม่โดยไม่ชนกับตารางของห้องอื่น แล้วบันทึกใน transaction เดียว"""
+        from modules.timetable_generator import (
+            TimetableGenerator, requirements_from_schedule, find_conflicts)
+        from modules.timetable_model import get_timetable
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 1, 'T001')
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 2, 'T001')
+        self._add(db_with_teachers, 'ป.1/1', 'อังคาร', 1, 'T002', subject="ภาษาไทย")
+        self._add(db_with_teachers, 'ป.2/1', 'จันทร์', 3, 'T001')
+
+        entries = list(get_timetable(db_with_teachers).entries.values())
+        requirements = requirements_from_schedule(e for e in entries if e['class_room'] == 'ป.1/1')
+        fixed = [e for e in entries if e['class_room'] != 'ป.1/1']
+        result = TimetableGenerator(requirements, fixed=fixed, seed=3).generate()
+        assert result.complete
+
+        assert db_with_teachers.replace_class_schedules(['ป.1/1'], result.entries) is True
+        after = db_with_teachers.get_all_schedules()
+        assert len(after) == 4
+        assert find_conflicts(after) == []
+        assert len(db_with_teachers.get_schedule_by_class('ป.2/1')) == 1
+
+    def test_replace_class_schedules_rolls_back(self, db_with_teachers):
+        """บันทึกไม่ผ่าน (ครูซ้ำ) - ตารางเดิมไม่ถูกลบ"""
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 1, 'T001')
+        duplicate = {'class_room': 'ป.1/1', 'day_of_week': 'พุธ', 'period_no': 1,
+                     'subject_name': 'คณิตศาสตร์', 'teacher_id': 'T002'}
+        assert db_with_teachers.replace_class_schedules(['ป.1/1'], [duplicate, dict(duplicate)]) is False
+        assert [s['day_of_week'] for s in db_with_teachers.get_schedule_by_class('ป.1/1')] == ['จันทร์']
+
+
+class TestRoomUsage:
+    """ทดสอบการตรวจห้องซ้อนและอัตราการใช้ห้อง"""
+
+    @staticmethod
+    def _add(db, class_room, day, period, teacher_id, room_no, subject="คอมพิวเตอร์"):
+        return db.add_schedule({
+            'class_room': class_room, 'day_of_week': day, 'period_no': period,
+            'subject_name': subject, 'teacher_id': teacher_id, 'room_no': room_no,
+        })
+
+    def test_room_conflict_blocked(self, db_with_teachers):
+        """ห้องเดียวกัน วัน/คาบเดียวกัน - ได้ข้อความแจ้งห้องซ้อน"""
+        assert self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 1, 'T001', 'Lab1') is True
+        result = self._add(db_with_teachers, 'ป.2/1', 'จันทร์', 1, 'T002', 'Lab1')
+        assert isinstance(result, str)
+        assert 'Lab1' in result and 'ป.1/1' in result
+        assert self._add(db_with_teachers, 'ป.2/1', 'จันทร์', 1, 'T002', 'Lab2') is True
+        assert self._add(db_with_teachers, 'ป.3/1', 'จันทร์', 1, 'T003', None) is True
+
+    def test_update_keeps_own_room(self, db_with_teachers):
+        """แก้ไขคาบเดิมโดยไม่ย้ายห้อง ไม่นับว่าซ้อนกับตัวเอง"""
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 1, 'T001', 'Lab1')
+        self._add(db_with_teachers, 'ป.2/1', 'จันทร์', 2, 'T002', 'Lab1')
+        first, = db_with_teachers.get_schedule_by_class('ป.1/1')
+        assert db_with_teachers.update_schedule(first['id'], dict(first, subject_name="หุ่นยนต์")) is True
+        moved = dict(first, period_no=2)
+        assert 'Lab1' in db_with_teachers.update_schedule(first['id'], moved)
+
+    def test_model_message_matches_db(self, db_with_teachers):
+        from modules.timetable_model import get_timetable
+        self._add(db_with_teachers, 'ป.1/1', 'พุธ', 4, 'T001', 'Lab1')
+        model = get_timetable(db_with_teachers)
+        assert model.room_conflict_message('Lab1', 'พุธ', 4) == \
+            db_with_teachers.check_room_conflict('Lab1', 'พุธ', 4)
+        assert model.room_conflict_message('Lab1', 'พุธ', 5) is None
+        assert model.room_conflict_message(None, 'พุธ', 4) is None
+
+    def test_room_index_used(self, db_with_teachers):
+        """ตรวจห้องซ้อนด้วย idx_schedule_room"""
+        db_with_teachers.cursor.execute("""
+            EXPLAIN QUERY PLAN SELECT class_room FROM schedule
+            WHERE version_id = ? AND room_no = ? AND day_of_week = ? AND period_no = ?
+        """, (1, 'Lab1', 'จันทร์', 1))
+        plan = " ".join(str(tuple(row)) for row in db_with_teachers.cursor.fetchall())
+        assert 'idx_schedule_room' in plan
+
+    def test_usage_and_existing_conflicts(self, db_with_teachers):
+        """อัตราการใช้จาก aggregate query + ห้องซ้อนที่มีอยู่ก่อน"""
+        from modules.room_usage import summarize_room_usage
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 1, 'T001', 'Lab1')
+        self._add(db_with_teachers, 'ป.1/2', 'อังคาร', 1, 'T001', 'Lab1')
+        self._add(db_with_teachers, 'ป.1/1', 'จันทร์', 2, 'T002', 'Lab2')
+        # ข้อมูลเดิมที่ซ้อนกันอยู่แล้ว (บันทึกก่อนมีการตรวจ)
+        db_with_teachers.cursor.execute("""
+            INSERT INTO schedule (class_room, day_of_week, period_no, subject_name, teacher_id, room_no)
+            VALUES ('ป.2/1', 'จันทร์', 1, 'คอมพิวเตอร์', 'T003', 'Lab1')
+        """)
+        db_with_teachers.conn.commit()
+
+        rows = db_with_teachers.get_room_usage()
+        assert {(r['room_no'], r['period_no'], r['days_used'], r['bookings']) for r in rows} == {
+            ('Lab1', 1, 2, 3), ('Lab2', 2, 1, 1)}
+        summary = summarize_room_usage(rows)
+        lab1 = summary['rooms'][0]
+        assert (lab1['room_no'], lab1['used'], lab1['double_booked']) == ('Lab1', 2, 1)
+
+        conflicts = db_with_teachers.get_room_conflicts()
+        assert len(conflicts) == 1
+        assert conflicts[0]['bookings'] == 2
+        assert set(conflicts[0]['class_rooms'].split(', ')) == {'ป.1/1', 'ป.2/1'}
+
+
+class TestSubstituteFinder:
+    """ทดสอบหาครูสอนแทนจากฐานข้อมูลจริง"""
+
+    def test_find_substitutes(self, db_with_teachers):
+        from modules.substitutes import find_substitutes
+        for class_room, day, period, teacher in (
+            ('ป.1/1', 'จันทร์', 1, 'T001'), ('ป.1/1', 'จันทร์', 2, 'T001'),
+            ('ป.2/1', 'จันทร์', 1, 'T002'), ('ป.2/1', 'อังคาร', 1, 'T002'),
+            ('ป.3/1', 'จันทร์', 2, 'T003'),
+        ):
+            assert db_with_teachers.add_schedule({
+                'class_room': class_room, 'day_of_week': day, 'period_no': period,
+                'subject_name': 'ภาษาไทย', 'teacher_id': teacher,
+            }) is True
+
+        result = find_substitutes(db_with_teachers, 'T001', '2026-10-19')   # วันจันทร์
+        assert result['day_of_week'] == 'จันทร์'
+        by_period = {item['period_no']: [c['teacher_id'] for c in item['candidates']]
+                     for item in result['periods']}
+        assert by_period == {1: ['T003'], 2: ['T002']}
+
+        assert find_substitutes(db_with_teachers, 'T001', '2026-10-20')['periods'] == []
+        weekend = find_substitutes(db_with_teachers, 'T001', '2026-10-18')
+        assert weekend['day_of_week'] is None and weekend['periods'] == []
+
+
+class TestTimetableVersions:
+    """ทดสอบรุ่นของตารางเรียน (copy-on-write) และตารางเวลาเรียน"""
+
+    @staticmethod
+    def _add(db, class_room, day, period, teacher_id, version_id=None, subject="ภาษาไทย"):
+        return db.add_schedule({
+            'class_room': class_room, 'day_of_week': day, 'period_no': period,
+            'subject_name': subject, 'teacher_id': teacher_id,
+        }, version_id)
+
+    @staticmethod
+    def _rows(db, version_id):
+        db.cursor.execute("SELECT COUNT(*) FROM schedule WHERE version_id = ?", (version_id,))
+        return db.cursor.fetchone()[0]
+
+    def test_draft_copies_on_first_write(self, db_with_teachers):
+        """ฉบับร่างอ่านจากรุ่นที่ใช้อยู่จนกว่าจะแก้ไข - แก้ฉบับร่างไม่กระทบรุ่นที่ใช้อยู่"""
+        db = db_with_teachers
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        draft = db.create_timetable_version('2569/2', 'ฉบับร่าง')
+        assert self._rows(db, draft) == 0
+        assert len(db.get_schedule_by_class('ป.1/1', draft)) == 1
+
+        # ครูคนเดิม วัน/คาบเดิม ในรุ่นอื่น ไม่ชนกัน
+        assert self._add(db, 'ป.2/1', 'จันทร์', 2, 'T001', draft) is True
+        assert self._rows(db, draft) == 2
+        assert len(db.get_all_schedules()) == 1
+        assert len(db.get_all_schedules(draft)) == 2
+
+        entry, = db.get_schedule_by_class('ป.1/1', draft)
+        assert db.delete_schedule(entry['id'], draft) is True
+        assert db.get_schedule_by_class('ป.1/1', draft) == []
+        assert len(db.get_schedule_by_class('ป.1/1')) == 1
+
+    def test_edit_base_keeps_draft_snapshot(self, db_with_teachers):
+        """แก้รุ่นที่ใช้อยู่หลังสร้างฉบับร่าง - ฉบับร่างได้สำเนาของตารางเดิมก่อน"""
+        db = db_with_teachers
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        draft = db.create_timetable_version('2569/2')
+        entry, = db.get_schedule_by_class('ป.1/1')
+        assert db.delete_schedule(entry['id']) is True
+
+        assert db.get_all_schedules() == []
+        assert [s['class_room'] for s in db.get_all_schedules(draft)] == ['ป.1/1']
+
+    def test_ids_from_base_edit_draft_copy(self, db_with_teachers):
+        """id ที่เห็นก่อนคัดลอก (ของรุ่นต้นแบบ) แก้ไขคาบของฉบับร่าง ไม่ใช่ของรุ่นที่ใช้อยู่"""
+        db = db_with_teachers
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        draft = db.create_timetable_version('2569/2')
+        seen, = db.get_schedule_by_class('ป.1/1', draft)
+        assert db.update_schedule(seen['id'], dict(seen, subject_name="คณิตศาสตร์"), draft) is True
+
+        assert db.get_schedule_by_class('ป.1/1')[0]['subject_name'] == "ภาษาไทย"
+        assert db.get_schedule_by_class('ป.1/1', draft)[0]['subject_name'] == "คณิตศาสตร์"
+
+    def test_stale_id_not_reported_as_saved(self, db_with_teachers):
+        """id ของคาบที่ถูกลบไปแล้ว - แก้/ลบไม่สำเร็จ และไม่คัดลอกรุ่นต้นแบบค้างไว้"""
+        db = db_with_teachers
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        stale = db.create_timetable_version('2569/2')
+        draft = db.create_timetable_version('2569/3')
+        self._add(db, 'ป.2/1', 'จันทร์', 2, 'T002', draft)
+        entry, = db.get_schedule_by_class('ป.2/1', draft)
+        assert db.delete_schedule(entry['id'], draft) is True
+
+        assert db.update_schedule(entry['id'], dict(entry, subject_name="คณิตศาสตร์"), draft) is False
+        assert db.delete_schedule(entry['id'], draft) is False
+        assert self._rows(db, draft) == 1
+        assert len(db.get_all_schedules()) == 1
+
+        # id ที่ไม่มีอยู่ในฉบับร่างที่ยังไม่ได้คัดลอก - ฉบับร่างยังอ่านผ่านรุ่นต้นแบบเหมือนเดิม
+        assert db.delete_schedule(entry['id'], stale) is False
+        assert self._rows(db, stale) == 0
+        assert len(db.get_all_schedules(stale)) == 1
+
+    def test_publish_and_delete(self, db_with_teachers):
+        db = db_with_teachers
+        live = db.live_version_id()
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        draft = db.create_timetable_version('2569/2')
+        self._add(db, 'ป.1/1', 'จันทร์', 2, 'T002', draft)
+
+        assert db.publish_timetable_version(draft) is True
+        assert db.live_version_id() == draft
+        assert len(db.get_all_schedules()) == 2
+        statuses = {v['id']: v['status'] for v in db.get_timetable_versions()}
+        assert statuses == {live: 'archived', draft: 'live'}
+
+        assert db.delete_timetable_version(draft) is False
+        assert db.delete_timetable_version(live) is True
+        assert self._rows(db, live) == 0
+        assert len(db.get_all_schedules()) == 2
+
+    def test_delete_base_keeps_dependent_draft(self, db_with_teachers):
+        db = db_with_teachers
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        first = db.create_timetable_version('2569/2')
+        second = db.create_timetable_version('2570/1', based_on=first)
+        assert db.delete_timetable_version(first) is True
+        assert len(db.get_all_schedules(second)) == 1
+
+    def test_model_per_version(self, db_with_teachers):
+        from modules.timetable_model import get_timetable
+        db = db_with_teachers
+        self._add(db, 'ป.1/1', 'จันทร์', 1, 'T001')
+        draft = db.create_timetable_version('2569/2')
+        assert get_timetable(db, draft) is get_timetable(db)
+        self._add(db, 'ป.1/1', 'จันทร์', 2, 'T001', draft)
+        assert get_timetable(db).class_entry('ป.1/1', 'จันทร์', 2) is None
+        assert get_timetable(db, draft).class_entry('ป.1/1', 'จันทร์', 2) is not None
+
+    def test_migrate_old_schedule(self, tmp_path):
+        """ฐานข้อมูลเดิม (ไม่มี version_id) ย้ายแถวเดิมเป็นรุ่นที่ใช้อยู่"""
+        import sqlite3
+        from database.db import Database
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE schedule (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                class_room TEXT NOT NULL,
+                day_of_week TEXT NOT NULL,
+                period_no INTEGER NOT NULL,
+                start_time TEXT,
+                end_time TEXT,
+                subject_name TEXT NOT NULL,
+                teacher_id TEXT NOT NULL,
+                room_no TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(teacher_id, day_of_week, period_no)
+            );
+            CREATE INDEX idx_schedule_class ON schedule(class_room, day_of_week);
+            INSERT INTO schedule (class_room, day_of_week, period_no, subject_name, teacher_id)
+            VALUES ('ป.1/1', 'จันทร์', 1, 'ภาษาไทย', 'T001');
+        """)
+        conn.close()
+
+        db = Database(path)
+        try:
+            db.cursor.execute("SELECT id, version_id FROM schedule")
+            assert [tuple(row) for row in db.cursor.fetchall()] == [(1, db.live_version_id())]
+            db.add_teacher({'teacher_id': 'T001', 'title': 'นาย', 'first_name': 'สมศักดิ์', 'last_name': 'สอนดี'})
+            draft = db.create_timetable_version('2569/2')
+            assert isinstance(self._add(db, 'ป.2/1', 'จันทร์', 1, 'T001', draft), str)
+            assert self._add(db, 'ป.2/1', 'จันทร์', 2, 'T001', draft) is True
+            assert len(db.get_all_schedules(draft)) == 2
+            assert len(db.get_all_schedules()) == 1
+        finally:
+            db.close()
+
+    def test_class_index_used(self, db_with_teachers):
+        """ดึงตารางห้องเรียนด้วย idx_schedule_class (version_id นำหน้า)"""
+        db_with_teachers.cursor.execute("""
+            EXPLAIN QUERY PLAN SELECT * FROM schedule WHERE version_id = ? AND class_room = ?
+        """, (1, 'ป.1/1'))
+        plan = " ".join(str(tuple(row)) for row in db_with_teachers.cursor.fetchall())
+        assert 'idx_schedule_class' in plan
+
+    def test_bell_schedule(self, db_with_teachers):
+        """ตั้งเวลาเรียน - ตรวจรูปแบบ/คาบซ้อน และแกนคาบของ TimetableModel ตามตารางเวลา"""
+        from modules.timetable_model import get_timetable, PERIODS
+        db = db_with_teachers
+        assert [b['period_no'] for b in db.get_bell_schedule()] == list(PERIODS)
+        assert isinstance(db.save_bell_schedule([("8:30", "9:20"), ("9:10", "10:00")]), str)
+        assert isinstance(db.save_bell_schedule([("08:30", "08:00")]), str)
+        assert isinstance(db.save_bell_schedule([("8.30", "9.20")]), str)
+        assert isinstance(db.save_bell_schedule([]), str)
+        assert len(db.get_bell_schedule()) == len(PERIODS)
+
+        assert db.save_bell_schedule([("8:30", "9:20"), ("09:20", "10:10"), ("10:20", "11:10")]) is True
+        assert db.get_bell_schedule()[0] == {'period_no': 1, 'start_time': '08:30', 'end_time': '09:20'}
+        assert get_timetable(db).periods == (1, 2, 3)
@@ -381,8 +381,8 @@ class TestEdgeCasesSchedule:
     def test_delete_nonexistent_schedule(self, test_db):
         """ทดสอบลบตารางที่ไม่มี"""
         result = test_db.delete_schedule(99999)
-        # ควรสำเร็จ (แต่ไม่มีการเปลี่ยนแปลง)
-        assert result is True
+        # ไม่มีแถวถูกลบ - ไม่รายงานว่าสำเร็จ
+        assert result is False
 
     def test_check_conflict_with_exclude_id(self, db_with_teachers):
         """ทดสอบตรวจสอบความขัดแย้งโดยไม่รวม ID ที่กำลังแก้ไข"""
@@ -3,6 +3,11 @@ test_integration.py
 ทดสอบการทำงานร่วมกันของหลายโมดูล (Integration Tests)
 """
 
+import ast
+import os
+import subprocess
+import sys
+
 import pytest
 from datetime import datetime, timedelta
 
@@ -496,3 +501,229 @@ class TestMultiModuleIntegration:
         assert len(students_p21) == 2
         assert len(attendance_p21) == 2
         assert len(health_p21) == 2
+
+
+def _render_student_ids(db, file_path):
+    """render ทดสอบ (ระดับ module เพื่อให้ส่งเข้า worker process ได้)"""
+    students = db.get_all_students()
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(s['student_id'] for s in students))
+    return f"{len(students)} รายการ"
+
+
+def _render_teacher_ids(db, file_path):
+    teachers = db.get_all_teachers()
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(t['teacher_id'] for t in teachers))
+    return f"{len(teachers)} รายการ"
+
+
+class TestReportBundle:
+    """Scenario: Export ชุดรายงานปลายภาคเป็น ZIP เดียวผ่าน process pool"""
+
+    def test_bundle_zip_contains_artifacts_and_manifest(self, db_with_students, tmp_path):
+        """ZIP ต้องมีทุกไฟล์และ manifest ที่ตรงกับเนื้อหา"""
+        import hashlib
+        import json
+        import zipfile
+        from modules.report_bundle import build_bundle, MANIFEST_NAME
+
+        zip_path = tmp_path / "bundle.zip"
+        manifest = build_bundle(
+            db_with_students.db_path, str(zip_path),
+            artifacts=[("students.txt", _render_student_ids), ("teachers.txt", _render_teacher_ids)],
+            max_workers=2,
+        )
+
+        with zipfile.ZipFile(zip_path) as zf:
+            names = set(zf.namelist())
+            assert names == {"students.txt", "teachers.txt", MANIFEST_NAME}
+            stored = json.loads(zf.read(MANIFEST_NAME).decode("utf-8"))
+            student_ids = zf.read("students.txt").decode("utf-8").split("\n")
+
+            for entry in stored["artifacts"]:
+                data = zf.read(entry["file"])
+                assert entry["bytes"] == len(data)
+                assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+
+        assert stored == manifest
+        assert sorted(student_ids) == sorted(s['student_id'] for s in db_with_students.get_all_students())
+        assert [e["file"] for e in manifest["artifacts"]] == ["students.txt", "teachers.txt"]
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEAVY_LIBRARIES = ("reportlab", "openpyxl", "matplotlib")
+# งบเวลา import (ไมโครวินาที) ของส่วนที่โหลดตอนเปิดโปรแกรมและไม่ต้องใช้ GUI
+STARTUP_IMPORT_BUDGET_US = 400_000
+STARTUP_MODULES = [
+    "database.db", "modules.export_jobs", "modules.export_cache",
+    "modules.report_bundle", "modules.lru", "modules.icon_atlas",
+]
+
+
+def _top_level_imports(path):
+    """ชื่อ module ที่ import ตอนโหลดไฟล์ (ไม่นับ import ภายในฟังก์ชัน/เมธอด)"""
+    tree = ast.parse(open(path, encoding="utf-8").read())
+    names = []
+
+    def visit(node):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                continue
+            if isinstance(child, ast.Import):
+                names.extend(alias.name for alias in child.names)
+            elif isinstance(child, ast.ImportFrom) and child.module and not child.level:
+                names.append(child.module)
+                names.extend(f"{child.module}.{alias.name}" for alias in child.names)
+            visit(child)
+
+    visit(tree)
+    return names
+
+
+def _module_file(name):
+    path = os.path.join(PROJECT_ROOT, *name.split(".")) + ".py"
+    return path if os.path.exists(path) else None
+
+
+class TestStartupImports:
+    """ไลบรารีหนัก (reportlab/openpyxl/matplotlib) ต้องโหลดเมื่อใช้ ไม่ใช่ตอนเปิดโปรแกรม"""
+
+    def test_main_does_not_import_heavy_libraries(self):
+        """ไล่ import ระดับ module ทั้งหมดจาก main.py ต้องไม่ถึงไลบรารีหนัก"""
+        pending = [os.path.join(PROJECT_ROOT, "main.py")]
+        seen = set()
+        offenders = []
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            for name in _top_level_imports(path):
+                if name.split(".")[0] in HEAVY_LIBRARIES:
+                    offenders.append(f"{os.path.relpath(path, PROJECT_ROOT)}: {name}")
+                module_path = _module_file(name)
+                if module_path:
+                    pending.append(module_path)
+
+        assert not offenders, "\n".join(offenders)
+
+    def test_import_time_budget(self):
+        """เวลา import แบบ cold (python -X importtime) ต้องไม่เกินงบ"""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(STARTUP_MODULES)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60,
+        )
+        assert result.returncode == 0, result.stderr
+
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            if cumulative_us.strip().isdigit():
+                cumulative[name.strip()] = int(cumulative_us)
+
+        assert not [name for name in cumulative if name.split(".")[0] in HEAVY_LIBRARIES]
+        total = sum(cumulative.get(name, 0) for name in STARTUP_MODULES)
+        assert total < STARTUP_IMPORT_BUDGET_US, f"import ใช้ {total / 1000:.0f} ms"
+
+
+class TestSharedFonts:
+    """UI ต้องขอ font จาก FontRegistry แทนการสร้าง CTkFont เอง"""
+
+    def test_ui_modules_do_not_create_fonts(self):
+        """ไล่ module ที่ main.py import (ทั้งหมด) - ห้ามเรียก ctk.CTkFont(...) ตรงๆ"""
+        pending = [os.path.join(PROJECT_ROOT, "main.py")]
+        seen = set()
+        offenders = []
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            tree = ast.parse(open(path, encoding="utf-8").read())
+            for node in ast.walk(tree):
+                if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                        and node.func.attr == "CTkFont"):
+                    offenders.append(f"{os.path.relpath(path, PROJECT_ROOT)}:{node.lineno}")
+            for name in _top_level_imports(path):
+                module_path = _module_file(name)
+                if module_path and not module_path.endswith("ui_fonts.py"):
+                    pending.append(module_path)
+
+        assert not offenders, "\n".join(offenders)
+
+
+SAMPLE_DATA = os.path.join(os.path.dirname(__file__), "sample_data")
+
+
+class TestTimetableImport:
+    """ทดสอบนำเข้าตารางเรียนทั้งชุด: ตรวจในหน่วยความจำ แล้วบันทึกใน transaction เดียว"""
+
+    @staticmethod
+    def _add_teachers(db):
+        for teacher_id, first_name in (("T101", "สมศักดิ์"), ("T102", "สมหญิง"), ("T103", "วิภา")):
+            db.add_teacher({'teacher_id': teacher_id, 'title': "ครู", 'first_name': first_name,
+                            'last_name': "ทดสอบ", 'phone': ""})
+
+    def test_import_sample_csv(self, test_db):
+        from modules.timetable_import import plan_import
+        self._add_teachers(test_db)
+
+        result = plan_import(test_db, os.path.join(SAMPLE_DATA, "timetable.csv"))
+        assert result.problems == []
+        assert result.class_rooms == ["ป.1/1", "ป.2/1"]
+        assert len(result.entries) == result.cells == 18
+        assert test_db.replace_class_schedules(result.class_rooms, result.entries) is True
+
+        lab = [s for s in test_db.get_all_schedules() if s['room_no'] == "Lab1"]
+        assert {(s['class_room'], s['period_no']) for s in lab} == {("ป.1/1", 5), ("ป.2/1", 6)}
+        monday = test_db.get_schedule_by_class("ป.1/1")[0]
+        assert (monday['start_time'], monday['end_time']) == ("08:00", "09:00")
+
+    def test_conflicts_reported_together(self, test_db):
+        from modules.timetable_import import plan_import
+        self._add_teachers(test_db)
+        for class_room, day, period, teacher in (("ป.1/1", "ศุกร์", 8, "T101"),
+                                                 ("ป.4/1", "อังคาร", 2, "T102")):
+            test_db.add_schedule({'class_room': class_room, 'day_of_week': day, 'period_no': period,
+                                  'subject_name': "ภาษาไทย", 'teacher_id': teacher})
+
+        result = plan_import(test_db, os.path.join(SAMPLE_DATA, "timetable_conflicts.csv"))
+        report = "\n".join(result.problems)
+        assert len(result.problems) == 6
+        assert "เสาร์" in report and "ต้องระบุ 'วิชา / รหัสครู'" in report
+        assert "ไม่พบรหัสครู T999" in report
+        assert "ห้อง Lab1 ถูกใช้อยู่แล้ว" in report
+        assert report.count("มีคาบสอนอยู่แล้ว") == 2     # ในไฟล์เอง + กับตารางเดิมของ ป.4/1
+        assert [(e['class_room'], e['period_no']) for e in result.entries] == [("ป.1/1", 1), ("ป.1/1", 2)]
+        assert result.skipped == 4
+
+        assert test_db.replace_class_schedules(result.class_rooms, result.entries) is True
+        assert len(test_db.get_schedule_by_class("ป.1/1")) == 2     # ตารางเดิมของห้องถูกแทนที่
+        assert len(test_db.get_schedule_by_class("ป.4/1")) == 1     # ห้องอื่นไม่เปลี่ยน
+        assert test_db.get_schedule_by_class("ป.2/1") == []
+
+    def test_periods_beyond_default_checked(self, test_db, tmp_path):
+        """ตารางเวลาเรียนเกิน 8 คาบ - คาบที่ 9 ก็ต้องตรวจครูซ้ำ/ห้องซ้อน"""
+        from modules.timetable_import import plan_import
+        self._add_teachers(test_db)
+        bell = [(f"{8 + i:02d}:00", f"{8 + i:02d}:50") for i in range(9)]
+        assert test_db.save_bell_schedule(bell) is True
+
+        path = tmp_path / "nine.csv"
+        path.write_text(
+            "ห้องเรียน,วัน,คาบ 9\n"
+            "ป.1/1,จันทร์,ภาษาไทย / T101\n"
+            "ป.2/1,จันทร์,ภาษาไทย / T101\n"
+            "ป.3/1,จันทร์,วิทยาศาสตร์ / T102 / Lab1\n"
+            "ป.4/1,จันทร์,วิทยาศาสตร์ / T103 / Lab1\n", encoding="utf-8")
+
+        result = plan_import(test_db, str(path))
+        assert len(result.problems) == 2
+        assert "มีคาบสอนอยู่แล้ว" in result.problems[0]
+        assert "Lab1" in result.problems[1]
+        assert (result.entries[0]['start_time'], result.entries[0]['end_time']) == ("16:00", "16:50")
+        assert test_db.replace_class_schedules(result.class_rooms, result.entries) is True
+        assert len(test_db.get_all_schedules()) == 2
@@ -3,6 +3,8 @@ test_utils.py
 ทดสอบฟังก์ชันช่วยเหลือและ utilities
 """
 
+import json
+
 import pytest
 from database.db import Database
 
@@ -243,3 +245,1460 @@ class TestDayOfWeekOrdering:
                 assert schedules[i]['period_no'] <= schedules[i+1]['period_no']
             else:
                 assert current_day <= next_day
+
+
+class _AfterRecorder:
+    """widget จำลองที่เก็บ callback ของ after() ไว้ให้ทดสอบเรียกเอง"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, func):
+        self.callbacks.append(func)
+
+
+class TestExportJobs:
+    """ทดสอบตัวรันงาน Export เบื้องหลัง"""
+
+    def _make_runner(self):
+        from modules.export_jobs import ExportJobRunner
+        statuses = []
+        runner = ExportJobRunner(_AfterRecorder(), lambda msg, t="info": statuses.append((msg, t)),
+                                 show_panel=False)
+        return runner, statuses
+
+    def test_job_success_reports_progress_and_result(self):
+        """งานสำเร็จ: แจ้งความคืบหน้าและข้อความสำเร็จผ่าน update_status"""
+        runner, statuses = self._make_runner()
+
+        def work(job):
+            for _ in job.iterate(range(8)):
+                pass
+            return "Export สำเร็จ"
+
+        job = runner.submit("Export ทดสอบ", work)
+        job.thread.join(timeout=5)
+        runner.poll()
+
+        assert job.state == "done"
+        assert statuses[-1] == ("Export สำเร็จ", "success")
+        assert any(t == "info" and "%" in msg for msg, t in statuses)
+        assert not runner.busy
+
+    def test_job_cancel_removes_partial_file(self, tmp_path):
+        """ยกเลิกงาน: ไฟล์ที่สร้างไม่เสร็จต้องถูกลบ และไฟล์เดิมที่จะเขียนทับต้องอยู่ครบ"""
+        import threading
+        runner, statuses = self._make_runner()
+        file_path = tmp_path / "partial.xlsx"
+        file_path.write_text("old")
+        started = threading.Event()
+
+        def work(job):
+            with open(job.output_path, "w") as f:
+                f.write("partial")
+            started.set()
+            while True:
+                job.check()
+
+        job = runner.submit("Export ทดสอบ", work, str(file_path))
+        started.wait(timeout=5)
+        runner.cancel(job)
+        job.thread.join(timeout=5)
+        runner.poll()
+
+        assert job.state == "cancelled"
+        assert file_path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["partial.xlsx"]
+        assert statuses[-1][1] == "warning"
+
+    def test_job_replaces_target_only_on_success(self, tmp_path, monkeypatch):
+        """งานสำเร็จ: ไฟล์ชั่วคราวถูกย้ายไปแทนไฟล์ปลายทาง / ล้มเหลวก่อนเขียน: ไฟล์เดิมไม่หาย"""
+        import os
+        from modules import export_jobs
+        monkeypatch.setattr(export_jobs.messagebox, "showerror", lambda *a, **kw: None)
+        runner, statuses = self._make_runner()
+        file_path = tmp_path / "report.pdf"
+        file_path.write_text("old")
+
+        def fail(job):
+            raise ValueError("ไม่มีข้อมูล")
+
+        def write(job):
+            assert job.output_path != str(file_path)
+            assert os.path.dirname(job.output_path) == str(tmp_path)
+            with open(job.output_path, "w") as f:
+                f.write("new")
+            return "ok"
+
+        job = runner.submit("Export ทดสอบ", fail, str(file_path))
+        job.thread.join(timeout=5)
+        runner.poll()
+        assert job.state == "error"
+        assert file_path.read_text() == "old"
+
+        job = runner.submit("Export ทดสอบ", write, str(file_path))
+        job.thread.join(timeout=5)
+        runner.poll()
+        assert job.state == "done"
+        assert file_path.read_text() == "new"
+        assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+
+    def test_on_finish_called_on_error(self, monkeypatch):
+        """งานผิดพลาด: on_done ไม่ถูกเรียก แต่ on_finish ถูกเรียกเพื่อคืนสถานะปุ่ม"""
+        from modules import export_jobs
+        errors, finished, done = [], [], []
+        monkeypatch.setattr(export_jobs.messagebox, "showerror",
+                            lambda title, message, **kw: errors.append(kw.get("parent")))
+        runner, statuses = self._make_runner()
+        owner = object()
+
+        def work(job):
+            raise ValueError("boom")
+
+        job = runner.submit("จัดตาราง", work, on_done=done.append,
+                            on_finish=lambda j: finished.append(j.state), parent=owner)
+        job.thread.join(timeout=5)
+        runner.poll()
+
+        assert (job.state, done, finished, errors) == ("error", [], ["error"], [owner])
+        assert statuses[-1][1] == "error"
+
+    def test_worker_reads_through_readonly_connection(self, db_with_students):
+        """worker ได้ job.db แยกของตัวเอง และเขียนข้อมูลไม่ได้"""
+        import sqlite3
+        runner, statuses = self._make_runner()
+        seen = {}
+
+        def work(job):
+            seen['count'] = len(job.db.get_all_students())
+            try:
+                job.db.cursor.execute("DELETE FROM students")
+            except sqlite3.OperationalError:
+                seen['readonly'] = True
+            return "ok"
+
+        job = runner.submit("Export ทดสอบ", work, db=db_with_students)
+        job.thread.join(timeout=5)
+        runner.poll()
+
+        assert job.state == "done"
+        assert seen['count'] == len(db_with_students.get_all_students())
+        assert seen.get('readonly') is True
+
+
+class TestExportCache:
+    """ทดสอบแคชไฟล์ Export แบบ content-addressed"""
+
+    def test_same_rows_use_cached_file(self, tmp_path):
+        """ข้อมูลเดิมต้องไม่ render ซ้ำ และได้ไฟล์เนื้อหาเดียวกัน"""
+        from modules.export_cache import ExportCache
+        cache = ExportCache(str(tmp_path / "cache"))
+        calls = []
+
+        def render(path):
+            calls.append(path)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("ตารางเรียน ป.1/1")
+
+        rows = ["ป.1/1", [{"day_of_week": "จันทร์", "period_no": 1, "subject_name": "คณิต"}]]
+        first = cache.get_or_render("class_schedule_pdf", rows, str(tmp_path / "a.pdf"), render)
+        second = cache.get_or_render("class_schedule_pdf", rows, str(tmp_path / "b.pdf"), render)
+
+        assert (first, second) == (False, True)
+        assert len(calls) == 1
+        assert (tmp_path / "b.pdf").read_text(encoding="utf-8") == "ตารางเรียน ป.1/1"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_changes_with_rows_and_template_version(self, tmp_path):
+        """ข้อมูลหรือเวอร์ชันเทมเพลตเปลี่ยน -> key ต้องเปลี่ยน"""
+        from modules.export_cache import ExportCache
+        cache = ExportCache(str(tmp_path))
+        base = cache.make_key("transcript_pdf", [{"score": 80}], 1)
+
+        assert base == cache.make_key("transcript_pdf", [{"score": 80}], 1)
+        assert base != cache.make_key("transcript_pdf", [{"score": 81}], 1)
+        assert base != cache.make_key("transcript_pdf", [{"score": 80}], 2)
+        assert base != cache.make_key("class_schedule_pdf", [{"score": 80}], 1)
+
+    def test_lru_eviction_keeps_size_bound(self, tmp_path):
+        """เกินขนาด -> ลบไฟล์ที่ไม่ได้ใช้นานที่สุด ไฟล์ที่เพิ่งใช้ต้องยังอยู่"""
+        import os
+        from modules.export_cache import ExportCache
+        cache = ExportCache(str(tmp_path / "cache"), max_bytes=250)
+        src = tmp_path / "src.bin"
+        src.write_bytes(b"x" * 100)
+
+        keys = [cache.make_key("transcript_pdf", [i]) for i in range(3)]
+        cache.store(keys[0], str(src))
+        cache.store(keys[1], str(src))
+        # ทำให้ key 0 เป็นไฟล์ที่ไม่ได้ใช้นานที่สุด
+        os.utime(cache._path(keys[0]), (1, 1))
+        cache.store(keys[2], str(src))
+
+        assert cache.total_bytes() <= 250
+        assert not os.path.exists(cache._path(keys[0]))
+        assert cache.fetch(keys[1], str(tmp_path / "out.bin"))
+        assert cache.fetch(keys[2], str(tmp_path / "out2.bin"))
+
+
+def _make_ttf(path, start, end):
+    """สร้างไฟล์ TTF ขั้นต่ำที่มีเฉพาะตาราง cmap (format 4) ครอบช่วง start-end"""
+    import struct
+    seg_count = 2  # ช่วงที่ต้องการ + segment ปิดท้าย 0xFFFF
+    subtable = struct.pack(">HHHHHHH", 4, 0, 0, seg_count * 2, 2, 0, 0)
+    subtable += struct.pack(">2H", end, 0xFFFF) + b"\x00\x00"
+    subtable += struct.pack(">2H", start, 0xFFFF)
+    subtable += struct.pack(">2h", 1 - start, 1)
+    subtable += struct.pack(">2H", 0, 0)
+    cmap = struct.pack(">HHHHI", 0, 1, 3, 1, 12) + subtable
+    header = struct.pack(">IHHHH", 0x00010000, 1, 16, 0, 0)
+    directory = struct.pack(">4sIII", b"cmap", 0, 12 + 16, len(cmap))
+    path.write_bytes(header + directory + cmap)
+
+
+class TestFontDiscovery:
+    """ทดสอบการค้นหาฟอนต์ไทยและ index ฟอนต์บนดิสก์"""
+
+    def test_cmap_detects_thai_support(self, tmp_path):
+        """ฟอนต์ที่มีช่วง U+0E00-0E7F ต้องผ่าน ฟอนต์ละตินต้องไม่ผ่าน"""
+        from modules.font_discovery import ttf_supports_codepoints
+        thai = tmp_path / "Loma.ttf"
+        latin = tmp_path / "Latin.ttf"
+        _make_ttf(thai, 0x0E00, 0x0E7F)
+        _make_ttf(latin, 0x0020, 0x007E)
+        (tmp_path / "broken.ttf").write_bytes(b"not a font")
+
+        assert ttf_supports_codepoints(str(thai)) is True
+        assert ttf_supports_codepoints(str(latin)) is False
+        assert ttf_supports_codepoints(str(tmp_path / "broken.ttf")) is False
+
+    def test_scan_prefers_regular_thai_family(self, tmp_path):
+        """สแกนโฟลเดอร์: ได้เฉพาะฟอนต์ไทย เรียงตระกูลที่ต้องการและตัวปกติก่อน"""
+        from modules.font_discovery import discover_thai_fonts
+        fonts = tmp_path / "truetype"
+        fonts.mkdir()
+        _make_ttf(fonts / "Garuda-Bold.ttf", 0x0E00, 0x0E7F)
+        _make_ttf(fonts / "Garuda.ttf", 0x0E00, 0x0E7F)
+        _make_ttf(fonts / "Loma.ttf", 0x0E00, 0x0E7F)
+        _make_ttf(fonts / "DejaVuSans.ttf", 0x0020, 0x007E)
+
+        found = discover_thai_fonts(font_dirs=[str(tmp_path)], use_fc_list=False)
+        names = [name for path, name in found if str(tmp_path) in path]
+
+        assert names == ["Loma", "Garuda", "Garuda-Bold"]
+
+    def test_font_index_roundtrip_and_invalidation(self, tmp_path):
+        """index จำ path ไว้ และไม่ใช้เมื่อไฟล์ฟอนต์หรือรุ่น library เปลี่ยน"""
+        import os
+        from modules.font_discovery import FontIndex
+        font = tmp_path / "Loma.ttf"
+        _make_ttf(font, 0x0E00, 0x0E7F)
+        index = FontIndex(str(tmp_path / "index"))
+
+        index.store(str(font), "Loma", "4.0", font={"parsed": True})
+        entry = index.lookup("4.0")
+        assert entry["path"] == str(font) and entry["name"] == "Loma"
+        assert index.load_metrics(entry) == {"parsed": True}
+
+        assert index.lookup("4.1") is None
+        with open(font, "ab") as f:
+            f.write(b"\x00" * 8)
+        os.utime(font, (1, 1))
+        assert index.lookup("4.0") is None
+
+    def test_metrics_only_loaded_from_index_dir(self, tmp_path):
+        """index ที่ชี้ไปยัง pickle นอก index_dir ต้องไม่ถูก unpickle"""
+        import pickle
+        from modules.font_discovery import FontIndex
+        font = tmp_path / "Loma.ttf"
+        _make_ttf(font, 0x0E00, 0x0E7F)
+        index = FontIndex(str(tmp_path / "index"))
+        index.store(str(font), "Loma", "4.0", font={"parsed": True})
+        assert index.lookup("4.0")["metrics"] == "Loma.pickle"
+
+        outside = tmp_path / "evil.pickle"
+        outside.write_bytes(pickle.dumps({"parsed": "outside"}))
+        for metrics in (str(outside), "../evil.pickle", None, 42):
+            assert index.load_metrics({"metrics": metrics}) is None
+
+    def test_known_font_outranks_indexed_font(self, tmp_path):
+        """เพิ่มฟอนต์ในโปรเจคภายหลัง - ฟอนต์ที่ index จำไว้ต้องไม่ถูกใช้ต่อ"""
+        from modules.font_discovery import outranked_by_known_font
+        project = tmp_path / "THSarabunNew.ttf"
+        system = tmp_path / "Tahoma.ttf"
+        other = tmp_path / "Loma.ttf"
+        for path in (system, other):
+            _make_ttf(path, 0x0E00, 0x0E7F)
+        known = [(str(project), "Sarabun"), (str(system), "Tahoma")]
+
+        assert outranked_by_known_font(str(system), known) is False
+        assert outranked_by_known_font(str(other), known) is True    # Tahoma สำคัญกว่า fc-list
+
+        _make_ttf(project, 0x0E00, 0x0E7F)
+        assert outranked_by_known_font(str(system), known) is True
+        assert outranked_by_known_font(str(project), known) is False
+
+
+class TestIconAtlas:
+    """ทดสอบ icon atlas บนดิสก์"""
+
+    def test_atlas_roundtrip(self, tmp_path):
+        """icon ที่บันทึกแล้วต้องโหลดได้ในครั้งถัดไป (process ใหม่ = instance ใหม่)"""
+        from modules.icon_atlas import IconAtlas
+        path = str(tmp_path / "icons" / "atlas.pickle")
+        atlas = IconAtlas(path, library_version="0.2.0")
+        atlas.put("users", 16, 2, 2, b"\x00\x80\xff\x10")
+
+        assert atlas.save() is True
+        assert atlas.save() is False  # ไม่มีอะไรใหม่ ไม่ต้องเขียนซ้ำ
+
+        reloaded = IconAtlas(path, library_version="0.2.0")
+        assert reloaded.get("users", 16) == (2, 2, b"\x00\x80\xff\x10")
+        assert reloaded.get("users", 18) is None
+
+    def test_atlas_ignored_when_library_version_changes(self, tmp_path):
+        """tkfontawesome รุ่นใหม่ -> ไม่ใช้ mask เก่า"""
+        from modules.icon_atlas import IconAtlas
+        path = str(tmp_path / "atlas.pickle")
+        atlas = IconAtlas(path, library_version="0.2.0")
+        atlas.put("plus", 14, 1, 1, b"\xff")
+        atlas.save()
+
+        assert len(IconAtlas(path, library_version="0.3.0")) == 0
+
+
+class TestLRUCache:
+    """ทดสอบแคช LRU ที่ใช้กับ IconManager"""
+
+    def test_evicts_least_recently_used(self):
+        from modules.lru import LRUCache
+        evicted = []
+        cache = LRUCache(maxsize=2, on_evict=lambda k, v: evicted.append(k))
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # a กลายเป็นรายการล่าสุด
+        cache.put("c", 3)
+
+        assert "b" not in cache
+        assert cache.keys() == ["a", "c"]
+        assert evicted == ["b"]
+
+    def test_stats(self):
+        from modules.lru import LRUCache
+        cache = LRUCache(maxsize=1)
+        cache.put("x", 0)  # ค่า falsy ก็ต้องนับเป็น hit
+        assert cache.get("x") == 0
+        assert cache.get("y") is None
+        cache.put("y", 1)
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["evictions"] == 1 and stats["size"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_invalid_maxsize(self):
+        from modules.lru import LRUCache
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStartupProfiler:
+    """ทดสอบ startup profiler"""
+
+    def test_phases_marks_and_report(self, tmp_path):
+        from modules.startup_profiler import StartupProfiler
+        clock = _FakeClock()
+        out = tmp_path / "startup.json"
+        profiler = StartupProfiler(enabled=True, output_path=str(out), clock=clock)
+
+        clock.now = 0.5
+        profiler.mark("imports")
+        with profiler.phase("__init__"):
+            with profiler.phase("Database"):
+                clock.now = 0.75
+        profiler.mark("first_frame")
+
+        assert profiler.finish() == str(out)
+        assert profiler.finish() is None  # เขียนครั้งเดียว
+
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["first_frame_ms"] == 750.0
+        assert [(p["name"], p["depth"], p["duration_ms"]) for p in report["phases"]] == [
+            ("__init__", 0, 250.0), ("Database", 1, 250.0)]
+        assert "Database" in profiler.summary(report)
+
+    def test_disabled_records_nothing(self, tmp_path):
+        from modules.startup_profiler import StartupProfiler
+        profiler = StartupProfiler(enabled=False, output_path=str(tmp_path / "x.json"))
+        with profiler.phase("anything"):
+            profiler.mark("first_frame")
+        assert profiler.phases == [] and profiler.marks == []
+        assert profiler.finish() is None
+        assert not (tmp_path / "x.json").exists()
+
+    def test_first_frame_keeps_other_map_bindings(self, tmp_path):
+        """ไม่ unbind <Map> (จะลบ binding อื่นของหน้าต่าง) - handler เลิกทำงานหลัง map ครั้งแรกแทน"""
+        from types import SimpleNamespace
+        from modules.startup_profiler import StartupProfiler
+
+        class Window:
+            def __init__(self):
+                self.handlers, self.idle = [], []
+
+            def bind(self, sequence, func, add=None):
+                assert add == "+"
+                self.handlers.append(func)
+
+            def unbind(self, sequence, funcid=None):
+                raise AssertionError("unbind ลบ <Map> binding ของคนอื่นด้วย")
+
+            def after_idle(self, func):
+                self.idle.append(func)
+
+        window = Window()
+        profiler = StartupProfiler(enabled=True, output_path=str(tmp_path / "s.json"), clock=_FakeClock())
+        profiler.watch_first_frame(window)
+        event = SimpleNamespace(widget=window)
+        window.handlers[0](event)
+        window.handlers[0](event)       # map ซ้ำก่อนวาดเสร็จ - ไม่ตั้งเวลาอีก
+        assert len(window.idle) == 1
+
+        window.idle.pop()()
+        window.handlers[0](event)
+        assert window.idle == [] and profiler.finished
+        assert [m["name"] for m in profiler.marks] == ["window_mapped", "first_frame"]
+
+    def test_enable_from_env_or_cli(self):
+        from modules.startup_profiler import profiler_from_environment
+        assert not profiler_from_environment([], {}).enabled
+        assert profiler_from_environment([], {"SCHOOL_PROFILE_STARTUP": "1"}).enabled
+
+        profiler = profiler_from_environment(["--profile-startup=out.json"], {})
+        assert profiler.enabled and profiler.output_path == "out.json"
+
+
+class _FakeFrame:
+    """แทน CTkFrame: จำสถานะ grid/destroy"""
+
+    def __init__(self):
+        self.visible = False
+        self.destroyed = False
+
+    def grid(self, **options):
+        self.visible = True
+
+    def grid_remove(self):
+        self.visible = False
+
+    def winfo_exists(self):
+        return not self.destroyed
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class _FakeModule:
+    def __init__(self, frame):
+        self.frame = frame
+        self.shown = 0
+
+    def on_show(self):
+        self.shown += 1
+
+
+class TestScreenManager:
+    """ทดสอบ ScreenManager (keep-alive + LRU)"""
+
+    def test_reuses_screen_and_calls_on_show(self):
+        from modules.screen_manager import ScreenManager
+        frames = []
+        manager = ScreenManager(lambda: frames.append(_FakeFrame()) or frames[-1])
+
+        students = manager.show("students", _FakeModule)
+        manager.show("grades", _FakeModule)
+        assert not students.frame.visible
+
+        assert manager.show("students", _FakeModule) is students
+        assert students.frame.visible and students.shown == 1
+        assert manager.builds == 2 and manager.reuses == 1 and len(frames) == 2
+
+    def test_evicts_least_recently_used(self):
+        from modules.screen_manager import ScreenManager
+        manager = ScreenManager(_FakeFrame, max_alive=2)
+        first = manager.show("a", _FakeModule)
+        manager.show("b", _FakeModule)
+        manager.show("a", _FakeModule)
+        manager.show("c", _FakeModule)
+
+        assert manager.keys() == ["a", "c"]
+        assert not first.frame.destroyed
+
+    def test_busy_screen_is_kept(self):
+        from modules.screen_manager import ScreenManager
+
+        class _Busy:
+            busy = True
+
+        manager = ScreenManager(_FakeFrame, max_alive=1)
+        exporting = manager.show("reports", _FakeModule)
+        exporting.export_jobs = _Busy()
+        manager.show("students", _FakeModule)
+
+        assert "reports" in manager and not exporting.frame.destroyed
+        exporting.export_jobs.busy = False
+        manager.show("grades", _FakeModule)
+        assert manager.keys() == ["grades"] and exporting.frame.destroyed
+
+    def test_discard_rebuilds(self):
+        from modules.screen_manager import ScreenManager
+        manager = ScreenManager(_FakeFrame)
+        home = manager.show("home", _FakeModule)
+        assert manager.discard("home") is True
+        assert home.frame.destroyed and manager.current is None
+        assert manager.show("home", _FakeModule) is not home
+
+
+class _FakeTabview:
+    """แทน CTkTabview: tab แรกที่ add ถูกเลือกอัตโนมัติ"""
+
+    def __init__(self):
+        self.tabs = []
+        self.selected = None
+        self.command = None
+
+    def configure(self, command=None):
+        self.command = command
+
+    def add(self, name):
+        self.tabs.append(name)
+        if self.selected is None:
+            self.selected = name
+
+    def get(self):
+        return self.selected
+
+    def set(self, name):
+        self.selected = name
+
+    def click(self, name):
+        self.selected = name
+        self.command()
+
+
+class TestLazyTabs:
+    """ทดสอบการสร้าง tab เมื่อถูกเลือกครั้งแรก"""
+
+    def test_only_visible_tab_is_built(self):
+        from modules.lazy_tabs import LazyTabs
+        built = []
+        tabview = _FakeTabview()
+        tabs = LazyTabs(tabview)
+        for name in ("class", "teacher", "workload"):
+            tabs.add(name, lambda n=name: built.append(n))
+
+        assert built == ["class"]
+        tabview.click("workload")
+        tabview.click("class")
+        tabview.click("workload")
+        assert built == ["class", "workload"]
+        assert tabs.is_built("workload") and not tabs.is_built("teacher")
+
+    def test_select_builds(self):
+        from modules.lazy_tabs import LazyTabs
+        built = []
+        tabs = LazyTabs(_FakeTabview())
+        tabs.add("a", lambda: built.append("a"))
+        tabs.add("b", lambda: built.append("b"))
+        tabs.select("b")
+        assert built == ["a", "b"]
+
+
+def _roster_students():
+    return [
+        {'student_id': "S3", 'class_room': "ม.1/2"},
+        {'student_id': "S1", 'class_room': "ม.1/1"},
+        {'student_id': "S2", 'class_room': "ม.1/1"},
+    ]
+
+
+class TestAttendanceRoster:
+    """ทดสอบข้อมูลหน้าเช็คชื่อ + ตำแหน่งแถวของ virtualized list"""
+
+    def test_rows_grouped_by_room(self):
+        from modules.attendance_roster import AttendanceRoster, ROW_ROOM, ROW_STUDENT, ROW_SUMMARY
+        roster = AttendanceRoster(_roster_students())
+        assert list(roster.rooms) == ["ม.1/1", "ม.1/2"]
+        assert [r.kind for r in roster.rows] == [
+            ROW_ROOM, ROW_STUDENT, ROW_STUDENT, ROW_SUMMARY,
+            ROW_ROOM, ROW_STUDENT, ROW_SUMMARY,
+        ]
+        assert [r.student_id for r in roster.rows if r.kind == ROW_STUDENT] == ["S1", "S2", "S3"]
+        assert len(roster) == 3
+
+    def test_counts_follow_status_changes(self):
+        from modules.attendance_roster import AttendanceRoster
+        roster = AttendanceRoster(_roster_students(), {"S1": "ขาด", "S9": "มา", "S3": "ไม่รู้"})
+        counts, total = roster.counts("ม.1/1")
+        assert (counts["ขาด"], counts["none"], total) == (1, 1, 2)
+
+        assert roster.set_status("S2", "มา") is True
+        assert roster.set_status("S2", "มา") is False
+        assert roster.set_status("S9", "มา") is False
+        assert roster.mark_room("ม.1/2", "ลา") == 1
+        counts, total = roster.counts()
+        assert (counts["มา"], counts["ขาด"], counts["ลา"], counts["none"], total) == (1, 1, 1, 0, 3)
+        assert roster.selected() == [("S1", "ขาด"), ("S2", "มา"), ("S3", "ลา")]
+
+        roster.mark_room("ม.1/1", None)
+        assert roster.counts("ม.1/1")[0]["none"] == 2
+        with pytest.raises(ValueError):
+            roster.set_status("S1", "หาย")
+
+    def test_visible_range(self):
+        from modules.attendance_roster import VirtualLayout
+        layout = VirtualLayout([100] + [50] * 1000)
+        assert layout.total == 50100
+        assert layout.visible_range(0, 200) == (0, 3)
+        assert layout.visible_range(120, 100) == (1, 4)
+        assert layout.visible_range(120, 100, overscan=2) == (0, 6)
+        assert layout.visible_range(50050, 500)[1] == len(layout)
+        assert VirtualLayout().visible_range(0, 500) == (0, 0)
+
+    def test_layout_from_generator(self):
+        """heights เป็น generator ก็ต้องได้ทั้ง offsets และ heights"""
+        from modules.attendance_roster import VirtualLayout
+        layout = VirtualLayout(h for h in [100, 50, 50])
+        assert (len(layout), layout.total, layout.offsets) == (3, 200, [0, 100, 150])
+        assert layout.visible_range(120, 10) == (1, 2)
+
+    def test_clamp_top(self):
+        from modules.attendance_roster import VirtualLayout
+        layout = VirtualLayout([50] * 10)
+        assert layout.clamp_top(-20, 200) == 0
+        assert layout.clamp_top(1000, 200) == 300
+        assert VirtualLayout([50]).clamp_top(30, 200) == 0
+
+
+class _PooledWidget:
+    def __init__(self, log):
+        self.log = log
+        self.item = None
+
+    def bind(self, item):
+        self.item = item
+        self.log.append(("bind", item))
+
+
+class TestWidgetPool:
+    """ทดสอบการนำ widget กลับมาใช้ใหม่"""
+
+    def _pool(self, log):
+        from modules.widget_pool import WidgetPool
+        return WidgetPool(
+            lambda: _PooledWidget(log),
+            bind=lambda w, item: w.bind(item),
+            show=lambda w: log.append(("show", w.item)),
+            hide=lambda w: log.append(("hide", w.item)),
+        )
+
+    def test_sync_reuses_and_creates_shortfall(self):
+        log = []
+        pool = self._pool(log)
+        first = pool.sync(["a", "b", "c"])
+        assert pool.created == 3 and pool.reused == 0
+
+        log.clear()
+        second = pool.sync(["x", "y"])
+        assert second == first[:2]
+        assert ("hide", "c") in log and not any(e[0] == "show" for e in log)
+        assert pool.created == 3 and pool.reused == 2
+
+        log.clear()
+        third = pool.sync(["p", "q", "r", "s"])
+        assert third[:3] == first and pool.created == 4
+        # ตัวที่ถูกซ่อนแสดงใหม่ต่อท้ายตามลำดับ
+        assert [e for e in log if e[0] == "show"] == [("show", "r"), ("show", "s")]
+        assert [w.item for w in pool.active] == ["p", "q", "r", "s"]
+
+    def test_sync_empty_hides_all(self):
+        log = []
+        pool = self._pool(log)
+        pool.sync(["a", "b"])
+        assert pool.sync([]) == []
+        assert pool.stats()['shown'] == 0
+        assert [e for e in log if e[0] == "hide"] == [("hide", "a"), ("hide", "b")]
+
+    def test_acquire_release(self):
+        from modules.widget_pool import WidgetPool
+        hidden = []
+        pool = WidgetPool(object, hide=hidden.append)
+        a, b = pool.acquire(), pool.acquire()
+        pool.release(a)
+        assert hidden == [a]
+        assert pool.acquire() is a
+        assert pool.stats() == {'created': 2, 'reused': 1, 'shown': 0, 'free': 0}
+        assert b is not a
+
+
+def _search_students():
+    return [
+        {'student_id': "65001", 'first_name': "สมชาย", 'last_name': "ใจดี"},
+        {'student_id': "65002", 'first_name': "สมหญิง", 'last_name': "รักเรียน"},
+        {'student_id': "65003", 'first_name': "วิชัย", 'last_name': "สมบูรณ์"},
+        {'student_id': "65004", 'first_name': "John", 'last_name': "Smith"},
+    ]
+
+
+class TestStudentSearchIndex:
+    """ทดสอบการค้นหานักเรียนในหน่วยความจำ"""
+
+    def test_matches_like_query_fields(self):
+        from modules.search_index import StudentSearchIndex
+        index = StudentSearchIndex(_search_students())
+        assert [s['student_id'] for s in index.search("650")] == ["65001", "65002", "65003", "65004"]
+        assert [s['student_id'] for s in index.search("รักเรียน")] == ["65002"]
+        assert [s['student_id'] for s in index.search("smi")] == ["65004"]
+        assert index.search("ไม่มีชื่อนี้") == []
+        assert len(index.search("")) == 4
+
+    def test_prefix_matches_first(self):
+        from modules.search_index import StudentSearchIndex
+        index = StudentSearchIndex(_search_students())
+        # วิชัย สมบูรณ์ ตรงที่ต้นนามสกุล, สมชาย/สมหญิง ตรงที่ต้นชื่อ - ทั้งหมดเป็น prefix
+        assert [s['student_id'] for s in index.search("สม")] == ["65001", "65002", "65003"]
+        # ตรงกลางคำ (ไม่ใช่ prefix) ก็ยังพบ
+        assert [s['student_id'] for s in index.search("รณ์")] == ["65003"]
+        assert [s['student_id'] for s in index.search("65004 ")] == ["65004"]
+        assert [s['student_id'] for s in index.search("ญิง")] == ["65002"]
+        assert [s['student_id'] for s in index.search("ใจ")] == ["65001"]
+
+        index = StudentSearchIndex([
+            {'student_id': "1", 'first_name': "Isabel", 'last_name': "Ko"},
+            {'student_id': "2", 'first_name': "Bel", 'last_name': "Ma"},
+        ])
+        assert [s['student_id'] for s in index.search("bel")] == ["2", "1"]
+
+    def test_full_name_and_narrowing(self):
+        from modules.search_index import StudentSearchIndex
+        index = StudentSearchIndex(_search_students())
+        typed = "สมชาย ใจดี"
+        results = None
+        for end in range(1, len(typed) + 1):
+            results = index.search(typed[:end])
+        assert [s['student_id'] for s in results] == ["65001"]
+        assert [s['student_id'] for s in index.search("  JOHN   smith ")] == ["65004"]
+        # ลบตัวอักษร (คำค้นกว้างขึ้น) ต้องกลับมาครบ
+        assert len(index.search("สม")) == 3
+
+
+class _FakeTree:
+    """จำลอง ttk.Treeview เฉพาะส่วนที่ TreeBinder ใช้ + นับจำนวนคำสั่ง"""
+
+    def __init__(self):
+        self.children = []
+        self.items = {}
+        self.calls = 0
+
+    def insert(self, parent, index, iid, values, tags=()):
+        assert iid not in self.items
+        self.calls += 1
+        self.items[iid] = {'values': values, 'tags': tags}
+        self.children.insert(index, iid)
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            del self.items[iid]
+            if iid in self.children:
+                self.children.remove(iid)
+
+    def detach(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            self.children.remove(iid)
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+        if iid in self.children:
+            self.children.remove(iid)
+        self.children.insert(index, iid)
+
+    def item(self, iid, **options):
+        self.calls += 1
+        self.items[iid].update(options)
+
+    def shown(self):
+        return [(iid, self.items[iid]['values'], self.items[iid]['tags']) for iid in self.children]
+
+
+class TestTreeBinder:
+    """ทดสอบการอัปเดต Treeview แบบ diff"""
+
+    @staticmethod
+    def _rows(names):
+        return [(name, (name, name.upper())) for name in names]
+
+    @staticmethod
+    def _expected(rows):
+        return [(iid, values, ("evenrow" if pos % 2 == 0 else "oddrow",))
+                for pos, (iid, values) in enumerate(rows)]
+
+    def _check(self, tree, binder, rows):
+        stats = binder.bind(rows)
+        assert tree.shown() == self._expected(rows)
+        return stats
+
+    def test_edit_one_row_touches_one_row(self):
+        from modules.tree_binding import TreeBinder
+        tree = _FakeTree()
+        binder = TreeBinder(tree)
+        rows = self._rows("abcdefgh")
+        self._check(tree, binder, rows)
+
+        tree.calls = 0
+        rows[3] = ("d", ("d", "edited"))
+        stats = self._check(tree, binder, rows)
+        assert stats == {'inserted': 0, 'deleted': 0, 'moved': 0, 'updated': 1}
+        assert tree.calls == 1
+
+    def test_moves_use_longest_increasing_run(self):
+        from modules.tree_binding import TreeBinder
+        tree = _FakeTree()
+        binder = TreeBinder(tree, stripe_tags=None)
+        binder.bind(self._rows("abcdef"))
+        stats = binder.bind(self._rows("bcdefa"))
+        assert tree.children == list("bcdefa")
+        assert stats['moved'] == 1
+
+        stats = binder.bind(self._rows("fedcba"))
+        assert tree.children == list("fedcba")
+        assert stats['moved'] == 4  # f, a อยู่กับที่
+
+    def test_mixed_changes(self):
+        from modules.tree_binding import TreeBinder
+        tree = _FakeTree()
+        binder = TreeBinder(tree)
+        self._check(tree, binder, self._rows("abcde"))
+        stats = self._check(tree, binder, self._rows("xaecz"))
+        assert (stats['inserted'], stats['deleted']) == (2, 2)
+        self._check(tree, binder, [])
+        assert tree.items == {} and len(binder) == 0
+
+    def test_keep_detached_reuses_rows(self):
+        from modules.tree_binding import TreeBinder
+        tree = _FakeTree()
+        binder = TreeBinder(tree, keep_detached=True)
+        self._check(tree, binder, self._rows("abcd"))
+        self._check(tree, binder, self._rows("c"))
+        assert "a" in binder and set(tree.items) == set("abcd")
+
+        stats = self._check(tree, binder, self._rows("abcd"))
+        assert stats['inserted'] == 0 and stats['moved'] == 3
+        assert binder.drop_detached() == 0
+        binder.bind(self._rows("b"))
+        assert binder.drop_detached() == 3
+        assert set(tree.items) == {"b"}
+
+    def test_duplicate_iid_rejected(self):
+        from modules.tree_binding import TreeBinder
+        with pytest.raises(ValueError):
+            TreeBinder(_FakeTree()).bind([("a", ()), ("a", ())])
+
+    def test_longest_increasing_run(self):
+        from modules.tree_binding import longest_increasing_run
+        assert longest_increasing_run([]) == set()
+        assert len(longest_increasing_run([3, 0, 1, 4, 2, 5])) == 4
+        assert longest_increasing_run([0, 1, 2]) == {0, 1, 2}
+
+
+class _IdleWidget:
+    """จำลอง widget สำหรับ after_idle - รัน callback เมื่อเรียก run_idle()"""
+
+    def __init__(self):
+        self.queue = []
+        self.exists = True
+
+    def after_idle(self, callback):
+        self.queue.append(callback)
+        return f"after#{len(self.queue)}"
+
+    def after_cancel(self, after_id):
+        self.queue.clear()
+
+    def winfo_exists(self):
+        return self.exists
+
+    def run_idle(self):
+        queue, self.queue = self.queue, []
+        for callback in queue:
+            callback()
+
+
+class TestIdleSlices:
+    """ทดสอบการทำงานทีละชุดตอน idle"""
+
+    def test_batches(self):
+        from modules.idle_slices import IdleSlices
+        widget, done, handled = _IdleWidget(), [], []
+        task = IdleSlices(widget, range(7), handled.append, batch_size=3,
+                          on_done=lambda: done.append(True), first_batch_now=True)
+        assert handled == [0, 1, 2] and task.remaining == 4
+        widget.run_idle()
+        assert handled == [0, 1, 2, 3, 4, 5] and not done
+        widget.run_idle()
+        assert handled == list(range(7)) and done == [True]
+        assert task.done and task.slices == 3 and widget.queue == []
+
+    def test_cancel_and_destroyed_widget(self):
+        from modules.idle_slices import IdleSlices
+        widget, handled = _IdleWidget(), []
+        task = IdleSlices(widget, range(5), handled.append, batch_size=2)
+        assert handled == []
+        task.cancel()
+        widget.run_idle()
+        assert handled == [] and not task.done
+
+        widget = _IdleWidget()
+        IdleSlices(widget, range(5), handled.append, batch_size=2, first_batch_now=True)
+        widget.exists = False
+        widget.run_idle()
+        assert handled == [0, 1]
+
+    def test_empty_finishes_immediately(self):
+        from modules.idle_slices import IdleSlices
+        done = []
+        IdleSlices(_IdleWidget(), [], lambda item: None, on_done=lambda: done.append(1))
+        assert done == [1]
+        with pytest.raises(ValueError):
+            IdleSlices(_IdleWidget(), [1], lambda item: None, batch_size=0)
+
+
+class _BuildFrame:
+    """จำลอง frame สำหรับ build_offscreen (บันทึกลำดับเหตุการณ์ลง log)"""
+
+    def __init__(self, log, name, parent=None):
+        self.log = log
+        self.name = name
+        self.children = []
+        self.propagate = True
+        self.packed = False
+        if parent is not None:
+            parent.children.append(self)
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def destroy(self):
+        self.log.append(("destroy", self.name))
+
+    def pack(self, **options):
+        self.packed = True
+        self.log.append(("pack", self.name, self.propagate))
+
+    def pack_propagate(self, flag):
+        self.propagate = flag
+
+    def grid_propagate(self, flag):
+        self.propagate = flag
+
+    def update_idletasks(self):
+        self.log.append(("update_idletasks", self.name))
+
+
+class TestBuildOffscreen:
+    """ทดสอบการสร้างเนื้อหานอกจอแล้วแสดงครั้งเดียว"""
+
+    def _host(self, log):
+        host = _BuildFrame(log, "host")
+        _BuildFrame(log, "old", host)
+        return host
+
+    def test_builds_unmapped_then_swaps(self, monkeypatch):
+        from modules import offscreen
+        monkeypatch.delenv(offscreen.ENV_OFFSCREEN, raising=False)
+        log = []
+        host = self._host(log)
+        with offscreen.build_offscreen(host, lambda h: _BuildFrame(log, "new"), "test_swap") as content:
+            assert not content.packed and content.propagate is False
+            assert log == []  # เนื้อหาเดิมยังแสดงอยู่ระหว่างสร้าง
+        assert log == [("destroy", "old"), ("pack", "new", True)]
+        assert offscreen.timings["test_swap"]['offscreen'] is True
+
+    def test_direct_mode_and_hooks(self, monkeypatch):
+        from modules import offscreen
+        monkeypatch.setenv(offscreen.ENV_OFFSCREEN, "0")
+        entries = []
+        hook = lambda name, entry: entries.append((name, entry))
+        offscreen.add_timing_hook(hook)
+        try:
+            log = []
+            host = self._host(log)
+            ticks = iter([0.0, 0.010, 0.025])
+            with offscreen.build_offscreen(host, lambda h: _BuildFrame(log, "new", h), "test_direct",
+                                           clock=lambda: next(ticks)):
+                pass
+        finally:
+            offscreen.remove_timing_hook(hook)
+        assert log[:2] == [("destroy", "old"), ("pack", "new", True)]
+        assert log[-1] == ("update_idletasks", "host")
+        name, entry = entries[0]
+        assert name == "test_direct" and entry['offscreen'] is False
+        assert round(entry['build_ms']) == 10 and round(entry['total_ms']) == 25
+
+    def test_failure_keeps_old_content(self, monkeypatch):
+        from modules import offscreen
+        monkeypatch.delenv(offscreen.ENV_OFFSCREEN, raising=False)
+        log = []
+        host = self._host(log)
+        with pytest.raises(RuntimeError):
+            with offscreen.build_offscreen(host, lambda h: _BuildFrame(log, "new"), "test_fail"):
+                raise RuntimeError("boom")
+        assert log == [("destroy", "new")]
+
+    def test_environment_flag(self):
+        from modules.offscreen import offscreen_enabled
+        assert offscreen_enabled({}) is True
+        assert offscreen_enabled({"SCHOOL_OFFSCREEN_BUILD": "off"}) is False
+        assert offscreen_enabled({"SCHOOL_OFFSCREEN_BUILD": "1"}) is True
+
+
+class TestFontRegistry:
+    """ทดสอบการใช้ font ร่วมกัน"""
+
+    @staticmethod
+    def _registry():
+        from modules.ui_fonts import FontRegistry
+        return FontRegistry(factory=lambda **options: dict(options))
+
+    @staticmethod
+    def _replay_font_calls(fonts, path, class_names):
+        """
+        เรียก FONTS.font()/FONTS.style() ตามที่เขียนไว้จริงในคลาสที่ระบุ (อ่านจาก source ด้วย ast)
+        กับ registry ทดสอบ - ไม่ต้องสร้าง widget (customtkinter ไม่จำเป็น)
+        Returns:
+            จำนวนการเรียก
+        """
+        import ast
+        import os
+        root = os.path.join(os.path.dirname(__file__), "..")
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        calls = 0
+        for node in tree.body:
+            if not (isinstance(node, ast.ClassDef) and node.name in class_names):
+                continue
+            for call in ast.walk(node):
+                func = getattr(call, "func", None)
+                if not (isinstance(call, ast.Call) and isinstance(func, ast.Attribute)
+                        and isinstance(func.value, ast.Name) and func.value.id == "FONTS"):
+                    continue
+                args = [ast.literal_eval(a) for a in call.args]
+                kwargs = {k.arg: ast.literal_eval(k.value) for k in call.keywords}
+                getattr(fonts, func.attr)(*args, **kwargs)
+                calls += 1
+        return calls
+
+    def _load_screens(self, fonts, rows=40):
+        """เปิดตารางเรียน (_TimetablePanel) + รายชื่อเช็คชื่อ (แถวห้อง/นักเรียน/สรุปหลายแถว) 1 ครั้ง"""
+        calls = self._replay_font_calls(fonts, "modules/schedule.py", {"_TimetablePanel"})
+        assert calls, "ไม่พบการขอ font ใน _TimetablePanel"
+        for _ in range(rows):
+            calls += self._replay_font_calls(
+                fonts, "modules/attendance.py",
+                {"_RosterRoomRow", "_RosterStudentRow", "_RosterSummaryRow"})
+        return calls
+
+    def test_fonts_created_once_per_spec(self):
+        """font ที่หน้าจอจริงขอ: สร้างครั้งเดียวต่อชุด - เพิ่มชุดใหม่ต้องแก้รายการนี้ด้วย"""
+        fonts = self._registry()
+        calls = self._load_screens(fonts)
+        assert set(fonts._fonts) == {
+            ("TH Sarabun New", 20, "bold"),      # h2
+            ("TH Sarabun New", 16, "normal"),
+            ("TH Sarabun New", 15, "normal"),
+            ("TH Sarabun New", 15, "bold"),
+            ("TH Sarabun New", 14, "normal"),    # body
+            ("TH Sarabun New", 14, "bold"),      # body_bold
+            ("TH Sarabun New", 13, "bold"),      # cell
+        }
+        first_load = fonts.created
+        assert first_load == 7
+        self._load_screens(fonts)
+        self._load_screens(fonts)
+        assert fonts.created == first_load
+        assert fonts.stats()['requests'] == 3 * calls > 100
+
+    def test_timetable_cells_use_canvas_fonts(self):
+        """ช่องของตารางวาดบน Canvas ด้วย font tuple จาก STYLES - ไม่สร้าง CTkFont ต่อช่อง"""
+        from modules.timetable_canvas import CANVAS_FONTS
+        from modules.ui_fonts import STYLES
+        assert CANVAS_FONTS["title"] == STYLES["cell"]
+        assert CANVAS_FONTS["subtitle"] == STYLES["cell_caption"]
+        assert all(isinstance(spec, tuple) and len(spec) == 3 for spec in CANVAS_FONTS.values())
+
+    def test_style_matches_font(self):
+        fonts = self._registry()
+        assert fonts.style("cell") is fonts.font("TH Sarabun New", 13, "bold")
+        assert fonts.style("body") == {'family': "TH Sarabun New", 'size': 14, 'weight': "normal"}
+        assert fonts.font(size=48) == {'size': 48, 'weight': "normal"}
+        with pytest.raises(KeyError):
+            fonts.style("huge")
+
+    def test_clear(self):
+        fonts = self._registry()
+        fonts.style("h1")
+        fonts.clear()
+        assert len(fonts) == 0
+        fonts.style("h1")
+        assert fonts.created == 2
+
+
+class TestTimetableLayout:
+    """ทดสอบตำแหน่ง/hit-test ของตารางบน Canvas"""
+
+    @staticmethod
+    def _layout(width=800):
+        from modules.timetable_canvas import TimetableLayout
+        return TimetableLayout(5, 8, width)
+
+    def test_columns_stretch_to_width(self):
+        layout = self._layout(800)
+        assert layout.width == pytest.approx(800)
+        x1, _, x2, _ = layout.rect(4, 0)
+        assert x2 == pytest.approx(800 - layout.gap)
+        assert layout.rect(-1, -1)[:2] == (layout.gap, layout.gap)
+
+    def test_min_cell_width(self):
+        from modules.timetable_canvas import MIN_CELL_WIDTH
+        layout = self._layout(100)
+        assert layout.cell_width == MIN_CELL_WIDTH
+        assert layout.width > 100
+
+    def test_hit_every_cell_center(self):
+        layout = self._layout()
+        for row in range(8):
+            for col in range(5):
+                x1, y1, x2, y2 = layout.rect(col, row)
+                assert layout.hit((x1 + x2) / 2, (y1 + y2) / 2) == (col, row)
+                assert layout.hit(x1, y1) == (col, row)
+
+    def test_hit_outside_cells(self):
+        layout = self._layout()
+        header = layout.rect(0, -1)
+        assert layout.hit(header[0] + 5, header[1] + 5) is None
+        row_header = layout.rect(-1, 0)
+        assert layout.hit(row_header[0] + 5, row_header[1] + 5) is None
+        x1, y1, x2, y2 = layout.rect(1, 1)
+        assert layout.hit(x2 + layout.gap / 2, y1 + 5) is None   # ช่องว่างระหว่างคอลัมน์
+        assert layout.hit(x1 + 5, y2 + layout.gap / 2) is None   # ช่องว่างระหว่างแถว
+        assert layout.hit(layout.width + 10, y1) is None
+        assert layout.hit(x1, layout.height + 10) is None
+
+    def test_rounded_rect_points(self):
+        from modules.timetable_canvas import rounded_rect_points
+        points = rounded_rect_points(0, 0, 100, 60, 8)
+        assert len(points) == 24
+        xs, ys = points[0::2], points[1::2]
+        assert (min(xs), max(xs), min(ys), max(ys)) == (0, 100, 0, 60)
+        # รัศมีไม่เกินครึ่งหนึ่งของด้านที่สั้นกว่า
+        assert rounded_rect_points(0, 0, 10, 10, 50)[0] == 5
+
+    def test_same_cell_ignores_payload(self):
+        from modules.timetable_canvas import TimetableCell, _same_cell
+        a = TimetableCell("คณิต", "ครูสมชาย", "#DBEAFE", payload=1)
+        b = TimetableCell("คณิต", "ครูสมชาย", "#DBEAFE", payload=2)
+        assert _same_cell(a, b)
+        assert not _same_cell(a, TimetableCell("ไทย", "ครูสมชาย", "#DBEAFE"))
+        assert not _same_cell(a, None)
+        assert _same_cell(None, None)
+
+
+class TestTimetableBitsets:
+    """ทดสอบดัชนี bitset ของ TimetableModel"""
+
+    @staticmethod
+    def _model():
+        from modules.timetable_model import TimetableModel
+        entries = [
+            {'id': 1, 'class_room': "ป.1/1", 'day_of_week': "จันทร์", 'period_no': 1,
+             'teacher_id': "T1", 'room_no': "101", 'subject_name': "คณิต"},
+            {'id': 2, 'class_room': "ป.1/1", 'day_of_week': "จันทร์", 'period_no': 2,
+             'teacher_id': "T2", 'room_no': "101", 'subject_name': "ไทย"},
+            {'id': 3, 'class_room': "ป.2/1", 'day_of_week': "ศุกร์", 'period_no': 8,
+             'teacher_id': "T1", 'room_no': None, 'subject_name': "คณิต"},
+        ]
+        return TimetableModel(entries)
+
+    def test_slot_bits(self):
+        model = self._model()
+        assert model.slot_count == 40
+        assert model.slot_bit("จันทร์", 1) == 0
+        assert model.slot_bit("ศุกร์", 8) == 39
+        assert model.slot_bit("ศุกร์", "8") == 39
+        assert model.slot_bit("เสาร์", 1) is None
+        assert model.slot_bit("จันทร์", 9) is None
+        assert model.slot_of(9) == ("อังคาร", 2)
+
+    def test_masks_and_lookup(self):
+        model = self._model()
+        assert model.teacher_mask("T1") == (1 << 0) | (1 << 39)
+        assert model.class_mask("ป.1/1") == 0b11
+        assert model.room_mask("101") == 0b11
+        assert model.teacher_entry("T1", "ศุกร์", 8)['id'] == 3
+        assert model.class_entry("ป.1/1", "จันทร์", 2)['id'] == 2
+        assert model.teacher_entry("T2", "ศุกร์", 8) is None
+        assert [e['id'] for e in model.room_entries("101", "จันทร์", 1)] == [1]
+
+    def test_free_slots(self):
+        model = self._model()
+        assert len(model.free_slots(teacher_id="T1")) == 38
+        free = model.free_slots(teacher_id="T2", class_room="ป.1/1")
+        assert ("จันทร์", 1) not in free and ("จันทร์", 2) not in free
+        assert free[0] == ("จันทร์", 3)
+        assert model.free_mask() == model.full_mask
+
+    def test_remove_and_readd(self):
+        model = self._model()
+        removed = model.remove(1)
+        assert removed['id'] == 1
+        assert model.teacher_mask("T1") == 1 << 39
+        assert model.room_mask("101") == 0b10
+        assert model.remove(1) is None
+        model.add(dict(removed, period_no=3))
+        assert model.class_mask("ป.1/1") == 0b110
+        # add ซ้ำ id เดิม = แทนที่
+        model.add(dict(removed, period_no=4))
+        assert model.class_mask("ป.1/1") == 0b1010
+        assert len(model) == 3
+
+    def test_shared_slot_keeps_other_entry(self):
+        model = self._model()
+        model.add({'id': 4, 'class_room': "ป.1/1", 'day_of_week': "จันทร์", 'period_no': 1,
+                   'teacher_id': "T3", 'room_no': "101", 'subject_name': "ดนตรี"})
+        assert len(model.room_entries("101", "จันทร์", 1)) == 2
+        model.remove(4)
+        assert model.class_entry("ป.1/1", "จันทร์", 1)['id'] == 1
+        assert model.room_mask("101") == 0b11
+
+
+class TestTimetableGenerator:
+    """ทดสอบการจัดตารางอัตโนมัติ"""
+
+    def test_synthetic_school_40_classes(self):
+        from modules.timetable_generator import TimetableGenerator, synthetic_school, find_conflicts
+        requirements, availability = synthetic_school(40, seed=1)
+        result = TimetableGenerator(requirements, availability=availability, seed=1).generate()
+        assert result.complete
+        assert len(result.entries) == sum(r.periods for r in requirements)
+        assert find_conflicts(result.entries) == []
+        assert result.seconds < 30
+
+    def test_constraints_respected(self):
+        from modules.timetable_generator import TimetableGenerator, Requirement
+        full = (1 << 40) - 1
+        monday = (1 << 8) - 1
+        requirements = [
+            Requirement("ป.1/1", "คณิต", "T1", 5),
+            Requirement("ป.1/2", "คณิต", "T1", 5),
+            Requirement("ป.1/1", "ไทย", "T2", 4, room_no="Lab"),
+            Requirement("ป.1/2", "วิทย์", "T3", 4, room_no="Lab"),
+        ]
+        fixed = [{'class_room': "ป.2/1", 'day_of_week': "อังคาร", 'period_no': 1,
+                  'teacher_id': "T1", 'room_no': None}]
+        result = TimetableGenerator(requirements, fixed=fixed, max_per_day=1,
+                                    availability={"T2": full & ~monday}).generate()
+        assert result.complete
+        per_day = {}
+        for e in result.entries:
+            key = (e['class_room'], e['subject_name'], e['day_of_week'])
+            per_day[key] = per_day.get(key, 0) + 1
+            assert (e['teacher_id'], e['day_of_week'], e['period_no']) != ("T1", "อังคาร", 1)
+            assert not (e['teacher_id'] == "T2" and e['day_of_week'] == "จันทร์")
+        assert max(per_day.values()) == 1
+        lab = [(e['day_of_week'], e['period_no']) for e in result.entries if e['room_no'] == "Lab"]
+        assert len(lab) == len(set(lab)) == 8
+        assert {e['start_time'] for e in result.entries if e['period_no'] == 5} == {"13:00"}
+
+    def test_over_capacity_reports_problem(self):
+        from modules.timetable_generator import TimetableGenerator, Requirement, find_conflicts
+        requirements = [Requirement(f"ป.1/{i}", "คณิต", "T1", 5) for i in range(1, 10)]
+        result = TimetableGenerator(requirements).generate()
+        assert not result.complete
+        assert len(result.entries) == 40
+        assert sum(count for _, count in result.unplaced) == 5
+        assert "T1" in result.problems[0]
+        assert find_conflicts(result.entries) == []
+
+    def test_diff_schedules(self):
+        from modules.timetable_generator import diff_schedules
+
+        def entry(day, period, subject, teacher="T1", room="ป.1/1"):
+            return {'class_room': room, 'day_of_week': day, 'period_no': period,
+                    'subject_name': subject, 'teacher_id': teacher, 'room_no': None}
+
+        current = [entry("จันทร์", 1, "คณิต"), entry("จันทร์", 2, "ไทย"), entry("อังคาร", 1, "วิทย์")]
+        proposed = [entry("จันทร์", 1, "คณิต"), entry("จันทร์", 2, "ไทย", teacher="T2"),
+                    entry("พุธ", 1, "วิทย์")]
+        diff = diff_schedules(current, proposed)
+        assert diff['unchanged'] == 1
+        assert [(old['teacher_id'], new['teacher_id']) for old, new in diff['changed']] == [("T1", "T2")]
+        assert [e['day_of_week'] for e in diff['added']] == ["พุธ"]
+        assert [e['day_of_week'] for e in diff['removed']] == ["อังคาร"]
+
+    def test_requirements_from_schedule(self):
+        from modules.timetable_generator import requirements_from_schedule
+        schedules = [
+            {'class_room': "ป.1/1", 'subject_name': "คณิต", 'teacher_id': "T1", 'room_no': None},
+            {'class_room': "ป.1/1", 'subject_name': "คณิต", 'teacher_id': "T1", 'room_no': ""},
+            {'class_room': "ป.1/1", 'subject_name': "ไทย", 'teacher_id': "T2", 'room_no': "101"},
+        ]
+        reqs = requirements_from_schedule(schedules)
+        assert [(r.subject_name, r.periods, r.room_no) for r in reqs] == [("คณิต", 2, None), ("ไทย", 1, "101")]
+
+    def test_load_csv(self, tmp_path):
+        from modules.timetable_generator import load_requirements_csv, load_availability_csv
+        req_file = tmp_path / "req.csv"
+        req_file.write_text("class_room,subject_name,teacher_id,periods_per_week,room_no\n"
+                            "ป.1/1,คณิต,T1,5,\nป.1/1,คอม,T2,2,Lab1\n", encoding="utf-8")
+        reqs = load_requirements_csv(str(req_file))
+        assert [(r.teacher_id, r.periods, r.room_no) for r in reqs] == [("T1", 5, None), ("T2", 2, "Lab1")]
+
+        req_file.write_text("class_room,subject_name,teacher_id,periods_per_week\nป.1/1,คณิต,T1,x\n",
+                            encoding="utf-8")
+        with pytest.raises(ValueError, match="บรรทัด 2"):
+            load_requirements_csv(str(req_file))
+
+        avail_file = tmp_path / "avail.csv"
+        avail_file.write_text("teacher_id,day_of_week,period_no\nT1,จันทร์,\nT1,อังคาร,3\n",
+                              encoding="utf-8")
+        availability = load_availability_csv(str(avail_file))
+        assert availability["T1"] == ((1 << 40) - 1) & ~0xFF & ~(1 << 10)
+
+    def test_csv_unknown_teacher_rejected(self, tmp_path):
+        """รหัสครูในไฟล์ที่ไม่มีในระบบ - แจ้งทุกรหัสและไม่จัดตาราง"""
+        from modules.timetable_generator import load_requirements_csv, check_teachers
+        req_file = tmp_path / "req.csv"
+        req_file.write_text("class_room,subject_name,teacher_id,periods_per_week\n"
+                            "ป.1/1,คณิต,T999,3\nป.1/1,ไทย,T1,2\nป.1/2,คอม,T888,1\n", encoding="utf-8")
+        reqs = load_requirements_csv(str(req_file))
+        teachers = [{'teacher_id': "T1"}, {'teacher_id': "T2"}]
+        with pytest.raises(ValueError, match="T888, T999"):
+            check_teachers(reqs, teachers)
+        check_teachers([r for r in reqs if r.teacher_id == "T1"], teachers)
+
+
+class TestRoomUsageSummary:
+    """ทดสอบการสรุปอัตราการใช้ห้อง"""
+
+    def test_summary(self):
+        from modules.room_usage import summarize_room_usage
+        rows = [
+            {'room_no': "Lab2", 'period_no': 1, 'days_used': 5, 'bookings': 5},
+            {'room_no': "Lab1", 'period_no': 1, 'days_used': 2, 'bookings': 3},
+            {'room_no': "Lab1", 'period_no': 8, 'days_used': 2, 'bookings': 2},
+            {'room_no': "Lab1", 'period_no': 9, 'days_used': 1, 'bookings': 1},  # นอกตาราง
+        ]
+        summary = summarize_room_usage(rows)
+        assert [r['room_no'] for r in summary['rooms']] == ["Lab1", "Lab2"]
+        lab1, lab2 = summary['rooms']
+        assert (lab1['used'], lab1['capacity'], lab1['percent'], lab1['double_booked']) == (4, 40, 10.0, 1)
+        assert lab1['by_period'][1] == 2 and lab1['by_period'][2] == 0
+        assert lab2['percent'] == 12.5
+        assert summary['by_period'][1] == 70.0     # (2 + 5) / (5 วัน × 2 ห้อง)
+        assert summary['by_period'][8] == 20.0
+        assert summary['percent'] == 11.2
+
+    def test_empty(self):
+        from modules.room_usage import summarize_room_usage
+        summary = summarize_room_usage([])
+        assert summary['rooms'] == [] and summary['percent'] == 0.0
+
+
+class TestSubstitutes:
+    """ทดสอบการหาครูสอนแทนด้วย bitset"""
+
+    @staticmethod
+    def _entry(id, teacher_id, day, period, class_room="ป.1/1"):
+        return {'id': id, 'teacher_id': teacher_id, 'day_of_week': day, 'period_no': period,
+                'class_room': class_room, 'subject_name': "คณิตศาสตร์", 'room_no': None}
+
+    def test_weekday_of(self):
+        from datetime import date
+        from modules.substitutes import weekday_of
+        assert weekday_of("2026-10-19") == "จันทร์"
+        assert weekday_of(date(2026, 10, 23)) == "ศุกร์"
+        assert weekday_of("2026-10-24") is None     # วันเสาร์
+        with pytest.raises(ValueError):
+            weekday_of("19/10/2026")
+
+    def test_plan_ranks_free_teachers_by_workload(self):
+        from modules.substitutes import plan_substitutes
+        from modules.timetable_model import TimetableModel
+        entries = [
+            self._entry(1, "A", "จันทร์", 1), self._entry(2, "A", "จันทร์", 3),
+            self._entry(3, "A", "อังคาร", 1),
+            self._entry(4, "B", "จันทร์", 1, "ป.2/1"),
+            self._entry(5, "C", "อังคาร", 2, "ป.3/1"), self._entry(6, "C", "อังคาร", 3, "ป.3/1"),
+            self._entry(7, "D", "จันทร์", 2, "ป.4/1"),
+        ]
+        model = TimetableModel(entries)
+        workload = [
+            {'teacher_id': "A", 'name': "ครูเอ", 'periods_per_week': 3},
+            {'teacher_id': "C", 'name': "ครูซี", 'periods_per_week': 2},
+            {'teacher_id': "B", 'name': "ครูบี", 'periods_per_week': 1},
+            {'teacher_id': "D", 'name': "ครูดี", 'periods_per_week': 1},
+            {'teacher_id': "E", 'name': "ครูอี", 'periods_per_week': 0},
+        ]
+        plan = plan_substitutes(model, "A", "จันทร์", model.teacher_entries("A"), workload)
+
+        assert [item['period_no'] for item in plan] == [1, 3]
+        first, third = plan
+        # คาบ 1: B สอนอยู่ -> E (0), D (1 คาบ, วันนี้ 1), C (2)
+        assert [c['teacher_id'] for c in first['candidates']] == ["E", "D", "C"]
+        # คาบ 3: ทุกคนว่าง; B กับ D ภาระเท่ากัน เรียงตามชื่อ (ครูดี ก่อน ครูบี)
+        assert [c['teacher_id'] for c in third['candidates']] == ["E", "D", "B", "C"]
+        assert third['candidates'][1]['periods_today'] == 1
+        assert all(c['teacher_id'] != "A" for item in plan for c in item['candidates'])
+
+        limited = plan_substitutes(model, "A", "จันทร์", model.teacher_entries("A"), workload, limit=1)
+        assert [len(item['candidates']) for item in limited] == [1, 1]
+        assert plan_substitutes(model, "A", "พุธ", model.teacher_entries("A"), workload) == []
+
+
+class TestTimetableImportParsing:
+    """ทดสอบอ่านตาราง ห้องเรียน × วัน × คาบ"""
+
+    def test_parse_cell(self):
+        from modules.timetable_import import parse_cell
+        assert parse_cell(None) is None
+        assert parse_cell("  ") is None and parse_cell("-") is None
+        assert parse_cell("ภาษาไทย / T001") == ("ภาษาไทย", "T001", None)
+        assert parse_cell("คอมพิวเตอร์\nT003\nLab1") == ("คอมพิวเตอร์", "T003", "Lab1")
+        with pytest.raises(ValueError):
+            parse_cell("ภาษาไทย")
+
+    def test_read_grid(self):
+        from modules.timetable_import import read_grid
+        rows = [
+            ("ห้องเรียน", "วัน", "คาบ 1", "คาบ 2", 9),
+            ("ป.1/1", "จันทร์", "ภาษาไทย / T001", None, None),
+            (None, None, None, None, None),                 # แถวว่างข้าม
+            ("ป.1/1", "อาทิตย์", "ภาษาไทย / T001", None, None),
+        ]
+        cells, problems = read_grid(rows, "ชีต 1")
+        assert [(c[1]['class_room'], c[1]['day_of_week'], c[1]['period_no']) for c in cells] == \
+            [("ป.1/1", "จันทร์", 1)]
+        assert cells[0][0] == "ชีต 1 แถว 2 ป.1/1 วันจันทร์ คาบ 1"
+        assert len(problems) == 2       # ไม่มีคาบที่ 9 + วันอาทิตย์
+        assert "แถว 4" in problems[1]
+
+        cells, problems = read_grid([("วัน", "1")], "x.csv")
+        assert cells == [] and "ห้องเรียน" in problems[0]